@@ -0,0 +1,118 @@
+"""
+Benchmark: a burst of diagnose requests with and without admission control.
+
+Simulates POST /diagnose as a Claude call (--service-ms) that holds one
+of --pool database connections, like the server's SQLAlchemy pool
+(default size 5, waits up to --pool-timeout for a connection). A burst
+of --requests arrives from --clients clients at once. Without admission
+control every request starts and queues on the pool, and the late ones
+time out after waiting; with it, excess requests get an immediate 429
+with Retry-After and admitted ones finish quickly.
+
+Usage:
+    python benchmarks/bench_admission.py [--requests N] [--clients C]
+"""
+
+import os
+import sys
+import time
+import asyncio
+import argparse
+import statistics
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import httpx  # noqa: E402
+from fastapi import FastAPI, HTTPException  # noqa: E402
+
+from src.mcp_server.admission import (  # noqa: E402
+    AdmissionControl,
+    AdmissionMiddleware,
+    default_policies,
+)
+
+
+def _app(args, admission: bool):
+    pool = asyncio.Semaphore(args.pool)
+    peak = {"in_flight": 0, "max": 0}
+    app = FastAPI()
+    if admission:
+        app.add_middleware(AdmissionMiddleware, control=AdmissionControl())
+
+    @app.post("/diagnose")
+    async def diagnose():
+        peak["in_flight"] += 1
+        peak["max"] = max(peak["max"], peak["in_flight"])
+        try:
+            await asyncio.wait_for(pool.acquire(), args.pool_timeout)
+        except asyncio.TimeoutError:
+            raise HTTPException(status_code=500, detail="QueuePool timeout")
+        finally:
+            peak["in_flight"] -= 1
+        try:
+            await asyncio.sleep(args.service_ms / 1000)
+            return {"ok": True}
+        finally:
+            pool.release()
+
+    return app, peak
+
+
+async def _burst(args, admission: bool) -> dict:
+    app, peak = _app(args, admission)
+    outcomes = {200: [], 429: [], 500: []}
+
+    async def request(n):
+        # One address per client, so each has its own token bucket
+        client_ip = f"10.0.0.{n % args.clients}"
+        async with httpx.AsyncClient(
+            transport=httpx.ASGITransport(app=app, client=(client_ip, 0)),
+            base_url="http://bench",
+            timeout=None,
+        ) as client:
+            start = time.perf_counter()
+            response = await client.post("/diagnose")
+            outcomes[response.status_code].append(time.perf_counter() - start)
+
+    await asyncio.gather(*(request(n) for n in range(args.requests)))
+
+    ok = sorted(outcomes[200])
+    return {
+        "ok": len(ok),
+        "rejected": len(outcomes[429]),
+        "failed": len(outcomes[500]),
+        "p50_s": statistics.median(ok) if ok else 0,
+        "max_s": ok[-1] if ok else 0,
+        "reject_ms": statistics.median(outcomes[429]) * 1000 if outcomes[429] else 0,
+        "peak_waiting": peak["max"],
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument("--requests", type=int, default=200)
+    parser.add_argument("--clients", type=int, default=10)
+    parser.add_argument("--service-ms", type=float, default=500)
+    parser.add_argument("--pool", type=int, default=5)
+    parser.add_argument("--pool-timeout", type=float, default=5.0)
+    args = parser.parse_args()
+
+    policy = default_policies()[("POST", "/diagnose")]
+    print(
+        f"{args.requests} requests from {args.clients} clients at once, "
+        f"{args.service_ms:g}ms each, pool of {args.pool} "
+        f"(admission: {policy.max_concurrent} slots, queue {policy.max_queue}, "
+        f"burst {policy.burst}/client)"
+    )
+    for label, admission in (("no admission", False), ("admission", True)):
+        r = asyncio.run(_burst(args, admission))
+        print(
+            f"  {label:<13} {r['ok']:>4} ok  {r['failed']:>4} pool timeouts  "
+            f"{r['rejected']:>4} x 429 (in {r['reject_ms']:.1f}ms)  "
+            f"ok p50 {r['p50_s']:.2f}s max {r['max_s']:.2f}s  "
+            f"peak waiting for pool {r['peak_waiting']}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,131 @@
+"""
+Benchmark: dashboard first paint, per-panel requests vs one snapshot.
+
+Loads the dashboard's data the old way (GET /agents, /reports, /plan,
+/security/summary and /security/vulnerabilities, sent concurrently like
+a browser does) and with one GET /dashboard/snapshot, --loads times
+each, against a server started with SENTINEL_CACHE_TTL_SECONDS=0.
+
+"after write" loads follow a new bottleneck being saved, so the caches
+must rebuild (per-panel: /reports only; snapshot: the reports panel);
+"unchanged" loads only revalidate table versions.
+
+Usage:
+    DATABASE_URL=... python benchmarks/bench_dashboard.py [--loads N]
+"""
+
+import os
+import sys
+import time
+import socket
+import asyncio
+import argparse
+import statistics
+import subprocess
+
+import httpx
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from src.storage.postgres_client import PostgresClient  # noqa: E402
+
+PANEL_PATHS = (
+    "/agents",
+    "/reports",
+    "/plan",
+    "/security/summary",
+    "/security/vulnerabilities",
+)
+
+
+def _free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+async def _wait_ready(client: httpx.AsyncClient, timeout: float = 30) -> None:
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            if (await client.get("/health")).status_code == 200:
+                return
+        except httpx.HTTPError:
+            pass
+        await asyncio.sleep(0.2)
+    raise RuntimeError("Server didn't start")
+
+
+async def _load(client: httpx.AsyncClient, paths) -> float:
+    start = time.perf_counter()
+    responses = await asyncio.gather(*(client.get(path) for path in paths))
+    elapsed = (time.perf_counter() - start) * 1000
+    for response in responses:
+        if response.status_code not in (200, 404):  # 404: no plan yet
+            response.raise_for_status()
+    return elapsed
+
+
+async def _measure(url: str, db: PostgresClient, loads: int) -> dict:
+    agent_id = db.get_all_agents()[0]["agent_id"]
+    results = {}
+    # Browsers open up to six connections per host
+    limits = httpx.Limits(max_connections=6)
+    async with httpx.AsyncClient(base_url=url, limits=limits) as client:
+        await _wait_ready(client)
+        for label, paths in (
+            ("per-panel", PANEL_PATHS),
+            ("snapshot", ("/dashboard/snapshot",)),
+        ):
+            await _load(client, paths)  # Open connections, fill caches
+            for state in ("after write", "unchanged"):
+                latencies = []
+                for n in range(loads):
+                    if state == "after write":
+                        db.save_bottleneck(
+                            agent_id,
+                            {"description": f"Bench {n}", "confidence": 0.5},
+                        )
+                    latencies.append(await _load(client, paths))
+                results[f"{label}, {state}"] = (len(paths), sorted(latencies))
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument("--loads", type=int, default=100)
+    args = parser.parse_args()
+
+    db = PostgresClient()
+    db.connect()
+    if not db.get_all_agents():
+        parser.error("Register some agents first (sentinel init-project)")
+
+    port = _free_port()
+    env = {
+        **os.environ,
+        "SERVER_PORT": str(port),
+        "LOG_LEVEL": "WARNING",
+        "SENTINEL_CACHE_TTL_SECONDS": "0",
+    }
+    server = subprocess.Popen(
+        [sys.executable, "-m", "src.mcp_server.sentinel_server"], cwd=ROOT, env=env
+    )
+    try:
+        results = asyncio.run(_measure(f"http://127.0.0.1:{port}", db, args.loads))
+    finally:
+        server.terminate()
+        server.wait()
+
+    print(f"{args.loads} dashboard loads each")
+    for label, (requests, latencies) in results.items():
+        print(
+            f"  {label:<24} {requests} request(s)  "
+            f"p50 {statistics.median(latencies):6.2f}ms  "
+            f"p99 {latencies[int(len(latencies) * 0.99) - 1]:6.2f}ms"
+        )
+
+
+if __name__ == "__main__":
+    main()
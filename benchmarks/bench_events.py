@@ -0,0 +1,158 @@
+"""
+Benchmark: how soon a dashboard sees a new bottleneck, push vs polling.
+
+Saves --writes bottlenecks at random intervals from a separate process
+(as a worker would) and measures, for each, the delay until a client
+notices it:
+
+- push: subscribed to GET /events (Postgres LISTEN/NOTIFY behind it);
+- polling: GET /reports every --poll-interval seconds, as the dashboard
+  did, comparing each agent's latest bottleneck.
+
+Also counts the requests each client made.
+
+Usage:
+    DATABASE_URL=postgresql://... python benchmarks/bench_events.py \\
+        [--writes N] [--poll-interval 2]
+"""
+
+import os
+import sys
+import json
+import time
+import random
+import socket
+import asyncio
+import argparse
+import statistics
+import subprocess
+
+import httpx
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from src.storage.postgres_client import PostgresClient  # noqa: E402
+
+
+def _free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+async def _wait_ready(client: httpx.AsyncClient, timeout: float = 30) -> None:
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            if (await client.get("/health")).status_code == 200:
+                return
+        except httpx.HTTPError:
+            pass
+        await asyncio.sleep(0.2)
+    raise RuntimeError("Server didn't start")
+
+
+async def _push(client, seen: dict, counts: dict, ready: asyncio.Event) -> None:
+    counts["push"] += 1
+    async with client.stream("GET", "/events?kinds=bottleneck") as response:
+        event = None
+        async for line in response.aiter_lines():
+            if line.startswith("event: "):
+                event = line[len("event: ") :]
+                ready.set()
+            elif line.startswith("data: ") and event == "bottleneck":
+                description = json.loads(line[len("data: ") :])["bottleneck"][
+                    "description"
+                ]
+                seen["push"].setdefault(description, time.perf_counter())
+
+
+async def _poll(client, interval: float, seen: dict, counts: dict) -> None:
+    await asyncio.sleep(random.uniform(0, interval))  # Page opened any time
+    while True:
+        counts["polling"] += 1
+        reports = (await client.get("/reports")).json()["reports"]
+        now = time.perf_counter()
+        for report in reports:
+            if report["bottleneck"]:
+                seen["polling"].setdefault(report["bottleneck"]["description"], now)
+        await asyncio.sleep(interval)
+
+
+async def _measure(url: str, db: PostgresClient, args) -> tuple:
+    agent_id = db.get_all_agents()[0]["agent_id"]
+    seen = {"push": {}, "polling": {}}
+    counts = {"push": 0, "polling": 0}
+    written = {}
+    ready = asyncio.Event()
+
+    async with httpx.AsyncClient(base_url=url, timeout=None) as client:
+        await _wait_ready(client)
+        tasks = [
+            asyncio.create_task(_push(client, seen, counts, ready)),
+            asyncio.create_task(_poll(client, args.poll_interval, seen, counts)),
+        ]
+        await ready.wait()
+        run = f"bench-{time.time():.0f}"
+        for n in range(args.writes):
+            await asyncio.sleep(random.uniform(0.5, 2 * args.poll_interval))
+            description = f"{run}-{n}"
+            written[description] = time.perf_counter()
+            await asyncio.to_thread(
+                db.save_bottleneck,
+                agent_id,
+                {"description": description, "confidence": 0.5},
+            )
+        await asyncio.sleep(args.poll_interval + 1)
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+    delays = {
+        mode: sorted(
+            (seen[mode][d] - at) * 1000 for d, at in written.items() if d in seen[mode]
+        )
+        for mode in seen
+    }
+    return delays, counts, len(written)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument("--writes", type=int, default=20)
+    parser.add_argument("--poll-interval", type=float, default=2.0)
+    args = parser.parse_args()
+
+    if not os.getenv("DATABASE_URL", "").startswith("postgresql"):
+        parser.error("DATABASE_URL must point at PostgreSQL (events use NOTIFY)")
+    db = PostgresClient()
+    db.connect()
+    if not db.get_all_agents():
+        parser.error("Register some agents first (sentinel init-project)")
+
+    port = _free_port()
+    env = {**os.environ, "SERVER_PORT": str(port), "LOG_LEVEL": "WARNING"}
+    server = subprocess.Popen(
+        [sys.executable, "-m", "src.mcp_server.sentinel_server"], cwd=ROOT, env=env
+    )
+    try:
+        delays, counts, writes = asyncio.run(
+            _measure(f"http://127.0.0.1:{port}", db, args)
+        )
+    finally:
+        server.terminate()
+        server.wait()
+
+    print(f"{writes} bottlenecks saved by another process")
+    for mode, latencies in delays.items():
+        # The latest bottleneck per agent hides ones saved between polls
+        print(
+            f"  {mode:<8} seen {len(latencies):>3}  "
+            f"p50 {statistics.median(latencies):7.1f}ms  "
+            f"max {latencies[-1]:7.1f}ms  {counts[mode]} request(s)"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,124 @@
+"""
+Benchmark: startup time of the CLI and the API server.
+
+Runs `sentinel --help`, `sentinel list-agents` and a server boot (importing
+the app) in fresh interpreters under `python -X importtime`, and reports
+wall time, total import time, the slowest top-level imports and whether
+any of the heavy SDKs (anthropic, the Notion client, the OTLP/gRPC
+exporter) were loaded. With --check, exits non-zero when a command's
+import time is over its budget or it loads a heavy SDK.
+
+Usage:
+    python benchmarks/bench_import_time.py [--repeat R] [--check]
+
+Without DATABASE_URL a temporary SQLite database is used.
+"""
+
+import os
+import sys
+import time
+import argparse
+import tempfile
+import subprocess
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Import-time budgets (milliseconds, best of --repeat)
+BUDGETS_MS = {
+    "sentinel --help": 250,
+    "sentinel list-agents": 500,
+    "server boot": 1000,
+}
+
+# SDKs only the code paths that call them should import
+HEAVY_MODULES = ("anthropic", "notion_client", "grpc", "opentelemetry.exporter")
+
+COMMANDS = {
+    "sentinel --help": ["-m", "src.cli.cli", "--help"],
+    "sentinel list-agents": ["-m", "src.cli.cli", "list-agents"],
+    "server boot": ["-c", "import src.mcp_server.sentinel_server"],
+}
+
+
+def _importtime(args, env) -> dict:
+    """Run a command under -X importtime and parse its import report"""
+    start = time.perf_counter()
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", *args],
+        cwd=ROOT,
+        env=env,
+        capture_output=True,
+        text=True,
+    )
+    wall_ms = (time.perf_counter() - start) * 1000
+
+    modules = []  # (self_us, cumulative_us, depth, name)
+    for line in proc.stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:") :].split("|")
+        depth = (len(name) - len(name.lstrip()) + 1) // 2
+        modules.append((int(self_us), int(cumulative_us), depth, name.strip()))
+
+    return {
+        "returncode": proc.returncode,
+        "wall_ms": wall_ms,
+        "import_ms": sum(m[0] for m in modules) / 1000,
+        "top": sorted((m for m in modules if m[2] == 1), key=lambda m: -m[1])[:5],
+        "heavy": sorted(
+            {
+                h
+                for h in HEAVY_MODULES
+                for m in modules
+                if m[3] == h or m[3].startswith(h + ".")
+            }
+        ),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument(
+        "--check", action="store_true", help="Exit 1 if a budget is exceeded"
+    )
+    args = parser.parse_args()
+
+    env = dict(os.environ)
+    if not env.get("DATABASE_URL"):
+        path = os.path.join(tempfile.mkdtemp(), "bench.db")
+        env["DATABASE_URL"] = f"sqlite:///{path}"
+        subprocess.run(
+            [sys.executable, "-m", "src.cli.cli", "init-db"],
+            cwd=ROOT,
+            env=env,
+            capture_output=True,
+        )
+
+    failures = []
+    print(f"best of {args.repeat}")
+    for label, command in COMMANDS.items():
+        runs = [_importtime(command, env) for _ in range(args.repeat)]
+        best = min(runs, key=lambda r: r["import_ms"])
+        budget = BUDGETS_MS[label]
+        over = best["import_ms"] > budget
+        heavy = sorted({name for r in runs for name in r["heavy"]})
+        print(
+            f"  {label:<22} wall {min(r['wall_ms'] for r in runs):7.1f}ms  "
+            f"imports {best['import_ms']:7.1f}ms (budget {budget}ms"
+            f"{', OVER' if over else ''})"
+        )
+        for _, cumulative_us, _, name in best["top"]:
+            print(f"      {cumulative_us / 1000:7.1f}ms  {name}")
+        if heavy:
+            print(f"      heavy SDKs loaded: {', '.join(heavy)}")
+        if over or heavy or best["returncode"]:
+            failures.append(label)
+
+    if args.check and failures:
+        print(f"over budget: {', '.join(failures)}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
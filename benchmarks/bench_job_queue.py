@@ -0,0 +1,131 @@
+"""
+Benchmark: job queue throughput with several local workers.
+
+Enqueues synthetic jobs that sleep for a fixed time (standing in for a
+Claude call), then drains the queue with 1, 2, 4, ... worker processes
+and reports jobs per second. Workers only share the Postgres table, as
+they would across hosts, so throughput should scale with worker count
+until the database becomes the bottleneck.
+
+Usage:
+    DATABASE_URL=postgresql://... python benchmarks/bench_job_queue.py \\
+        [--jobs N] [--latency SECONDS] [--workers 1,2,4,8] [--concurrency C]
+
+The benchmark creates the jobs table if needed and deletes its own jobs
+("bench" kind) before and after each run.
+"""
+
+import os
+import sys
+import time
+import asyncio
+import argparse
+import multiprocessing
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.storage.job_queue import JobQueue  # noqa: E402
+from src.storage.models import Job  # noqa: E402
+from src.storage.postgres_client import PostgresClient  # noqa: E402
+
+
+def _connect() -> PostgresClient:
+    db = PostgresClient()
+    db.connect()
+    return db
+
+
+def _clear(db: PostgresClient) -> None:
+    session = db.Session()
+    try:
+        session.query(Job).filter_by(kind="bench").delete()
+        session.commit()
+    finally:
+        session.close()
+
+
+def _worker_process(index: int, latency: float, concurrency: int, done) -> None:
+    from src.orchestration.worker import Worker
+
+    async def handle(job, worker):
+        await asyncio.sleep(latency)
+        return {"worker": worker.worker_id}
+
+    async def main():
+        worker = Worker(
+            JobQueue(_connect()),
+            {"bench": handle},
+            worker_id=f"bench-{index}",
+            concurrency=concurrency,
+            poll_interval=0.05,
+        )
+        stop = asyncio.Event()
+
+        async def stop_when_drained():
+            while True:
+                await asyncio.sleep(0.2)
+                if done.is_set():
+                    stop.set()
+                    return
+
+        await asyncio.gather(worker.run(stop), stop_when_drained())
+
+    asyncio.run(main())
+
+
+def _run(workers: int, jobs: int, latency: float, concurrency: int) -> float:
+    db = _connect()
+    _clear(db)
+    queue = JobQueue(db)
+    queue.enqueue_many([{"kind": "bench", "payload": {"n": n}} for n in range(jobs)])
+
+    done = multiprocessing.Event()
+    processes = [
+        multiprocessing.Process(
+            target=_worker_process, args=(i, latency, concurrency, done)
+        )
+        for i in range(workers)
+    ]
+    start = time.perf_counter()
+    for process in processes:
+        process.start()
+
+    while queue.stats().get("bench", {}).get("succeeded", 0) < jobs:
+        time.sleep(0.05)
+    elapsed = time.perf_counter() - start
+
+    done.set()
+    for process in processes:
+        process.join()
+    _clear(db)
+    return elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument("--jobs", type=int, default=400)
+    parser.add_argument("--latency", type=float, default=0.2)
+    parser.add_argument("--workers", default="1,2,4,8")
+    parser.add_argument("--concurrency", type=int, default=4)
+    args = parser.parse_args()
+
+    db = _connect()
+    db.init_db()
+
+    print(
+        f"{args.jobs} jobs x {args.latency * 1000:.0f}ms, "
+        f"{args.concurrency} slots per worker"
+    )
+    baseline = None
+    for workers in [int(w) for w in args.workers.split(",")]:
+        elapsed = _run(workers, args.jobs, args.latency, args.concurrency)
+        throughput = args.jobs / elapsed
+        baseline = baseline or throughput
+        print(
+            f"  {workers:>2} worker(s)  {elapsed:6.2f}s  {throughput:7.1f} jobs/s  "
+            f"x{throughput / baseline:.2f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,137 @@
+"""
+Benchmark: per-call latency of MCP tool calls against the REST API.
+
+Makes the same cheap call (an agent's state, one database read) --calls
+times, one after another, three ways:
+
+- REST: POST /state on the API server, as an MCP-to-HTTP proxy would;
+- MCP over HTTP: a tools/call to POST /mcp on the same server;
+- MCP over stdio: a tools/call to `sentinel mcp`, as an MCP client
+  that launches the server itself would.
+
+The HTTP paths use one keep-alive connection, so connection setup isn't
+counted. A proxy adds its own hop on top of the REST figure.
+
+Usage:
+    DATABASE_URL=... python benchmarks/bench_mcp.py [--calls N] [--agent ID]
+"""
+
+import os
+import sys
+import json
+import time
+import socket
+import argparse
+import statistics
+import subprocess
+
+import httpx
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def _free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def _wait_ready(url: str, timeout: float = 30) -> None:
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            if httpx.get(f"{url}/health").status_code == 200:
+                return
+        except httpx.HTTPError:
+            pass
+        time.sleep(0.2)
+    raise RuntimeError("Server didn't start")
+
+
+def _tool_call(request_id: int, agent_id: str) -> dict:
+    return {
+        "jsonrpc": "2.0",
+        "id": request_id,
+        "method": "tools/call",
+        "params": {"name": "state", "arguments": {"agent_id": agent_id}},
+    }
+
+
+def _timed(calls: int, call) -> list:
+    call(0)  # Warm up
+    latencies = []
+    for n in range(1, calls + 1):
+        start = time.perf_counter()
+        call(n)
+        latencies.append((time.perf_counter() - start) * 1000)
+    return sorted(latencies)
+
+
+def _http(url: str, calls: int, agent_id: str) -> dict:
+    with httpx.Client(base_url=url) as client:
+
+        def rest(n):
+            client.post("/state", json={"agent_id": agent_id}).raise_for_status()
+
+        def mcp(n):
+            result = client.post("/mcp", json=_tool_call(n, agent_id)).json()
+            assert not result["result"]["isError"], result
+
+        return {
+            "REST POST /state": _timed(calls, rest),
+            "MCP over HTTP": _timed(calls, mcp),
+        }
+
+
+def _stdio(calls: int, agent_id: str, env: dict) -> list:
+    proc = subprocess.Popen(
+        [sys.executable, "-m", "src.cli.cli", "mcp"],
+        cwd=ROOT,
+        env=env,
+        stdin=subprocess.PIPE,
+        stdout=subprocess.PIPE,
+    )
+    try:
+
+        def call(n):
+            proc.stdin.write(json.dumps(_tool_call(n, agent_id)).encode() + b"\n")
+            proc.stdin.flush()
+            result = json.loads(proc.stdout.readline())
+            assert not result["result"]["isError"], result
+
+        return _timed(calls, call)
+    finally:
+        proc.stdin.close()
+        proc.wait()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument("--calls", type=int, default=500)
+    parser.add_argument("--agent", default="research-01")
+    args = parser.parse_args()
+
+    port = _free_port()
+    url = f"http://127.0.0.1:{port}"
+    env = {**os.environ, "SERVER_PORT": str(port), "LOG_LEVEL": "WARNING"}
+    server = subprocess.Popen(
+        [sys.executable, "-m", "src.mcp_server.sentinel_server"], cwd=ROOT, env=env
+    )
+    try:
+        _wait_ready(url)
+        results = _http(url, args.calls, args.agent)
+    finally:
+        server.terminate()
+        server.wait()
+    results["MCP over stdio"] = _stdio(args.calls, args.agent, env)
+
+    print(f"state of {args.agent}, {args.calls} sequential calls")
+    for label, latencies in results.items():
+        print(
+            f"  {label:<17} p50 {statistics.median(latencies):6.2f}ms  "
+            f"p99 {latencies[int(len(latencies) * 0.99) - 1]:6.2f}ms"
+        )
+
+
+if __name__ == "__main__":
+    main()
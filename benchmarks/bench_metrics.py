@@ -0,0 +1,126 @@
+"""
+Benchmark: what recording metrics costs on the hot paths.
+
+Times --queries database reads through the instrumented engine (cursor
+listeners feeding db.query.duration) and through a plain engine on the
+same database, and --requests API requests to a small app with and
+without MetricsMiddleware. Metrics go to an in-memory reader, so no
+export cost is included; then prints the collected query latencies as a
+bucketed histogram, as a collector would receive them.
+
+Usage:
+    DATABASE_URL=... python benchmarks/bench_metrics.py \\
+        [--queries N] [--requests N]
+"""
+
+import os
+import sys
+import time
+import asyncio
+import argparse
+
+import httpx
+from fastapi import FastAPI
+from opentelemetry.sdk.metrics.export import InMemoryMetricReader
+from sqlalchemy import create_engine, text
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from src.observability import metrics  # noqa: E402
+from src.observability.metrics import MetricsMiddleware  # noqa: E402
+from src.storage.postgres_client import PostgresClient  # noqa: E402
+
+ROUNDS = 3
+
+QUERY = text("SELECT agent_id, domain, last_run FROM agents")
+
+
+def _time_queries(engine, n: int) -> float:
+    with engine.connect() as conn:
+        start = time.perf_counter()
+        for _ in range(n):
+            conn.execute(QUERY).fetchall()
+        return (time.perf_counter() - start) / n * 1e6
+
+
+async def _time_requests(instrumented: bool, n: int) -> float:
+    app = FastAPI()
+    if instrumented:
+        app.add_middleware(MetricsMiddleware)
+
+    @app.get("/agents/{agent_id}")
+    async def get_agent(agent_id: str):
+        return {"agent_id": agent_id}
+
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://x") as client:
+        start = time.perf_counter()
+        for i in range(n):
+            await client.get(f"/agents/agent-{i % 10}")
+        return (time.perf_counter() - start) / n * 1e6
+
+
+def _histogram(reader, name: str):
+    for resource in reader.get_metrics_data().resource_metrics:
+        for scope in resource.scope_metrics:
+            for metric in scope.metrics:
+                if metric.name == name:
+                    return metric.data.data_points
+    return []
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument("--queries", type=int, default=5000)
+    parser.add_argument("--requests", type=int, default=2000)
+    args = parser.parse_args()
+
+    reader = InMemoryMetricReader()
+    metrics.setup_metrics(reader=reader)
+
+    db = PostgresClient()
+    db.connect()
+    db.init_db()
+    plain = create_engine(db.db_url)
+
+    # Best of a few alternating rounds, so neither side gets the warm-up
+    print(f"{args.queries} queries ({db.engine.dialect.name})")
+    baseline = instrumented = float("inf")
+    for _ in range(ROUNDS):
+        baseline = min(baseline, _time_queries(plain, args.queries))
+        instrumented = min(instrumented, _time_queries(db.engine, args.queries))
+    print(f"  plain engine   {baseline:8.1f}us/query")
+    print(
+        f"  instrumented   {instrumented:8.1f}us/query  "
+        f"(+{instrumented - baseline:.1f}us)"
+    )
+
+    print(f"{args.requests} requests (in-process)")
+    baseline = instrumented = float("inf")
+    for _ in range(ROUNDS):
+        baseline = min(baseline, asyncio.run(_time_requests(False, args.requests)))
+        instrumented = min(
+            instrumented, asyncio.run(_time_requests(True, args.requests))
+        )
+    print(f"  no middleware  {baseline:8.1f}us/request")
+    print(
+        f"  instrumented   {instrumented:8.1f}us/request  "
+        f"(+{instrumented - baseline:.1f}us)"
+    )
+
+    print("db.query.duration (SELECT) as exported:")
+    for point in _histogram(reader, "sentinel.db.query.duration"):
+        if point.attributes["db.operation"] != "SELECT":
+            continue
+        bounds = list(point.explicit_bounds) + [float("inf")]
+        for bound, count in zip(bounds, point.bucket_counts):
+            if count:
+                print(f"  <= {bound * 1000:8.1f}ms  {count}")
+
+    plain.dispose()
+    db.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,113 @@
+"""
+Benchmark: synthesis prompt encoding.
+
+Compares the pretty-printed JSON the orchestrator used to send with the
+compact, budgeted table from src.orchestration.encoding on a recorded
+report set: input tokens and encode time, and optionally real input
+token counts and synthesis latency against the API (--live).
+
+Usage:
+    python benchmarks/bench_prompt_encoding.py [reports.json] [--budget N] [--live]
+
+Record a report set from a running server with:
+    curl -s localhost:8000/reports | jq .reports > reports.json
+"""
+
+import os
+import sys
+import json
+import time
+import argparse
+import statistics
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.orchestration.encoding import PromptEncoder, count_tokens  # noqa: E402
+from src.orchestration.reports import flatten_report  # noqa: E402
+
+DEFAULT_REPORTS = os.path.join(
+    os.path.dirname(os.path.abspath(__file__)), "data", "sample_reports.json"
+)
+
+
+def _rank(reports):
+    return sorted(
+        reports,
+        key=lambda x: x.get("impact_score", 0) * x.get("confidence", 0.5),
+        reverse=True,
+    )
+
+
+def _time(fn, repeat=50):
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = fn()
+        samples.append((time.perf_counter() - start) * 1000)
+    return result, statistics.median(samples)
+
+
+def _live(label, text):
+    """Measure real input tokens and synthesis latency for one encoding"""
+    import asyncio
+    from src.agents.orchestrator import OrchestratorAgent
+
+    orchestrator = OrchestratorAgent()
+    prompt = f"Here are the bottleneck reports from all sub-agents:\n\n{text}"
+    counted = orchestrator.claude_client.messages.count_tokens(
+        model="claude-sonnet-4-20250514",
+        messages=[{"role": "user", "content": prompt}],
+    )
+    start = time.perf_counter()
+    asyncio.run(
+        orchestrator.call_claude(
+            system_prompt="Summarize the top three bottlenecks as JSON.",
+            user_message=prompt,
+            max_tokens=500,
+        )
+    )
+    elapsed = time.perf_counter() - start
+    print(
+        f"  {label:<18} api_input_tokens={counted.input_tokens} latency={elapsed:.2f}s"
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument("reports", nargs="?", default=DEFAULT_REPORTS)
+    parser.add_argument("--budget", type=int, default=60000)
+    parser.add_argument("--live", action="store_true", help="Call the Claude API")
+    args = parser.parse_args()
+
+    with open(args.reports) as f:
+        ranked = _rank([flatten_report(r) for r in json.load(f)])
+
+    baseline, baseline_ms = _time(lambda: json.dumps(ranked, indent=2))
+    encoder = PromptEncoder(args.budget)
+    encoded, encoded_ms = _time(lambda: encoder.encode(ranked))
+
+    baseline_tokens = count_tokens(baseline)
+    print(f"Reports: {len(ranked)} from {args.reports}")
+    print(f"{'encoding':<20}{'tokens':>10}{'chars':>10}{'encode_ms':>12}")
+    print(
+        f"{'json indent=2':<20}{baseline_tokens:>10}{len(baseline):>10}{baseline_ms:>12.3f}"
+    )
+    print(
+        f"{'compact table':<20}{encoded.tokens:>10}{len(encoded.text):>10}{encoded_ms:>12.3f}"
+    )
+    print(f"Token reduction: {1 - encoded.tokens / baseline_tokens:.0%}")
+
+    tight = encoder.encode(ranked, budget=baseline_tokens // 4)
+    print(
+        f"At budget {baseline_tokens // 4}: {tight.included} included, "
+        f"{tight.trimmed} trimmed, {tight.omitted} omitted ({tight.tokens} tokens)"
+    )
+
+    if args.live:
+        print("Live API measurements:")
+        _live("json indent=2", baseline)
+        _live("compact table", encoded.text)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,146 @@
+"""
+Benchmark: database load from dashboard polling, with and without the
+response cache.
+
+Simulates several dashboard tabs polling /agents, /reports and the
+security endpoints every 2 seconds (sending If-None-Match like a
+browser), while a diagnosis is saved every 10 seconds. Time is
+simulated, so the run takes seconds. Reports SQL statements executed,
+304s and request latency for each mode.
+
+Usage:
+    DATABASE_URL=postgresql://... python benchmarks/bench_response_cache.py \\
+        [--tabs N] [--minutes M] [--agents A]
+
+Without DATABASE_URL a temporary SQLite database is used. The server
+module is imported as-is, so NOTION_API_KEY must be set (any value).
+"""
+
+import os
+import sys
+import time
+import argparse
+import tempfile
+import statistics
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+ENDPOINTS = ["/agents", "/reports", "/security/summary", "/security/vulnerabilities"]
+POLL_SECONDS = 2
+WRITE_SECONDS = 10
+
+
+class SimulatedClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def _seed(db, agents: int) -> None:
+    for n in range(agents):
+        db.register_agent(f"agent-{n:02d}", "research")
+        db.save_bottleneck(
+            f"agent-{n:02d}",
+            {"description": f"Bottleneck {n}", "confidence": 0.8, "impact_score": 5},
+        )
+        db.save_vulnerability(
+            {
+                "source": "semgrep",
+                "rule_id": f"rule-{n}",
+                "severity": "high",
+                "description": f"Finding {n}",
+            }
+        )
+
+
+def _run(server, client, tabs: int, minutes: float, cached: bool) -> dict:
+    from sqlalchemy import event
+    from src.mcp_server.response_cache import ResponseCache
+
+    clock = SimulatedClock()
+    server.cache = ResponseCache(server.db, enabled=cached, clock=clock)
+
+    statements = 0
+
+    def count(*args):
+        nonlocal statements
+        statements += 1
+
+    event.listen(server.db.engine, "before_cursor_execute", count)
+    etags = {}
+    latencies = []
+    not_modified = 0
+    requests = 0
+    try:
+        for tick in range(int(minutes * 60 / POLL_SECONDS)):
+            clock.now = tick * POLL_SECONDS
+            if clock.now and clock.now % WRITE_SECONDS == 0:
+                server.db.save_bottleneck(
+                    "agent-00", {"description": f"Update {tick}", "confidence": 0.9}
+                )
+            for tab in range(tabs):
+                for path in ENDPOINTS:
+                    headers = {}
+                    if (tab, path) in etags:
+                        headers["If-None-Match"] = etags[(tab, path)]
+                    start = time.perf_counter()
+                    response = client.get(path, headers=headers)
+                    latencies.append((time.perf_counter() - start) * 1000)
+                    requests += 1
+                    if response.status_code == 304:
+                        not_modified += 1
+                    elif "etag" in response.headers:
+                        etags[(tab, path)] = response.headers["etag"]
+    finally:
+        event.remove(server.db.engine, "before_cursor_execute", count)
+
+    latencies.sort()
+    return {
+        "requests": requests,
+        "statements": statements,
+        "not_modified": not_modified,
+        "p50_ms": statistics.median(latencies),
+        "p99_ms": latencies[int(len(latencies) * 0.99) - 1],
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument("--tabs", type=int, default=5)
+    parser.add_argument("--minutes", type=float, default=5)
+    parser.add_argument("--agents", type=int, default=20)
+    args = parser.parse_args()
+
+    if not os.getenv("DATABASE_URL"):
+        path = os.path.join(tempfile.mkdtemp(), "bench.db")
+        os.environ["DATABASE_URL"] = f"sqlite:///{path}"
+
+    from fastapi.testclient import TestClient
+    from src.mcp_server import sentinel_server as server
+
+    with TestClient(server.app) as client:
+        server.db.init_db()
+        _seed(server.db, args.agents)
+
+        print(
+            f"{args.tabs} tabs x {len(ENDPOINTS)} endpoints every {POLL_SECONDS}s "
+            f"for {args.minutes:g} min, a write every {WRITE_SECONDS}s"
+        )
+        results = {}
+        for label, cached in (("uncached", False), ("cached", True)):
+            results[label] = r = _run(server, client, args.tabs, args.minutes, cached)
+            print(
+                f"  {label:<9} {r['requests']} requests  "
+                f"{r['statements']:>6} SQL statements  {r['not_modified']:>5} x 304  "
+                f"p50 {r['p50_ms']:.2f}ms  p99 {r['p99_ms']:.2f}ms"
+            )
+        reduction = (
+            1 - results["cached"]["statements"] / results["uncached"]["statements"]
+        )
+        print(f"  database statements reduced by {reduction:.0%}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,96 @@
+"""
+Benchmark: priority scoring and ranking.
+
+Compares the original lambda sort on impact_score * confidence with the
+columnar PriorityScorer from src.orchestration.scoring on a synthetic
+report set: scoring alone, full ranking and top-k selection, with the
+default weights (impact x confidence) and with every factor enabled.
+
+Usage:
+    python benchmarks/bench_scoring.py [--reports N] [--top K]
+"""
+
+import os
+import sys
+import time
+import random
+import argparse
+import statistics
+from datetime import datetime, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.orchestration.scoring import PriorityScorer, ScoringWeights  # noqa: E402
+
+DOMAINS = ["github-triage", "research", "security", "podcast-production", "jobs"]
+
+# Every opt-in factor enabled
+ALL_FEATURES = ScoringWeights(
+    recency_half_life_days=14,
+    open_age_weight=0.1,
+    blocks_weight=0.1,
+    domain_weights={"security": 1.5},
+)
+
+
+def _reports(count, seed=7):
+    rng = random.Random(seed)
+    now = datetime.utcnow()
+    return [
+        {
+            "agent_id": f"agent-{i}",
+            "domain": rng.choice(DOMAINS),
+            "impact_score": round(rng.uniform(0, 10), 1),
+            "confidence": round(rng.uniform(0.3, 1.0), 2),
+            "blocking": [f"item {rng.randint(0, 500)}"] * rng.randint(0, 4),
+            "identified_at": (now - timedelta(hours=rng.randint(0, 2000))).isoformat(),
+            "open_since": (now - timedelta(days=rng.randint(0, 120))).isoformat(),
+        }
+        for i in range(count)
+    ]
+
+
+def _lambda_rank(reports):
+    return sorted(
+        reports,
+        key=lambda x: x.get("impact_score", 0) * x.get("confidence", 0.5),
+        reverse=True,
+    )
+
+
+def _time(fn, repeat=9):
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - start) * 1000)
+    return statistics.median(samples)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument("--reports", type=int, default=100_000)
+    parser.add_argument("--top", type=int, default=20)
+    args = parser.parse_args()
+
+    reports = _reports(args.reports)
+    print(f"{len(reports)} reports")
+    print(f"  {'lambda sort (impact x confidence)':<40}", end="")
+    print(f"{_time(lambda: _lambda_rank(reports)):8.1f} ms")
+
+    scorers = {
+        "default": PriorityScorer(ScoringWeights()),
+        "all features": PriorityScorer(ALL_FEATURES),
+    }
+    for name, scorer in scorers.items():
+        timings = {
+            "score only": lambda: scorer.score(reports),
+            "full ranking": lambda: scorer.rank(reports),
+            f"top-{args.top}": lambda: scorer.top_k(reports, args.top),
+        }
+        for label, fn in timings.items():
+            print(f"  {f'{name}: {label}':<40}{_time(fn):8.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,132 @@
+"""
+Benchmark: API response encoding time and bytes on the wire.
+
+Compares FastAPI's default path (jsonable_encoder, then the stdlib JSON
+encoder in JSONResponse) with FastJSONResponse (orjson), and the body
+size uncompressed, gzipped and (if installed) brotli-compressed, for
+payloads shaped like /reports, /security/vulnerabilities and a stored
+orchestration plan.
+
+Usage:
+    python benchmarks/bench_serialization.py [--agents N] [--repeat R]
+"""
+
+import os
+import sys
+import json
+import time
+import random
+import argparse
+from datetime import datetime, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from fastapi.encoders import jsonable_encoder  # noqa: E402
+
+from src.mcp_server.serialization import brotli, compress, dumps  # noqa: E402
+
+
+def _payloads(agents: int) -> dict:
+    rng = random.Random(7)
+    now = datetime(2024, 6, 3, 9, 0, 0)
+
+    def bottleneck(n):
+        return {
+            "description": f"Agent {n} is blocked on review capacity for the "
+            f"{rng.choice(['API', 'dashboard', 'pipeline'])} workstream",
+            "impact_score": round(rng.uniform(1, 10), 2),
+            "confidence": round(rng.uniform(0.3, 1), 2),
+            "blocking": [f"task-{n}-{k}" for k in range(rng.randint(0, 4))],
+            "recommended_action": "Pair with the platform team this week",
+            "identified_at": now - timedelta(hours=n),
+        }
+
+    reports = {
+        "reports": [
+            {
+                "agent_id": f"agent-{n:03d}",
+                "domain": rng.choice(["research", "github", "security"]),
+                "last_run": now - timedelta(minutes=n),
+                "bottleneck": bottleneck(n),
+            }
+            for n in range(agents)
+        ]
+    }
+    vulnerabilities = {
+        "vulnerabilities": [
+            {
+                "id": n,
+                "source": rng.choice(["semgrep", "trivy", "gitleaks"]),
+                "severity": rng.choice(["critical", "high", "medium", "low"]),
+                "rule_id": f"rule-{n % 40}",
+                "description": "Untrusted input reaches a shell command",
+                "file_path": f"src/module_{n % 25}.py",
+                "line_number": rng.randint(1, 800),
+                "identified_at": now - timedelta(days=n % 30),
+            }
+            for n in range(agents * 5)
+        ]
+    }
+    plan = {
+        "week": "2024-W23",
+        "top_bottleneck": bottleneck(0),
+        "priority_ranking": [
+            {"agent_id": f"agent-{n:03d}", **bottleneck(n)} for n in range(agents)
+        ],
+        "weekly_plan": [
+            {"action": f"Unblock agent-{n:03d}", "priority": n + 1, "wave": n // 5}
+            for n in range(min(agents, 40))
+        ],
+        "created_at": now,
+    }
+    return {
+        "/reports": reports,
+        "/security/vulnerabilities": vulnerabilities,
+        "plan": plan,
+    }
+
+
+def _default_encode(payload) -> bytes:
+    # What FastAPI does for a returned dict with JSONResponse
+    return json.dumps(
+        jsonable_encoder(payload),
+        ensure_ascii=False,
+        allow_nan=False,
+        indent=None,
+        separators=(",", ":"),
+    ).encode("utf-8")
+
+
+def _time(fn, payload, repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn(payload)
+        best = min(best, time.perf_counter() - start)
+    return best * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument("--agents", type=int, default=200)
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    print(f"{args.agents} agents, best of {args.repeat}")
+    for name, payload in _payloads(args.agents).items():
+        default_ms = _time(_default_encode, payload, args.repeat)
+        fast_ms = _time(dumps, payload, args.repeat)
+        body = dumps(payload)
+        gzip_ms = _time(lambda b: compress(b, "gzip"), body, args.repeat)
+        gzipped = compress(body, "gzip")
+        sizes = f"{len(body) / 1024:7.1f} KB raw  {len(gzipped) / 1024:6.1f} KB gzip"
+        if brotli is not None:
+            sizes += f"  {len(compress(body, 'br')) / 1024:6.1f} KB br"
+        print(
+            f"  {name:<27} encode {default_ms:7.2f}ms -> {fast_ms:6.2f}ms "
+            f"(x{default_ms / fast_ms:4.1f})  gzip {gzip_ms:5.2f}ms  {sizes}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,129 @@
+"""
+Benchmark: what tracing costs on the agent hot paths.
+
+Times --calls instrumented call_claude() calls (a fake Claude client, so
+only Sentinel's own work is measured) and the same calls with the
+decorator stripped (__wrapped__), in each telemetry mode:
+
+    disabled   OTEL_SDK_DISABLED=true: no-op tracer and meter
+    ratio 0    every trace dropped by the sampler, metrics recorded
+    ratio 0.1  1 in 10 traces kept
+    ratio 1    every trace kept
+
+Spans go to an in-memory exporter and metrics to an in-memory reader, so
+no export cost is included. Each mode runs in a fresh interpreter, since
+the mode is fixed once telemetry is set up.
+
+Usage:
+    python benchmarks/bench_telemetry.py [--calls N]
+"""
+
+import os
+import sys
+import json
+import time
+import asyncio
+import argparse
+import subprocess
+from types import SimpleNamespace
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+ROUNDS = 3
+
+MODES = {
+    "disabled": {"OTEL_SDK_DISABLED": "true"},
+    "ratio 0": {"OTEL_TRACES_SAMPLER_ARG": "0"},
+    "ratio 0.1": {"OTEL_TRACES_SAMPLER_ARG": "0.1"},
+    "ratio 1": {"OTEL_TRACES_SAMPLER_ARG": "1"},
+}
+
+RESPONSE = SimpleNamespace(
+    usage=SimpleNamespace(input_tokens=1200, output_tokens=300),
+    content=[SimpleNamespace(text="{}")],
+)
+
+
+class FakeMessages:
+    def create(self, **kwargs):
+        return RESPONSE
+
+
+async def _time_calls(call, agent, n: int) -> float:
+    start = time.perf_counter()
+    for _ in range(n):
+        await call(agent, "system", "user", model="claude-sonnet-4-20250514")
+    return (time.perf_counter() - start) / n * 1e6
+
+
+def _run_mode(calls: int) -> dict:
+    """Time one mode in this process (set by the environment)"""
+    from src.agents.base_agent import BaseAgent
+    from src.agents.research_agent import ResearchAnalystAgent
+    from src.observability import metrics, telemetry
+
+    if os.getenv("OTEL_SDK_DISABLED") == "true":
+        telemetry.setup_telemetry()
+    else:
+        from opentelemetry.sdk.metrics.export import InMemoryMetricReader
+        from opentelemetry.sdk.trace.export.in_memory_span_exporter import (
+            InMemorySpanExporter,
+        )
+
+        metrics.setup_metrics(reader=InMemoryMetricReader())
+        exporter = InMemorySpanExporter()
+        telemetry.setup_telemetry(span_exporter=exporter)
+
+    agent = ResearchAnalystAgent("research-01", "research")
+    agent.claude_client = SimpleNamespace(messages=FakeMessages())
+    instrumented = BaseAgent.call_claude
+    plain = instrumented.__wrapped__
+
+    # Best of a few alternating rounds, so neither side gets the warm-up
+    baseline = traced = float("inf")
+    for _ in range(ROUNDS):
+        baseline = min(baseline, asyncio.run(_time_calls(plain, agent, calls)))
+        traced = min(traced, asyncio.run(_time_calls(instrumented, agent, calls)))
+
+    telemetry.flush_telemetry()
+    spans = 0 if telemetry._provider is None else len(exporter.get_finished_spans())
+    return {"baseline": baseline, "traced": traced, "spans": spans}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument("--calls", type=int, default=20000)
+    parser.add_argument("--mode", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.mode:
+        print(json.dumps(_run_mode(args.calls)))
+        return
+
+    environ = {
+        k: v
+        for k, v in os.environ.items()
+        if k not in ("OTEL_SDK_DISABLED", "OTEL_TRACES_SAMPLER_ARG")
+    }
+    print(f"{args.calls} call_claude() calls (fake client)")
+    for mode, env in MODES.items():
+        proc = subprocess.run(
+            [sys.executable, __file__, "--calls", str(args.calls), "--mode", mode],
+            cwd=ROOT,
+            env={**environ, **env},
+            capture_output=True,
+            text=True,
+            check=True,
+        )
+        result = json.loads(proc.stdout.strip().splitlines()[-1])
+        overhead = result["traced"] - result["baseline"]
+        print(
+            f"  {mode:10} {result['traced']:8.1f}us/call  "
+            f"(+{overhead:.1f}us over undecorated, "
+            f"{result['spans']} spans kept)"
+        )
+
+
+if __name__ == "__main__":
+    main()
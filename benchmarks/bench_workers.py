@@ -0,0 +1,124 @@
+"""
+Benchmark: API request throughput by number of server workers.
+
+Starts the server with SENTINEL_WORKERS=1, 2, 4 ... and drives it from
+several client processes (keep-alive connections) for a fixed time,
+reporting requests per second and latency percentiles. Each request
+reads from Postgres on a cache miss, so the workers share all state
+through the database.
+
+Usage:
+    DATABASE_URL=postgresql://... python benchmarks/bench_workers.py \\
+        [--workers 1,2,4] [--clients 16] [--seconds 10] [--path /reports]
+
+The server module is imported as-is, so NOTION_API_KEY must be set (any
+value). Throughput only scales while there are free CPU cores for the
+workers and the clients.
+"""
+
+import os
+import sys
+import time
+import socket
+import argparse
+import statistics
+import subprocess
+import multiprocessing
+
+import httpx
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def _free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def _wait_ready(url: str, timeout: float = 30) -> None:
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            if httpx.get(f"{url}/health").status_code == 200:
+                return
+        except httpx.HTTPError:
+            pass
+        time.sleep(0.2)
+    raise RuntimeError("Server didn't start")
+
+
+def _client(url: str, path: str, seconds: float, results) -> None:
+    latencies = []
+    with httpx.Client(base_url=url) as client:
+        deadline = time.monotonic() + seconds
+        while time.monotonic() < deadline:
+            start = time.perf_counter()
+            client.get(path).raise_for_status()
+            latencies.append((time.perf_counter() - start) * 1000)
+    results.put(latencies)
+
+
+def _run(workers: int, clients: int, seconds: float, path: str) -> dict:
+    port = _free_port()
+    url = f"http://127.0.0.1:{port}"
+    env = {
+        **os.environ,
+        "SENTINEL_WORKERS": str(workers),
+        "SERVER_PORT": str(port),
+        "LOG_LEVEL": "WARNING",
+    }
+    server = subprocess.Popen(
+        [sys.executable, "-m", "src.mcp_server.sentinel_server"], cwd=ROOT, env=env
+    )
+    try:
+        _wait_ready(url)
+        results = multiprocessing.Queue()
+        procs = [
+            multiprocessing.Process(target=_client, args=(url, path, seconds, results))
+            for _ in range(clients)
+        ]
+        for proc in procs:
+            proc.start()
+        latencies = [ms for _ in procs for ms in results.get()]
+        for proc in procs:
+            proc.join()
+    finally:
+        server.terminate()
+        server.wait()
+
+    latencies.sort()
+    return {
+        "rps": len(latencies) / seconds,
+        "p50_ms": statistics.median(latencies),
+        "p99_ms": latencies[int(len(latencies) * 0.99) - 1],
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument("--workers", default="1,2,4")
+    parser.add_argument("--clients", type=int, default=16)
+    parser.add_argument("--seconds", type=float, default=10)
+    parser.add_argument("--path", default="/reports")
+    args = parser.parse_args()
+
+    if not os.getenv("DATABASE_URL", "").startswith("postgresql"):
+        parser.error("DATABASE_URL must point at PostgreSQL (workers share it)")
+
+    print(
+        f"GET {args.path}, {args.clients} clients for {args.seconds:g}s "
+        f"({os.cpu_count()} CPUs)"
+    )
+    baseline = None
+    for workers in (int(n) for n in args.workers.split(",")):
+        r = _run(workers, args.clients, args.seconds, args.path)
+        baseline = baseline or r["rps"]
+        print(
+            f"  {workers} worker(s)  {r['rps']:8.0f} req/s (x{r['rps'] / baseline:.2f})"
+            f"  p50 {r['p50_ms']:.1f}ms  p99 {r['p99_ms']:.1f}ms"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -18,8 +18,9 @@ cd ..
 echo "   Triggering Sentinel Aggregation at $API_URL..."
 RESPONSE=$(curl -s -o /dev/null -w "%{http_code}" -X POST "$API_URL/orchestrate")
 
-if [ "$RESPONSE" -eq 200 ]; then
-    echo "✅ Sentinel Scan Complete. Vulnerabilities ingested."
+# The cycle is queued for Sentinel workers; a changed SARIF file is re-ingested
+if [ "$RESPONSE" -eq 202 ]; then
+    echo "✅ Sentinel Scan Queued. Vulnerabilities will be ingested by the workers."
     exit 0
 else
     echo "❌ Sentinel Ingestion Failed (HTTP $RESPONSE)."
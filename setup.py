@@ -14,9 +14,11 @@ setup(
         "sqlalchemy>=2.0.23",
         "fastapi>=0.104.1",
         "uvicorn>=0.24.0",
+        "orjson>=3.8",
         "notion-client>=2.2.1",
-        "anthropic>=0.7.0",
+        "anthropic>=0.49.0",
         "click>=8.1.7",
+        "numpy>=1.24",
         "requests>=2.31.0",
     ],
     entry_points={
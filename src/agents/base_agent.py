@@ -4,18 +4,39 @@ Base agent class for all Sentinel agents.
 
 import os
 import json
+import asyncio
 import logging
 from abc import ABC, abstractmethod
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
+from functools import partial
 from typing import Dict, Any, Optional
 
-import anthropic
 from opentelemetry import trace
 
+from src.observability import metrics
 from src.observability.telemetry import get_tracer, instrument_claude_call
+from src.storage.cost_ledger import get_ledger
 
 logger = logging.getLogger(__name__)
 
+DEFAULT_CLAUDE_MODEL = "claude-sonnet-4-20250514"
+
+# Claude calls running at once in this process. The SDK client blocks, so
+# calls run on these threads and the event loop keeps serving requests
+CLAUDE_THREADS = 32
+
+_claude_executor: Optional[ThreadPoolExecutor] = None
+
+
+def _claude_threads() -> ThreadPoolExecutor:
+    global _claude_executor
+    if _claude_executor is None:
+        _claude_executor = ThreadPoolExecutor(
+            max_workers=CLAUDE_THREADS, thread_name_prefix="claude"
+        )
+    return _claude_executor
+
 
 class BaseAgent(ABC):
     """Abstract base class for all agents"""
@@ -29,16 +50,31 @@ class BaseAgent(ABC):
         self.max_retries = 3
         self.timeout = 3600  # 1 hour
 
-        # Initialize Claude API client
-        api_key = os.getenv("ANTHROPIC_API_KEY")
-        if api_key:
-            self.claude_client = anthropic.Anthropic(api_key=api_key)
-        else:
+        # Claude API client, created on first use (see claude_client)
+        self._claude_client = None
+        if not os.getenv("ANTHROPIC_API_KEY"):
             logger.warning(f"ANTHROPIC_API_KEY not set for agent {agent_id}")
-            self.claude_client = None
 
-        # Get OpenTelemetry tracer
-        self.tracer = get_tracer()
+    @property
+    def claude_client(self):
+        """Claude API client (None without ANTHROPIC_API_KEY)"""
+        if self._claude_client is None:
+            api_key = os.getenv("ANTHROPIC_API_KEY")
+            if api_key:
+                # Deferred: the SDK is slow to import and most commands don't call it
+                import anthropic
+
+                self._claude_client = anthropic.Anthropic(api_key=api_key)
+        return self._claude_client
+
+    @claude_client.setter
+    def claude_client(self, client) -> None:
+        self._claude_client = client
+
+    @property
+    def tracer(self):
+        """OpenTelemetry tracer (telemetry is set up on first use)"""
+        return get_tracer()
 
     @abstractmethod
     async def run(self) -> Dict[str, Any]:
@@ -83,7 +119,7 @@ class BaseAgent(ABC):
         self,
         system_prompt: str,
         user_message: str,
-        model: str = "claude-sonnet-4-20250514",
+        model: str = DEFAULT_CLAUDE_MODEL,
         max_tokens: int = 2000,
     ) -> str:
         """
@@ -99,6 +135,7 @@ class BaseAgent(ABC):
             Response text from Claude
 
         Raises:
+            BudgetExceeded: If the agent's or its project's budget is spent
             Exception: If Claude API client is not initialized or API call fails
         """
         if not self.claude_client:
@@ -106,53 +143,54 @@ class BaseAgent(ABC):
                 f"Claude API client not initialized for agent {self.agent_id}"
             )
 
-        with self.tracer.start_as_current_span("claude_api_call") as span:
-            # Add span attributes
-            span.set_attribute("agent.id", self.agent_id)
-            span.set_attribute("agent.type", self.agent_type)
-            span.set_attribute("model", model)
-            span.set_attribute("prompt.system.length", len(system_prompt))
-            span.set_attribute("prompt.user.length", len(user_message))
-
-            try:
-                # Make Claude API call
-                response = self.claude_client.messages.create(
+        ledger = get_ledger()
+        if ledger is not None:
+            ledger.check(self.agent_id)
+
+        # The span is instrument_claude_call's: one span per call, which
+        # already carries the agent, prompt sizes, outcome and errors
+        span = trace.get_current_span()
+        span.set_attribute("model", model)
+
+        try:
+            # Make Claude API call off the event loop, so concurrent
+            # diagnoses and syntheses overlap
+            response = await asyncio.get_running_loop().run_in_executor(
+                _claude_threads(),
+                partial(
+                    self.claude_client.messages.create,
                     model=model,
                     max_tokens=max_tokens,
                     system=system_prompt,
                     messages=[{"role": "user", "content": user_message}],
-                )
-
-                # Track token usage
-                span.set_attribute("tokens.input", response.usage.input_tokens)
-                span.set_attribute("tokens.output", response.usage.output_tokens)
-                span.set_attribute(
-                    "tokens.total",
-                    response.usage.input_tokens + response.usage.output_tokens,
-                )
-
-                # Extract and return text content
-                response_text = response.content[0].text
-
-                span.set_attribute("response.length", len(response_text))
-                span.set_attribute("success", True)
-
-                logger.debug(
-                    f"Claude API call successful for agent {self.agent_id}: "
-                    f"{response.usage.input_tokens} input tokens, "
-                    f"{response.usage.output_tokens} output tokens"
-                )
-
-                return response_text
-
-            except Exception as e:
-                span.set_attribute("success", False)
-                span.set_attribute("error.type", type(e).__name__)
-                span.set_attribute("error.message", str(e))
-                span.record_exception(e)
-
-                logger.error(
-                    f"Claude API call failed for agent {self.agent_id}: {e}",
-                    exc_info=True,
-                )
-                raise
+                ),
+            )
+        except Exception as e:
+            logger.error(
+                f"Claude API call failed for agent {self.agent_id}: {e}",
+                exc_info=True,
+            )
+            raise
+
+        # Track token usage
+        usage = response.usage
+        span.set_attribute("tokens.input", usage.input_tokens)
+        span.set_attribute("tokens.output", usage.output_tokens)
+        span.set_attribute("tokens.total", usage.input_tokens + usage.output_tokens)
+        metrics.record_tokens(usage, {"agent.type": self.agent_type, "model": model})
+        if ledger is not None:
+            ledger.record(
+                self.agent_id, model, usage, domain=getattr(self, "domain", None)
+            )
+
+        # Extract and return text content
+        response_text = response.content[0].text
+        span.set_attribute("response.length", len(response_text))
+
+        logger.debug(
+            f"Claude API call successful for agent {self.agent_id}: "
+            f"{usage.input_tokens} input tokens, "
+            f"{usage.output_tokens} output tokens"
+        )
+
+        return response_text
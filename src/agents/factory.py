@@ -0,0 +1,44 @@
+"""
+Builds the sub-agent that handles a registered agent's domain.
+
+One mapping for every process that runs agents: the API server, workers,
+the executor, the scheduler and run-cycle. Agent modules are imported
+on first use, so callers stay light at startup.
+"""
+
+import logging
+from typing import Optional
+
+from src.agents.sub_agent import SubAgent
+
+logger = logging.getLogger(__name__)
+
+
+def build_agent(agent_id: str, domain: Optional[str] = None) -> SubAgent:
+    """
+    Instantiate the agent class for an agent's domain.
+
+    Exact domains are matched first, then "security", "github" and
+    "research" in the domain or agent ID. Anything else gets a
+    ResearchAnalystAgent, which diagnoses any domain through Claude.
+    """
+    domain = domain or "default"
+    names = f"{agent_id} {domain}".lower()
+
+    if domain == "security" or agent_id == "security-aggregator":
+        from src.agents.security_aggregator import SecurityAggregatorAgent
+
+        return SecurityAggregatorAgent(agent_id, domain)
+
+    if domain == "github-triage" or "github" in names:
+        from src.agents.github_agent import GitHubTriageAgent
+
+        return GitHubTriageAgent(agent_id, domain)
+
+    from src.agents.research_agent import ResearchAnalystAgent
+
+    if domain != "ai-systems-research" and "research" not in names:
+        logger.warning(
+            f"No agent class for {agent_id} ({domain}), using ResearchAnalystAgent"
+        )
+    return ResearchAnalystAgent(agent_id, domain)
@@ -3,13 +3,21 @@ Orchestration agent (Chief of Staff).
 Synthesizes sub-agent reports and generates weekly priorities.
 """
 
+import os
 import json
 import logging
 from datetime import datetime
-from typing import Dict, Any, List
+from typing import Dict, Any, List, Optional
 
 from src.agents.base_agent import BaseAgent
 from src.observability.telemetry import instrument_agent_method
+from src.orchestration.conflicts import ConflictDetector
+from src.orchestration.encoding import PromptEncoder
+from src.orchestration.fingerprint import diff_digests, fingerprint_reports, report_key
+from src.orchestration.planner import DependencyPlanner
+from src.orchestration.reports import flatten_report
+from src.orchestration.scoring import PriorityScorer
+from src.orchestration.synthesis import HierarchicalSynthesizer
 
 logger = logging.getLogger(__name__)
 
@@ -20,10 +28,25 @@ class OrchestratorAgent(BaseAgent):
     Runs weekly to synthesize findings and route priorities.
     """
 
+    # Bottlenecks the LLM ranks itself when synthesizing hierarchically
+    HIERARCHICAL_RANKING_SIZE = 20
+    # Precomputed conflicts included in the synthesis prompt
+    PROMPT_CONFLICTS = 20
+
     def __init__(self):
         super().__init__("orchestrator", agent_type="orchestrator")
         self.last_synthesis = None
         self.current_plan = None
+        self.plan_max_tokens = int(os.getenv("SENTINEL_PLAN_MAX_TOKENS", "4000"))
+        self.synthesizer = HierarchicalSynthesizer(self._call_model)
+        self.encoder = PromptEncoder(self.synthesizer.token_budget)
+        self.conflict_detector = ConflictDetector()
+        self.planner = DependencyPlanner()
+        self.scorer = PriorityScorer()
+        # Largest fraction of changed reports still synthesized incrementally
+        self.incremental_threshold = float(
+            os.getenv("SENTINEL_INCREMENTAL_THRESHOLD", "0.25")
+        )
 
     async def run(self) -> Dict[str, Any]:
         """Run weekly orchestration"""
@@ -33,13 +56,21 @@ class OrchestratorAgent(BaseAgent):
 
     @instrument_agent_method("orchestrator.synthesize")
     async def synthesize(
-        self, sub_agent_reports: List[Dict[str, Any]]
+        self,
+        sub_agent_reports: List[Dict[str, Any]],
+        previous_plan: Optional[Dict[str, Any]] = None,
     ) -> Dict[str, Any]:
         """
         Synthesize all sub-agent reports into weekly priorities using Claude API.
 
+        If the report set is unchanged since previous_plan (or the last plan
+        this agent produced), that plan is re-stamped and returned without
+        calling Claude. If only a few reports changed, Claude only receives
+        the changed reports plus the previous plan.
+
         Args:
             sub_agent_reports: List of bottleneck reports from sub-agents
+            previous_plan: Last stored plan, including its input_fingerprint
 
         Returns:
             {
@@ -64,8 +95,17 @@ class OrchestratorAgent(BaseAgent):
                     "cross_domain_conflicts": [],
                 }
 
-            # Rank by impact (preliminary ranking)
-            ranked = self._rank_by_impact(sub_agent_reports)
+            # Rank by weighted priority score (preliminary ranking)
+            flat = [flatten_report(report) for report in sub_agent_reports]
+            order, scores = self.scorer.order(flat)
+            ranked = [flat[i] for i in order]
+
+            # Reuse the previous plan when no report has changed
+            fingerprint, digests = fingerprint_reports(ranked)
+            previous = previous_plan or self.current_plan
+            if previous and previous.get("input_fingerprint") == fingerprint:
+                logger.info("Report set unchanged, re-stamping previous plan")
+                return await self._restamp(previous)
 
             # Use Claude to intelligently synthesize the reports
             system_prompt = """You are the Chief of Staff (Orchestrator) in a multi-agent system.
@@ -73,10 +113,10 @@ class OrchestratorAgent(BaseAgent):
 Your role is to synthesize reports from multiple domain-specific agents and create a coherent weekly action plan. You must:
 1. Identify the highest-impact bottleneck across all domains
 2. Rank all bottlenecks by priority (considering both impact and confidence)
-3. Detect cross-domain conflicts (when resources or attention are needed in multiple domains)
+3. Validate the precomputed cross-domain conflicts (shared blockers and resources found by a deterministic index), refine their resolution strategies and add any the index could not see
 4. Generate a clear, actionable weekly plan
 
-You will receive a JSON array of bottleneck reports, each with:
+You will receive bottleneck reports as a pipe-delimited table. The first row lists the field names, each following row is one report, and list values are separated by ";". Fields may include:
 - description: What the bottleneck is
 - confidence: Agent's confidence (0.0-1.0)
 - impact_score: Estimated impact (0.0-10.0)
@@ -108,9 +148,78 @@ Respond with a JSON object (and ONLY JSON, no other text) with this structure:
                     pass
                 reports_with_context.append(report)
 
-            user_message = f"""Here are the bottleneck reports from all sub-agents:
+            # Deterministic conflicts, handed to the LLM instead of raw derivation
+            conflicts = self._find_conflicts(ranked)
+            conflicts_section = self._conflicts_section(conflicts)
+
+            # Dependency waves and weekly allocation from the blocking graph
+            weekly_plan, allocation, schedule = self.planner.plan(
+                ranked, scores.tolist()
+            )
+            conflicts_section += self._schedule_section(ranked, schedule)
+
+            delta = diff_digests(
+                previous.get("report_digests") if previous else None, digests
+            )
+            if self._is_small_change(previous, delta, len(digests)):
+                mode = "incremental"
+            else:
+                # Compact table, trimmed to the token budget by impact rank
+                encoded = self.encoder.encode(
+                    reports_with_context, budget=self.synthesizer.token_budget
+                )
+                # Large fleets don't fit one prompt: condense them hierarchically
+                mode = "direct" if encoded.complete else "hierarchical"
+
+            if mode == "incremental":
+                updated_keys = delta.updated_keys
+                changed = [
+                    report
+                    for index, report in enumerate(reports_with_context)
+                    if report_key(report, index) in updated_keys
+                ]
+                previous_summary = {
+                    "top_bottleneck": previous.get("top_bottleneck", {}),
+                    "priority_ranking": (previous.get("priority_ranking") or [])[
+                        : self.HIERARCHICAL_RANKING_SIZE
+                    ],
+                    "cross_domain_conflicts": previous.get(
+                        "cross_domain_conflicts", []
+                    ),
+                    "weekly_plan": previous.get("weekly_plan", []),
+                }
+                user_message = f"""Only {delta.size} of {len(reports_with_context)} bottleneck reports changed since the previous weekly plan was produced.
+
+Previous plan:
+{json.dumps(previous_summary, separators=(",", ":"), default=str)}
+
+New or changed reports:
+{self.encoder.encode(changed).text}
+
+Reports from these agents were resolved or removed: {", ".join(delta.removed) or "none"}
 
-{json.dumps(reports_with_context, indent=2)}
+Update the previous plan to account for these changes, keeping everything that is still valid. In "priority_ranking", include only the {self.HIERARCHICAL_RANKING_SIZE} highest-priority bottlenecks.
+
+{conflicts_section}Return your synthesis as a JSON object following the specified structure."""
+            elif mode == "hierarchical":
+                summaries = await self.synthesizer.condense(reports_with_context)
+                user_message = f"""There are {len(reports_with_context)} bottleneck reports, too many to list individually. Here are hierarchical group summaries covering all of them:
+
+{json.dumps(summaries, separators=(",", ":"))}
+
+Synthesize these summaries into a coherent weekly action plan. Consider:
+1. Which bottleneck has the highest real impact (not just highest score)?
+2. Are there dependencies or conflicts between domains?
+3. What's the most strategic sequence of actions?
+4. What can be parallelized vs. what must be sequential?
+
+In "priority_ranking", include only the {self.HIERARCHICAL_RANKING_SIZE} highest-priority bottlenecks.
+
+{conflicts_section}Return your synthesis as a JSON object following the specified structure."""
+            else:
+                user_message = f"""Here are the bottleneck reports from all sub-agents:
+
+{encoded.text}
 
 Synthesize these reports into a coherent weekly action plan. Consider:
 1. Which bottleneck has the highest real impact (not just highest score)?
@@ -118,11 +227,13 @@ Synthesize these reports into a coherent weekly action plan. Consider:
 3. What's the most strategic sequence of actions?
 4. What can be parallelized vs. what must be sequential?
 
-Return your synthesis as a JSON object following the specified structure."""
+{conflicts_section}Return your synthesis as a JSON object following the specified structure."""
 
             # Call Claude API for intelligent synthesis
             response_text = await self.call_claude(
-                system_prompt=system_prompt, user_message=user_message, max_tokens=2000
+                system_prompt=system_prompt,
+                user_message=user_message,
+                max_tokens=self.plan_max_tokens,
             )
 
             # Parse JSON response
@@ -143,9 +254,26 @@ Return your synthesis as a JSON object following the specified structure."""
                         )
                         plan[field] = {} if field == "top_bottleneck" else []
 
+                if mode != "direct":
+                    plan["priority_ranking"] = self._complete_ranking(
+                        plan["priority_ranking"], ranked
+                    )
+                if mode == "hierarchical":
+                    plan["synthesis_rounds"] = self.synthesizer.rounds + 1
+
+                if not plan["cross_domain_conflicts"]:
+                    plan["cross_domain_conflicts"] = conflicts
+
+                plan["synthesis_mode"] = mode
+                plan["input_fingerprint"] = fingerprint
+                plan["report_digests"] = digests
+
                 # Add metadata
                 plan["week"] = datetime.now().isoformat()
-                plan["resource_allocation"] = {}  # Can be enhanced later
+                plan["resource_allocation"] = allocation
+                if not plan["weekly_plan"]:
+                    plan["weekly_plan"] = weekly_plan
+                self._add_schedule(plan, ranked, schedule)
 
                 self.current_plan = plan
                 self.last_synthesis = datetime.now().isoformat()
@@ -169,39 +297,140 @@ Return your synthesis as a JSON object following the specified structure."""
                 )
                 logger.error(f"Response text: {response_text}")
 
-                # Fallback to simple ranking
-                return self._generate_plan(ranked, self._find_conflicts(ranked))
+                # Fallback to simple ranking, stamped like any other plan so
+                # the next cycle can reuse or update it
+                plan = self._generate_plan(
+                    ranked, conflicts, (weekly_plan, allocation, schedule)
+                )
+                plan["synthesis_mode"] = "fallback"
+                plan["input_fingerprint"] = fingerprint
+                plan["report_digests"] = digests
+
+                self.current_plan = plan
+                self.last_synthesis = datetime.now().isoformat()
+                return plan
 
         except Exception as e:
             logger.error(f"Orchestrator synthesis failed: {e}", exc_info=True)
             await self.log_error(e, {"reports": len(sub_agent_reports)})
             raise
 
-    def _rank_by_impact(self, reports: List[Dict]) -> List[Dict]:
-        """Rank bottlenecks by impact score"""
-        return sorted(
-            reports,
-            key=lambda x: x.get("impact_score", 0) * x.get("confidence", 0.5),
-            reverse=True,
+    def _is_small_change(
+        self, previous: Optional[Dict[str, Any]], delta, report_count: int
+    ) -> bool:
+        """Check whether the previous plan can be updated incrementally"""
+        if not previous or not previous.get("report_digests"):
+            return False
+        return 0 < delta.size <= max(1, int(report_count * self.incremental_threshold))
+
+    async def _restamp(self, previous: Dict[str, Any]) -> Dict[str, Any]:
+        """Return the previous plan stamped with the current time"""
+        plan = dict(previous)
+        plan["week"] = datetime.now().isoformat()
+        plan["cached"] = True
+
+        self.current_plan = plan
+        self.last_synthesis = datetime.now().isoformat()
+
+        await self.log_decision(
+            {
+                "type": "orchestration_cached",
+                "input_fingerprint": plan.get("input_fingerprint"),
+            }
+        )
+        return plan
+
+    async def _call_model(
+        self, system_prompt: str, user_message: str, max_tokens: int
+    ) -> str:
+        """Model call used by the hierarchical synthesizer"""
+        return await self.call_claude(
+            system_prompt=system_prompt,
+            user_message=user_message,
+            max_tokens=max_tokens,
         )
 
+    def _complete_ranking(
+        self, llm_ranking: List[Dict], ranked: List[Dict]
+    ) -> List[Dict]:
+        """Append locally ranked reports the LLM's partial ranking left out"""
+        seen = {
+            (item.get("agent_id"), item.get("description"))
+            for item in llm_ranking
+            if isinstance(item, dict)
+        }
+        return list(llm_ranking) + [
+            report
+            for report in ranked
+            if (report.get("agent_id"), report.get("description")) not in seen
+        ]
+
+    def _rank_by_impact(self, reports: List[Dict]) -> List[Dict]:
+        """Rank bottlenecks by weighted priority score"""
+        return self.scorer.rank(reports)
+
     def _find_conflicts(self, ranked_reports: List[Dict]) -> List[Dict]:
         """Identify resource conflicts between agents"""
-        conflicts = []
-        # Implementation would detect when multiple agents
-        # need the same resources
-        return conflicts
+        return self.conflict_detector.detect(ranked_reports)
+
+    def _conflicts_section(self, conflicts: List[Dict]) -> str:
+        """Render precomputed conflicts for the synthesis prompt"""
+        if not conflicts:
+            return "Precomputed cross-domain conflicts: none found.\n\n"
+
+        shown = [
+            {
+                "description": c["description"],
+                "affected_domains": c["affected_domains"],
+                "agents": c["agents"][:5],
+                "resolution_strategy": c["resolution_strategy"],
+            }
+            for c in conflicts[: self.PROMPT_CONFLICTS]
+        ]
+        return (
+            f"Precomputed cross-domain conflicts ({len(conflicts)} found, "
+            f"top {len(shown)} shown):\n"
+            f"{json.dumps(shown, separators=(',', ':'))}\n\n"
+        )
+
+    def _schedule_section(self, ranked: List[Dict], schedule) -> str:
+        """Render the dependency schedule for the synthesis prompt"""
+        if not schedule.edges:
+            return ""
+
+        label = self.planner.label
+        waves = [[label(ranked, n) for n in wave[:10]] for wave in schedule.waves[:5]]
+        return (
+            f"Dependency analysis ({schedule.edges} blocking edges, "
+            f"{len(schedule.waves)} waves): work in earlier waves unblocks "
+            f"later ones.\n"
+            f"Waves (first 5, top 10 agents each): "
+            f"{json.dumps(waves, separators=(',', ':'))}\n"
+            f"Critical path ({schedule.critical_path_hours}h): "
+            f"{' -> '.join(label(ranked, n) for n in schedule.critical_path)}\n\n"
+        )
+
+    def _add_schedule(self, plan: Dict[str, Any], ranked: List[Dict], schedule):
+        """Attach dependency waves and the critical path to a plan"""
+        label = self.planner.label
+        plan["action_waves"] = [
+            [label(ranked, n) for n in wave] for wave in schedule.waves
+        ]
+        plan["critical_path"] = [label(ranked, n) for n in schedule.critical_path]
+        plan["critical_path_hours"] = schedule.critical_path_hours
 
     def _generate_plan(
-        self, ranked: List[Dict], conflicts: List[Dict]
+        self, ranked: List[Dict], conflicts: List[Dict], planned: tuple = None
     ) -> Dict[str, Any]:
         """Generate weekly action plan"""
+        weekly_plan, allocation, schedule = planned or self.planner.plan(ranked)
         plan = {
             "week": datetime.now().isoformat(),
             "top_bottleneck": ranked[0] if ranked else {},
             "priority_ranking": ranked,
-            "resource_allocation": {},
-            "weekly_plan": [],
+            "resource_allocation": allocation,
+            "weekly_plan": weekly_plan,
             "cross_domain_conflicts": conflicts,
         }
+        self._add_schedule(plan, ranked, schedule)
         return plan
@@ -19,19 +19,12 @@ class ResearchAnalystAgent(SubAgent):
         super().__init__(agent_id, domain)
         self.sources = ["arXiv", "TechCrunch", "GitHub Trending", "Hacker News"]
 
-    @instrument_agent_method("research_agent.diagnose")
-    async def diagnose(self) -> Dict[str, Any]:
+    def build_diagnosis_request(self) -> Dict[str, Any]:
         """
-        Scan sources and identify high-signal items using Claude API.
+        Build the Claude request used to scan for high-signal items.
 
         Returns:
-            Dictionary containing bottleneck information with fields:
-            - description: str
-            - confidence: float (0.0 to 1.0)
-            - impact_score: float (0.0 to 10.0)
-            - blocking: List[str]
-            - recommended_action: str
-            - reasoning: str
+            Dictionary with system_prompt, user_message and max_tokens
         """
         # Define system prompt for Research Analyst Agent
         system_prompt = f"""You are a Research & Intelligence Agent for the domain: {self.domain}.
@@ -68,72 +61,31 @@ Consider:
 
 Return your analysis as a JSON object following the specified structure."""
 
+        return {
+            "system_prompt": system_prompt,
+            "user_message": user_message,
+            "max_tokens": 1000,
+        }
+
+    @instrument_agent_method("research_agent.diagnose")
+    async def diagnose(self) -> Dict[str, Any]:
+        """
+        Scan sources and identify high-signal items using Claude API.
+
+        Returns:
+            Dictionary containing bottleneck information with fields:
+            - description: str
+            - confidence: float (0.0 to 1.0)
+            - impact_score: float (0.0 to 10.0)
+            - blocking: List[str]
+            - recommended_action: str
+            - reasoning: str
+        """
         try:
             # Call Claude API
-            response_text = await self.call_claude(
-                system_prompt=system_prompt, user_message=user_message, max_tokens=1000
-            )
-
-            # Parse JSON response
-            try:
-                bottleneck = json.loads(response_text)
-
-                # Validate required fields
-                required_fields = [
-                    "description",
-                    "confidence",
-                    "impact_score",
-                    "blocking",
-                    "recommended_action",
-                    "reasoning",
-                ]
-                for field in required_fields:
-                    if field not in bottleneck:
-                        logger.warning(
-                            f"Missing field '{field}' in Claude response, using default"
-                        )
-                        bottleneck[field] = (
-                            ""
-                            if field
-                            in ["description", "recommended_action", "reasoning"]
-                            else (
-                                0.0 if field in ["confidence", "impact_score"] else []
-                            )
-                        )
-
-                # Ensure confidence and impact_score are floats in valid ranges
-                bottleneck["confidence"] = max(
-                    0.0, min(1.0, float(bottleneck["confidence"]))
-                )
-                bottleneck["impact_score"] = max(
-                    0.0, min(10.0, float(bottleneck["impact_score"]))
-                )
-
-                # Log the scan
-                await self.log_decision(
-                    {
-                        "type": "intelligence_scan",
-                        "sources": self.sources,
-                        "finding": bottleneck["description"],
-                        "confidence": bottleneck["confidence"],
-                    }
-                )
-
-                return bottleneck
-
-            except json.JSONDecodeError as e:
-                logger.error(f"Failed to parse Claude response as JSON: {e}")
-                logger.error(f"Response text: {response_text}")
-
-                # Return a default "no bottleneck" response
-                return {
-                    "description": "Analysis failed - unable to parse response",
-                    "confidence": 0.0,
-                    "impact_score": 0.0,
-                    "blocking": [],
-                    "recommended_action": "Retry analysis",
-                    "reasoning": "JSON parsing error",
-                }
+            response_text = await self.call_claude(**self.build_diagnosis_request())
+
+            return await self.parse_diagnosis(response_text)
 
         except Exception as e:
             logger.error(f"Research agent diagnose failed: {e}", exc_info=True)
@@ -149,6 +101,27 @@ Return your analysis as a JSON object following the specified structure."""
                 "reasoning": "Exception during diagnosis",
             }
 
+    async def parse_diagnosis(self, response_text: str) -> Dict[str, Any]:
+        """
+        Validate a scan response and log the finding.
+        """
+        try:
+            bottleneck = self._parse_bottleneck(response_text)
+        except json.JSONDecodeError as e:
+            return self._unparsed_bottleneck(e, response_text)
+
+        # Log the scan
+        await self.log_decision(
+            {
+                "type": "intelligence_scan",
+                "sources": self.sources,
+                "finding": bottleneck["description"],
+                "confidence": bottleneck["confidence"],
+            }
+        )
+
+        return bottleneck
+
     async def execute(self, action: Dict[str, Any]) -> Dict[str, Any]:
         """
         Execute research actions.
@@ -1,7 +1,8 @@
 import json
+import hashlib
 import logging
 import os
-from typing import Dict, Any
+from typing import Dict, Any, Optional
 
 from src.agents.sub_agent import SubAgent
 from src.storage.postgres_client import PostgresClient
@@ -17,11 +18,23 @@ class SecurityAggregatorAgent(SubAgent):
     - Security tool APIs
     """
 
-    def __init__(self):
-        super().__init__("security-aggregator", domain="security")
+    def __init__(self, agent_id: str = "security-aggregator", domain: str = "security"):
+        super().__init__(agent_id, domain=domain)
+        self.sarif_path = "security-reports/eslint-results.sarif"
         self.db = PostgresClient()
         self.db.connect()
 
+    def input_fingerprint(self) -> Optional[str]:
+        """Hash of the SARIF report; findings only change when it does"""
+        if not os.path.exists(self.sarif_path):
+            return "no-sarif"
+
+        digest = hashlib.sha256()
+        with open(self.sarif_path, "rb") as f:
+            for chunk in iter(lambda: f.read(1 << 20), b""):
+                digest.update(chunk)
+        return digest.hexdigest()
+
     async def diagnose(self) -> Dict[str, Any]:
         """
         Scan for new security reports and ingest them.
@@ -30,13 +43,19 @@ class SecurityAggregatorAgent(SubAgent):
         logger.info("Running security aggregation scan...")
 
         # 1. Ingest ESLint SARIF if it exists
-        sarif_path = "security-reports/eslint-results.sarif"
         findings_count = 0
-        if os.path.exists(sarif_path):
-            findings_count += self._ingest_sarif(sarif_path, source="eslint")
+        ingested = os.path.exists(self.sarif_path)
+        if ingested:
+            findings_count += self._ingest_sarif(self.sarif_path, source="eslint")
 
         # 2. Get summary for diagnosis
         summary = self.db.get_security_summary()
+        if ingested:
+            # Dashboards update their security panels from this
+            self.db.publish_event(
+                "ingest",
+                {"source": "eslint", "findings": findings_count, "summary": summary},
+            )
 
         if summary["total_findings"] > 0:
             # Determine bottleneck based on critical findings
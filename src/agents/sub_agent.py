@@ -3,6 +3,7 @@ Sub-agent base class for domain-specific agents.
 """
 
 import json
+import hashlib
 import logging
 from abc import abstractmethod
 from datetime import datetime
@@ -44,6 +45,96 @@ class SubAgent(BaseAgent):
         """
         pass
     
+    def build_diagnosis_request(self) -> Optional[Dict[str, Any]]:
+        """
+        Describe the Claude call behind diagnose() without making it.
+        
+        Used to submit many diagnoses as one message batch. Agents that
+        do not diagnose through Claude return None and are run inline.
+        
+        Returns:
+            {
+                "system_prompt": str,
+                "user_message": str,
+                "max_tokens": int
+            }
+        """
+        return None
+    
+    def input_fingerprint(self) -> Optional[str]:
+        """
+        Cheap digest of everything diagnose() depends on.
+        
+        The cycle runner skips diagnosis while this matches the value
+        stored at the agent's last (recent) run. The default covers agents
+        that diagnose through Claude: their prompt. Agents that read files
+        or services override this; None means "unknown, always diagnose".
+        """
+        request = self.build_diagnosis_request()
+        if request is None:
+            return None
+        canonical = json.dumps(request, sort_keys=True, separators=(",", ":"))
+        return hashlib.sha256(canonical.encode()).hexdigest()
+    
+    async def parse_diagnosis(self, response_text: str) -> Dict[str, Any]:
+        """
+        Turn a raw Claude response into a validated bottleneck.
+        Override in subclasses to log domain-specific decisions.
+        """
+        try:
+            return self._parse_bottleneck(response_text)
+        except json.JSONDecodeError as e:
+            return self._unparsed_bottleneck(e, response_text)
+    
+    def _parse_bottleneck(self, response_text: str) -> Dict[str, Any]:
+        """
+        Parse and validate a bottleneck JSON response.
+        
+        Raises:
+            json.JSONDecodeError: If the response is not valid JSON
+        """
+        bottleneck = json.loads(response_text)
+        
+        # Validate required fields
+        defaults = {
+            "description": "",
+            "confidence": 0.0,
+            "impact_score": 0.0,
+            "blocking": [],
+            "recommended_action": "",
+            "reasoning": "",
+        }
+        for field, default in defaults.items():
+            if field not in bottleneck:
+                logger.warning(
+                    f"Missing field '{field}' in Claude response, using default"
+                )
+                bottleneck[field] = default
+        
+        # Ensure confidence and impact_score are floats in valid ranges
+        bottleneck["confidence"] = max(0.0, min(1.0, float(bottleneck["confidence"])))
+        bottleneck["impact_score"] = max(
+            0.0, min(10.0, float(bottleneck["impact_score"]))
+        )
+        
+        return bottleneck
+    
+    def _unparsed_bottleneck(
+        self, error: json.JSONDecodeError, response_text: str
+    ) -> Dict[str, Any]:
+        """Default "no bottleneck" response for unparseable output"""
+        logger.error(f"Failed to parse Claude response as JSON: {error}")
+        logger.error(f"Response text: {response_text}")
+        
+        return {
+            "description": "Analysis failed - unable to parse response",
+            "confidence": 0.0,
+            "impact_score": 0.0,
+            "blocking": [],
+            "recommended_action": "Retry analysis",
+            "reasoning": "JSON parsing error",
+        }
+    
     async def execute(self, action: Dict[str, Any]) -> Dict[str, Any]:
         """
         Execute action within guardrails.
@@ -6,6 +6,7 @@ import os
 import json
 import asyncio
 import logging
+from datetime import datetime
 from pathlib import Path
 
 import click
@@ -45,7 +46,7 @@ def init_db():
 
         console.print("[green]✓ Database initialized[/]")
         console.print(
-            "[dim]Tables created: agents, bottlenecks, actions, orchestrator_plans, decision_log, notion_sync[/]"
+            "[dim]Tables created: agents, bottlenecks, actions, orchestrator_plans, decision_log, notion_sync, jobs[/]"
         )
     except Exception as e:
         console.print(f"[red]✗ Failed: {e}[/]")
@@ -55,7 +56,27 @@ def init_db():
 @cli.command()
 @click.option("--mode", default="diagnostic", help="diagnostic|conditional|full")
 @click.option("--verbose", is_flag=True, help="Verbose output")
-def run_cycle(mode, verbose):
+@click.option(
+    "--batch",
+    is_flag=True,
+    help="Submit diagnoses as one message batch (for scheduled, non-interactive runs)",
+)
+@click.option(
+    "--poll-interval",
+    default=60.0,
+    show_default=True,
+    help="Seconds between batch status checks",
+)
+@click.option(
+    "--force", is_flag=True, help="Re-diagnose every agent, even if unchanged"
+)
+@click.option(
+    "--force-agent",
+    "force_agents",
+    multiple=True,
+    help="Re-diagnose this agent even if unchanged (repeatable)",
+)
+def run_cycle(mode, verbose, batch, poll_interval, force, force_agents):
     """Run a complete Sentinel cycle"""
     console.print(f"[bold blue]Running cycle in {mode} mode...[/]")
 
@@ -64,10 +85,8 @@ def run_cycle(mode, verbose):
 
     async def _run_cycle_async():
         from src.storage.postgres_client import PostgresClient
-        from src.agents.research_agent import ResearchAnalystAgent
-        from src.agents.github_agent import GitHubTriageAgent
-        from src.observability.telemetry import setup_telemetry
-        from datetime import datetime
+        from src.storage.cost_ledger import cycle, setup_ledger
+        from src.observability.telemetry import flush_telemetry, setup_telemetry
 
         # Initialize OpenTelemetry
         setup_telemetry(service_name="sentinel")
@@ -75,6 +94,26 @@ def run_cycle(mode, verbose):
 
         db = PostgresClient()
         db.connect()
+        # Records each Claude call's cost and enforces budgets
+        ledger = setup_ledger(db)
+
+        try:
+            with cycle(f"cli-{datetime.utcnow():%Y%m%dT%H%M%S}"):
+                await _run_cycle_agents(db, ledger)
+        finally:
+            # Spans still batched would be lost when the command exits
+            flush_telemetry()
+
+    async def _run_cycle_agents(db, ledger):
+        from src.agents.factory import build_agent
+        from src.orchestration.freshness import DiagnosisGate
+
+        # Skips agents whose inputs haven't changed since a recent run
+        gate = DiagnosisGate(force=force, force_agents=force_agents)
+
+        if batch:
+            await _run_batch_cycle(db, mode, poll_interval, gate, ledger)
+            return
 
         # Get all registered agents
         agents = db.get_all_agents()
@@ -89,6 +128,7 @@ def run_cycle(mode, verbose):
 
         # Run diagnostic for each agent
         bottlenecks_found = 0
+        skipped = 0
         for agent_info in agents:
             agent_id = agent_info["agent_id"]
             domain = agent_info["domain"]
@@ -97,64 +137,31 @@ def run_cycle(mode, verbose):
             console.print(f"[cyan]→ {name}[/] ({domain})")
 
             try:
-                # Instantiate the appropriate agent class based on agent_id or domain
-                agent = None
-                if "research" in agent_id.lower() or "research" in domain.lower():
-                    agent = ResearchAnalystAgent(agent_id, domain)
-                elif "github" in agent_id.lower() or "github" in domain.lower():
-                    agent = GitHubTriageAgent(agent_id, domain)
-                else:
-                    # Default to ResearchAnalystAgent for unknown types
+                agent = build_agent(agent_id, domain)
+
+                check = gate.check(agent, agent_info)
+                if check.skip:
                     console.print(
-                        f"  [yellow]⚠[/] Unknown agent type, using ResearchAnalystAgent as default"
+                        "  [dim]↺ Inputs unchanged, keeping last bottleneck[/]\n"
                     )
-                    agent = ResearchAnalystAgent(agent_id, domain)
+                    skipped += 1
+                    continue
 
                 # Run diagnostic
                 bottleneck = await agent.diagnose()
 
-                # Check if bottleneck is significant (confidence > 0)
-                if bottleneck and bottleneck.get("confidence", 0) > 0:
-                    # Save bottleneck to database
-                    db.save_bottleneck(agent_id, bottleneck)
-
-                    # Log the decision
-                    db.log_decision(
-                        agent_id=agent_id,
-                        decision_type="bottleneck_identified",
-                        reasoning=bottleneck.get("reasoning", "Diagnostic analysis"),
-                        context={"mode": mode, "domain": domain},
-                        outcome={"bottleneck": bottleneck},
-                    )
-
-                    console.print(
-                        f"  [yellow]⚠[/] Bottleneck: {bottleneck['description']}"
-                    )
-                    console.print(
-                        f"  [dim]Impact: {bottleneck['impact_score']}/10 | Confidence: {bottleneck['confidence']:.0%}[/]\n"
-                    )
+                if _record_diagnosis(db, agent_id, domain, mode, bottleneck):
                     bottlenecks_found += 1
-                else:
-                    console.print(
-                        f"  [green]✓[/] No significant bottlenecks identified\n"
-                    )
 
-                # Update last_run timestamp
-                db.update_agent_last_run(agent_id)
+                # Update last_run timestamp and the inputs it saw
+                db.update_agent_last_run(agent_id, check.fingerprint)
 
             except Exception as agent_error:
                 console.print(f"  [red]✗[/] Agent failed: {agent_error}\n")
                 logger.error(f"Agent {agent_id} failed: {agent_error}", exc_info=True)
                 continue
 
-        # Summary
-        console.print(f"[green]✓ Cycle complete[/]")
-        console.print(
-            f"[dim]Mode: {mode} | Agents: {len(agents)} | Bottlenecks: {bottlenecks_found}[/]"
-        )
-
-        if bottlenecks_found > 0:
-            console.print(f"\n[yellow]💡 Tip: Review bottlenecks in Notion dashboard[/]")
+        _print_cycle_summary(mode, len(agents), bottlenecks_found, skipped)
 
     try:
         # Run the async function
@@ -165,6 +172,583 @@ def run_cycle(mode, verbose):
         raise
 
 
+async def _run_batch_cycle(db, mode: str, poll_interval: float, gate, ledger):
+    """Run every agent's diagnosis through one message batch"""
+    import anthropic
+    from src.agents.factory import build_agent
+    from src.orchestration.batch import BatchDiagnosisRunner
+
+    runner = BatchDiagnosisRunner(
+        anthropic.Anthropic(api_key=os.getenv("ANTHROPIC_API_KEY")),
+        poll_interval=poll_interval,
+    )
+
+    # Resume an interrupted batch before submitting a new one
+    pending = runner.pending()
+    if pending:
+        console.print(f"[yellow]↻ Resuming batch {pending['batch_id']}[/]\n")
+        mode = pending.get("context", {}).get("mode", mode)
+        agent_infos = list(pending["requests"].values())
+    else:
+        agent_infos = db.get_all_agents()
+
+    if not agent_infos:
+        console.print("[yellow]⚠ No agents registered. Run 'init-project' first.[/]")
+        return
+
+    batched, inline = [], []
+    fingerprints = {}
+    skipped = 0
+    for agent_info in agent_infos:
+        agent = build_agent(agent_info["agent_id"], agent_info["domain"])
+        check = gate.check(agent, agent_info)
+        fingerprints[agent.agent_id] = check.fingerprint
+
+        # A resumed batch was already paid for, so collect all of it
+        if check.skip and not pending:
+            console.print(f"[cyan]→ {agent.agent_id}[/] ({agent.domain})")
+            console.print("  [dim]↺ Inputs unchanged, keeping last bottleneck[/]\n")
+            skipped += 1
+        elif not pending and _over_budget(ledger, agent):
+            skipped += 1
+        elif agent.build_diagnosis_request() is None:
+            inline.append(agent)
+        else:
+            batched.append(agent)
+
+    bottlenecks_found = 0
+
+    # Agents that don't call Claude still diagnose inline
+    for agent in inline:
+        console.print(f"[cyan]→ {agent.agent_id}[/] ({agent.domain}) [dim]inline[/]")
+        try:
+            bottleneck = await agent.diagnose()
+            if _record_diagnosis(db, agent.agent_id, agent.domain, mode, bottleneck):
+                bottlenecks_found += 1
+            db.update_agent_last_run(agent.agent_id, fingerprints[agent.agent_id])
+        except Exception as agent_error:
+            console.print(f"  [red]✗[/] Agent failed: {agent_error}\n")
+            logger.error(f"Agent {agent.agent_id} failed: {agent_error}", exc_info=True)
+
+    if batched:
+        console.print(
+            f"[dim]Submitting {len(batched)} diagnosis request(s) as one batch...[/]"
+        )
+        results = await runner.run(
+            batched, context={"mode": mode}, keep_checkpoint=True
+        )
+
+        # Store every bottleneck in one transaction before forgetting the
+        # batch: if that fails, the next run collects the same results
+        found = [
+            {"agent_id": agent_id, "bottleneck": result["bottleneck"]}
+            for agent_id, result in results.items()
+            if result["status"] == "success" and _significant(result["bottleneck"])
+        ]
+        if found:
+            db.save_bottlenecks(found)
+        runner.complete()
+
+        for agent in batched:
+            result = results[agent.agent_id]
+            console.print(f"[cyan]→ {agent.agent_id}[/] ({agent.domain})")
+
+            if result["status"] != "success":
+                console.print(f"  [red]✗[/] Agent failed: {result['error']}\n")
+                continue
+
+            bottleneck = result["bottleneck"]
+            if _record_diagnosis(
+                db, agent.agent_id, agent.domain, mode, bottleneck, saved=True
+            ):
+                bottlenecks_found += 1
+            db.update_agent_last_run(agent.agent_id, fingerprints[agent.agent_id])
+
+    _print_cycle_summary(mode, len(agent_infos), bottlenecks_found, skipped)
+
+
+def _over_budget(ledger, agent) -> bool:
+    """Print and return True if the agent can't spend more right now"""
+    from src.storage.cost_ledger import BudgetExceeded
+
+    try:
+        ledger.check(agent.agent_id)
+    except BudgetExceeded as e:
+        console.print(f"[cyan]→ {agent.agent_id}[/] ({agent.domain})")
+        console.print(f"  [yellow]⚠[/] Skipped: {e}\n")
+        return True
+    return False
+
+
+def _significant(bottleneck) -> bool:
+    """Whether a diagnosis found a bottleneck worth recording (confidence > 0)"""
+    return bool(bottleneck) and bottleneck.get("confidence", 0) > 0
+
+
+def _record_diagnosis(
+    db, agent_id: str, domain: str, mode: str, bottleneck, saved: bool = False
+) -> bool:
+    """
+    Persist a significant bottleneck; returns True if one was recorded.
+
+    With saved, the bottleneck is already stored and only the decision is
+    logged.
+    """
+    if not _significant(bottleneck):
+        console.print("  [green]✓[/] No significant bottlenecks identified\n")
+        return False
+
+    # Save bottleneck to database
+    if not saved:
+        db.save_bottleneck(agent_id, bottleneck)
+
+    # Log the decision
+    db.log_decision(
+        agent_id=agent_id,
+        decision_type="bottleneck_identified",
+        reasoning=bottleneck.get("reasoning", "Diagnostic analysis"),
+        context={"mode": mode, "domain": domain},
+        outcome={"bottleneck": bottleneck},
+    )
+
+    console.print(f"  [yellow]⚠[/] Bottleneck: {bottleneck['description']}")
+    console.print(
+        f"  [dim]Impact: {bottleneck['impact_score']}/10 | Confidence: {bottleneck['confidence']:.0%}[/]\n"
+    )
+    return True
+
+
+def _print_cycle_summary(
+    mode: str, agent_count: int, bottlenecks_found: int, skipped: int = 0
+):
+    """Print the end-of-cycle summary"""
+    console.print("[green]✓ Cycle complete[/]")
+    console.print(
+        f"[dim]Mode: {mode} | Agents: {agent_count} | Bottlenecks: {bottlenecks_found}"
+        f" | Unchanged: {skipped}[/]"
+    )
+
+    if bottlenecks_found > 0:
+        console.print("\n[yellow]💡 Tip: Review bottlenecks in Notion dashboard[/]")
+
+
+@cli.command()
+@click.argument("configs", nargs=-1)
+@click.option("--mode", default="diagnostic", help="diagnostic|conditional|full")
+@click.option(
+    "--jitter",
+    default=60.0,
+    show_default=True,
+    help="Largest random delay, in seconds, added to each run",
+)
+@click.option(
+    "--no-catch-up",
+    is_flag=True,
+    help="Skip runs missed while the scheduler was down instead of running once",
+)
+@click.option(
+    "--max-concurrency",
+    default=4,
+    show_default=True,
+    help="Jobs allowed to run at the same time",
+)
+def scheduler(configs, mode, jitter, no_catch_up, max_concurrency):
+    """Run agents and orchestration on their cadences until stopped
+
+    Cadences come from the project CONFIGS: each sub-agent's
+    "update_frequency" (default daily) and the project's
+    "orchestration_frequency" (default weekly). Intervals ("6h", "every 2d")
+    and cron expressions ("0 9 * * 1") are accepted too.
+
+    Several schedulers may run against one database (e.g. one per server
+    host); they elect a leader, and only the leader runs jobs.
+    """
+    console.print("[bold blue]Starting scheduler...[/]")
+
+    async def _run_scheduler_async():
+        import signal
+        from src.storage.postgres_client import PostgresClient
+        from src.observability.telemetry import setup_telemetry
+        from src.agents.orchestrator import OrchestratorAgent
+        from src.orchestration.leader import LeaderElection
+        from src.orchestration.scheduler import Scheduler, parse_cadence
+
+        from src.storage.cost_ledger import setup_ledger
+
+        setup_telemetry(service_name="sentinel-scheduler")
+
+        db = PostgresClient()
+        db.connect()
+        setup_ledger(db)
+        leader = LeaderElection(db, "scheduler")
+
+        agent_cadences = {}
+        orchestration_cadence = "weekly"
+        for config in configs:
+            with open(config, "r") as f:
+                project_config = json.load(f)
+            orchestration_cadence = project_config.get(
+                "orchestration_frequency", orchestration_cadence
+            )
+            for agent_config in project_config.get("sub_agents", []):
+                agent_cadences[agent_config["agent_id"]] = agent_config.get(
+                    "update_frequency", "daily"
+                )
+
+        schedule = Scheduler(
+            max_jitter_seconds=jitter,
+            catch_up=not no_catch_up,
+            max_concurrency=max_concurrency,
+        )
+
+        agents = db.get_all_agents()
+        if not agents:
+            console.print(
+                "[yellow]⚠ No agents registered. Run 'init-project' first.[/]"
+            )
+            return
+
+        for agent_info in agents:
+            agent_id = agent_info["agent_id"]
+            cadence = parse_cadence(agent_cadences.get(agent_id, "daily"))
+            schedule.add(
+                agent_id,
+                cadence,
+                _leader_only(
+                    leader,
+                    _scheduled_diagnosis(
+                        db, agent_id, agent_info["domain"], mode, cadence
+                    ),
+                ),
+                last_run=agent_info.get("last_run"),
+            )
+
+        previous_plan = db.get_latest_orchestration_result()
+        orchestrator = OrchestratorAgent()
+        schedule.add(
+            "orchestration",
+            parse_cadence(orchestration_cadence),
+            _leader_only(leader, lambda: _scheduled_orchestration(db, orchestrator)),
+            last_run=datetime.fromisoformat(previous_plan["week"])
+            if previous_plan
+            else None,
+            # Diagnoses due at the same time go first
+            priority=10,
+        )
+
+        table = Table(title="Schedule")
+        table.add_column("Job", style="cyan")
+        table.add_column("Cadence", style="magenta")
+        table.add_column("Next run", style="yellow")
+        for job in schedule.snapshot():
+            table.add_row(
+                job["name"], job["cadence"], job["next_run"].strftime("%Y-%m-%d %H:%M")
+            )
+        console.print(table)
+        console.print("[dim]Press Ctrl+C to stop[/]\n")
+
+        stop = asyncio.Event()
+        loop = asyncio.get_running_loop()
+        for signum in (signal.SIGINT, signal.SIGTERM):
+            loop.add_signal_handler(signum, stop.set)
+
+        try:
+            await schedule.run(stop)
+        finally:
+            leader.release()
+        console.print("[green]✓ Scheduler stopped[/]")
+
+    try:
+        asyncio.run(_run_scheduler_async())
+    except Exception as e:
+        console.print(f"[red]✗ Failed: {e}[/]")
+        logger.error(f"Scheduler failed: {e}", exc_info=True)
+        raise
+
+
+def _leader_only(leader, job):
+    """Wrap a scheduled job so only the leading scheduler runs it"""
+
+    async def run():
+        if not await asyncio.to_thread(leader.is_leader):
+            logger.debug(f"Not the {leader.role} leader, skipping scheduled job")
+            return
+        await job()
+
+    return run
+
+
+def _scheduled_diagnosis(db, agent_id: str, domain: str, mode: str, cadence):
+    """Build the job that diagnoses one agent on its cadence"""
+    from src.agents.factory import build_agent
+    from src.orchestration.freshness import DiagnosisGate
+    from src.orchestration.scheduler import typical_period
+
+    # A run one cadence period old counts as stale, even with jitter
+    gate = DiagnosisGate()
+    period = typical_period(cadence, datetime.now())
+    gate.max_age = min(gate.max_age, period * 0.9)
+
+    async def run():
+        agent = build_agent(agent_id, domain)
+        agent_info = db.get_agent_state(agent_id) or {"agent_id": agent_id}
+
+        # The cadence decides when to look; unchanged inputs still skip Claude
+        check = gate.check(agent, agent_info)
+        if check.skip:
+            logger.info(f"{agent_id}: inputs unchanged, keeping last bottleneck")
+            return
+
+        bottleneck = await agent.diagnose()
+        _record_diagnosis(db, agent_id, domain, mode, bottleneck)
+        db.update_agent_last_run(agent_id, check.fingerprint)
+
+    return run
+
+
+async def _scheduled_orchestration(db, orchestrator):
+    """Synthesize the latest reports into a stored plan"""
+    from src.orchestration.tasks import synthesize_plan
+
+    plan, _, reports = await synthesize_plan(db, orchestrator)
+    console.print(
+        f"[green]✓ Orchestration complete[/] [dim]({len(reports)} reports)[/]"
+    )
+
+
+@cli.command()
+@click.option("--host", default=None, help="Bind address [default: SERVER_HOST]")
+@click.option("--port", type=int, default=None, help="Port [default: SERVER_PORT]")
+@click.option(
+    "--workers",
+    type=int,
+    default=None,
+    help="Server processes, e.g. one per core [default: SENTINEL_WORKERS or 1]",
+)
+def serve(host, port, workers):
+    """Run the API server
+
+    Workers share no state in memory, so any number can serve behind one
+    port. Run `sentinel worker` alongside to process orchestration jobs.
+    """
+    from src.mcp_server.sentinel_server import serve as run_server
+
+    run_server(host=host, port=port, workers=workers)
+
+
+@cli.command()
+def mcp():
+    """Serve Sentinel's tools to an MCP client over stdio
+
+    Start this from the client's MCP configuration. It runs the same
+    tools as POST /mcp on the API server, without HTTP in between.
+    """
+    from src.mcp_server.mcp_protocol import run_stdio
+    from src.mcp_server import sentinel_server
+    from src.storage.cost_ledger import setup_ledger
+
+    sentinel_server.db.connect()
+    setup_ledger(sentinel_server.db)
+    try:
+        asyncio.run(run_stdio(sentinel_server.mcp))
+    finally:
+        sentinel_server.db.close()
+
+
+@cli.command()
+@click.option(
+    "--concurrency", default=4, show_default=True, help="Jobs run at the same time"
+)
+@click.option(
+    "--kinds",
+    default="diagnose,orchestrate",
+    show_default=True,
+    help="Comma-separated job kinds this worker handles",
+)
+@click.option(
+    "--lease",
+    default=120.0,
+    show_default=True,
+    help="Seconds a claimed job stays leased between heartbeats",
+)
+@click.option(
+    "--poll-interval",
+    default=1.0,
+    show_default=True,
+    help="Seconds an idle slot waits before polling again",
+)
+def worker(concurrency, kinds, lease, poll_interval):
+    """Process queued jobs until stopped (run one per core or host)"""
+    console.print(f"[bold blue]Starting worker ({concurrency} slots)...[/]")
+
+    async def _run_worker_async():
+        import signal
+        from src.storage.postgres_client import PostgresClient
+        from src.storage.job_queue import JobQueue
+        from src.observability.telemetry import setup_telemetry
+        from src.agents.factory import build_agent
+        from src.agents.orchestrator import OrchestratorAgent
+        from src.orchestration.tasks import build_handlers
+        from src.orchestration.worker import Worker
+
+        from src.storage.cost_ledger import setup_ledger
+
+        setup_telemetry(service_name="sentinel-worker")
+
+        db = PostgresClient()
+        db.connect()
+        setup_ledger(db)
+        queue = JobQueue(db)
+
+        handlers = build_handlers(db, queue, build_agent, OrchestratorAgent())
+        wanted = {kind.strip() for kind in kinds.split(",") if kind.strip()}
+        unknown = wanted - set(handlers)
+        if unknown:
+            raise click.BadParameter(f"Unknown job kinds: {', '.join(sorted(unknown))}")
+
+        job_worker = Worker(
+            queue,
+            {kind: handlers[kind] for kind in wanted},
+            concurrency=concurrency,
+            lease_seconds=lease,
+            poll_interval=poll_interval,
+        )
+        console.print(f"[dim]Worker {job_worker.worker_id} handling: {kinds}[/]")
+        console.print("[dim]Press Ctrl+C to stop[/]\n")
+
+        stop = asyncio.Event()
+        loop = asyncio.get_running_loop()
+        for signum in (signal.SIGINT, signal.SIGTERM):
+            loop.add_signal_handler(signum, stop.set)
+
+        await job_worker.run(stop)
+        console.print(
+            f"[green]✓ Worker stopped[/] [dim]({job_worker.processed} done, "
+            f"{job_worker.failed} failed)[/]"
+        )
+
+    try:
+        asyncio.run(_run_worker_async())
+    except Exception as e:
+        console.print(f"[red]✗ Failed: {e}[/]")
+        logger.error(f"Worker failed: {e}", exc_info=True)
+        raise
+
+
+@cli.command()
+@click.option(
+    "--concurrency", default=8, show_default=True, help="Actions run at the same time"
+)
+@click.option(
+    "--per-agent",
+    default=2,
+    show_default=True,
+    help="Actions run at the same time for one agent",
+)
+@click.option(
+    "--batch-size",
+    default=20,
+    show_default=True,
+    help="Finished actions written back per transaction",
+)
+@click.option(
+    "--poll-interval",
+    default=1.0,
+    show_default=True,
+    help="Seconds to wait when no action is queued",
+)
+@click.option(
+    "--stale-after",
+    default=3600.0,
+    show_default=True,
+    help="Re-queue actions left executing longer than this at startup",
+)
+def executor(concurrency, per_agent, batch_size, poll_interval, stale_after):
+    """Run queued actions by priority until stopped"""
+    console.print(f"[bold blue]Starting action executor ({concurrency} slots)...[/]")
+
+    async def _run_executor_async():
+        import signal
+        from src.storage.postgres_client import PostgresClient
+        from src.storage.action_queue import ActionQueue
+        from src.observability.telemetry import setup_telemetry
+        from src.agents.factory import build_agent
+        from src.orchestration.executor import ActionExecutor
+
+        setup_telemetry(service_name="sentinel-executor")
+
+        db = PostgresClient()
+        db.connect()
+        actions = ActionQueue(db)
+        actions.requeue_stale(stale_after)
+
+        action_executor = ActionExecutor(
+            actions,
+            build_agent,
+            concurrency=concurrency,
+            per_agent_limit=per_agent,
+            batch_size=batch_size,
+            poll_interval=poll_interval,
+        )
+        console.print("[dim]Press Ctrl+C to stop[/]\n")
+
+        stop = asyncio.Event()
+        loop = asyncio.get_running_loop()
+        for signum in (signal.SIGINT, signal.SIGTERM):
+            loop.add_signal_handler(signum, stop.set)
+
+        await action_executor.run(stop)
+        console.print(
+            f"[green]✓ Executor stopped[/] [dim]({action_executor.completed} completed, "
+            f"{action_executor.failed} failed)[/]"
+        )
+        _print_action_stats(action_executor.latency_summary())
+
+    try:
+        asyncio.run(_run_executor_async())
+    except Exception as e:
+        console.print(f"[red]✗ Failed: {e}[/]")
+        logger.error(f"Executor failed: {e}", exc_info=True)
+        raise
+
+
+@cli.command()
+@click.option("--hours", type=float, help="Only actions finished in the last N hours")
+def action_stats(hours):
+    """Show queue latency and execution percentiles per action type"""
+    from datetime import timedelta
+    from src.storage.postgres_client import PostgresClient
+    from src.storage.action_queue import ActionQueue
+
+    db = PostgresClient()
+    db.connect()
+    since = datetime.utcnow() - timedelta(hours=hours) if hours else None
+    _print_action_stats(ActionQueue(db).latency_stats(since))
+
+
+def _print_action_stats(summary) -> None:
+    """Table of per-action-type percentiles from latency_summary()"""
+    if not summary:
+        console.print("[dim]No finished actions[/]")
+        return
+
+    table = Table(title="Action Latency (seconds)")
+    table.add_column("Action Type", style="cyan")
+    table.add_column("Count", justify="right")
+    for label in ("Queue", "Exec"):
+        for p in ("p50", "p90", "p99"):
+            table.add_column(f"{label} {p}", justify="right")
+
+    for action_type, stats in summary.items():
+        table.add_row(
+            action_type,
+            str(stats["count"]),
+            *(f"{v:.2f}" for v in stats["queue_seconds"].values()),
+            *(f"{v:.2f}" for v in stats["execution_seconds"].values()),
+        )
+    console.print(table)
+
+
 @cli.command()
 @click.argument("config")
 def init_project(config):
@@ -173,6 +757,7 @@ def init_project(config):
 
     try:
         from src.storage.postgres_client import PostgresClient
+        from src.storage.cost_ledger import CostLedger
 
         # Load config
         with open(config, "r") as f:
@@ -185,6 +770,7 @@ def init_project(config):
         # Connect to database
         db = PostgresClient()
         db.connect()
+        ledger = CostLedger(db)
 
         # Register agents
         agents_registered = 0
@@ -198,9 +784,13 @@ def init_project(config):
                 name=agent_config.get("name"),
                 responsibilities=agent_config.get("responsibilities"),
                 autonomy_level=agent_config.get("autonomy_level", "diagnostic"),
+                project=project_name,
             )
             console.print(f"  [green]✓[/] Registered: {agent_id} ({domain})")
             agents_registered += 1
+            _set_budget(ledger, "agent", agent_id, agent_config.get("budget"))
+
+        _set_budget(ledger, "project", project_name, project_config.get("budget"))
 
         console.print(f"\n[green]✓ Project initialized: {project_name}[/]")
         console.print(f"[dim]Registered {agents_registered} agents[/]")
@@ -210,6 +800,97 @@ def init_project(config):
         raise
 
 
+def _set_budget(ledger, scope: str, name: str, budget) -> None:
+    """Store a config's {"limit_usd": ..., "window_hours": ...} budget"""
+    if not budget:
+        return
+    window_hours = budget.get("window_hours", 24)
+    ledger.set_budget(scope, name, budget["limit_usd"], window_hours)
+    console.print(
+        f"  [green]✓[/] Budget: {name} ${budget['limit_usd']:g} per {window_hours:g}h"
+    )
+
+
+@cli.command()
+@click.option("--hours", type=float, help="Only calls in the last N hours")
+@click.option("--days", type=float, help="Only calls in the last N days")
+@click.option(
+    "--by",
+    "group_by",
+    type=click.Choice(["agent", "domain", "project", "cycle", "model", "day"]),
+    default="agent",
+    show_default=True,
+    help="What to total spend by",
+)
+def costs(hours, days, group_by):
+    """Show Claude token usage and spend, and budget headroom"""
+    from datetime import timedelta
+    from src.storage.postgres_client import PostgresClient
+    from src.storage.cost_ledger import CostLedger
+
+    db = PostgresClient()
+    db.connect()
+    ledger = CostLedger(db)
+
+    since = None
+    if hours or days:
+        since = datetime.utcnow() - timedelta(hours=(hours or 0) + 24 * (days or 0))
+    column = {"agent": "agent_id", "cycle": "cycle_id"}.get(group_by, group_by)
+    _print_costs(ledger.summary(since, column), column, ledger.budgets())
+
+
+def _print_costs(summary, column: str, budgets) -> None:
+    """Spend table from CostLedger.summary(), then budgets"""
+    if not summary:
+        console.print("[dim]No Claude calls recorded[/]")
+    else:
+        table = Table(title="Claude Spend")
+        table.add_column(column.replace("_id", "").capitalize(), style="cyan")
+        for label in ("Calls", "Input", "Output", "Cache Read", "Cost (USD)"):
+            table.add_column(label, justify="right")
+        for row in summary:
+            table.add_row(
+                row[column] or "-",
+                str(row["calls"]),
+                f"{row['input_tokens']:,}",
+                f"{row['output_tokens']:,}",
+                f"{row['cache_read_tokens']:,}",
+                f"{row['cost_usd']:.4f}",
+            )
+        table.add_row(
+            "[bold]Total[/]",
+            str(sum(r["calls"] for r in summary)),
+            f"{sum(r['input_tokens'] for r in summary):,}",
+            f"{sum(r['output_tokens'] for r in summary):,}",
+            f"{sum(r['cache_read_tokens'] for r in summary):,}",
+            f"[bold]{sum(r['cost_usd'] for r in summary):.4f}[/]",
+        )
+        console.print(table)
+
+    if budgets:
+        table = Table(title="Budgets")
+        table.add_column("Scope", style="cyan")
+        table.add_column("Name")
+        table.add_column("Window", justify="right")
+        table.add_column("Spent (USD)", justify="right")
+        table.add_column("Limit (USD)", justify="right")
+        table.add_column("Used", justify="right")
+        for budget in budgets:
+            used = (
+                budget["spent_usd"] / budget["limit_usd"] if budget["limit_usd"] else 1
+            )
+            style = "red" if used >= 1 else "yellow" if used >= 0.8 else "green"
+            table.add_row(
+                budget["scope"],
+                budget["name"],
+                f"{budget['window_hours']:g}h",
+                f"{budget['spent_usd']:.4f}",
+                f"{budget['limit_usd']:.2f}",
+                f"[{style}]{used:.0%}[/]",
+            )
+        console.print(table)
+
+
 @cli.command()
 def test_notion():
     """Test Notion API connection"""
@@ -282,6 +963,7 @@ def list_agents():
     """List all agents"""
     try:
         from src.storage.postgres_client import PostgresClient
+
         db = PostgresClient()
         db.connect()
         agents = db.get_all_agents()
@@ -290,18 +972,15 @@ def list_agents():
         table.add_column("Agent ID", style="cyan")
         table.add_column("Domain", style="magenta")
         table.add_column("Autonomy", style="yellow")
-        
+
         for agent in agents:
-            table.add_row(
-                agent['agent_id'], 
-                agent['domain'], 
-                agent['autonomy_level']
-            )
-        
+            table.add_row(agent["agent_id"], agent["domain"], agent["autonomy_level"])
+
         console.print(table)
     except Exception as e:
         console.print(f"[red]✗ Failed: {e}[/]")
 
+
 @cli.command()
 @click.argument("agent_id")
 def show_agent(agent_id):
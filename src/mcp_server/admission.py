@@ -0,0 +1,332 @@
+"""
+Admission control for the expensive API endpoints.
+
+Each guarded endpoint gets a policy:
+
+- a per-client token bucket, so one script can't take every slot;
+- a concurrency cap on requests in progress (diagnoses start Claude
+  calls and hold database connections);
+- a bounded wait queue in front of the cap, where requests wait up to a
+  timeout for a slot.
+
+Requests over their client's rate, arriving to a full queue, or timing
+out in it get 429 with Retry-After instead of piling up, so a burst
+degrades into fast rejections rather than slow failures. Counts are
+exposed through GET /stats and recorded as metrics.
+"""
+
+import os
+import math
+import time
+import asyncio
+import logging
+from collections import OrderedDict, deque
+from contextlib import asynccontextmanager
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Optional, Tuple
+
+from src.mcp_server.serialization import dumps
+from src.observability.telemetry import record_metric
+
+logger = logging.getLogger(__name__)
+
+# Clients whose buckets are remembered (least recently seen dropped)
+MAX_CLIENTS = 10000
+
+# Weight of the newest request in the average service time
+SERVICE_TIME_ALPHA = 0.2
+
+
+@dataclass
+class AdmissionPolicy:
+    max_concurrent: int  # Requests in progress at once
+    max_queue: int  # Requests waiting for a slot
+    queue_timeout: float  # Seconds a request waits before 429
+    rate: float  # Requests per second per client (token refill)
+    burst: int  # Bucket size: requests a client may make at once
+
+
+class Rejected(Exception):
+    """Request refused; retry_after is in seconds"""
+
+    def __init__(self, reason: str, retry_after: float):
+        super().__init__(reason)
+        self.reason = reason
+        self.retry_after = retry_after
+
+
+class TokenBuckets:
+    """Per-client token buckets for one policy"""
+
+    def __init__(
+        self, rate: float, burst: int, clock: Callable[[], float] = time.monotonic
+    ):
+        self.rate = rate
+        self.burst = burst
+        self.clock = clock
+        # client -> (tokens, updated_at)
+        self._buckets: "OrderedDict[str, Tuple[float, float]]" = OrderedDict()
+
+    def take(self, client: str) -> float:
+        """
+        Take a token for client.
+
+        Returns 0 if one was available, else seconds until one will be.
+        """
+        now = self.clock()
+        tokens, updated = self._buckets.pop(client, (float(self.burst), now))
+        tokens = min(self.burst, tokens + (now - updated) * self.rate)
+
+        wait = 0.0
+        if tokens >= 1:
+            tokens -= 1
+        else:
+            wait = (1 - tokens) / self.rate
+
+        self._buckets[client] = (tokens, now)
+        if len(self._buckets) > MAX_CLIENTS:
+            self._buckets.popitem(last=False)
+        return wait
+
+
+class AdmissionLimiter:
+    """Concurrency cap with a bounded, timed wait queue"""
+
+    def __init__(self, name: str, policy: AdmissionPolicy):
+        self.name = name
+        self.policy = policy
+        self.buckets = TokenBuckets(policy.rate, policy.burst)
+        self.active = 0
+        self._waiters: "deque[asyncio.Future]" = deque()
+        self.service_seconds = 1.0  # Moving average, for Retry-After
+        self.counts = {"admitted": 0, "queued": 0, "rejected": 0, "rate_limited": 0}
+
+    @property
+    def queue_depth(self) -> int:
+        return len(self._waiters)
+
+    async def acquire(self, client: str) -> None:
+        """Wait for a slot; raises Rejected instead of waiting too long"""
+        wait = self.buckets.take(client)
+        if wait:
+            self._reject("rate_limited", wait)
+
+        if self.active < self.policy.max_concurrent and not self._waiters:
+            self.active += 1
+            self.counts["admitted"] += 1
+            return
+
+        if len(self._waiters) >= self.policy.max_queue:
+            self._reject("rejected", self._estimated_wait())
+
+        waiter = asyncio.get_running_loop().create_future()
+        self._waiters.append(waiter)
+        self.counts["queued"] += 1
+        self._record_queue_depth()
+        try:
+            await asyncio.wait_for(waiter, self.policy.queue_timeout)
+        except asyncio.TimeoutError:
+            self._waiters.remove(waiter)
+            self._record_queue_depth()
+            self._reject("rejected", self._estimated_wait())
+        except asyncio.CancelledError:
+            # The client went away while waiting
+            if waiter in self._waiters:
+                self._waiters.remove(waiter)
+                self._record_queue_depth()
+            elif not waiter.cancelled():
+                self._hand_off()  # It was just given a slot: pass it on
+            raise
+        # _hand_off() gave this request its slot
+        self.counts["admitted"] += 1
+
+    def release(self, elapsed: float) -> None:
+        """Free a slot, handing it to the longest waiter if any"""
+        self.service_seconds += SERVICE_TIME_ALPHA * (elapsed - self.service_seconds)
+        self._hand_off()
+
+    def _hand_off(self) -> None:
+        while self._waiters:
+            waiter = self._waiters.popleft()
+            if not waiter.done():
+                waiter.set_result(None)  # The slot passes on; active unchanged
+                self._record_queue_depth()
+                return
+        self.active -= 1
+
+    def _record_queue_depth(self) -> None:
+        record_metric(
+            "admission.queue_depth", self.queue_depth, {"endpoint": self.name}
+        )
+
+    def _estimated_wait(self) -> float:
+        # Time for the requests ahead (running and queued) to drain
+        ahead = len(self._waiters) + 1
+        return self.service_seconds * ahead / self.policy.max_concurrent
+
+    def _reject(self, outcome: str, retry_after: float) -> None:
+        self.counts[outcome] += 1
+        record_metric(
+            "admission.rejected", 1, {"endpoint": self.name, "reason": outcome}
+        )
+        raise Rejected(outcome, retry_after)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            **self.counts,
+            "active": self.active,
+            "queue_depth": self.queue_depth,
+            "max_concurrent": self.policy.max_concurrent,
+            "max_queue": self.policy.max_queue,
+            "avg_service_seconds": round(self.service_seconds, 3),
+        }
+
+
+def _env_policy(prefix: str, default: AdmissionPolicy) -> AdmissionPolicy:
+    """Policy with SENTINEL_ADMISSION_<PREFIX>_<FIELD> overrides"""
+    values = {}
+    for field, kind in (
+        ("max_concurrent", int),
+        ("max_queue", int),
+        ("queue_timeout", float),
+        ("rate", float),
+        ("burst", int),
+    ):
+        raw = os.getenv(f"SENTINEL_ADMISSION_{prefix}_{field.upper()}")
+        values[field] = kind(raw) if raw else getattr(default, field)
+    return AdmissionPolicy(**values)
+
+
+def default_policies() -> Dict[Tuple[str, str], AdmissionPolicy]:
+    """(method, path) -> policy for the guarded endpoints"""
+    diagnose_slots = int(os.getenv("SENTINEL_DIAGNOSE_CONCURRENCY", "8"))
+    return {
+        ("POST", "/diagnose"): _env_policy(
+            "DIAGNOSE",
+            AdmissionPolicy(diagnose_slots, 4 * diagnose_slots, 10.0, 1.0, 10),
+        ),
+        ("POST", "/diagnose/batch"): _env_policy(
+            "BATCH", AdmissionPolicy(2, 4, 10.0, 0.1, 3)
+        ),
+        ("POST", "/orchestrate"): _env_policy(
+            "ORCHESTRATE", AdmissionPolicy(4, 16, 5.0, 0.2, 5)
+        ),
+    }
+
+
+class AdmissionControl:
+    """
+    Admission limiters for the guarded endpoints, shared with /stats.
+
+    Usage:
+        admission = AdmissionControl()  # default_policies()
+        app.add_middleware(AdmissionMiddleware, control=admission)
+    """
+
+    def __init__(
+        self,
+        policies: Dict[Tuple[str, str], AdmissionPolicy] = None,
+        trust_proxy_headers: Optional[bool] = None,
+    ):
+        """
+        Args:
+            policies: (method, path) -> policy; default_policies() if None
+            trust_proxy_headers: Identify clients by X-Real-IP (set by nginx)
+                rather than the peer address; SENTINEL_TRUST_PROXY_HEADERS
+        """
+        self.limiters = {
+            key: AdmissionLimiter(f"{key[0]} {key[1]}", policy)
+            for key, policy in (policies or default_policies()).items()
+        }
+        if trust_proxy_headers is None:
+            trust_proxy_headers = os.getenv(
+                "SENTINEL_TRUST_PROXY_HEADERS", ""
+            ).lower() in ("1", "true", "yes")
+        self.trust_proxy_headers = trust_proxy_headers
+
+    def limiter_for(self, scope) -> Optional[AdmissionLimiter]:
+        if scope["type"] != "http":
+            return None
+        return self.limiters.get((scope["method"], scope["path"].rstrip("/")))
+
+    def client(self, scope) -> str:
+        if self.trust_proxy_headers:
+            for name, value in scope.get("headers") or []:
+                if name == b"x-real-ip":
+                    return value.decode("latin-1")
+        client = scope.get("client")
+        return client[0] if client else "unknown"
+
+    @asynccontextmanager
+    async def admit(self, key: Tuple[str, str], client: str):
+        """
+        Hold a slot of the limiter for key (method, path) around a call
+        that doesn't come through the middleware, such as an MCP tool
+        call. Raises Rejected like acquire().
+        """
+        limiter = self.limiters.get(key)
+        if limiter is None:
+            yield
+            return
+
+        await limiter.acquire(client)
+        start = time.monotonic()
+        try:
+            yield
+        finally:
+            limiter.release(time.monotonic() - start)
+
+    def stats(self) -> Dict[str, Any]:
+        return {limiter.name: limiter.stats() for limiter in self.limiters.values()}
+
+
+class AdmissionMiddleware:
+    """ASGI middleware admitting guarded requests through an AdmissionControl"""
+
+    def __init__(self, app, control: AdmissionControl):
+        self.app = app
+        self.control = control
+
+    async def __call__(self, scope, receive, send):
+        limiter = self.control.limiter_for(scope)
+        if limiter is None:
+            await self.app(scope, receive, send)
+            return
+
+        try:
+            await limiter.acquire(self.control.client(scope))
+        except Rejected as e:
+            await _too_many_requests(send, e)
+            return
+
+        start = time.monotonic()
+        try:
+            # Returns once the response (including a stream) is sent
+            await self.app(scope, receive, send)
+        finally:
+            limiter.release(time.monotonic() - start)
+
+
+async def _too_many_requests(send, rejected: Rejected) -> None:
+    retry_after = max(1, math.ceil(rejected.retry_after))
+    body = dumps(
+        {
+            "detail": "Too many requests"
+            if rejected.reason == "rate_limited"
+            else "Server busy, retry later",
+            "reason": rejected.reason,
+            "retry_after": retry_after,
+        }
+    )
+    await send(
+        {
+            "type": "http.response.start",
+            "status": 429,
+            "headers": [
+                (b"content-type", b"application/json"),
+                (b"content-length", str(len(body)).encode()),
+                (b"retry-after", str(retry_after).encode()),
+            ],
+        }
+    )
+    await send({"type": "http.response.body", "body": body})
@@ -0,0 +1,277 @@
+"""
+Model Context Protocol (MCP) over JSON-RPC 2.0.
+
+Serves tools to MCP clients without an HTTP proxy in between: over
+stdio (`sentinel mcp`, one JSON message per line) or as streamable HTTP
+(POST /mcp on the API server, plain JSON responses). Both transports
+hand messages to the same MCPServer, whose tools call into the server
+process directly and so share its agent registry and database pool.
+
+Implements the parts of the protocol a tool server needs: initialize,
+ping, tools/list and tools/call (plus batches and notifications).
+
+Usage:
+    mcp = MCPServer("sentinel", "0.1.0")
+
+    @mcp.tool("state", GetStateRequest)
+    async def state(args: GetStateRequest, client: str):
+        return db.get_agent_state(args.agent_id)
+
+    await run_stdio(mcp)
+"""
+
+import sys
+import json
+import asyncio
+import inspect
+import logging
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Type
+
+from pydantic import BaseModel, ValidationError
+
+from src.mcp_server.serialization import dumps
+
+logger = logging.getLogger(__name__)
+
+# Newest first; a client asking for another version gets the newest
+PROTOCOL_VERSIONS = ("2025-06-18", "2025-03-26", "2024-11-05")
+
+# JSON-RPC error codes
+PARSE_ERROR = -32700
+INVALID_REQUEST = -32600
+METHOD_NOT_FOUND = -32601
+INVALID_PARAMS = -32602
+INTERNAL_ERROR = -32603
+
+# Longest stdio message accepted (one line)
+MAX_MESSAGE_BYTES = 16 * 1024 * 1024
+
+
+class JSONRPCError(Exception):
+    """Error returned to the caller as a JSON-RPC error response"""
+
+    def __init__(self, code: int, message: str, data: Any = None):
+        super().__init__(message)
+        self.code = code
+        self.message = message
+        self.data = data
+
+
+class ToolError(Exception):
+    """A tool failed; the message is returned to the client as the result"""
+
+
+@dataclass
+class Tool:
+    name: str
+    description: str
+    params: Optional[Type[BaseModel]]  # Validates the call's arguments
+    handler: Callable[..., Awaitable[Any]]  # (args, client) -> result
+
+    def spec(self) -> Dict[str, Any]:
+        schema = (
+            self.params.model_json_schema()
+            if self.params
+            else {"type": "object", "properties": {}}
+        )
+        return {
+            "name": self.name,
+            "description": self.description,
+            "inputSchema": schema,
+        }
+
+
+class MCPServer:
+    """Dispatches MCP JSON-RPC messages to registered tools"""
+
+    def __init__(self, name: str, version: str, instructions: Optional[str] = None):
+        self.info = {"name": name, "version": version}
+        self.instructions = instructions
+        self.tools: Dict[str, Tool] = {}
+        self.counts = {"calls": 0, "errors": 0}
+
+    def tool(self, name: str, params: Optional[Type[BaseModel]] = None):
+        """
+        Register a tool; its docstring is the description clients see.
+
+        The handler is called as handler(args, client) with args
+        validated against params (None if the tool takes none) and client
+        identifying the caller, and returns a JSON-serializable result.
+        """
+
+        def register(handler):
+            self.tools[name] = Tool(
+                name, inspect.getdoc(handler) or name, params, handler
+            )
+            return handler
+
+        return register
+
+    async def handle_bytes(self, data: bytes, client: str = "local") -> Optional[bytes]:
+        """Handle one message or batch; None if there's nothing to send back"""
+        try:
+            message = json.loads(data)
+        except ValueError:
+            return dumps(_error(None, JSONRPCError(PARSE_ERROR, "Parse error")))
+
+        if isinstance(message, list):
+            if not message:
+                return dumps(_error(None, JSONRPCError(INVALID_REQUEST, "Empty batch")))
+            responses = await asyncio.gather(*(self.handle(m, client) for m in message))
+            responses = [r for r in responses if r is not None]
+            return dumps(responses) if responses else None
+
+        response = await self.handle(message, client)
+        return dumps(response) if response is not None else None
+
+    async def handle(self, message: Any, client: str = "local") -> Optional[dict]:
+        """Handle one JSON-RPC message; None for notifications and responses"""
+        if not isinstance(message, dict) or message.get("jsonrpc") != "2.0":
+            return _error(None, JSONRPCError(INVALID_REQUEST, "Invalid request"))
+
+        method = message.get("method")
+        request_id = message.get("id")
+        if not isinstance(method, str):
+            # A response to a request we never send, or malformed
+            if "id" in message and ("result" in message or "error" in message):
+                return None
+            return _error(request_id, JSONRPCError(INVALID_REQUEST, "Invalid request"))
+
+        is_notification = "id" not in message
+        try:
+            result = await self._dispatch(method, message.get("params") or {}, client)
+        except JSONRPCError as e:
+            return None if is_notification else _error(request_id, e)
+        except Exception as e:
+            logger.error(f"MCP {method} failed: {e}", exc_info=True)
+            return (
+                None
+                if is_notification
+                else _error(request_id, JSONRPCError(INTERNAL_ERROR, str(e)))
+            )
+
+        if is_notification:
+            return None
+        return {"jsonrpc": "2.0", "id": request_id, "result": result}
+
+    async def _dispatch(self, method: str, params: Dict[str, Any], client: str):
+        if method == "initialize":
+            return self._initialize(params)
+        if method == "ping":
+            return {}
+        if method == "tools/list":
+            return {"tools": [tool.spec() for tool in self.tools.values()]}
+        if method == "tools/call":
+            return await self._call_tool(params, client)
+        if method.startswith("notifications/"):
+            return None  # initialized, cancelled, ...: nothing to do
+        raise JSONRPCError(METHOD_NOT_FOUND, f"Method not found: {method}")
+
+    def _initialize(self, params: Dict[str, Any]) -> Dict[str, Any]:
+        requested = params.get("protocolVersion")
+        result = {
+            "protocolVersion": requested
+            if requested in PROTOCOL_VERSIONS
+            else PROTOCOL_VERSIONS[0],
+            "capabilities": {"tools": {"listChanged": False}},
+            "serverInfo": self.info,
+        }
+        if self.instructions:
+            result["instructions"] = self.instructions
+        return result
+
+    async def _call_tool(self, params: Dict[str, Any], client: str) -> Dict[str, Any]:
+        tool = self.tools.get(params.get("name"))
+        if tool is None:
+            raise JSONRPCError(INVALID_PARAMS, f"Unknown tool: {params.get('name')}")
+
+        try:
+            args = (
+                tool.params.model_validate(params.get("arguments") or {})
+                if tool.params
+                else None
+            )
+        except ValidationError as e:
+            raise JSONRPCError(
+                INVALID_PARAMS,
+                f"Invalid arguments for {tool.name}",
+                e.errors(include_url=False, include_context=False),
+            )
+
+        self.counts["calls"] += 1
+        try:
+            result = await tool.handler(args, client)
+        except ToolError as e:
+            self.counts["errors"] += 1
+            return _tool_error(str(e))
+        except Exception as e:
+            self.counts["errors"] += 1
+            logger.error(f"Tool {tool.name} failed: {e}", exc_info=True)
+            return _tool_error(str(e) or type(e).__name__)
+
+        response = {
+            "content": [{"type": "text", "text": dumps(result).decode()}],
+            "isError": False,
+        }
+        if isinstance(result, dict):
+            response["structuredContent"] = result
+        return response
+
+    def stats(self) -> Dict[str, Any]:
+        return {**self.counts, "tools": len(self.tools)}
+
+
+def _error(request_id: Any, error: JSONRPCError) -> Dict[str, Any]:
+    body = {"code": error.code, "message": error.message}
+    if error.data is not None:
+        body["data"] = error.data
+    return {"jsonrpc": "2.0", "id": request_id, "error": body}
+
+
+def _tool_error(message: str) -> Dict[str, Any]:
+    return {"content": [{"type": "text", "text": message}], "isError": True}
+
+
+async def run_stdio(server: MCPServer, stdin=None, stdout=None) -> None:
+    """
+    Serve MCP over stdio until stdin closes.
+
+    Messages are newline-delimited JSON. Requests are handled
+    concurrently, so a slow diagnosis doesn't hold up a ping; each
+    response is written as one line when it's ready. Logs must go to
+    stderr, since stdout carries the protocol.
+    """
+    loop = asyncio.get_running_loop()
+    stdin = stdin or sys.stdin.buffer
+    stdout = stdout or sys.stdout.buffer
+
+    reader = asyncio.StreamReader(limit=MAX_MESSAGE_BYTES)
+    await loop.connect_read_pipe(lambda: asyncio.StreamReaderProtocol(reader), stdin)
+
+    def write(response: bytes) -> None:
+        stdout.write(response + b"\n")
+        stdout.flush()
+
+    async def respond(line: bytes) -> None:
+        response = await server.handle_bytes(line, client="stdio")
+        if response is not None:
+            write(response)
+
+    pending: List[asyncio.Task] = []
+    while True:
+        try:
+            line = await reader.readline()
+        except ValueError:
+            # Longer than MAX_MESSAGE_BYTES
+            write(dumps(_error(None, JSONRPCError(INVALID_REQUEST, "Too large"))))
+            continue
+        if not line:
+            break
+        if not line.strip():
+            continue
+        pending = [task for task in pending if not task.done()]
+        pending.append(asyncio.create_task(respond(line)))
+
+    # stdin closed: finish what's in flight before exiting
+    await asyncio.gather(*pending, return_exceptions=True)
@@ -0,0 +1,297 @@
+"""
+Response cache for the read endpoints the dashboard polls.
+
+Each cached response depends on a few tables. Writes bump those tables'
+version counters (table_versions, in the writing transaction), so:
+
+- the ETag is a digest of the request and the versions it depends on,
+  and a matching If-None-Match is answered with 304 without building
+  the body;
+- a cached body stays valid while the versions are unchanged, so the
+  expensive queries only run after a write;
+- within a short TTL the versions aren't even read, unless this process
+  wrote since (writes from other workers show up after the TTL).
+
+DashboardSnapshot applies the same scheme to GET /dashboard/snapshot,
+which returns every dashboard panel at once.
+"""
+
+import os
+import time
+import hashlib
+import logging
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Optional, Tuple
+
+from fastapi import Request, Response
+
+from src.mcp_server.serialization import dumps
+from src.observability.telemetry import record_metric
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_TTL_SECONDS = 2.0
+DEFAULT_MAX_ENTRIES = 256
+
+# Browsers must revalidate (sending If-None-Match) before reusing a body
+CACHE_CONTROL = "no-cache"
+
+
+@dataclass
+class CachedResponse:
+    etag: str
+    body: bytes
+    versions: Dict[str, int]
+    generation: int  # db.write_generation when last validated
+    checked_at: float
+
+
+class ResponseCache:
+    """
+    ETag/TTL cache keyed by request path and query.
+
+    Usage:
+        cache = ResponseCache(db)
+
+        @app.get("/agents")
+        async def list_agents(request: Request):
+            return cache.respond(request, ("agents",), lambda: {...})
+    """
+
+    def __init__(
+        self,
+        db,
+        ttl_seconds: float = None,
+        max_entries: int = DEFAULT_MAX_ENTRIES,
+        enabled: bool = True,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        """
+        Args:
+            db: PostgresClient (provides table versions and write_generation)
+            ttl_seconds: Seconds a body is served without reading versions
+            max_entries: Cached responses kept (least recently used dropped)
+            enabled: False always builds the body (for comparisons)
+            clock: Monotonic time source
+        """
+        self.db = db
+        self.ttl = (
+            ttl_seconds
+            if ttl_seconds is not None
+            else float(os.getenv("SENTINEL_CACHE_TTL_SECONDS", DEFAULT_TTL_SECONDS))
+        )
+        self.max_entries = max_entries
+        self.enabled = enabled
+        self.clock = clock
+        self._entries: "OrderedDict[str, CachedResponse]" = OrderedDict()
+        self.counts = {"fresh": 0, "revalidated": 0, "built": 0, "not_modified": 0}
+
+    def respond(
+        self, request: Request, tables: Tuple[str, ...], build: Callable[[], Any]
+    ) -> Response:
+        """Serve a JSON response from the cache, or build and cache it"""
+        if not self.enabled:
+            return Response(dumps(build()), media_type="application/json")
+
+        key = f"{request.url.path}?{request.url.query}"
+        entry, outcome = self._lookup(key, tables, request, build)
+        self.counts[outcome] += 1
+        record_metric(
+            "cache.response", 1, {"path": request.url.path, "outcome": outcome}
+        )
+
+        headers = {"ETag": entry.etag, "Cache-Control": CACHE_CONTROL}
+        if outcome == "not_modified" or _matches(
+            request.headers.get("if-none-match"), entry.etag
+        ):
+            if outcome != "not_modified":
+                self.counts["not_modified"] += 1
+            return Response(status_code=304, headers=headers)
+        return Response(entry.body, media_type="application/json", headers=headers)
+
+    def _lookup(self, key, tables, request, build) -> Tuple[CachedResponse, str]:
+        now = self.clock()
+        entry = self._entries.get(key)
+        if entry is not None:
+            self._entries.move_to_end(key)
+            if (
+                now - entry.checked_at < self.ttl
+                and entry.generation == self.db.write_generation
+            ):
+                return entry, "fresh"
+
+        generation = self.db.write_generation
+        versions = self.db.get_table_versions(tables)
+        etag = _etag(key, versions)
+
+        if entry is not None and entry.versions == versions:
+            entry.generation = generation
+            entry.checked_at = now
+            return entry, "revalidated"
+
+        if entry is None and _matches(request.headers.get("if-none-match"), etag):
+            # The client already has this version (e.g. from another worker)
+            return CachedResponse(etag, b"", versions, generation, now), "not_modified"
+
+        entry = CachedResponse(etag, dumps(build()), versions, generation, now)
+        self._entries[key] = entry
+        if len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+        return entry, "built"
+
+    def stats(self) -> Dict[str, Any]:
+        return {**self.counts, "entries": len(self._entries), "ttl_seconds": self.ttl}
+
+
+def _etag(key: str, versions: Dict[str, int]) -> str:
+    material = key + "|" + ",".join(f"{t}={v}" for t, v in sorted(versions.items()))
+    return '"' + hashlib.sha256(material.encode()).hexdigest()[:32] + '"'
+
+
+def _matches(if_none_match: Optional[str], etag: str) -> bool:
+    if not if_none_match:
+        return False
+    candidates = [tag.strip() for tag in if_none_match.split(",")]
+    return "*" in candidates or etag in candidates or f"W/{etag}" in candidates
+
+
+# Dashboard panel -> (tables it reads, reader(db, session))
+DASHBOARD_PANELS = {
+    "agents": (("agents",), lambda db, session: db.get_all_agents(session=session)),
+    "reports": (
+        ("agents", "bottlenecks"),
+        lambda db, session: db.get_all_agent_reports(session=session),
+    ),
+    "plan": (
+        ("orchestrator_plans",),
+        lambda db, session: db.get_latest_orchestration_result(session=session),
+    ),
+    "security_summary": (
+        ("security_vulnerabilities",),
+        lambda db, session: db.get_security_summary(session=session),
+    ),
+    "vulnerabilities": (
+        ("security_vulnerabilities",),
+        lambda db, session: db.get_vulnerabilities(session=session),
+    ),
+}
+
+
+class DashboardSnapshot:
+    """
+    Every dashboard panel in one response, read in one transaction.
+
+    The table versions and the panels are read in the same snapshot
+    (db.snapshot_session), so the panels agree with each other and with
+    the ETag. Each panel is kept serialized; after a write only the
+    panels reading the written tables are rebuilt, and the body is
+    spliced together from the rest. Freshness follows ResponseCache:
+    versions aren't read within the TTL unless this process wrote.
+
+    Usage:
+        snapshot = DashboardSnapshot(db)
+
+        @app.get("/dashboard/snapshot")
+        async def dashboard_snapshot(request: Request):
+            return snapshot.respond(request)
+    """
+
+    def __init__(
+        self,
+        db,
+        panels: Dict[str, Tuple[Tuple[str, ...], Callable]] = None,
+        ttl_seconds: float = None,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        """
+        Args:
+            db: PostgresClient
+            panels: name -> (tables, reader(db, session)); DASHBOARD_PANELS
+            ttl_seconds: Seconds the snapshot is served without reading
+                versions (SENTINEL_CACHE_TTL_SECONDS)
+            clock: Monotonic time source
+        """
+        self.db = db
+        self.panels = panels or DASHBOARD_PANELS
+        self.tables = tuple(
+            sorted({table for tables, _ in self.panels.values() for table in tables})
+        )
+        self.ttl = (
+            ttl_seconds
+            if ttl_seconds is not None
+            else float(os.getenv("SENTINEL_CACHE_TTL_SECONDS", DEFAULT_TTL_SECONDS))
+        )
+        self.clock = clock
+        self._bodies: Dict[str, bytes] = {}  # Serialized panels
+        self._snapshot: Optional[CachedResponse] = None
+        self.counts = {
+            "fresh": 0,
+            "revalidated": 0,
+            "built": 0,
+            "not_modified": 0,
+            "panels_built": 0,
+        }
+
+    def respond(self, request: Request) -> Response:
+        """Serve the snapshot, rebuilding the panels that changed"""
+        snapshot, outcome = self._lookup(request)
+        self.counts[outcome] += 1
+        record_metric(
+            "cache.response", 1, {"path": request.url.path, "outcome": outcome}
+        )
+
+        headers = {"ETag": snapshot.etag, "Cache-Control": CACHE_CONTROL}
+        if outcome == "not_modified" or _matches(
+            request.headers.get("if-none-match"), snapshot.etag
+        ):
+            if outcome != "not_modified":
+                self.counts["not_modified"] += 1
+            return Response(status_code=304, headers=headers)
+        return Response(snapshot.body, media_type="application/json", headers=headers)
+
+    def _lookup(self, request: Request) -> Tuple[CachedResponse, str]:
+        now = self.clock()
+        snapshot = self._snapshot
+        if (
+            snapshot is not None
+            and now - snapshot.checked_at < self.ttl
+            and snapshot.generation == self.db.write_generation
+        ):
+            return snapshot, "fresh"
+
+        generation = self.db.write_generation
+        with self.db.snapshot_session() as session:
+            versions = self.db.get_table_versions(self.tables, session=session)
+            etag = _etag("dashboard", versions)
+
+            if snapshot is not None and snapshot.versions == versions:
+                snapshot.generation = generation
+                snapshot.checked_at = now
+                return snapshot, "revalidated"
+
+            if _matches(request.headers.get("if-none-match"), etag):
+                # The client already has this version (e.g. from another worker)
+                unbuilt = CachedResponse(etag, b"", versions, generation, now)
+                return unbuilt, "not_modified"
+
+            previous = snapshot.versions if snapshot else {}
+            for name, (tables, read) in self.panels.items():
+                if name not in self._bodies or any(
+                    previous.get(table) != versions[table] for table in tables
+                ):
+                    self._bodies[name] = dumps(read(self.db, session))
+                    self.counts["panels_built"] += 1
+
+        body = (
+            b"{"
+            + b",".join(dumps(name) + b":" + self._bodies[name] for name in self.panels)
+            + b',"versions":'
+            + dumps(versions)
+            + b"}"
+        )
+        self._snapshot = CachedResponse(etag, body, versions, generation, now)
+        return self._snapshot, "built"
+
+    def stats(self) -> Dict[str, Any]:
+        return {**self.counts, "ttl_seconds": self.ttl}
@@ -3,24 +3,49 @@
 Sentinel MCP Server
 
 Provides agents as tools callable by Claude via Model Context Protocol.
+
+The server keeps no state that other workers need: plans, jobs and
+agent reports live in Postgres, and orchestration runs in `sentinel
+worker` processes. Run several workers with SENTINEL_WORKERS (see
+docs/SETUP.md).
 """
 
 import os
 import json
+import math
+import socket
+import asyncio
 import logging
-from datetime import datetime
-from typing import Optional, Dict, Any
+from datetime import datetime, timedelta
+from typing import Optional, Dict, Any, List
 
-from fastapi import FastAPI, HTTPException
+from fastapi import FastAPI, HTTPException, Request
 from fastapi.middleware.cors import CORSMiddleware
-from pydantic import BaseModel
+from fastapi.responses import Response, StreamingResponse
+from pydantic import BaseModel, Field
 from dotenv import load_dotenv
 import uvicorn
 
-from src.agents.orchestrator import OrchestratorAgent
+from src.agents.factory import build_agent
 from src.agents.sub_agent import SubAgent
+from src.mcp_server.admission import AdmissionControl, AdmissionMiddleware, Rejected
+from src.mcp_server.mcp_protocol import MCPServer, ToolError
+from src.observability import metrics
+from src.observability.metrics import MetricsMiddleware
+from src.observability.telemetry import setup_telemetry
+from src.mcp_server.response_cache import DashboardSnapshot, ResponseCache
+from src.mcp_server.serialization import (
+    CompressionMiddleware,
+    FastJSONResponse,
+    dumps,
+)
+from src.orchestration.progress import format_sse, orchestration_events
+from src.orchestration.singleflight import DiagnosisCoalescer
+from src.storage.action_queue import ActionQueue
+from src.storage.cost_ledger import setup_ledger
+from src.storage.event_bus import EventBus
+from src.storage.job_queue import JobQueue
 from src.storage.postgres_client import PostgresClient
-from src.storage.notion_client import NotionClient
 
 # Load environment variables
 load_dotenv()
@@ -37,8 +62,14 @@ app = FastAPI(
     title="Sentinel MCP Server",
     description="Multi-agent orchestration via Model Context Protocol",
     version="0.1.0",
+    default_response_class=FastJSONResponse,
 )
 
+# Concurrency caps, wait queues and per-client rates for expensive
+# endpoints (inside CORS, so browsers can read the 429s)
+admission = AdmissionControl()
+app.add_middleware(AdmissionMiddleware, control=admission)
+
 # Configure CORS
 app.add_middleware(
     CORSMiddleware,
@@ -47,11 +78,29 @@ app.add_middleware(
     allow_methods=["*"],  # Allows all methods
     allow_headers=["*"],  # Allows all headers
 )
+app.add_middleware(CompressionMiddleware)
+# Outermost, so endpoint latency includes compression and admission waits
+app.add_middleware(MetricsMiddleware)
 
-# Initialize clients
+# Initialize clients (the database connects at startup)
 db = PostgresClient()
-notion = NotionClient()
-orchestrator = None  # Lazy loaded
+queue = JobQueue(db)
+actions = ActionQueue(db)
+
+# Diagnoses (Claude calls) running at once across all requests
+diagnose_slots = asyncio.Semaphore(
+    int(os.getenv("SENTINEL_DIAGNOSE_CONCURRENCY", "8"))
+)
+# ETag/TTL cache for the endpoints the dashboard polls
+cache = ResponseCache(db)
+# Every dashboard panel in one response, rebuilt panel by panel on writes
+snapshot = DashboardSnapshot(db)
+# Identical concurrent diagnoses share one Claude call
+coalescer = DiagnosisCoalescer(db, slots=diagnose_slots)
+# Change events from every process, pushed to dashboards by GET /events
+bus = EventBus(db)
+# Registered agents' instances by agent_id, reused across requests
+agents: Dict[str, SubAgent] = {}
 
 
 # ==================== Models ====================
@@ -63,30 +112,65 @@ class DiagnoseRequest(BaseModel):
     project: Optional[str] = None
 
 
+class DiagnoseBatchRequest(BaseModel):
+    items: List[DiagnoseRequest] = Field(..., min_length=1, max_length=100)
+    stream: bool = False  # NDJSON, one line per item as it finishes
+
+
 class ExecuteRequest(BaseModel):
     agent_id: str
     action: Dict[str, Any]
+    priority: int = 5  # 1-10, lower runs first
 
 
 class GetStateRequest(BaseModel):
     agent_id: str
 
 
+class OrchestrateRequest(BaseModel):
+    force: bool = False
+    force_agents: List[str] = []
+
+
+class VulnerabilitiesRequest(BaseModel):
+    source: Optional[str] = None
+    severity: Optional[str] = None
+
+
 # ==================== Endpoints ====================
 
 
 @app.on_event("startup")
 async def startup():
-    """Initialize orchestrator and database"""
-    global orchestrator
+    """Connect to the database and listen for change events"""
     db.connect()
-    orchestrator = OrchestratorAgent()
-    logger.info("Sentinel MCP Server started")
+    setup_ledger(db)
+    await bus.start()
+    setup_telemetry(service_name="sentinel")
+    # Read at each metrics export; every server process reports the same
+    # values, so take the max across instances
+    metrics.setup_metrics()
+    metrics.observe("jobs.queue_depth", _job_queue_depths)
+    metrics.observe("actions.queue_depth", _action_queue_depth)
+    logger.info(f"Sentinel MCP Server started (pid {os.getpid()})")
+
+
+def _job_queue_depths():
+    return [
+        (statuses.get("queued", 0), {"kind": kind})
+        for kind, statuses in queue.stats().items()
+    ]
+
+
+def _action_queue_depth():
+    return [(actions.depth(), {})]
 
 
 @app.on_event("shutdown")
 async def shutdown():
     """Close database connection"""
+    await bus.stop()
+    setup_ledger(db).flush()  # Spend not yet written
     db.close()
     logger.info("Sentinel MCP Server stopped")
 
@@ -112,17 +196,15 @@ async def diagnose(request: DiagnoseRequest):
             request.agent_id, request.domain, request.project
         )
 
-        # Run diagnosis
-        bottleneck = await agent.diagnose()
-
-        # Store result
-        db.save_bottleneck(request.agent_id, bottleneck)
+        # Run diagnosis (or join an identical one in flight) and store it
+        bottleneck, coalesced = await coalescer.diagnose(agent)
 
         logger.info(f"Diagnosis complete: {bottleneck}")
 
         return {
             "agent_id": request.agent_id,
             "bottleneck": bottleneck,
+            "coalesced": coalesced,
             "timestamp": datetime.now().isoformat(),
         }
 
@@ -131,94 +213,250 @@ async def diagnose(request: DiagnoseRequest):
         raise HTTPException(status_code=500, detail=str(e))
 
 
-@app.post("/execute")
-async def execute(request: ExecuteRequest):
+@app.post("/diagnose/batch")
+async def diagnose_batch(request: DiagnoseBatchRequest):
     """
-    Execute action for a sub-agent.
+    Run diagnosis for many sub-agents at once.
 
-    Respects autonomy constraints and guardrails.
+    Items run concurrently (sharing the server's diagnosis limit with
+    POST /diagnose); the bottlenecks found are saved in one transaction
+    after all items finish. Each item gets its own result, so one agent
+    failing doesn't fail the batch. With "stream": true the results are
+    returned as NDJSON, one line per item as it finishes, then a summary.
     """
-    try:
-        logger.info(f"Executing action for {request.agent_id}")
-
-        agent = await _get_or_create_agent(request.agent_id)
+    registered = {agent["agent_id"] for agent in db.get_all_agents()}
+    # agent_id -> inputs each diagnosis saw, stored with its bottleneck
+    fingerprints: Dict[str, Optional[str]] = {}
+    tasks = [
+        asyncio.create_task(_diagnose_item(index, item, registered, fingerprints))
+        for index, item in enumerate(request.items)
+    ]
+    logger.info(f"Diagnosing {len(tasks)} agents in a batch")
+
+    if not request.stream:
+        results = await asyncio.gather(*tasks)
+        try:
+            saved = _save_batch(results, fingerprints)
+        except Exception as e:
+            logger.error(f"Failed to save batch diagnoses: {e}", exc_info=True)
+            raise HTTPException(status_code=500, detail=str(e))
+        return FastJSONResponse({**_batch_summary(results, saved), "results": results})
+
+    async def stream():
+        results = []
+        try:
+            for finished in asyncio.as_completed(tasks):
+                result = await finished
+                results.append(result)
+                yield dumps(result) + b"\n"
+
+            summary = _batch_summary(results, 0)
+            try:
+                summary["saved"] = _save_batch(results, fingerprints)
+            except Exception as e:
+                logger.error(f"Failed to save batch diagnoses: {e}", exc_info=True)
+                summary["error"] = str(e)
+            yield dumps({"summary": summary}) + b"\n"
+        finally:
+            # Client went away: stop diagnoses nobody will read
+            for task in tasks:
+                task.cancel()
 
-        # Check autonomy
-        if not agent.can_execute(request.action):
-            logger.warning(f"Action blocked by guardrails: {request.action}")
-            return {
-                "agent_id": request.agent_id,
-                "status": "pending_approval",
-                "action": request.action,
-            }
+    return StreamingResponse(stream(), media_type="application/x-ndjson")
 
-        # Execute
-        result = await agent.execute(request.action)
 
-        # Log outcome
-        db.log_action(request.agent_id, request.action, result)
+@app.post("/execute", status_code=202)
+async def execute(request: ExecuteRequest):
+    """
+    Queue an action for a sub-agent.
 
-        logger.info(f"Execution complete: {result}")
+    The action executor (`sentinel executor`) runs queued actions by
+    priority, through the agent's autonomy constraints and guardrails.
+    Poll GET /actions/{action_id} for the outcome.
+    """
+    try:
+        if not db.get_agent_state(request.agent_id):
+            raise HTTPException(
+                status_code=404, detail=f"Agent {request.agent_id} not registered"
+            )
+
+        action = db.log_action(
+            request.agent_id,
+            request.action.get("type", "unknown"),
+            description=request.action.get("description"),
+            parameters=request.action,
+            priority=request.priority,
+        )
+        logger.info(f"Queued action {action.id} for {request.agent_id}")
 
         return {
             "agent_id": request.agent_id,
-            "status": "success",
-            "result": result,
+            "status": "queued",
+            "action_id": action.id,
             "timestamp": datetime.now().isoformat(),
         }
 
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Failed to queue action: {e}", exc_info=True)
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+@app.get("/actions/stats")
+async def action_stats(hours: Optional[float] = None):
+    """Queue latency and execution percentiles per action type"""
+    try:
+        since = datetime.utcnow() - timedelta(hours=hours) if hours else None
+        return {"action_types": actions.latency_stats(since)}
     except Exception as e:
-        logger.error(f"Execution failed: {e}", exc_info=True)
+        logger.error(f"Failed to get action stats: {e}", exc_info=True)
         raise HTTPException(status_code=500, detail=str(e))
 
 
-@app.post("/orchestrate")
-async def orchestrate():
+@app.get("/actions/{action_id}")
+async def get_action(action_id: int):
+    """Get a queued action's status, timing and result"""
+    action = actions.get(action_id)
+    if not action:
+        raise HTTPException(status_code=404, detail=f"Action {action_id} not found")
+    return action
+
+
+@app.post("/orchestrate", status_code=202)
+async def orchestrate(request: Optional[OrchestrateRequest] = None):
     """
-    Run orchestration cycle.
-    
-    1. Triggers all registered agents to run diagnostics.
-    2. Synthesizes all sub-agent reports.
-    3. Generates priorities.
+    Queue an orchestration cycle for the worker pool.
+
+    The job fans out one diagnosis job per agent (agents whose inputs are
+    unchanged since a recent run are skipped unless forced), then
+    synthesizes all sub-agent reports into priorities once the last
+    diagnosis finishes. Poll GET /jobs/{job_id} for progress and the
+    resulting plan ID (GET /plan for the plan itself), or stream
+    GET /orchestrate/{job_id}/events. Requires at least one
+    `sentinel worker`.
+
+    Only one cycle runs at a time, across all server workers: while one
+    is unfinished, its job ID is returned (status "in_progress") instead
+    of queueing another.
     """
     try:
-        logger.info("Starting orchestration cycle")
-        
-        # 1. Get all agents
-        agents = db.get_all_agents()
-        
-        # 2. Run diagnostics for each agent
-        for agent_info in agents:
-            try:
-                agent = await _get_or_create_agent(
-                    agent_info["agent_id"], 
-                    agent_info["domain"]
-                )
-                bottleneck = await agent.diagnose()
-                db.save_bottleneck(agent_info["agent_id"], bottleneck)
-                logger.info(f"Diagnosed {agent_info['agent_id']}")
-            except Exception as e:
-                logger.error(f"Failed to diagnose {agent_info['agent_id']}: {e}")
-
-        # 3. Collect all agent reports
-        reports = db.get_all_agent_reports()
-        
-        # 4. Synthesize via orchestrator
-        plan = await orchestrator.synthesize(reports)
-        
-        # 5. Store in database
-        db.save_orchestration_result(plan)
-        
-        logger.info(f"Orchestration complete: {plan}")
-        
+        request = request or OrchestrateRequest()
+        job_id, created = queue.enqueue_unique(
+            "orchestrate",
+            {"force": request.force, "force_agents": request.force_agents},
+        )
+        if created:
+            logger.info(f"Queued orchestration job {job_id}")
+        else:
+            logger.info(f"Orchestration job {job_id} already in progress")
+
         return {
-            "status": "success",
-            "plan": plan,
-            "timestamp": datetime.now().isoformat()
+            "status": "queued" if created else "in_progress",
+            "job_id": job_id,
+            "timestamp": datetime.now().isoformat(),
         }
 
     except Exception as e:
-        logger.error(f"Orchestration failed: {e}", exc_info=True)
+        logger.error(f"Failed to queue orchestration: {e}", exc_info=True)
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+@app.get("/orchestrate/{job_id}/events")
+async def orchestration_progress(job_id: int):
+    """
+    Stream an orchestration job's progress as server-sent events.
+
+    Emits a "status" event per stage, an "agent" event as each agent's
+    diagnosis finishes (with its bottleneck), then "complete" with the
+    job result or "failed". Events already past are replayed first.
+    """
+    job = queue.get(job_id)
+    if not job or job["kind"] != "orchestrate":
+        raise HTTPException(
+            status_code=404, detail=f"Orchestration job {job_id} not found"
+        )
+
+    async def stream():
+        event_id = 0
+        async for event in orchestration_events(queue, job_id):
+            if event is not None:
+                event_id += 1
+            yield format_sse(event, event_id if event else None)
+
+    return StreamingResponse(
+        stream(),
+        media_type="text/event-stream",
+        # X-Accel-Buffering stops nginx from holding events back
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+@app.get("/events")
+async def events(kinds: Optional[str] = None):
+    """
+    Stream change events as server-sent events.
+
+    Events are deltas to apply to GET /dashboard/snapshot:
+
+        agent       an agent was registered or ran (last_run)
+        bottleneck  a bottleneck was saved (shaped like a report's)
+        ingest      security findings were ingested, with the new summary
+        plan        an orchestration plan was saved
+        action      an action was queued, started or finished
+        resync      events were missed: re-read the snapshot
+
+    The first event, "ready", carries the current table versions; if they
+    differ from the snapshot's "versions", re-read it. Filter with e.g.
+    ?kinds=bottleneck,plan.
+    """
+    wanted = [kind for kind in kinds.split(",") if kind] if kinds else None
+
+    async def stream():
+        with bus.subscribe(wanted) as subscription:
+            versions = db.get_table_versions(db.VERSIONED_TABLES)
+            yield format_sse({"event": "ready", "data": {"versions": versions}})
+            while True:
+                # None after 15s without events: a keepalive for proxies
+                yield format_sse(await subscription.get(timeout=15))
+
+    return StreamingResponse(
+        stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+@app.get("/stats")
+async def server_stats():
+    """Counters for this server process (coalescing, caching, admission)"""
+    return {
+        "admission": admission.stats(),
+        "dashboard": snapshot.stats(),
+        "diagnose": coalescer.stats(),
+        "events": bus.stats(),
+        "mcp": mcp.stats(),
+        "response_cache": cache.stats(),
+        "timestamp": datetime.now().isoformat(),
+    }
+
+
+@app.get("/jobs/{job_id}")
+async def get_job(job_id: int):
+    """Get a queued job's status, result and child job counts"""
+    job = queue.get(job_id)
+    if not job:
+        raise HTTPException(status_code=404, detail=f"Job {job_id} not found")
+    return job
+
+
+@app.get("/jobs")
+async def job_stats():
+    """Job counts by kind and status"""
+    try:
+        return {"jobs": queue.stats()}
+    except Exception as e:
+        logger.error(f"Failed to get job stats: {e}", exc_info=True)
         raise HTTPException(status_code=500, detail=str(e))
 
 
@@ -240,11 +478,12 @@ async def get_state(request: GetStateRequest):
 
 
 @app.get("/agents")
-async def list_agents():
+async def list_agents(request: Request):
     """List all registered agents"""
     try:
-        agents = db.get_all_agents()
-        return {"agents": agents}
+        return cache.respond(
+            request, ("agents",), lambda: {"agents": db.get_all_agents()}
+        )
 
     except Exception as e:
         logger.error(f"Failed to list agents: {e}", exc_info=True)
@@ -252,73 +491,293 @@ async def list_agents():
 
 
 @app.get("/reports")
-async def get_reports():
+async def get_reports(request: Request):
     """Get latest agent reports including bottlenecks"""
     try:
-        reports = db.get_all_agent_reports()
-        return {"reports": reports}
+        return cache.respond(
+            request,
+            ("agents", "bottlenecks"),
+            lambda: {"reports": db.get_all_agent_reports()},
+        )
 
     except Exception as e:
         logger.error(f"Failed to get reports: {e}", exc_info=True)
         raise HTTPException(status_code=500, detail=str(e))
 
 
+@app.get("/plan")
+async def get_plan(request: Request):
+    """Get the latest orchestration plan"""
+
+    def build():
+        plan = db.get_latest_orchestration_result()
+        if not plan:
+            raise HTTPException(status_code=404, detail="No plan yet")
+        return plan
+
+    try:
+        return cache.respond(request, ("orchestrator_plans",), build)
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Failed to get plan: {e}", exc_info=True)
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+@app.get("/dashboard/snapshot")
+async def dashboard_snapshot(request: Request):
+    """
+    Get every dashboard panel in one response: agents, reports, the
+    latest plan, the security summary and open vulnerabilities.
+
+    All panels are read in one transaction, so they are consistent with
+    each other; "versions" identifies the data they reflect.
+    """
+    try:
+        return snapshot.respond(request)
+    except Exception as e:
+        logger.error(f"Failed to get dashboard snapshot: {e}", exc_info=True)
+        raise HTTPException(status_code=500, detail=str(e))
+
+
 @app.get("/security/summary")
-async def get_security_summary():
+async def get_security_summary(request: Request):
     """Get aggregated security metrics"""
     try:
-        summary = db.get_security_summary()
-        return summary
+        return cache.respond(
+            request, ("security_vulnerabilities",), db.get_security_summary
+        )
     except Exception as e:
         logger.error(f"Failed to get security summary: {e}")
         raise HTTPException(status_code=500, detail=str(e))
 
 
 @app.get("/security/vulnerabilities")
-async def get_security_vulnerabilities(source: Optional[str] = None, severity: Optional[str] = None):
+async def get_security_vulnerabilities(
+    request: Request, source: Optional[str] = None, severity: Optional[str] = None
+):
     """Get list of security findings"""
     try:
-        vulns = db.get_vulnerabilities(source=source, severity=severity)
-        return {"vulnerabilities": vulns}
+        return cache.respond(
+            request,
+            ("security_vulnerabilities",),
+            lambda: {
+                "vulnerabilities": db.get_vulnerabilities(
+                    source=source, severity=severity
+                )
+            },
+        )
     except Exception as e:
         logger.error(f"Failed to get vulnerabilities: {e}")
         raise HTTPException(status_code=500, detail=str(e))
 
 
+# ==================== MCP ====================
+
+# Tools for MCP clients, over stdio (`sentinel mcp`) or POST /mcp. They
+# call the endpoints above in-process, with the same admission limits.
+mcp = MCPServer(
+    "sentinel",
+    app.version,
+    instructions="Diagnose and direct Sentinel's sub-agents, and query "
+    "their state and the aggregated security findings.",
+)
+
+
+@app.post("/mcp")
+async def mcp_endpoint(request: Request):
+    """
+    MCP streamable HTTP transport.
+
+    Takes a JSON-RPC message or batch and answers with JSON (never an
+    event stream; tools report no progress). Notifications get 202.
+    """
+    response = await mcp.handle_bytes(
+        await request.body(), client=admission.client(request.scope)
+    )
+    if response is None:
+        return Response(status_code=202)
+    return Response(response, media_type="application/json")
+
+
+@mcp.tool("diagnose", DiagnoseRequest)
+async def diagnose_tool(args: DiagnoseRequest, client: str):
+    """Run diagnosis for a sub-agent and return the bottleneck it found"""
+    return await _run_tool(lambda: diagnose(args), client, ("POST", "/diagnose"))
+
+
+@mcp.tool("execute", ExecuteRequest)
+async def execute_tool(args: ExecuteRequest, client: str):
+    """Queue an action for a registered sub-agent; returns its action ID"""
+    return await _run_tool(lambda: execute(args), client)
+
+
+@mcp.tool("orchestrate", OrchestrateRequest)
+async def orchestrate_tool(args: OrchestrateRequest, client: str):
+    """
+    Queue an orchestration cycle (or join the one in progress) that
+    diagnoses every agent and synthesizes a plan; see the plan tool
+    """
+    return await _run_tool(lambda: orchestrate(args), client, ("POST", "/orchestrate"))
+
+
+@mcp.tool("plan")
+async def plan_tool(args, client: str):
+    """Get the latest orchestration plan"""
+    plan = db.get_latest_orchestration_result()
+    if not plan:
+        raise ToolError("No plan yet")
+    return plan
+
+
+@mcp.tool("state", GetStateRequest)
+async def state_tool(args: GetStateRequest, client: str):
+    """Get the current state of an agent"""
+    return await _run_tool(lambda: get_state(args), client)
+
+
+@mcp.tool("security_summary")
+async def security_summary_tool(args, client: str):
+    """Get aggregated security metrics by severity and source"""
+    return db.get_security_summary()
+
+
+@mcp.tool("security_vulnerabilities", VulnerabilitiesRequest)
+async def security_vulnerabilities_tool(args: VulnerabilitiesRequest, client: str):
+    """List security findings, optionally by source and severity"""
+    return {
+        "vulnerabilities": db.get_vulnerabilities(
+            source=args.source, severity=args.severity
+        )
+    }
+
+
+async def _run_tool(call, client: str, admit: Optional[tuple] = None):
+    """Run an endpoint for a tool, under its admission limits if any"""
+    try:
+        async with admission.admit(admit, client):
+            return await call()
+    except Rejected as e:
+        raise ToolError(f"Server busy, retry in {max(1, math.ceil(e.retry_after))}s")
+    except HTTPException as e:
+        raise ToolError(e.detail)
+
+
 # ==================== Helpers ====================
 
 
 async def _get_or_create_agent(
     agent_id: str, domain: Optional[str] = None, project: Optional[str] = None
 ) -> SubAgent:
-    """Get agent from registry or create new instance"""
-    from src.agents.github_agent import GitHubTriageAgent
+    """
+    Get a registered agent's instance, or build one for this request.
 
-    if domain == "github-triage":
-        return GitHubTriageAgent(agent_id, domain)
+    Only registered agents are kept, one per agent_id with its registered
+    domain, so arbitrary client-supplied IDs can't grow the registry.
+    Agents are built with the mapping workers, the executor and the CLI
+    use; the project doesn't affect which agent is built.
+    """
+    agent = agents.get(agent_id)
+    if agent is not None:
+        return agent
+
+    state = await asyncio.to_thread(db.get_agent_state, agent_id)
+    if state is None:
+        return build_agent(agent_id, domain)
+    return agents.setdefault(agent_id, build_agent(agent_id, state["domain"]))
+
+
+async def _diagnose_item(
+    index: int,
+    item: DiagnoseRequest,
+    registered: set,
+    fingerprints: Dict[str, Optional[str]],
+) -> Dict[str, Any]:
+    """Diagnose one batch item; failures are reported, not raised"""
+    result = {"index": index, "agent_id": item.agent_id}
+    if item.agent_id not in registered:
+        return {**result, "status": "error", "error": "Agent not registered"}
 
-    if domain == "ai-systems-research":
-        from src.agents.research_agent import ResearchAnalystAgent
+    try:
+        agent = await _get_or_create_agent(item.agent_id, item.domain, item.project)
+        fingerprints[item.agent_id] = agent.input_fingerprint()
+        bottleneck, coalesced = await coalescer.diagnose(agent, persist=False)
+        return {
+            **result,
+            "status": "ok",
+            "bottleneck": bottleneck,
+            "coalesced": coalesced,
+        }
+    except Exception as e:
+        logger.error(f"Batch diagnosis failed for {item.agent_id}: {e}")
+        return {**result, "status": "error", "error": str(e)}
 
-        return ResearchAnalystAgent(agent_id, domain)
 
-    if domain == "security":
-        from src.agents.security_aggregator import SecurityAggregatorAgent
+def _save_batch(
+    results: List[Dict[str, Any]], fingerprints: Dict[str, Optional[str]]
+) -> int:
+    """
+    Store every successful item's bottleneck, and mark its agent's run
+    (so the freshness gate sees it), in one transaction
+    """
+    # Coalesced results were stored by the request that produced them
+    found = [
+        {**r, "input_fingerprint": fingerprints.get(r["agent_id"])}
+        for r in results
+        if r["status"] == "ok" and r.get("bottleneck") and not r.get("coalesced")
+    ]
+    return db.save_bottlenecks(found) if found else 0
 
-        return SecurityAggregatorAgent()
 
-    # In a real implementation, would load agent class dynamically
-    # For now, returns a basic SubAgent
-    agent = SubAgent(agent_id, domain or "default")
-    return agent
+def _batch_summary(results: List[Dict[str, Any]], saved: int) -> Dict[str, Any]:
+    succeeded = sum(1 for r in results if r["status"] == "ok")
+    return {
+        "succeeded": succeeded,
+        "failed": len(results) - succeeded,
+        "saved": saved,
+        "timestamp": datetime.now().isoformat(),
+    }
 
 
 # ==================== Main ====================
 
-if __name__ == "__main__":
-    uvicorn.run(
-        app,
-        host=os.getenv("SERVER_HOST", "127.0.0.1"),
-        port=int(os.getenv("SERVER_PORT", "8000")),
-        log_level=os.getenv("LOG_LEVEL", "info").lower(),
+
+def serve(host: str = None, port: int = None, workers: int = None) -> None:
+    """
+    Run the server, in several worker processes if workers > 1.
+
+    Defaults come from SERVER_HOST, SERVER_PORT and SENTINEL_WORKERS.
+    Workers share one listening socket; each has its own database pool.
+    """
+    host = host or os.getenv("SERVER_HOST", "127.0.0.1")
+    port = port or int(os.getenv("SERVER_PORT", "8000"))
+    workers = workers or int(os.getenv("SENTINEL_WORKERS", "1"))
+    log_level = os.getenv("LOG_LEVEL", "info").lower()
+
+    if workers <= 1:
+        uvicorn.run(app, host=host, port=port, log_level=log_level)
+        return
+
+    from uvicorn.supervisors import Multiprocess
+
+    config = uvicorn.Config(
+        "src.mcp_server.sentinel_server:app",
+        host=host,
+        port=port,
+        log_level=log_level,
+        workers=workers,
     )
+    # uvicorn binds with protocol 0, so asyncio never sets TCP_NODELAY on
+    # the workers' connections and keep-alive responses stall ~40ms on
+    # delayed ACKs. Bind the shared socket as TCP instead.
+    family = socket.AF_INET6 if ":" in host else socket.AF_INET
+    sock = socket.socket(family, socket.SOCK_STREAM, socket.IPPROTO_TCP)
+    sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+    sock.bind((host, port))
+    sock.set_inheritable(True)
+    logger.info(f"Serving on {host}:{port} with {workers} workers")
+    Multiprocess(config, target=uvicorn.Server(config).run, sockets=[sock]).run()
+
+
+if __name__ == "__main__":
+    serve()
@@ -0,0 +1,180 @@
+"""
+Response serialization and compression for the API.
+
+FastJSONResponse encodes with orjson, which serializes datetimes, numpy
+values and nested dicts natively, instead of walking payloads with
+jsonable_encoder and the stdlib encoder. Endpoints with large payloads
+return it directly, which also skips FastAPI's jsonable_encoder pass.
+
+CompressionMiddleware negotiates brotli (when the brotli package is
+installed) or gzip for responses above a size threshold. Streaming
+responses (server-sent events, NDJSON) pass through uncompressed so
+events aren't held back.
+"""
+
+import os
+import gzip
+import logging
+from decimal import Decimal
+from typing import Any, Optional
+
+import orjson
+from fastapi.responses import JSONResponse
+
+try:
+    import brotli
+except ImportError:  # Optional: gzip only
+    brotli = None
+
+logger = logging.getLogger(__name__)
+
+ORJSON_OPTIONS = orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY
+
+DEFAULT_MIN_SIZE = 1024
+GZIP_LEVEL = 6
+BROTLI_QUALITY = 5  # Close to gzip's speed, smaller output
+
+# Content types that are streamed incrementally
+_STREAMING_TYPES = (b"text/event-stream", b"application/x-ndjson")
+
+
+def _default(value: Any) -> Any:
+    """Types orjson doesn't handle natively"""
+    if hasattr(value, "model_dump"):
+        return value.model_dump(mode="json")
+    if isinstance(value, (set, frozenset, tuple)):
+        return list(value)
+    if isinstance(value, Decimal):
+        return float(value)
+    return str(value)
+
+
+def dumps(payload: Any) -> bytes:
+    """Encode a payload as JSON bytes"""
+    return orjson.dumps(payload, default=_default, option=ORJSON_OPTIONS)
+
+
+class FastJSONResponse(JSONResponse):
+    """JSONResponse encoded with orjson"""
+
+    def render(self, content: Any) -> bytes:
+        return dumps(content)
+
+
+def negotiate_encoding(accept_encoding: Optional[str]) -> Optional[str]:
+    """Pick "br" or "gzip" from an Accept-Encoding header (None for identity)"""
+    if not accept_encoding:
+        return None
+    accepted = {}
+    for part in accept_encoding.split(","):
+        name, _, params = part.strip().partition(";")
+        quality = 1.0
+        if params.strip().startswith("q="):
+            try:
+                quality = float(params.strip()[2:])
+            except ValueError:
+                quality = 0.0
+        accepted[name.strip().lower()] = quality
+
+    if brotli is not None and accepted.get("br", 0) > 0:
+        return "br"
+    if accepted.get("gzip", accepted.get("*", 0)) > 0:
+        return "gzip"
+    return None
+
+
+def _weaken(etag: bytes) -> bytes:
+    # The encoded bytes differ from the identity representation
+    return etag if etag.startswith(b"W/") else b"W/" + etag
+
+
+def compress(body: bytes, encoding: str) -> bytes:
+    if encoding == "br":
+        return brotli.compress(body, quality=BROTLI_QUALITY)
+    return gzip.compress(body, compresslevel=GZIP_LEVEL)
+
+
+class CompressionMiddleware:
+    """
+    ASGI middleware compressing responses with brotli or gzip.
+
+    Usage:
+        app.add_middleware(CompressionMiddleware, minimum_size=1024)
+    """
+
+    def __init__(self, app, minimum_size: int = None):
+        self.app = app
+        self.minimum_size = minimum_size or int(
+            os.getenv("SENTINEL_COMPRESS_MIN_BYTES", DEFAULT_MIN_SIZE)
+        )
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        headers = dict(scope.get("headers") or [])
+        encoding = negotiate_encoding(
+            headers.get(b"accept-encoding", b"").decode("latin-1")
+        )
+        if encoding is None:
+            await self.app(scope, receive, send)
+            return
+
+        start = None
+        chunks = []
+        passthrough = False
+
+        async def send_compressed(message):
+            nonlocal start, passthrough
+            if passthrough:
+                await send(message)
+                return
+
+            if message["type"] == "http.response.start":
+                response_headers = dict(message.get("headers") or [])
+                content_type = response_headers.get(b"content-type", b"")
+                if (
+                    message["status"] in (204, 304)
+                    or b"content-encoding" in response_headers
+                    or content_type.startswith(_STREAMING_TYPES)
+                ):
+                    passthrough = True
+                    await send(message)
+                else:
+                    start = message
+                return
+
+            if message["type"] != "http.response.body":
+                await send(message)
+                return
+
+            chunks.append(message.get("body", b""))
+            if message.get("more_body", False):
+                return
+
+            body = b"".join(chunks)
+            response_headers = [
+                (name, value)
+                for name, value in start.get("headers") or []
+                if name not in (b"content-length", b"vary")
+            ]
+            vary = [
+                value for name, value in start.get("headers") or [] if name == b"vary"
+            ]
+            vary_value = b", ".join(vary + [b"Accept-Encoding"])
+
+            if len(body) >= self.minimum_size:
+                body = compress(body, encoding)
+                response_headers = [
+                    (name, _weaken(value) if name == b"etag" else value)
+                    for name, value in response_headers
+                ]
+                response_headers.append((b"content-encoding", encoding.encode()))
+            response_headers.append((b"vary", vary_value))
+            response_headers.append((b"content-length", str(len(body)).encode()))
+
+            await send({**start, "headers": response_headers})
+            await send({"type": "http.response.body", "body": body})
+
+        await self.app(scope, receive, send_compressed)
@@ -0,0 +1,320 @@
+"""
+OpenTelemetry metrics for Sentinel.
+
+A MeterProvider exporting over OTLP to the same collector as the traces
+(SigNoz), and the catalog of instruments Sentinel records: latency
+histograms (agents, Claude calls, database queries, API endpoints),
+counters (tokens, cache outcomes, errors) and queue depth gauges.
+
+Metrics are recorded by name through record_metric() in telemetry.py;
+names missing from INSTRUMENTS only reach the current span. Instruments
+are exported as "sentinel.<name>". Nothing is exported (and the SDK isn't
+imported) until the process calls setup_metrics(), which setup_telemetry()
+does; recording before that is a no-op, so short CLI commands stay light.
+
+Environment:
+    OTEL_SDK_DISABLED: "true" turns metrics (and traces) off
+    OTEL_METRICS_EXPORTER: "otlp" (default), "console" or "none"
+    OTEL_METRIC_EXPORT_INTERVAL: Milliseconds between exports (60000)
+    OTEL_EXPORTER_OTLP_ENDPOINT: Collector address, shared with traces
+"""
+
+import os
+import time
+import logging
+import threading
+from typing import Any, Callable, Dict, Iterable, Optional, Tuple
+
+from opentelemetry import metrics
+
+logger = logging.getLogger(__name__)
+
+# name -> (kind, unit, description); kind is histogram, counter or gauge
+INSTRUMENTS: Dict[str, Tuple[str, str, str]] = {
+    # Latency
+    "agent.duration": ("histogram", "s", "Agent method run time"),
+    "claude.duration": ("histogram", "s", "Claude API call latency"),
+    "db.query.duration": ("histogram", "s", "Database query latency"),
+    "http.server.duration": ("histogram", "s", "API request latency by route"),
+    "worker.job_seconds": ("histogram", "s", "Job handler run time"),
+    "executor.queue_latency_seconds": (
+        "histogram",
+        "s",
+        "Time actions wait in the queue",
+    ),
+    "executor.execution_seconds": ("histogram", "s", "Action execution time"),
+    "scheduler.queue_lag_seconds": (
+        "histogram",
+        "s",
+        "How late scheduled jobs start",
+    ),
+    # Counts
+    "claude.tokens.input": ("counter", "{token}", "Input tokens sent to Claude"),
+    "claude.tokens.output": ("counter", "{token}", "Output tokens from Claude"),
+    "claude.tokens.cache_read": (
+        "counter",
+        "{token}",
+        "Input tokens read from Claude's prompt cache",
+    ),
+    "claude.cost": ("counter", "{USD}", "Claude spend, from the cost ledger"),
+    "cache.response": ("counter", "{request}", "Response cache lookups by outcome"),
+    "diagnose.coalesced": (
+        "counter",
+        "{diagnosis}",
+        "Diagnoses served by another's Claude call",
+    ),
+    "admission.rejected": ("counter", "{request}", "Requests refused with 429"),
+    "leader.elected": ("counter", "{election}", "Times this process became leader"),
+    "errors": ("counter", "{error}", "Failures by component and error type"),
+    # Queue depths
+    "admission.queue_depth": ("gauge", "{request}", "Requests waiting for a slot"),
+    "scheduler.queue_depth": ("gauge", "{job}", "Scheduled jobs overdue"),
+    "jobs.queue_depth": ("gauge", "{job}", "Queued jobs by kind"),
+    "actions.queue_depth": ("gauge", "{action}", "Queued actions"),
+}
+
+# Histogram buckets for the instruments measured in seconds
+LATENCY_BUCKETS = (
+    0.001,
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.1,
+    0.25,
+    0.5,
+    1.0,
+    2.5,
+    5.0,
+    10.0,
+    30.0,
+    60.0,
+    120.0,
+)
+
+_lock = threading.Lock()
+_meter: Optional[metrics.Meter] = None
+# False only when OTEL_SDK_DISABLED turned metrics off; a reader passed
+# to setup_metrics() turns them back on
+_recording = True
+_instruments: Dict[str, Any] = {}
+# Gauge name -> {attributes: last value set}
+_gauge_values: Dict[str, Dict[frozenset, float]] = {}
+# Gauge name -> callbacks returning [(value, attributes), ...]
+_gauge_callbacks: Dict[str, list] = {}
+
+
+def setup_metrics(service_name: str = "sentinel", reader=None) -> metrics.Meter:
+    """
+    Initialize the MeterProvider and its exporter.
+
+    Args:
+        service_name: Name of the service for telemetry
+        reader: Metric reader to use instead of the configured exporter
+            (tests, benchmarks); replaces any earlier setup
+
+    Returns:
+        Meter the catalog's instruments are created on
+    """
+    global _meter, _recording
+
+    with _lock:
+        if reader is not None:
+            _instruments.clear()
+            _gauge_values.clear()
+            _gauge_callbacks.clear()
+        elif _meter is not None:
+            return _meter
+
+        exporter_name = os.getenv("OTEL_METRICS_EXPORTER", "otlp").lower()
+        disabled = os.getenv("OTEL_SDK_DISABLED", "").strip().lower() == "true"
+        _recording = reader is not None or not disabled
+        if reader is None and (disabled or exporter_name == "none"):
+            _meter = metrics.NoOpMeter(__name__)
+            return _meter
+
+        try:
+            # Deferred like the tracing SDK: slow to import
+            from opentelemetry.sdk.metrics import Histogram, MeterProvider
+            from opentelemetry.sdk.metrics.export import (
+                ConsoleMetricExporter,
+                PeriodicExportingMetricReader,
+            )
+            from opentelemetry.sdk.metrics.view import (
+                ExplicitBucketHistogramAggregation,
+                View,
+            )
+            from opentelemetry.sdk.resources import Resource, SERVICE_NAME
+
+            if reader is not None:
+                exporter_name = type(reader).__name__
+            elif exporter_name == "console":
+                reader = PeriodicExportingMetricReader(ConsoleMetricExporter())
+            else:
+                from opentelemetry.exporter.otlp.proto.grpc.metric_exporter import (
+                    OTLPMetricExporter,
+                )
+
+                endpoint = os.getenv(
+                    "OTEL_EXPORTER_OTLP_ENDPOINT", "http://localhost:4317"
+                )
+                reader = PeriodicExportingMetricReader(
+                    OTLPMetricExporter(endpoint=endpoint, insecure=True)
+                )
+
+            provider = MeterProvider(
+                resource=Resource(attributes={SERVICE_NAME: service_name}),
+                metric_readers=[reader],
+                views=[
+                    View(
+                        instrument_type=Histogram,
+                        instrument_unit="s",
+                        aggregation=ExplicitBucketHistogramAggregation(LATENCY_BUCKETS),
+                    )
+                ],
+            )
+            if exporter_name in ("otlp", "console"):
+                metrics.set_meter_provider(provider)
+            _meter = provider.get_meter(__name__)
+            logger.info(f"OpenTelemetry metrics initialized: {exporter_name}")
+
+        except Exception as e:
+            logger.error(f"Failed to initialize metrics: {e}", exc_info=True)
+            _meter = metrics.NoOpMeter(__name__)
+
+        return _meter
+
+
+def record(name: str, value: float, attributes: Dict[str, Any] = None) -> bool:
+    """
+    Record a value on a catalog instrument.
+
+    Histograms record it, counters add it and gauges report it as the
+    current value for these attributes. Returns False for unknown names.
+    """
+    spec = INSTRUMENTS.get(name)
+    if spec is None:
+        return False
+
+    kind = spec[0]
+    if kind == "gauge":
+        _instrument(name)
+        key = frozenset((attributes or {}).items())
+        _gauge_values[name][key] = value
+    elif kind == "histogram":
+        _instrument(name).record(value, attributes)
+    else:
+        _instrument(name).add(value, attributes)
+    return True
+
+
+def record_tokens(usage, attributes: Dict[str, Any] = None) -> None:
+    """Count the tokens in a Claude response's usage block"""
+    record("claude.tokens.input", usage.input_tokens, attributes)
+    record("claude.tokens.output", usage.output_tokens, attributes)
+    cache_read = getattr(usage, "cache_read_input_tokens", None)
+    if cache_read:
+        record("claude.tokens.cache_read", cache_read, attributes)
+
+
+def observe(
+    name: str, callback: Callable[[], Iterable[Tuple[float, Dict[str, Any]]]]
+) -> None:
+    """
+    Report a gauge from callback at each export, e.g. a count read from
+    the database. callback returns [(value, attributes), ...].
+    """
+    _instrument(name)
+    if callback not in _gauge_callbacks[name]:
+        _gauge_callbacks[name].append(callback)
+
+
+def _instrument(name: str):
+    instrument = _instruments.get(name)
+    if instrument is not None:
+        return instrument
+
+    # The API's proxy meter until setup: forwards once a provider is set
+    meter = _meter or metrics.get_meter(__name__)
+    kind, unit, description = INSTRUMENTS[name]
+    with _lock:
+        if name in _instruments:
+            return _instruments[name]
+        full_name = f"sentinel.{name}"
+        if kind == "histogram":
+            instrument = meter.create_histogram(full_name, unit, description)
+        elif kind == "counter":
+            instrument = meter.create_counter(full_name, unit, description)
+        else:
+            _gauge_values[name] = {}
+            _gauge_callbacks[name] = []
+            instrument = meter.create_observable_gauge(
+                full_name, [_gauge_callback(name)], unit, description
+            )
+        _instruments[name] = instrument
+        return instrument
+
+
+def _gauge_callback(name: str):
+    def callback(options):
+        # .get(): a gauge from before setup_metrics(reader=...) replaced it
+        observations = [
+            metrics.Observation(value, dict(key))
+            for key, value in list(_gauge_values.get(name, {}).items())
+        ]
+        for source in _gauge_callbacks.get(name, ()):
+            try:
+                observations.extend(
+                    metrics.Observation(value, attributes)
+                    for value, attributes in source()
+                )
+            except Exception as e:
+                logger.warning(f"Gauge {name} callback failed: {e}")
+        return observations
+
+    return callback
+
+
+class MetricsMiddleware:
+    """ASGI middleware recording http.server.duration per route"""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        status = {"code": 500}
+
+        async def send_with_status(message):
+            if message["type"] == "http.response.start":
+                status["code"] = message["status"]
+            await send(message)
+
+        start = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            record(
+                "http.server.duration",
+                time.perf_counter() - start,
+                {
+                    "http.method": scope["method"],
+                    "http.route": _route(scope),
+                    "http.status_code": status["code"],
+                },
+            )
+
+
+def _route(scope) -> str:
+    # The matched route's template, so IDs in paths don't split series
+    from starlette.routing import Match
+
+    app = scope.get("app")
+    for route in getattr(app, "routes", ()):
+        match, _ = route.matches(scope)
+        if match == Match.FULL:
+            return getattr(route, "path", scope["path"])
+    return "unmatched"
@@ -1,91 +1,157 @@
 """
 OpenTelemetry instrumentation for Sentinel.
-Provides distributed tracing for all agent operations.
+Provides distributed tracing for all agent operations, and records
+metrics (see metrics.py) alongside the spans.
 """
 
 import os
+import time
 import logging
 from typing import Dict, Any, Optional
 from functools import wraps
 
 from opentelemetry import trace
-from opentelemetry.sdk.trace import TracerProvider
-from opentelemetry.sdk.trace.export import BatchSpanProcessor
-from opentelemetry.exporter.otlp.proto.grpc.trace_exporter import OTLPSpanExporter
-from opentelemetry.sdk.resources import Resource, SERVICE_NAME
+
+from src.observability import metrics
 
 logger = logging.getLogger(__name__)
 
 # Global tracer instance
 _tracer: Optional[trace.Tracer] = None
-
-
-def setup_telemetry(service_name: str = "sentinel") -> trace.Tracer:
+# Returned by get_tracer() until setup; forwards once a provider is set
+_proxy_tracer = trace.get_tracer(__name__)
+_provider = None
+# False when spans are off; instrumented methods skip straight to the
+# wrapped call only if metrics are off too (metrics._recording)
+_enabled = True
+
+
+def setup_telemetry(
+    service_name: str = "sentinel",
+    sample_ratio: Optional[float] = None,
+    span_exporter=None,
+) -> trace.Tracer:
     """
     Initialize OpenTelemetry with SigNoz backend.
 
+    Set OTEL_SDK_DISABLED=true (or OTEL_TRACES_EXPORTER=none) to disable
+    telemetry: tracers and meters are no-ops, the SDK isn't imported and
+    no exporter threads start.
+
     Args:
         service_name: Name of the service for telemetry
+        sample_ratio: Fraction of new traces recorded (default
+            OTEL_TRACES_SAMPLER_ARG, else 1.0); spans with a parent follow
+            the parent's decision
+        span_exporter: Exporter to use instead of OTLP (tests,
+            benchmarks); replaces any earlier setup
 
     Returns:
         Configured tracer instance
     """
-    global _tracer
+    global _tracer, _provider, _enabled
 
-    if _tracer is not None:
+    if _tracer is not None and span_exporter is None:
         logger.warning("Telemetry already initialized, returning existing tracer")
         return _tracer
 
+    exporter_name = os.getenv("OTEL_TRACES_EXPORTER", "otlp").lower()
+    if span_exporter is None and (telemetry_disabled() or exporter_name == "none"):
+        _tracer = trace.NoOpTracer()
+        _enabled = False
+        # Without traces, instrumented methods still record their metrics
+        metrics.setup_metrics(service_name)
+        logger.info("OpenTelemetry tracing disabled")
+        return _tracer
+
+    if sample_ratio is None:
+        sample_ratio = float(os.getenv("OTEL_TRACES_SAMPLER_ARG", "1.0"))
+
     try:
+        # Deferred: the SDK and gRPC exporter are slow to import, and only
+        # needed once something records a span
+        from opentelemetry.sdk.trace import TracerProvider
+        from opentelemetry.sdk.trace.export import BatchSpanProcessor
+        from opentelemetry.sdk.trace.sampling import ParentBased, TraceIdRatioBased
+        from opentelemetry.sdk.resources import Resource, SERVICE_NAME
+
         # Configure resource with service name
         resource = Resource(attributes={SERVICE_NAME: service_name})
 
-        # Create tracer provider
-        provider = TracerProvider(resource=resource)
+        # Create tracer provider; unsampled spans are never recorded
+        provider = TracerProvider(
+            resource=resource,
+            sampler=ParentBased(TraceIdRatioBased(sample_ratio)),
+        )
 
         # Get OTLP endpoint from environment or use default
         otlp_endpoint = os.getenv(
             "OTEL_EXPORTER_OTLP_ENDPOINT", "http://localhost:4317"
         )
 
-        # Create OTLP exporter for SigNoz
-        otlp_exporter = OTLPSpanExporter(
-            endpoint=otlp_endpoint, insecure=True  # Use insecure for local development
-        )
+        if span_exporter is None:
+            from opentelemetry.exporter.otlp.proto.grpc.trace_exporter import (
+                OTLPSpanExporter,
+            )
 
-        # Add span processor with batch export
-        provider.add_span_processor(BatchSpanProcessor(otlp_exporter))
+            # Create OTLP exporter for SigNoz
+            span_exporter = OTLPSpanExporter(
+                endpoint=otlp_endpoint,
+                insecure=True,  # Use insecure for local development
+            )
+            # Set as global tracer provider
+            trace.set_tracer_provider(provider)
+            # Metrics go to the same collector
+            metrics.setup_metrics(service_name)
 
-        # Set as global tracer provider
-        trace.set_tracer_provider(provider)
+        # Add span processor with batch export
+        provider.add_span_processor(BatchSpanProcessor(span_exporter))
 
         # Create and cache tracer
-        _tracer = trace.get_tracer(__name__)
+        _provider = provider
+        _tracer = provider.get_tracer(__name__)
+        _enabled = True
 
         logger.info(
-            f"OpenTelemetry initialized: service={service_name}, endpoint={otlp_endpoint}"
+            f"OpenTelemetry initialized: service={service_name}, "
+            f"endpoint={otlp_endpoint}, sample_ratio={sample_ratio}"
         )
 
         return _tracer
 
     except Exception as e:
         logger.error(f"Failed to initialize telemetry: {e}", exc_info=True)
-        # Return no-op tracer if setup fails
-        return trace.get_tracer(__name__)
+        # Use a no-op tracer if setup fails; metrics are still recorded
+        _tracer = trace.NoOpTracer()
+        _enabled = False
+        metrics.setup_metrics(service_name)
+        return _tracer
+
+
+def telemetry_disabled() -> bool:
+    """Whether OTEL_SDK_DISABLED turns telemetry off"""
+    return os.getenv("OTEL_SDK_DISABLED", "").strip().lower() == "true"
+
+
+def flush_telemetry(timeout_millis: int = 5000) -> None:
+    """Export spans still buffered (e.g. before a short command exits)"""
+    if _provider is not None:
+        _provider.force_flush(timeout_millis)
 
 
 def get_tracer() -> trace.Tracer:
     """
     Get the global tracer instance.
-    Initializes telemetry if not already done.
+
+    Before setup_telemetry() this is the API's proxy tracer: its spans
+    are no-ops until a tracer provider is set, and no exporters start in
+    processes (tests, short commands) that never ask for telemetry.
 
     Returns:
         Configured tracer instance
     """
-    global _tracer
-
     if _tracer is None:
-        return setup_telemetry()
+        return _proxy_tracer
 
     return _tracer
 
@@ -107,11 +173,19 @@ def instrument_agent_method(method_name: str):
         @wraps(func)
         async def wrapper(self, *args, **kwargs):
             tracer = get_tracer()
+            if not _enabled and not metrics._recording:
+                return await func(self, *args, **kwargs)
+
+            attributes = {
+                "agent.type": getattr(self, "agent_type", "unknown"),
+                "agent.method": method_name,
+            }
+            start = time.perf_counter()
 
             with tracer.start_as_current_span(method_name) as span:
                 # Add agent context attributes
                 span.set_attribute("agent.id", getattr(self, "agent_id", "unknown"))
-                span.set_attribute("agent.type", getattr(self, "agent_type", "unknown"))
+                span.set_attribute("agent.type", attributes["agent.type"])
                 span.set_attribute("agent.domain", getattr(self, "domain", "unknown"))
 
                 try:
@@ -140,8 +214,16 @@ def instrument_agent_method(method_name: str):
                     span.set_attribute("success", False)
                     span.set_attribute("error.type", type(e).__name__)
                     span.set_attribute("error.message", str(e))
+                    attributes["error.type"] = type(e).__name__
+                    metrics.record("errors", 1, {"component": "agent", **attributes})
                     raise
 
+                finally:
+                    attributes["success"] = "error.type" not in attributes
+                    metrics.record(
+                        "agent.duration", time.perf_counter() - start, attributes
+                    )
+
         return wrapper
 
     return decorator
@@ -151,6 +233,9 @@ def instrument_claude_call(func):
     """
     Decorator specifically for Claude API calls to track token usage and latency.
 
+    Its span is the only one per call: the wrapped method adds the model
+    and token counts to it (trace.get_current_span()).
+
     Usage:
         @instrument_claude_call
         async def call_claude(self, system_prompt: str, user_message: str) -> str:
@@ -160,10 +245,16 @@ def instrument_claude_call(func):
     @wraps(func)
     async def wrapper(self, *args, **kwargs):
         tracer = get_tracer()
+        if not _enabled and not metrics._recording:
+            return await func(self, *args, **kwargs)
+
+        attributes = {"agent.type": getattr(self, "agent_type", "unknown")}
+        start = time.perf_counter()
 
         with tracer.start_as_current_span("claude.api.call") as span:
             # Add agent context
             span.set_attribute("agent.id", getattr(self, "agent_id", "unknown"))
+            span.set_attribute("agent.type", attributes["agent.type"])
 
             # Add prompt metadata
             system_prompt = kwargs.get(
@@ -183,8 +274,17 @@ def instrument_claude_call(func):
                 span.record_exception(e)
                 span.set_attribute("success", False)
                 span.set_attribute("error.type", type(e).__name__)
+                span.set_attribute("error.message", str(e))
+                attributes["error.type"] = type(e).__name__
+                metrics.record("errors", 1, {"component": "claude", **attributes})
                 raise
 
+            finally:
+                attributes["success"] = "error.type" not in attributes
+                metrics.record(
+                    "claude.duration", time.perf_counter() - start, attributes
+                )
+
     return wrapper
 
 
@@ -206,13 +306,16 @@ def record_metric(
     name: str, value: float, attributes: Optional[Dict[str, Any]] = None
 ) -> None:
     """
-    Record a custom metric in the current span.
+    Record a custom metric in the current span, and on its instrument if
+    metrics.INSTRUMENTS has one.
 
     Args:
         name: Metric name
         value: Metric value
         attributes: Optional attributes to add to the metric
     """
+    metrics.record(name, value, attributes)
+
     current_span = trace.get_current_span()
 
     if current_span.is_recording():
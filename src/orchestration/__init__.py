@@ -0,0 +1 @@
+"""Orchestration runtime for Sentinel."""
@@ -0,0 +1,265 @@
+"""
+Message Batches execution mode for scheduled diagnosis cycles.
+
+Collects every agent's diagnosis request into a single asynchronous
+message batch, polls until the batch has ended and fans the results back
+out to the agents. The batch ID is checkpointed to disk so an interrupted
+cycle resumes the same batch instead of paying for a new one.
+"""
+
+import os
+import re
+import json
+import asyncio
+import logging
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Any, List, Optional
+
+from src.agents.base_agent import DEFAULT_CLAUDE_MODEL
+from src.agents.sub_agent import SubAgent
+from src.observability import metrics
+from src.storage.cost_ledger import get_ledger
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CHECKPOINT_PATH = ".sentinel/batch_checkpoint.json"
+
+# custom_id must match ^[a-zA-Z0-9_-]{1,64}$
+_CUSTOM_ID_INVALID = re.compile(r"[^a-zA-Z0-9_-]")
+
+
+class BatchCheckpoint:
+    """JSON checkpoint of the in-flight batch"""
+
+    def __init__(self, path: Optional[str] = None):
+        self.path = Path(
+            path or os.getenv("SENTINEL_BATCH_CHECKPOINT", DEFAULT_CHECKPOINT_PATH)
+        )
+
+    def load(self) -> Optional[Dict[str, Any]]:
+        """Load the checkpoint, or None if no batch is in flight"""
+        if not self.path.exists():
+            return None
+        try:
+            with open(self.path, "r") as f:
+                return json.load(f)
+        except (OSError, json.JSONDecodeError) as e:
+            logger.error(f"Ignoring unreadable batch checkpoint {self.path}: {e}")
+            return None
+
+    def save(self, state: Dict[str, Any]) -> None:
+        """Atomically write the checkpoint"""
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.path.with_suffix(".tmp")
+        with open(tmp_path, "w") as f:
+            json.dump(state, f, indent=2)
+        os.replace(tmp_path, self.path)
+
+    def clear(self) -> None:
+        """Remove the checkpoint once results have been fanned out"""
+        if self.path.exists():
+            self.path.unlink()
+
+
+class BatchDiagnosisRunner:
+    """
+    Runs agent diagnoses through the Message Batches API.
+
+    Usage:
+        runner = BatchDiagnosisRunner(anthropic.Anthropic())
+        results = await runner.run(agents)
+    """
+
+    def __init__(
+        self,
+        client,
+        checkpoint: Optional[BatchCheckpoint] = None,
+        model: str = DEFAULT_CLAUDE_MODEL,
+        poll_interval: float = 60.0,
+        timeout: float = 24 * 3600,
+    ):
+        self.client = client
+        self.checkpoint = checkpoint or BatchCheckpoint()
+        self.model = model
+        self.poll_interval = poll_interval
+        self.timeout = timeout
+
+    def pending(self) -> Optional[Dict[str, Any]]:
+        """Return the checkpointed batch left by an interrupted run, if any"""
+        return self.checkpoint.load()
+
+    def submit(
+        self, agents: List[SubAgent], context: Optional[Dict[str, Any]] = None
+    ) -> Dict[str, Any]:
+        """
+        Submit one batch covering every agent's diagnosis request.
+
+        Args:
+            agents: Agents whose build_diagnosis_request() is not None
+            context: Extra data persisted with the checkpoint (e.g. cycle mode)
+
+        Returns:
+            Checkpoint state for the submitted batch
+        """
+        requests = []
+        entries = {}
+        for index, agent in enumerate(agents):
+            request = agent.build_diagnosis_request()
+            if request is None:
+                raise ValueError(
+                    f"Agent {agent.agent_id} does not support batch diagnosis"
+                )
+
+            custom_id = self._custom_id(index, agent.agent_id)
+            entries[custom_id] = {"agent_id": agent.agent_id, "domain": agent.domain}
+            requests.append(
+                {
+                    "custom_id": custom_id,
+                    "params": {
+                        "model": self.model,
+                        "max_tokens": request.get("max_tokens", 2000),
+                        "system": request["system_prompt"],
+                        "messages": [
+                            {"role": "user", "content": request["user_message"]}
+                        ],
+                    },
+                }
+            )
+
+        batch = self.client.messages.batches.create(requests=requests)
+
+        state = {
+            "batch_id": batch.id,
+            "submitted_at": datetime.now().isoformat(),
+            "requests": entries,
+            "context": context or {},
+        }
+        self.checkpoint.save(state)
+
+        logger.info(f"Submitted batch {batch.id} with {len(requests)} request(s)")
+        return state
+
+    async def wait(self, batch_id: str) -> None:
+        """
+        Poll until the batch has ended.
+
+        Raises:
+            TimeoutError: If the batch does not end within the timeout
+        """
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + self.timeout
+
+        while True:
+            batch = self.client.messages.batches.retrieve(batch_id)
+            if batch.processing_status == "ended":
+                logger.info(f"Batch {batch_id} ended: {batch.request_counts}")
+                return
+
+            if loop.time() >= deadline:
+                raise TimeoutError(f"Batch {batch_id} did not end in {self.timeout}s")
+
+            logger.debug(
+                f"Batch {batch_id} {batch.processing_status}, "
+                f"polling again in {self.poll_interval}s"
+            )
+            await asyncio.sleep(self.poll_interval)
+
+    async def collect(
+        self, state: Dict[str, Any], agents: Dict[str, SubAgent]
+    ) -> Dict[str, Dict[str, Any]]:
+        """
+        Parse batch results back through each agent.
+
+        Args:
+            state: Checkpoint state returned by submit()
+            agents: Agents keyed by agent_id
+
+        Returns:
+            {agent_id: {"status": "success", "bottleneck": {...}}
+                    or {"status": "error", "error": str}}
+        """
+        results: Dict[str, Dict[str, Any]] = {}
+        entries = state["requests"]
+
+        for item in self.client.messages.batches.results(state["batch_id"]):
+            entry = entries.get(item.custom_id)
+            if entry is None:
+                logger.warning(f"Ignoring unknown batch result {item.custom_id}")
+                continue
+
+            agent_id = entry["agent_id"]
+            agent = agents.get(agent_id)
+            if agent is None:
+                results[agent_id] = {"status": "error", "error": "Agent not found"}
+                continue
+
+            if item.result.type != "succeeded":
+                error = getattr(item.result, "error", None)
+                results[agent_id] = {
+                    "status": "error",
+                    "error": f"Batch request {item.result.type}: {error}",
+                }
+                continue
+
+            message = item.result.message
+            metrics.record_tokens(
+                message.usage,
+                {"agent.type": agent.agent_type, "model": message.model, "batch": True},
+            )
+            ledger = get_ledger()
+            if ledger is not None:
+                ledger.record(
+                    agent_id,
+                    message.model,
+                    message.usage,
+                    domain=agent.domain,
+                    batch=True,
+                )
+            response_text = message.content[0].text
+            bottleneck = await agent.parse_diagnosis(response_text)
+            agent.bottleneck = bottleneck
+            agent.last_diagnosis = datetime.now().isoformat()
+            agent.metrics["diagnoses_run"] += 1
+            results[agent_id] = {"status": "success", "bottleneck": bottleneck}
+
+        for entry in entries.values():
+            results.setdefault(
+                entry["agent_id"], {"status": "error", "error": "No batch result"}
+            )
+
+        return results
+
+    async def run(
+        self,
+        agents: List[SubAgent],
+        context: Optional[Dict[str, Any]] = None,
+        keep_checkpoint: bool = False,
+    ) -> Dict[str, Dict[str, Any]]:
+        """
+        Submit (or resume) a batch, wait for it and collect the results.
+
+        The checkpoint is cleared only after results have been collected,
+        so a restart at any earlier point resumes the same batch. With
+        keep_checkpoint, it stays until complete() is called, e.g. once
+        the results are stored.
+        """
+        state = self.pending()
+        if state:
+            logger.info(f"Resuming batch {state['batch_id']} from checkpoint")
+        else:
+            state = self.submit(agents, context)
+
+        await self.wait(state["batch_id"])
+        results = await self.collect(state, {a.agent_id: a for a in agents})
+        if not keep_checkpoint:
+            self.complete()
+        return results
+
+    def complete(self) -> None:
+        """Forget the finished batch, so the next run submits a new one"""
+        self.checkpoint.clear()
+
+    @staticmethod
+    def _custom_id(index: int, agent_id: str) -> str:
+        return f"{index:04d}-{_CUSTOM_ID_INVALID.sub('_', agent_id)}"[:64]
@@ -0,0 +1,217 @@
+"""
+Deterministic cross-domain conflict detection.
+
+Builds an inverted index from normalized blocking items and the
+resources named in recommended actions to the reports that reference
+them. Any key referenced from two or more domains is a conflict: those
+domains are blocked on, or competing for, the same thing. Indexing and
+detection are linear in the total number of referenced items.
+"""
+
+import re
+from collections import defaultdict
+from typing import Dict, Any, Iterable, List, Optional, Set
+
+_NON_ALNUM = re.compile(r"[^a-z0-9]+")
+
+# Leading words that don't change what an item refers to
+_LEADING_STOPWORDS = frozenset({"a", "an", "the", "our", "all", "any"})
+
+# Shared resources recommended actions commonly compete for, matched as
+# whole normalized phrases; extend with ConflictDetector(resource_terms=...)
+RESOURCE_TERMS = frozenset(
+    {
+        "staging",
+        "staging cluster",
+        "staging environment",
+        "production",
+        "production cluster",
+        "production database",
+        "ci pipeline",
+        "build server",
+        "gpu cluster",
+        "release branch",
+        "main branch",
+        "on call rotation",
+        "legal review",
+        "design review",
+    }
+)
+
+# Quoted or backticked names: "staging cluster", `sentinel-db`
+_QUOTED = re.compile(r"`([^`]+)`|\"([^\"]+)\"")
+
+# Paths, repos, URLs and hostnames: src/app.py, nctroy/sentinel, api.example.com
+_LOCATOR = re.compile(r"\b[\w-]+(?:[./:][\w-]+)*(?:/[\w-]+|\.[a-z]{2,})\b")
+
+# Slashed words that aren't paths
+_NOT_LOCATORS = frozenset({"and/or", "either/or", "read/write", "n/a", "w/o"})
+
+_SENTENCE_END = re.compile(r"[.!?;:]\s+")
+
+
+def normalize_item(item: Any) -> str:
+    """Normalize a blocking item or resource name for indexing"""
+    words = _NON_ALNUM.sub(" ", str(item).lower()).split()
+    while words and words[0] in _LEADING_STOPWORDS:
+        words = words[1:]
+    return " ".join(words)
+
+
+def action_resources(
+    action: Optional[str], resource_terms: Iterable[str] = RESOURCE_TERMS
+) -> Set[str]:
+    """
+    Extract the resources a recommended action names explicitly.
+
+    Quoted names, paths/repos/URLs, capitalized names (other than a
+    sentence's first word) and phrases from resource_terms count. Plain
+    words ("review", "update", "data") don't, so actions that merely
+    share a verb don't conflict.
+    """
+    if not action:
+        return set()
+
+    resources = {
+        normalize_item(next(group for group in match.groups() if group))
+        for match in _QUOTED.finditer(action)
+    }
+    resources.update(
+        locator
+        for locator in (m.group(0).lower() for m in _LOCATOR.finditer(action))
+        if locator not in _NOT_LOCATORS
+    )
+
+    for sentence in _SENTENCE_END.split(action):
+        run: List[str] = []
+        # The first word is capitalized anyway; "" ends the last run
+        for word in sentence.split()[1:] + [""]:
+            if word[:1].isupper():
+                run.append(word)
+            elif run:
+                resources.add(normalize_item(" ".join(run)))
+                run = []
+
+    words = f" {normalize_item(action)} "
+    terms = [term for term in resource_terms if f" {term} " in words]
+    # "staging cluster", not also "staging"
+    resources.update(
+        term
+        for term in terms
+        if not any(term != other and f" {term} " in f" {other} " for other in terms)
+    )
+    resources.discard("")
+    return resources
+
+
+def _score(report: Dict[str, Any]) -> float:
+    return report.get("impact_score", 0) * report.get("confidence", 0.5)
+
+
+class ConflictDetector:
+    """
+    Finds cross-domain collisions over shared blockers and resources.
+
+    Usage:
+        conflicts = ConflictDetector().detect(ranked_reports)
+    """
+
+    def __init__(
+        self,
+        include_action_resources: bool = True,
+        resource_terms: Iterable[str] = RESOURCE_TERMS,
+    ):
+        self.include_action_resources = include_action_resources
+        self.resource_terms = frozenset(normalize_item(t) for t in resource_terms)
+
+    def build_index(self, reports: List[Dict[str, Any]]) -> Dict[tuple, List[int]]:
+        """
+        Map (kind, key) to the indexes of reports that reference it.
+
+        kind is "shared_blocker" for blocking items and "shared_resource"
+        for explicit resources and those recommended actions name (see
+        action_resources).
+        """
+        index: Dict[tuple, List[int]] = defaultdict(list)
+        for position, report in enumerate(reports):
+            keys = set()
+            for item in report.get("blocking") or []:
+                key = normalize_item(item)
+                if key:
+                    keys.add(("shared_blocker", key))
+
+            resources: Iterable[str] = report.get("resources") or []
+            for item in resources:
+                key = normalize_item(item)
+                if key:
+                    keys.add(("shared_resource", key))
+
+            if self.include_action_resources:
+                action = report.get("recommended_action")
+                for key in action_resources(action, self.resource_terms):
+                    keys.add(("shared_resource", key))
+
+            for key in keys:
+                index[key].append(position)
+        return index
+
+    def detect(
+        self, reports: List[Dict[str, Any]], limit: Optional[int] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        Detect conflicts between reports from different domains.
+
+        Args:
+            reports: Flat reports, ideally ranked by impact (earlier first)
+            limit: Maximum number of conflicts to return
+
+        Returns:
+            Conflicts sorted by the combined priority of involved reports:
+            [{"description", "affected_domains", "agents", "resource",
+              "type", "resolution_strategy", "severity"}]
+        """
+        conflicts = []
+        for (kind, key), positions in self.build_index(reports).items():
+            if len(positions) < 2:
+                continue
+
+            domains = {reports[p].get("domain") or "unknown" for p in positions}
+            if len(domains) < 2:
+                continue
+
+            involved = sorted(positions, key=lambda p: -_score(reports[p]))
+            agents = [reports[p].get("agent_id", f"#{p}") for p in involved]
+            conflicts.append(
+                {
+                    "description": self._describe(kind, key, len(involved), domains),
+                    "affected_domains": sorted(domains),
+                    "agents": agents,
+                    "resource": key,
+                    "type": kind,
+                    "resolution_strategy": self._resolution(kind, key, agents),
+                    "severity": round(sum(_score(reports[p]) for p in involved), 2),
+                }
+            )
+
+        conflicts.sort(key=lambda c: (-c["severity"], c["resource"]))
+        return conflicts[:limit] if limit else conflicts
+
+    @staticmethod
+    def _describe(kind: str, key: str, count: int, domains: Set[str]) -> str:
+        domain_list = ", ".join(sorted(domains))
+        if kind == "shared_blocker":
+            return f"{count} bottlenecks across {domain_list} all block '{key}'"
+        return f"{count} recommended actions across {domain_list} compete for '{key}'"
+
+    @staticmethod
+    def _resolution(kind: str, key: str, agents: List[str]) -> str:
+        rest = ", ".join(agents[1:4]) + (" and others" if len(agents) > 4 else "")
+        if kind == "shared_blocker":
+            return (
+                f"Unblock '{key}' as a single coordinated effort led by "
+                f"{agents[0]} (highest priority), including {rest}"
+            )
+        return (
+            f"Sequence work on '{key}': {agents[0]} first (highest priority), "
+            f"then {rest}"
+        )
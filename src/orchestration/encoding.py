@@ -0,0 +1,180 @@
+"""
+Token-budgeted prompt encoding for bottleneck reports.
+
+Reports are serialized as a pipe-delimited table with the field names
+listed once in a header row, instead of pretty-printed JSON that repeats
+every key and indents every line. When the table does not fit the token
+budget, low-ranked reports lose their optional fields first and are then
+omitted, so callers should pass reports already ranked by impact.
+"""
+
+import re
+from dataclasses import dataclass
+from typing import Dict, Any, List, Optional, Sequence
+
+# Fields in output order. Optional fields are blanked on low-ranked reports
+# before any report is omitted.
+DEFAULT_FIELDS = (
+    "agent_id",
+    "domain",
+    "impact_score",
+    "confidence",
+    "description",
+    "blocking",
+    "recommended_action",
+    "reasoning",
+)
+OPTIONAL_FIELDS = ("recommended_action", "blocking", "reasoning")
+
+_WORDS = re.compile(r"[A-Za-z]+")
+_NUMBERS = re.compile(r"\d+")
+_SYMBOLS = re.compile(r"[^\w\s]|_")
+_INDENTS = re.compile(r"\n[^\S\n]+|[^\S\n]{2,}")
+
+
+def count_tokens(text: str) -> int:
+    """
+    Approximate the number of model tokens in text, locally.
+
+    Words are costed at about four characters per token, numbers at three
+    digits per token, and punctuation and newlines at one token each.
+    Single spaces are free (they merge into the next word) but each run
+    of indentation costs one token.
+    """
+    return (
+        sum((len(w) + 3) // 4 for w in _WORDS.findall(text))
+        + sum((len(n) + 2) // 3 for n in _NUMBERS.findall(text))
+        + len(_SYMBOLS.findall(text))
+        + text.count("\n")
+        + len(_INDENTS.findall(text))
+    )
+
+
+def _cell(value: Any) -> str:
+    """Render one table cell"""
+    if value is None:
+        return ""
+    if isinstance(value, float):
+        return f"{value:g}"
+    if isinstance(value, (list, tuple)):
+        return ";".join(_cell(v) for v in value)
+    if isinstance(value, dict):
+        return ";".join(f"{k}={_cell(v)}" for k, v in value.items())
+    return " ".join(str(value).replace("|", "/").split())
+
+
+def encode_table(reports: Sequence[Dict[str, Any]], fields: Sequence[str]) -> str:
+    """Serialize reports as a header row plus one pipe-delimited row each"""
+    lines = ["|".join(fields)]
+    for report in reports:
+        lines.append("|".join(_cell(report.get(f)) for f in fields))
+    return "\n".join(lines)
+
+
+@dataclass
+class EncodedReports:
+    """Result of encoding a report set under a budget"""
+
+    text: str
+    tokens: int
+    fields: List[str]
+    included: int
+    omitted: int
+    trimmed: int = 0
+
+    @property
+    def complete(self) -> bool:
+        """True if every report was included"""
+        return self.omitted == 0
+
+
+class PromptEncoder:
+    """
+    Encodes ranked reports into a compact table that fits a token budget.
+
+    Lowest-ranked reports lose their optional fields first; if that is not
+    enough, they are omitted altogether.
+
+    Usage:
+        encoder = PromptEncoder(token_budget=8000)
+        encoded = encoder.encode(ranked_reports)
+    """
+
+    def __init__(
+        self,
+        token_budget: int,
+        fields: Sequence[str] = DEFAULT_FIELDS,
+        optional_fields: Sequence[str] = OPTIONAL_FIELDS,
+    ):
+        self.token_budget = token_budget
+        self.fields = list(fields)
+        self.optional_fields = set(optional_fields)
+
+    def encode(
+        self, ranked_reports: Sequence[Dict[str, Any]], budget: Optional[int] = None
+    ) -> EncodedReports:
+        """
+        Encode reports, trimming fields and then reports to fit the budget.
+
+        Args:
+            ranked_reports: Reports sorted from highest to lowest priority
+            budget: Override the encoder's token budget
+
+        Returns:
+            EncodedReports describing what was included
+        """
+        budget = budget or self.token_budget
+        fields = [f for f in self.fields if any(f in r for r in ranked_reports)]
+        core = [f for f in fields if f not in self.optional_fields]
+
+        rows = [[_cell(r.get(f)) for f in fields] for r in ranked_reports]
+
+        # Fast path: everything fits untrimmed
+        text = "\n".join(["|".join(fields)] + ["|".join(row) for row in rows])
+        tokens = count_tokens(text)
+        if tokens <= budget:
+            return EncodedReports(text, tokens, fields, len(rows), 0)
+
+        trimmed_rows = [
+            [
+                cell if f not in self.optional_fields else ""
+                for f, cell in zip(fields, row)
+            ]
+            for row in rows
+        ]
+        full_costs = [count_tokens("|".join(row)) + 1 for row in rows]
+        trimmed_costs = [count_tokens("|".join(row)) + 1 for row in trimmed_rows]
+
+        total = count_tokens("|".join(fields)) + sum(full_costs)
+
+        # 1. Trim optional fields from the lowest-ranked reports upwards
+        trim_from = len(rows)
+        while total > budget and trim_from > 0:
+            trim_from -= 1
+            total -= full_costs[trim_from] - trimmed_costs[trim_from]
+
+        # 2. Omit the lowest-ranked reports
+        included = len(rows)
+        while total > budget and included > 0:
+            included -= 1
+            total -= trimmed_costs[included]
+
+        if trim_from == 0:
+            # Every row is trimmed; drop the optional columns entirely
+            text = encode_table(ranked_reports[:included], core)
+            fields = core
+        else:
+            lines = ["|".join(fields)]
+            for index in range(included):
+                row = rows[index] if index < trim_from else trimmed_rows[index]
+                lines.append("|".join(row))
+            text = "\n".join(lines)
+
+        return EncodedReports(
+            text=text,
+            tokens=count_tokens(text),
+            fields=fields,
+            included=included,
+            omitted=len(rows) - included,
+            trimmed=max(0, included - trim_from),
+        )
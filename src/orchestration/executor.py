@@ -0,0 +1,221 @@
+"""
+Action executor: consumes the actions table.
+
+Queued actions are claimed in priority order and run through
+SubAgent.execute (which applies the agent's guardrails), with a global
+concurrency limit and a per-agent limit so one agent's backlog can't
+monopolize the executor or hammer a single external system. Timing and
+results are buffered and written back in batches.
+"""
+
+import asyncio
+import logging
+from collections import deque
+from datetime import datetime
+from typing import Callable, Deque, Dict, Any, List, Optional, Set
+
+from src.observability.telemetry import get_tracer, record_metric
+from src.storage.action_queue import TimingRow, latency_summary
+
+logger = logging.getLogger(__name__)
+
+# (agent_id, domain) -> SubAgent
+AgentFactory = Callable[[str, str], Any]
+
+# Result statuses reported by SubAgent.execute that aren't successes
+_UNSUCCESSFUL = ("blocked", "failed", "error")
+
+# Recent timings kept in memory for the percentile summary
+TIMING_HISTORY = 10000
+
+
+class ActionExecutor:
+    """
+    Runs queued actions with global and per-agent concurrency limits.
+
+    Usage:
+        executor = ActionExecutor(ActionQueue(db), build_agent, concurrency=8)
+        await executor.run(stop_event)
+        print(executor.latency_summary())
+    """
+
+    def __init__(
+        self,
+        actions,
+        agent_factory: AgentFactory,
+        concurrency: int = 8,
+        per_agent_limit: int = 2,
+        batch_size: int = 20,
+        flush_interval: float = 1.0,
+        poll_interval: float = 1.0,
+    ):
+        """
+        Args:
+            actions: ActionQueue
+            agent_factory: Builds a SubAgent from agent_id and domain
+            concurrency: Actions run at the same time
+            per_agent_limit: Actions run at the same time for one agent
+            batch_size: Finished actions buffered before writing them back
+            flush_interval: Most seconds a finished action stays buffered
+            poll_interval: Seconds to wait when nothing is claimable
+        """
+        self.actions = actions
+        self.agent_factory = agent_factory
+        self.concurrency = concurrency
+        self.per_agent_limit = per_agent_limit
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.poll_interval = poll_interval
+
+        self.completed = 0
+        self.failed = 0
+        self.timings: Deque[TimingRow] = deque(maxlen=TIMING_HISTORY)
+        self._agents: Dict[str, Any] = {}
+        self._running: Dict[str, int] = {}
+        self._tasks: Set[asyncio.Task] = set()
+        self._pending: List[Dict[str, Any]] = []
+        self._wake = asyncio.Event()
+
+    async def run(self, stop: asyncio.Event = None) -> None:
+        """Run until stop is set; in-flight actions finish and are recorded"""
+        stop = stop or asyncio.Event()
+        flusher = asyncio.create_task(self._flush_periodically(stop))
+        try:
+            while not stop.is_set():
+                self._wake.clear()
+                if not await self.dispatch():
+                    await self._wait(stop)
+        finally:
+            if self._tasks:
+                await asyncio.gather(*self._tasks, return_exceptions=True)
+            flusher.cancel()
+            await self.flush()
+
+    async def run_until_empty(self) -> int:
+        """Run actions until none are queued; returns the number finished"""
+        before = self.completed + self.failed
+        while await self.dispatch() or self._tasks:
+            if self._tasks:
+                await asyncio.wait(self._tasks, return_when=asyncio.FIRST_COMPLETED)
+        await self.flush()
+        return self.completed + self.failed - before
+
+    async def dispatch(self) -> int:
+        """Claim actions for free slots and start them; returns the number started"""
+        free = self.concurrency - len(self._tasks)
+        if free <= 0:
+            return 0
+        claimed = await asyncio.to_thread(
+            self.actions.claim, free, dict(self._running), self.per_agent_limit
+        )
+        for action in claimed:
+            agent_id = action["agent_id"]
+            self._running[agent_id] = self._running.get(agent_id, 0) + 1
+            task = asyncio.create_task(self._execute(action))
+            self._tasks.add(task)
+            task.add_done_callback(self._finished)
+        return len(claimed)
+
+    def _finished(self, task: asyncio.Task) -> None:
+        self._tasks.discard(task)
+        self._wake.set()
+
+    async def _wait(self, stop: asyncio.Event) -> None:
+        """Sleep until stop, a slot frees up, or the poll interval passes"""
+        waiters = [
+            asyncio.create_task(stop.wait()),
+            asyncio.create_task(self._wake.wait()),
+        ]
+        try:
+            await asyncio.wait(
+                waiters,
+                timeout=self.poll_interval,
+                return_when=asyncio.FIRST_COMPLETED,
+            )
+        finally:
+            for waiter in waiters:
+                waiter.cancel()
+
+    def _agent(self, agent_id: str, domain: Optional[str]):
+        # Reuse agents so their metrics accumulate across actions
+        if agent_id not in self._agents:
+            self._agents[agent_id] = self.agent_factory(agent_id, domain or "default")
+        return self._agents[agent_id]
+
+    async def _execute(self, action: Dict[str, Any]) -> None:
+        agent_id = action["agent_id"]
+        action_type = action["action_type"]
+        queued_at = datetime.fromisoformat(action["queued_at"])
+        started_at = datetime.fromisoformat(action["started_at"])
+
+        with get_tracer().start_as_current_span("executor.action") as span:
+            span.set_attribute("action.id", action["id"])
+            span.set_attribute("action.type", action_type)
+            span.set_attribute("agent.id", agent_id)
+
+            outcome: Dict[str, Any] = {"id": action["id"]}
+            try:
+                agent = self._agent(agent_id, action.get("domain"))
+                params = {"type": action_type, **action["parameters"]}
+                result = await agent.execute(params)
+                outcome["result"] = result
+                if (result or {}).get("status") in _UNSUCCESSFUL:
+                    outcome["status"] = "failed"
+                    # Agents explain failures as reason, error or message
+                    outcome["error"] = (
+                        result.get("reason")
+                        or result.get("error")
+                        or result.get("message")
+                    )
+                else:
+                    outcome["status"] = "completed"
+                    outcome["error"] = None
+            except Exception as e:
+                span.set_attribute("error", True)
+                logger.error(f"Action {action['id']} ({action_type}) failed: {e}")
+                outcome["status"] = "failed"
+                outcome["error"] = f"{type(e).__name__}: {e}"
+            finally:
+                self._running[agent_id] -= 1
+                if not self._running[agent_id]:
+                    del self._running[agent_id]
+
+            completed_at = datetime.utcnow()
+            outcome["completed_at"] = completed_at
+            if outcome["status"] == "completed":
+                self.completed += 1
+            else:
+                self.failed += 1
+
+            queue_seconds = (started_at - queued_at).total_seconds()
+            execution_seconds = (completed_at - started_at).total_seconds()
+            attributes = {"action_type": action_type}
+            record_metric("executor.queue_latency_seconds", queue_seconds, attributes)
+            record_metric("executor.execution_seconds", execution_seconds, attributes)
+            self.timings.append((action_type, queued_at, started_at, completed_at))
+
+        self._pending.append(outcome)
+        if len(self._pending) >= self.batch_size:
+            await self.flush()
+
+    async def flush(self) -> int:
+        """Write buffered outcomes back in one transaction"""
+        if not self._pending:
+            return 0
+        batch, self._pending = self._pending, []
+        try:
+            return await asyncio.to_thread(self.actions.record, batch)
+        except Exception as e:
+            # Keep them for the next flush rather than losing results
+            logger.error(f"Failed to record {len(batch)} action(s): {e}")
+            self._pending = batch + self._pending
+            return 0
+
+    async def _flush_periodically(self, stop: asyncio.Event) -> None:
+        while not stop.is_set():
+            await asyncio.sleep(self.flush_interval)
+            await self.flush()
+
+    def latency_summary(self) -> Dict[str, Dict[str, Any]]:
+        """Queue latency and execution percentiles per action type, this run"""
+        return latency_summary(self.timings)
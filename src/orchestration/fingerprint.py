@@ -0,0 +1,81 @@
+"""
+Fingerprinting of orchestration inputs.
+
+Each report gets a content digest that ignores volatile fields such as
+run timestamps, and the report set gets a fingerprint over all digests.
+Comparing fingerprints tells the orchestrator whether a stored plan is
+still valid; comparing digests tells it which reports changed.
+"""
+
+import json
+import hashlib
+from dataclasses import dataclass, field
+from typing import Dict, Any, List, Optional, Tuple
+
+# Fields that change on every run without changing the bottleneck itself
+VOLATILE_FIELDS = frozenset({"id", "last_run", "identified_at", "timestamp"})
+
+
+def report_key(report: Dict[str, Any], index: int) -> str:
+    """Stable identity of a report within a report set"""
+    return str(report.get("agent_id") or f"#{index}")
+
+
+def report_digest(report: Dict[str, Any]) -> str:
+    """Content digest of one report, ignoring volatile fields"""
+    content = {k: v for k, v in report.items() if k not in VOLATILE_FIELDS}
+    canonical = json.dumps(content, sort_keys=True, separators=(",", ":"), default=str)
+    return hashlib.sha256(canonical.encode()).hexdigest()[:16]
+
+
+def fingerprint_reports(
+    reports: List[Dict[str, Any]],
+) -> Tuple[str, Dict[str, str]]:
+    """
+    Fingerprint a report set.
+
+    Returns:
+        (fingerprint, {report_key: digest})
+    """
+    digests: Dict[str, str] = {}
+    for index, report in enumerate(reports):
+        key = report_key(report, index)
+        if key in digests:
+            key = f"{key}#{index}"
+        digests[key] = report_digest(report)
+
+    canonical = "\n".join(f"{k}:{digests[k]}" for k in sorted(digests))
+    return hashlib.sha256(canonical.encode()).hexdigest(), digests
+
+
+@dataclass
+class ReportDelta:
+    """Reports that differ between two fingerprinted report sets"""
+
+    added: List[str] = field(default_factory=list)
+    changed: List[str] = field(default_factory=list)
+    removed: List[str] = field(default_factory=list)
+
+    @property
+    def size(self) -> int:
+        return len(self.added) + len(self.changed) + len(self.removed)
+
+    @property
+    def updated_keys(self) -> set:
+        """Keys of reports whose current content must be re-sent"""
+        return set(self.added) | set(self.changed)
+
+
+def diff_digests(
+    previous: Optional[Dict[str, str]], current: Dict[str, str]
+) -> ReportDelta:
+    """Compare per-report digests of two report sets"""
+    previous = previous or {}
+    delta = ReportDelta()
+    for key, digest in current.items():
+        if key not in previous:
+            delta.added.append(key)
+        elif previous[key] != digest:
+            delta.changed.append(key)
+    delta.removed = [key for key in previous if key not in current]
+    return delta
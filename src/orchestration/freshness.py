@@ -0,0 +1,98 @@
+"""
+Change-driven diagnosis skipping.
+
+Each sub-agent exposes a cheap input fingerprint (SubAgent.input_fingerprint).
+A diagnosis is skipped when the fingerprint matches the one stored at the
+agent's last run and that run is recent enough. The agent's latest stored
+bottleneck is then still current and is reused as-is.
+"""
+
+import os
+import logging
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from typing import Dict, Any, Iterable, Optional
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MAX_AGE_HOURS = 24.0
+
+
+@dataclass
+class DiagnosisCheck:
+    """Outcome of checking whether an agent needs a fresh diagnosis"""
+
+    fingerprint: Optional[str]
+    reason: Optional[str]  # Why a diagnosis is needed; None to skip
+
+    @property
+    def skip(self) -> bool:
+        return self.reason is None
+
+
+class DiagnosisGate:
+    """
+    Decides which agents to re-diagnose in a cycle.
+
+    Usage:
+        gate = DiagnosisGate(force_agents=["security-aggregator"])
+        check = gate.check(agent, agent_info)
+        if not check.skip:
+            bottleneck = await agent.diagnose()
+            db.update_agent_last_run(agent.agent_id, check.fingerprint)
+    """
+
+    def __init__(
+        self,
+        max_age_hours: float = None,
+        force: bool = False,
+        force_agents: Iterable[str] = (),
+    ):
+        """
+        Args:
+            max_age_hours: Re-diagnose after this long even if inputs are unchanged
+            force: Re-diagnose every agent
+            force_agents: Agent IDs to re-diagnose regardless of their inputs
+        """
+        self.max_age = timedelta(
+            hours=max_age_hours
+            or float(
+                os.getenv("SENTINEL_DIAGNOSIS_MAX_AGE_HOURS", DEFAULT_MAX_AGE_HOURS)
+            )
+        )
+        self.force = force
+        self.force_agents = set(force_agents)
+
+    def check(
+        self, agent, agent_info: Dict[str, Any], now: datetime = None
+    ) -> DiagnosisCheck:
+        """
+        Compare an agent's current inputs with its last stored run.
+
+        Args:
+            agent: SubAgent instance
+            agent_info: Stored agent row with last_run and input_fingerprint
+            now: Reference time (default: now)
+        """
+        try:
+            fingerprint = agent.input_fingerprint()
+        except Exception as e:
+            logger.warning(f"Input fingerprint failed for {agent.agent_id}: {e}")
+            fingerprint = None
+
+        if self.force or agent.agent_id in self.force_agents:
+            return DiagnosisCheck(fingerprint, "forced")
+        if fingerprint is None:
+            return DiagnosisCheck(fingerprint, "no input fingerprint")
+        if fingerprint != agent_info.get("input_fingerprint"):
+            return DiagnosisCheck(fingerprint, "inputs changed")
+
+        last_run = agent_info.get("last_run")
+        if isinstance(last_run, str):
+            last_run = datetime.fromisoformat(last_run)
+        if last_run is None:
+            return DiagnosisCheck(fingerprint, "never run")
+        if (now or datetime.now()) - last_run > self.max_age:
+            return DiagnosisCheck(fingerprint, "last run is stale")
+
+        return DiagnosisCheck(fingerprint, None)
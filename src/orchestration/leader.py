@@ -0,0 +1,83 @@
+"""
+Leader election over Postgres advisory locks.
+
+Processes that may all run the same periodic work (schedulers next to
+each server replica, for example) campaign for a named role; only the
+process holding the role's advisory lock acts. The lock is tied to the
+leader's database connection, so if the leader dies or loses its
+connection, Postgres releases it and the next process to check takes
+over. On databases without advisory locks (SQLite) every process leads.
+"""
+
+import os
+import socket
+import logging
+from typing import Any, Dict
+
+from src.observability.telemetry import record_metric
+
+logger = logging.getLogger(__name__)
+
+
+class LeaderElection:
+    """
+    Campaign for a named role.
+
+    Usage:
+        leader = LeaderElection(db, "scheduler")
+        if leader.is_leader():
+            await run_cycle()
+        ...
+        leader.release()
+    """
+
+    def __init__(self, db, role: str):
+        """
+        Args:
+            db: Connected PostgresClient
+            role: Name of the role; processes campaigning for it share one lock
+        """
+        self.db = db
+        self.role = role
+        self.identity = f"{socket.gethostname()}:{os.getpid()}"
+        self._handle = None
+        self._leading = False
+        self.elections = 0
+
+    def is_leader(self) -> bool:
+        """Whether this process leads, taking the role if it's free"""
+        if self._leading and not self.db.advisory_lock_alive(self._handle):
+            logger.warning(f"Lost leadership of {self.role}: connection dropped")
+            self._drop()
+
+        if not self._leading:
+            acquired, handle = self.db.try_advisory_lock(f"leader:{self.role}")
+            if acquired:
+                self._handle = handle
+                self._leading = True
+                self.elections += 1
+                logger.info(f"{self.identity} is now the {self.role} leader")
+                record_metric("leader.elected", 1, {"role": self.role})
+        return self._leading
+
+    def release(self) -> None:
+        """Step down so another process can lead"""
+        if self._leading:
+            logger.info(f"{self.identity} stepping down as {self.role} leader")
+        self._drop()
+
+    def _drop(self) -> None:
+        handle, self._handle, self._leading = self._handle, None, False
+        try:
+            self.db.release_advisory_lock(handle)
+        except Exception as e:
+            # The connection is gone, and the lock with it
+            logger.debug(f"Releasing {self.role} lock failed: {e}")
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "role": self.role,
+            "identity": self.identity,
+            "leading": self._leading,
+            "elections": self.elections,
+        }
@@ -0,0 +1,311 @@
+"""
+Dependency-graph planning for weekly plans.
+
+Builds a DAG from bottleneck "blocking" relationships: if report A blocks
+something that report B is about (B's agent, domain, or a phrase in its
+description or action), A must be handled before B. The planner then
+computes topological levels (waves of work that can run in parallel),
+the critical path by effort, and a weekly time allocation.
+
+Everything is linear or n log n in the number of reports and edges, so
+plans for tens of thousands of reports take about a second.
+"""
+
+import os
+import heapq
+from collections import defaultdict
+from dataclasses import dataclass, field
+from typing import Dict, Any, List, Optional, Set
+
+from src.orchestration.conflicts import normalize_item
+
+DEFAULT_EFFORT_HOURS = 4.0
+DEFAULT_WEEKLY_HOURS = 40.0
+
+# Longest description phrase (in words) a blocking item can match
+_MAX_PHRASE_WORDS = 4
+
+# Exact knapsack is used while items x budget units stays below this
+_KNAPSACK_CELLS = 200_000
+
+
+def _score(report: Dict[str, Any]) -> float:
+    return report.get("impact_score", 0) * report.get("confidence", 0.5)
+
+
+def _effort(report: Dict[str, Any]) -> float:
+    try:
+        effort = float(report.get("effort_hours") or DEFAULT_EFFORT_HOURS)
+    except (TypeError, ValueError):
+        effort = DEFAULT_EFFORT_HOURS
+    return max(effort, 0.5)
+
+
+@dataclass
+class Schedule:
+    """Result of planning a report set"""
+
+    waves: List[List[int]]
+    critical_path: List[int]
+    critical_path_hours: float
+    edges: int
+    cycles_broken: int
+    selected: Set[int] = field(default_factory=set)
+    allocation_method: str = "greedy"
+
+
+class DependencyPlanner:
+    """
+    Turns ranked reports into parallel action waves and a weekly allocation.
+
+    Usage:
+        planner = DependencyPlanner(weekly_hours=40)
+        weekly_plan, allocation, schedule = planner.plan(ranked_reports)
+    """
+
+    def __init__(self, weekly_hours: float = None, max_fanout: int = 50):
+        """
+        Args:
+            weekly_hours: Time budget for the week
+            max_fanout: Most reports a single blocking item can point at
+        """
+        self.weekly_hours = weekly_hours or float(
+            os.getenv("SENTINEL_WEEKLY_HOURS", DEFAULT_WEEKLY_HOURS)
+        )
+        self.max_fanout = max_fanout
+
+    def build_graph(self, reports: List[Dict[str, Any]]) -> List[List[int]]:
+        """
+        Build successor lists: graph[a] holds every report that a blocks.
+
+        Each report is indexed under its agent_id, domain and every phrase
+        of up to four words from its description and recommended action;
+        blocking items are then looked up in that index.
+        """
+        index: Dict[str, List[int]] = defaultdict(list)
+        for position, report in enumerate(reports):
+            keys = {
+                normalize_item(report.get("agent_id", "")),
+                normalize_item(report.get("domain", "")),
+            }
+            for text in (report.get("description"), report.get("recommended_action")):
+                words = normalize_item(text or "").split()
+                for size in range(1, _MAX_PHRASE_WORDS + 1):
+                    for start in range(len(words) - size + 1):
+                        keys.add(" ".join(words[start : start + size]))
+            keys.discard("")
+            for key in keys:
+                index[key].append(position)
+
+        graph: List[List[int]] = [[] for _ in reports]
+        for position, report in enumerate(reports):
+            targets: Set[int] = set()
+            for item in report.get("blocking") or []:
+                matches = index.get(normalize_item(item), ())
+                # Matches are in rank order; keep the highest-ranked ones
+                for target in matches[: self.max_fanout]:
+                    if target != position:
+                        targets.add(target)
+            graph[position] = sorted(targets)
+        return graph
+
+    def schedule(
+        self, reports: List[Dict[str, Any]], scores: Optional[List[float]] = None
+    ) -> Schedule:
+        """Compute waves and the critical path, breaking cycles by priority"""
+        graph = self.build_graph(reports)
+        count = len(reports)
+        indegree = [0] * count
+        for targets in graph:
+            for target in targets:
+                indegree[target] += 1
+
+        scores = scores if scores is not None else [_score(r) for r in reports]
+        efforts = [_effort(r) for r in reports]
+        level = [0] * count
+        done = [False] * count
+
+        # Longest effort-weighted path ending at each node
+        path_hours = list(efforts)
+        parent: List[Optional[int]] = [None] * count
+
+        # Highest-priority first, so cycles are broken in favour of the top
+        remaining = [(-scores[i], i) for i in range(count)]
+        heapq.heapify(remaining)
+
+        ready = [i for i in range(count) if indegree[i] == 0]
+        processed = 0
+        cycles_broken = 0
+        while processed < count:
+            if not ready:
+                # Only cycles remain: release the highest-priority node
+                while remaining and done[remaining[0][1]]:
+                    heapq.heappop(remaining)
+                ready.append(heapq.heappop(remaining)[1])
+                cycles_broken += 1
+
+            next_ready = []
+            for node in ready:
+                if done[node]:
+                    continue
+                done[node] = True
+                processed += 1
+                for target in graph[node]:
+                    if done[target]:
+                        continue
+                    level[target] = max(level[target], level[node] + 1)
+                    if path_hours[node] + efforts[target] > path_hours[target]:
+                        path_hours[target] = path_hours[node] + efforts[target]
+                        parent[target] = node
+                    indegree[target] -= 1
+                    if indegree[target] == 0:
+                        next_ready.append(target)
+            ready = next_ready
+
+        waves: Dict[int, List[int]] = defaultdict(list)
+        for node in range(count):
+            waves[level[node]].append(node)
+        ordered_waves = [
+            sorted(waves[lvl], key=lambda n: -scores[n]) for lvl in sorted(waves)
+        ]
+
+        critical_path: List[int] = []
+        if count:
+            node = max(range(count), key=lambda n: path_hours[n])
+            critical_hours = path_hours[node]
+            while node is not None:
+                critical_path.append(node)
+                node = parent[node]
+            critical_path.reverse()
+        else:
+            critical_hours = 0.0
+
+        return Schedule(
+            waves=ordered_waves,
+            critical_path=critical_path,
+            critical_path_hours=round(critical_hours, 2),
+            edges=sum(len(t) for t in graph),
+            cycles_broken=cycles_broken,
+        )
+
+    def allocate(
+        self,
+        reports: List[Dict[str, Any]],
+        schedule: Schedule,
+        scores: Optional[List[float]] = None,
+    ) -> Dict[str, Any]:
+        """
+        Select the work that fits the weekly budget.
+
+        Uses an exact 0/1 knapsack (half-hour units) for small inputs and
+        greedy selection by priority per hour otherwise.
+        """
+        scores = scores if scores is not None else [_score(r) for r in reports]
+        efforts = [_effort(r) for r in reports]
+        units = int(self.weekly_hours * 2)
+
+        if len(reports) * units <= _KNAPSACK_CELLS:
+            selected = self._knapsack(scores, efforts, units)
+            method = "knapsack"
+        else:
+            selected = self._greedy(scores, efforts)
+            method = "greedy"
+
+        schedule.selected = selected
+        schedule.allocation_method = method
+
+        by_domain: Dict[str, float] = defaultdict(float)
+        for node in selected:
+            by_domain[reports[node].get("domain") or "unknown"] += efforts[node]
+
+        return {
+            "weekly_budget_hours": self.weekly_hours,
+            "allocated_hours": round(sum(efforts[n] for n in selected), 2),
+            "by_domain": {d: round(h, 2) for d, h in sorted(by_domain.items())},
+            "selected": [self.label(reports, n) for n in sorted(selected)],
+            "deferred": [
+                self.label(reports, n) for n in range(len(reports)) if n not in selected
+            ],
+            "method": method,
+        }
+
+    def plan(self, reports: List[Dict[str, Any]], scores: Optional[List[float]] = None):
+        """
+        Build the weekly plan for ranked reports.
+
+        Args:
+            reports: Flat reports, ranked by priority
+            scores: Priority scores aligned with reports
+                (default: impact_score * confidence)
+
+        Returns:
+            (weekly_plan, resource_allocation, schedule)
+        """
+        if scores is None:
+            scores = [_score(r) for r in reports]
+        schedule = self.schedule(reports, scores)
+        allocation = self.allocate(reports, schedule, scores)
+
+        critical = set(schedule.critical_path)
+        weekly_plan = []
+        for wave_number, wave in enumerate(schedule.waves, start=1):
+            for node in wave:
+                if node not in schedule.selected:
+                    continue
+                report = reports[node]
+                weekly_plan.append(
+                    {
+                        "action": report.get("recommended_action")
+                        or report.get("description", ""),
+                        "domain": report.get("domain"),
+                        "agent_id": report.get("agent_id"),
+                        "priority": len(weekly_plan) + 1,
+                        "wave": wave_number,
+                        "effort_hours": _effort(report),
+                        "on_critical_path": node in critical,
+                        "rationale": (
+                            f"Impact {report.get('impact_score', 0)}/10 at "
+                            f"{report.get('confidence', 0.5):.0%} confidence"
+                        ),
+                    }
+                )
+
+        return weekly_plan, allocation, schedule
+
+    def _knapsack(
+        self, scores: List[float], efforts: List[float], units: int
+    ) -> Set[int]:
+        weights = [max(1, int(round(e * 2))) for e in efforts]
+        best = [0.0] * (units + 1)
+        keep = []
+        for item, (value, weight) in enumerate(zip(scores, weights)):
+            taken = bytearray(units + 1)
+            for capacity in range(units, weight - 1, -1):
+                candidate = best[capacity - weight] + value
+                if candidate > best[capacity]:
+                    best[capacity] = candidate
+                    taken[capacity] = 1
+            keep.append(taken)
+
+        selected: Set[int] = set()
+        capacity = units
+        for item in range(len(scores) - 1, -1, -1):
+            if keep[item][capacity]:
+                selected.add(item)
+                capacity -= weights[item]
+        return selected
+
+    def _greedy(self, scores: List[float], efforts: List[float]) -> Set[int]:
+        order = sorted(range(len(scores)), key=lambda n: -scores[n] / efforts[n])
+        selected: Set[int] = set()
+        used = 0.0
+        for node in order:
+            if used + efforts[node] <= self.weekly_hours:
+                selected.add(node)
+                used += efforts[node]
+        return selected
+
+    @staticmethod
+    def label(reports: List[Dict[str, Any]], node: int) -> str:
+        """Name a report in plans and allocations"""
+        return str(reports[node].get("agent_id") or f"#{node}")
@@ -0,0 +1,113 @@
+"""
+Progress events for queued orchestration jobs.
+
+Follows an "orchestrate" job and its diagnosis children in the jobs
+table and turns state changes into events, streamed to clients as
+server-sent events:
+
+    status    the job's stage changed (queued, diagnosing, synthesizing)
+    agent     one agent's diagnosis finished, with its bottleneck
+    complete  the plan was stored (carries the job result)
+    failed    the job was dead-lettered
+
+A client that subscribes late first receives the events it missed.
+"""
+
+import json
+import asyncio
+from typing import AsyncIterator, Dict, Any, Optional
+
+TERMINAL_STATUSES = ("succeeded", "dead")
+
+
+def _stage(job: Dict[str, Any]) -> str:
+    if job["status"] in TERMINAL_STATUSES:
+        return job["status"]
+    if job["status"] == "waiting":
+        return "diagnosing"
+    if job["payload"].get("stage") == "synthesize":
+        return "synthesizing"
+    return job["status"]
+
+
+def _agent_event(child: Dict[str, Any]) -> Dict[str, Any]:
+    result = child.get("result") or {}
+    return {
+        "agent_id": child["payload"].get("agent_id") or result.get("agent_id"),
+        "domain": child["payload"].get("domain"),
+        "status": child["status"],
+        "skipped": result.get("skipped", False),
+        "bottleneck": result.get("bottleneck"),
+        "error": child.get("error") if child["status"] == "dead" else None,
+    }
+
+
+async def orchestration_events(
+    queue,
+    job_id: int,
+    poll_interval: float = 1.0,
+    keepalive_seconds: float = 15.0,
+) -> AsyncIterator[Optional[Dict[str, Any]]]:
+    """
+    Yield {"event": ..., "data": {...}} dicts until the job finishes.
+
+    None is yielded after keepalive_seconds without events, so callers
+    can keep idle connections open through proxies.
+    """
+    last_stage = None
+    reported = set()
+    idle = 0.0
+
+    while True:
+        job = await asyncio.to_thread(queue.get, job_id)
+        if job is None:
+            return
+        children = await asyncio.to_thread(queue.children, job_id)
+
+        events = []
+        finished = [c for c in children if c["status"] in TERMINAL_STATUSES]
+        for child in finished:
+            if child["id"] not in reported:
+                reported.add(child["id"])
+                data = _agent_event(child)
+                data["completed"] = len(reported)
+                data["total"] = len(children)
+                events.append({"event": "agent", "data": data})
+
+        stage = _stage(job)
+        if stage != last_stage and stage not in TERMINAL_STATUSES:
+            events.append(
+                {
+                    "event": "status",
+                    "data": {"job_id": job_id, "stage": stage, "agents": len(children)},
+                }
+            )
+            last_stage = stage
+
+        if job["status"] == "succeeded":
+            events.append({"event": "complete", "data": job["result"] or {}})
+        elif job["status"] == "dead":
+            events.append({"event": "failed", "data": {"error": job["error"]}})
+
+        for event in events:
+            yield event
+        if job["status"] in TERMINAL_STATUSES:
+            return
+
+        idle = 0.0 if events else idle + poll_interval
+        if idle >= keepalive_seconds:
+            idle = 0.0
+            yield None
+        await asyncio.sleep(poll_interval)
+
+
+def format_sse(event: Optional[Dict[str, Any]], event_id: int = None) -> str:
+    """Encode an event (or a keepalive, for None) as a server-sent event"""
+    if event is None:
+        return ": keepalive\n\n"
+    lines = []
+    if event_id is not None:
+        lines.append(f"id: {event_id}")
+    lines.append(f"event: {event['event']}")
+    lines.append(f"data: {json.dumps(event['data'], default=str)}")
+    return "\n".join(lines) + "\n\n"
@@ -0,0 +1,27 @@
+"""
+Helpers for normalizing sub-agent reports.
+"""
+
+from typing import Dict, Any
+
+# Agent-level fields carried alongside the bottleneck
+_AGENT_FIELDS = ("agent_id", "domain", "last_run")
+
+
+def flatten_report(report: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Flatten a report into a single bottleneck dict.
+
+    PostgresClient.get_all_agent_reports() nests the bottleneck under a
+    "bottleneck" key next to agent metadata, while agents return flat
+    bottleneck dicts. Both shapes are accepted; flat reports are returned
+    unchanged.
+    """
+    if "bottleneck" not in report:
+        return report
+
+    flat = dict(report.get("bottleneck") or {})
+    for field in _AGENT_FIELDS:
+        if field in report and field not in flat:
+            flat[field] = report[field]
+    return flat
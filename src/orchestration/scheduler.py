@@ -0,0 +1,338 @@
+"""
+Long-running scheduler for agent diagnostics and orchestration.
+
+Jobs sit in a priority queue (a heap) ordered by when they are due. Each
+job has an interval or cron cadence; due times get random jitter so that
+agents sharing a cadence don't all call Claude at once. Runs missed while
+the scheduler was down are caught up with a single run at startup. A job
+that is still running when it comes due again is skipped, not stacked.
+
+Cadence specs:
+    "hourly", "daily", "weekly"     fixed intervals
+    "30m", "6h", "every 2d"         intervals in s/m/h/d/w
+    "0 9 * * 1"                     5-field cron (minute hour dom month dow)
+"""
+
+import re
+import heapq
+import random
+import asyncio
+import logging
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from typing import Awaitable, Callable, Dict, Any, List, Optional, Set, Union
+
+from src.observability.telemetry import get_tracer, record_metric
+
+logger = logging.getLogger(__name__)
+
+_ALIASES = {"hourly": 3600, "daily": 86400, "weekly": 604800}
+_UNIT_SECONDS = {"s": 1, "m": 60, "h": 3600, "d": 86400, "w": 604800}
+_INTERVAL = re.compile(r"^(?:every\s+)?(\d+(?:\.\d+)?)\s*([smhdw])$")
+
+# Longest search window for the next cron match (covers Feb 29)
+_CRON_HORIZON = timedelta(days=366 * 5)
+
+
+class IntervalCadence:
+    """Runs every fixed period"""
+
+    def __init__(self, seconds: float):
+        if seconds <= 0:
+            raise ValueError("Interval must be positive")
+        self.period = timedelta(seconds=seconds)
+
+    def next_after(self, moment: datetime) -> datetime:
+        return moment + self.period
+
+    def __repr__(self):
+        return f"every {self.period}"
+
+
+class CronCadence:
+    """Runs at times matching a 5-field cron expression"""
+
+    _RANGES = ((0, 59), (0, 23), (1, 31), (1, 12), (0, 7))
+
+    def __init__(self, expression: str):
+        fields = expression.split()
+        if len(fields) != 5:
+            raise ValueError(f"Cron expression needs 5 fields: '{expression}'")
+
+        self.expression = expression
+        parsed = [
+            self._parse_field(field, low, high)
+            for field, (low, high) in zip(fields, self._RANGES)
+        ]
+        self.minutes, self.hours, self.days, self.months, weekdays = parsed
+        # Cron allows 7 for Sunday
+        self.weekdays = {d % 7 for d in weekdays}
+        # When both day fields are restricted, either may match
+        self.day_restricted = fields[2] != "*"
+        self.weekday_restricted = fields[4] != "*"
+
+    @staticmethod
+    def _parse_field(field: str, low: int, high: int) -> Set[int]:
+        values: Set[int] = set()
+        for part in field.split(","):
+            step = 1
+            if "/" in part:
+                part, step_text = part.split("/", 1)
+                step = int(step_text)
+            if part == "*":
+                start, end = low, high
+            elif "-" in part:
+                start_text, end_text = part.split("-", 1)
+                start, end = int(start_text), int(end_text)
+            else:
+                start = int(part)
+                end = high if step > 1 else start
+            if not (low <= start <= end <= high) or step < 1:
+                raise ValueError(f"Invalid cron field '{field}'")
+            values.update(range(start, end + 1, step))
+        return values
+
+    def _day_matches(self, moment: datetime) -> bool:
+        day = moment.day in self.days
+        # Python weekdays start on Monday, cron weekdays on Sunday
+        weekday = (moment.weekday() + 1) % 7 in self.weekdays
+        if self.day_restricted and self.weekday_restricted:
+            return day or weekday
+        return day and weekday
+
+    def next_after(self, moment: datetime) -> datetime:
+        candidate = moment.replace(second=0, microsecond=0) + timedelta(minutes=1)
+        limit = candidate + _CRON_HORIZON
+        while candidate < limit:
+            if candidate.month not in self.months:
+                year = candidate.year + candidate.month // 12
+                month = candidate.month % 12 + 1
+                candidate = candidate.replace(
+                    year=year, month=month, day=1, hour=0, minute=0
+                )
+            elif not self._day_matches(candidate):
+                candidate = candidate.replace(hour=0, minute=0) + timedelta(days=1)
+            elif candidate.hour not in self.hours:
+                candidate = candidate.replace(minute=0) + timedelta(hours=1)
+            elif candidate.minute not in self.minutes:
+                candidate += timedelta(minutes=1)
+            else:
+                return candidate
+        raise ValueError(f"Cron expression never matches: '{self.expression}'")
+
+    def __repr__(self):
+        return f"cron '{self.expression}'"
+
+
+Cadence = Union[IntervalCadence, CronCadence]
+
+
+def parse_cadence(spec: Union[str, int, float]) -> Cadence:
+    """
+    Parse a cadence from a project config.
+
+    Raises:
+        ValueError: If the spec is not a known alias, interval or cron expression
+    """
+    if isinstance(spec, (int, float)):
+        return IntervalCadence(spec)
+
+    text = str(spec).strip().lower()
+    if text in _ALIASES:
+        return IntervalCadence(_ALIASES[text])
+
+    match = _INTERVAL.match(text)
+    if match:
+        return IntervalCadence(float(match.group(1)) * _UNIT_SECONDS[match.group(2)])
+
+    if len(text.split()) == 5:
+        return CronCadence(text)
+
+    raise ValueError(f"Unrecognized cadence: '{spec}'")
+
+
+def typical_period(cadence: Cadence, moment: datetime) -> timedelta:
+    """Gap between the next two runs after moment"""
+    first = cadence.next_after(moment)
+    return cadence.next_after(first) - first
+
+
+@dataclass
+class ScheduledJob:
+    """A recurring job and its run history"""
+
+    name: str
+    cadence: Cadence
+    run: Callable[[], Awaitable[Any]]
+    priority: int = 0  # Lower runs first when jobs are due together
+    last_run: Optional[datetime] = None
+    next_run: Optional[datetime] = None  # Scheduled time, before jitter
+    due: Optional[datetime] = None  # Scheduled time, with jitter
+    running: bool = False
+    runs: int = 0
+    failures: int = 0
+    overlaps: int = 0
+
+
+class Scheduler:
+    """
+    Runs recurring jobs from a due-time priority queue.
+
+    Usage:
+        scheduler = Scheduler(max_jitter_seconds=60)
+        scheduler.add("research-01", parse_cadence("daily"), job, last_run=...)
+        await scheduler.run(stop_event)
+    """
+
+    def __init__(
+        self,
+        max_jitter_seconds: float = 60.0,
+        catch_up: bool = True,
+        max_concurrency: int = 4,
+        clock: Callable[[], datetime] = datetime.now,
+        rng: random.Random = None,
+    ):
+        """
+        Args:
+            max_jitter_seconds: Largest random delay added to each due time
+            catch_up: Run once at startup for runs missed while stopped
+            max_concurrency: Jobs allowed to run at the same time
+            clock: Source of the current (naive, local) time
+            rng: Random source for jitter
+        """
+        self.max_jitter = max_jitter_seconds
+        self.catch_up = catch_up
+        self.clock = clock
+        self.rng = rng or random.Random()
+        self.jobs: Dict[str, ScheduledJob] = {}
+        self._queue: List[tuple] = []
+        self._sequence = 0
+        self._semaphore = asyncio.Semaphore(max_concurrency)
+        self._tasks: Set[asyncio.Task] = set()
+
+    def add(
+        self,
+        name: str,
+        cadence: Cadence,
+        run: Callable[[], Awaitable[Any]],
+        last_run: Optional[datetime] = None,
+        priority: int = 0,
+    ) -> ScheduledJob:
+        """Register a job; its first run is based on when it last ran"""
+        job = ScheduledJob(name, cadence, run, priority, last_run)
+        self.jobs[name] = job
+
+        now = self.clock()
+        if last_run is None:
+            first = now
+        else:
+            first = cadence.next_after(last_run)
+            if first <= now:
+                # Missed while stopped: one catch-up run, or wait for the next slot
+                if self.catch_up:
+                    first = now
+                else:
+                    while first <= now:
+                        first = cadence.next_after(first)
+        self._push(job, first)
+        return job
+
+    def _next_slot(self, job: ScheduledJob, after: datetime) -> datetime:
+        """Next scheduled time strictly after a moment"""
+        upcoming = job.cadence.next_after(job.next_run)
+        while upcoming <= after:
+            upcoming = job.cadence.next_after(upcoming)
+        return upcoming
+
+    def _push(self, job: ScheduledJob, scheduled: datetime) -> None:
+        job.next_run = scheduled
+        job.due = scheduled + timedelta(seconds=self.rng.uniform(0, self.max_jitter))
+        self._sequence += 1
+        heapq.heappush(self._queue, (job.due, job.priority, self._sequence, job.name))
+
+    def seconds_until_due(self) -> Optional[float]:
+        """Seconds until the next job is due (None if nothing is scheduled)"""
+        if not self._queue:
+            return None
+        return max(0.0, (self._queue[0][0] - self.clock()).total_seconds())
+
+    def run_pending(self) -> List[asyncio.Task]:
+        """Start every job that is due now; returns the started tasks"""
+        now = self.clock()
+        started = []
+        while self._queue and self._queue[0][0] <= now:
+            due, _, _, name = heapq.heappop(self._queue)
+            job = self.jobs[name]
+
+            # Schedule the next occurrence; runs missed while late coalesce
+            self._push(job, self._next_slot(job, now))
+
+            if job.running:
+                job.overlaps += 1
+                logger.warning(f"Job {name} still running, skipping run due {due}")
+                continue
+
+            job.running = True
+            task = asyncio.create_task(self._execute(job, due))
+            self._tasks.add(task)
+            task.add_done_callback(self._tasks.discard)
+            started.append(task)
+        return started
+
+    async def _execute(self, job: ScheduledJob, due: datetime) -> None:
+        try:
+            async with self._semaphore:
+                started = self.clock()
+                lag = (started - due).total_seconds()
+                overdue = sum(1 for entry in self._queue if entry[0] <= started)
+
+                with get_tracer().start_as_current_span("scheduler.run_job") as span:
+                    span.set_attribute("scheduler.job", job.name)
+                    record_metric("scheduler.queue_lag_seconds", lag, {"job": job.name})
+                    record_metric("scheduler.queue_depth", overdue)
+                    logger.info(f"Running {job.name} (queue lag {lag:.1f}s)")
+
+                    try:
+                        await job.run()
+                        job.runs += 1
+                    except Exception as e:
+                        job.failures += 1
+                        span.set_attribute("error", True)
+                        logger.error(
+                            f"Scheduled job {job.name} failed: {e}", exc_info=True
+                        )
+                    job.last_run = started
+        finally:
+            job.running = False
+
+    async def run(self, stop: asyncio.Event = None, max_sleep: float = 60.0) -> None:
+        """Run until stop is set, then wait for running jobs to finish"""
+        stop = stop or asyncio.Event()
+        while not stop.is_set():
+            self.run_pending()
+            wait = self.seconds_until_due()
+            timeout = max_sleep if wait is None else min(wait, max_sleep)
+            try:
+                await asyncio.wait_for(stop.wait(), timeout=max(timeout, 0.01))
+            except asyncio.TimeoutError:
+                pass
+
+        if self._tasks:
+            logger.info(f"Waiting for {len(self._tasks)} running job(s)")
+            await asyncio.gather(*self._tasks, return_exceptions=True)
+
+    def snapshot(self) -> List[Dict[str, Any]]:
+        """Current state of every job, soonest first"""
+        return [
+            {
+                "name": job.name,
+                "cadence": repr(job.cadence),
+                "next_run": job.due,
+                "last_run": job.last_run,
+                "running": job.running,
+                "runs": job.runs,
+                "failures": job.failures,
+                "overlaps": job.overlaps,
+            }
+            for job in sorted(self.jobs.values(), key=lambda j: j.due)
+        ]
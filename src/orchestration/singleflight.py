@@ -0,0 +1,177 @@
+"""
+Request coalescing for duplicate diagnoses.
+
+Identical diagnoses (same agent, same input fingerprint) that overlap in
+time share one Claude call:
+
+- Within a process, the first caller starts the work and later callers
+  await the same task (single-flight).
+- Across server workers, the leader holds a Postgres advisory lock on
+  the key while it diagnoses. A leader in another worker waits for the
+  lock, then finds the bottleneck the first one just stored and reuses
+  it instead of calling Claude again.
+
+A leader takes its diagnosis slot before the lock. The lock holds a
+pooled connection, so this keeps lock connections to one per slot and
+leaves the pool room for the reads and writes made under the lock.
+"""
+
+import asyncio
+import logging
+from contextlib import nullcontext
+from datetime import datetime
+from typing import Awaitable, Callable, Dict, Any, Hashable, Optional, Tuple
+
+from src.observability.telemetry import record_metric
+
+logger = logging.getLogger(__name__)
+
+
+class SingleFlight:
+    """
+    Runs at most one call per key at a time; concurrent callers share it.
+
+    The shared work runs in its own task, so a caller that goes away
+    (e.g. a closed HTTP connection) doesn't cancel it for the others.
+    """
+
+    def __init__(self):
+        self._calls: Dict[Hashable, asyncio.Task] = {}
+        self.leaders = 0
+        self.coalesced = 0
+
+    async def do(
+        self, key: Hashable, fn: Callable[[], Awaitable[Any]]
+    ) -> Tuple[Any, bool]:
+        """
+        Run fn for key, or join the call already in flight.
+
+        Returns:
+            (result, coalesced) where coalesced is True for joined calls
+        """
+        task = self._calls.get(key)
+        coalesced = task is not None
+        if coalesced:
+            self.coalesced += 1
+        else:
+            self.leaders += 1
+            task = asyncio.ensure_future(fn())
+            self._calls[key] = task
+            task.add_done_callback(lambda done: self._forget(key, done))
+        return await asyncio.shield(task), coalesced
+
+    def _forget(self, key: Hashable, task: asyncio.Task) -> None:
+        if self._calls.get(key) is task:
+            del self._calls[key]
+        if not task.cancelled():
+            task.exception()  # Retrieved here when every caller went away
+
+    @property
+    def in_flight(self) -> int:
+        return len(self._calls)
+
+
+class DiagnosisCoalescer:
+    """
+    Coalesces duplicate diagnoses within and across server workers.
+
+    Usage:
+        coalescer = DiagnosisCoalescer(db, slots=asyncio.Semaphore(8))
+        bottleneck, shared = await coalescer.diagnose(agent)
+    """
+
+    def __init__(self, db, slots: asyncio.Semaphore = None):
+        """
+        Args:
+            db: Connected PostgresClient (advisory locks need PostgreSQL)
+            slots: Limits diagnoses running at once, if given
+        """
+        self.db = db
+        self.slots = slots
+        self.flight = SingleFlight()
+        self.reused = 0
+
+    async def diagnose(
+        self, agent, persist: bool = True
+    ) -> Tuple[Dict[str, Any], bool]:
+        """
+        Diagnose an agent unless an identical diagnosis is running.
+
+        Args:
+            agent: SubAgent
+            persist: Store the bottleneck and mark the run. Callers that
+                store results themselves (in a batch) pass False and
+                store only results that weren't shared.
+
+        Returns:
+            (bottleneck, shared) where shared means another request
+            produced and stored the bottleneck
+        """
+        fingerprint = agent.input_fingerprint()
+        # A storing request never waits on one that leaves storing to its
+        # caller: that caller may fail or go away before it saves
+        key = (agent.agent_id, fingerprint, persist)
+
+        (bottleneck, reused), coalesced = await self.flight.do(
+            key, lambda: self._lead(agent, fingerprint, persist)
+        )
+        if coalesced:
+            record_metric(
+                "diagnose.coalesced", 1, {"agent_id": agent.agent_id, "scope": "local"}
+            )
+        # Calls that don't store join each other, so each caller saves
+        return bottleneck, (coalesced and persist) or reused
+
+    async def _lead(
+        self, agent, fingerprint: Optional[str], persist: bool
+    ) -> Tuple[Dict[str, Any], bool]:
+        requested = datetime.now()  # Same clock as agents.last_run
+        async with self.slots or nullcontext():
+            lock = await asyncio.to_thread(
+                self.db.acquire_advisory_lock,
+                f"diagnose:{agent.agent_id}:{fingerprint}",
+            )
+            try:
+                fresh = await asyncio.to_thread(
+                    self._stored_since, agent.agent_id, fingerprint, requested
+                )
+                if fresh is not None:
+                    self.reused += 1
+                    record_metric(
+                        "diagnose.coalesced",
+                        1,
+                        {"agent_id": agent.agent_id, "scope": "cross_worker"},
+                    )
+                    return fresh, True
+
+                bottleneck = await agent.diagnose()
+
+                if persist:
+                    await asyncio.to_thread(
+                        self.db.save_bottleneck, agent.agent_id, bottleneck
+                    )
+                    await asyncio.to_thread(
+                        self.db.update_agent_last_run, agent.agent_id, fingerprint
+                    )
+                return bottleneck, False
+            finally:
+                await asyncio.to_thread(self.db.release_advisory_lock, lock)
+
+    def _stored_since(
+        self, agent_id: str, fingerprint: Optional[str], since: datetime
+    ) -> Optional[Dict[str, Any]]:
+        """Bottleneck another worker stored for these inputs while we waited"""
+        state = self.db.get_agent_state(agent_id)
+        if not state or not state.get("last_run") or state["last_run"] < since:
+            return None
+        if state.get("input_fingerprint") != fingerprint:
+            return None
+        return self.db.get_latest_bottleneck(agent_id)
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "leaders": self.flight.leaders,
+            "coalesced": self.flight.coalesced,
+            "reused_across_workers": self.reused,
+            "in_flight": self.flight.in_flight,
+        }
@@ -0,0 +1,262 @@
+"""
+Hierarchical (map-reduce) synthesis for large agent fleets.
+
+Reports are grouped by domain and packed into token-budgeted chunks.
+Each chunk is condensed into a group summary in parallel (map), then
+summaries are merged in parallel rounds (reduce) until they fit in a
+single prompt. With a fan-in of k summaries per reduce call, a fleet of
+n agents needs about log_k(n) sequential rounds.
+"""
+
+import os
+import json
+import asyncio
+import logging
+from collections import defaultdict
+from typing import Awaitable, Callable, Dict, Any, List
+
+from src.orchestration.encoding import count_tokens, encode_table
+
+logger = logging.getLogger(__name__)
+
+# (system_prompt, user_message, max_tokens) -> response text
+ModelCall = Callable[[str, str, int], Awaitable[str]]
+
+DEFAULT_TOKEN_BUDGET = 60000
+DEFAULT_CONCURRENCY = 8
+
+# Fields kept from each report when condensing
+_REPORT_FIELDS = (
+    "agent_id",
+    "domain",
+    "description",
+    "impact_score",
+    "confidence",
+    "blocking",
+    "recommended_action",
+)
+
+MAP_SYSTEM_PROMPT = (
+    "You are a staff analyst supporting the Chief of Staff in a multi-agent "
+    "system.\n"
+    "\n"
+    "You will receive bottleneck reports from agents in one domain as a "
+    "pipe-delimited table; the first row lists the field names and list values "
+    'are separated by ";". Condense them into a group summary that preserves '
+    "everything needed for cross-domain prioritization.\n"
+    "\n"
+    "Respond with a JSON object (and ONLY JSON, no other text) with this "
+    "structure:\n"
+    "{\n"
+    '    "domains": ["domain"],\n'
+    '    "summary": "2-3 sentence summary of the group\'s state",\n'
+    '    "top_bottlenecks": [up to 5 of the most important report objects, '
+    "unchanged],\n"
+    '    "conflicts": [{"description": "resource or attention conflict", '
+    '"agents": ["agent_id"]}],\n'
+    '    "recommended_actions": [{"action": "specific action", '
+    '"agent_id": "agent_id", "priority": 1-10}]\n'
+    "}"
+)
+
+REDUCE_SYSTEM_PROMPT = (
+    "You are a staff analyst supporting the Chief of Staff in a multi-agent "
+    "system.\n"
+    "\n"
+    "You will receive a JSON array of group summaries, each covering one or "
+    "more domains. Merge them into a single group summary, keeping the "
+    "highest-impact bottlenecks, every cross-domain conflict and the most "
+    "important actions.\n"
+    "\n"
+    "Respond with a JSON object (and ONLY JSON, no other text) with this "
+    "structure:\n"
+    "{\n"
+    '    "domains": ["every domain covered"],\n'
+    '    "summary": "2-3 sentence summary across the merged groups",\n'
+    '    "top_bottlenecks": [up to 5 of the most important bottleneck objects, '
+    "unchanged],\n"
+    '    "conflicts": [{"description": "resource or attention conflict", '
+    '"agents": ["agent_id"]}],\n'
+    '    "recommended_actions": [{"action": "specific action", '
+    '"agent_id": "agent_id", "priority": 1-10}]\n'
+    "}"
+)
+
+
+def _compact(obj: Any) -> str:
+    return json.dumps(obj, separators=(",", ":"), default=str)
+
+
+class HierarchicalSynthesizer:
+    """
+    Condenses an arbitrarily large report set into summaries that fit
+    one synthesis prompt.
+
+    Usage:
+        synthesizer = HierarchicalSynthesizer(call_model)
+        if not synthesizer.fits(reports):
+            summaries = await synthesizer.condense(reports)
+    """
+
+    def __init__(
+        self,
+        call_model: ModelCall,
+        token_budget: int = None,
+        max_concurrency: int = None,
+        summary_max_tokens: int = 1500,
+    ):
+        """
+        Args:
+            call_model: Coroutine making one Claude call
+            token_budget: Input tokens allowed per prompt
+            max_concurrency: Concurrent model calls per round
+            summary_max_tokens: Output tokens allowed per group summary
+        """
+        self.call_model = call_model
+        self.token_budget = token_budget or int(
+            os.getenv("SENTINEL_SYNTHESIS_TOKEN_BUDGET", DEFAULT_TOKEN_BUDGET)
+        )
+        self.max_concurrency = max_concurrency or int(
+            os.getenv("SENTINEL_SYNTHESIS_CONCURRENCY", DEFAULT_CONCURRENCY)
+        )
+        self.summary_max_tokens = summary_max_tokens
+        self.rounds = 0
+
+    def fits(self, items: List[Dict[str, Any]]) -> bool:
+        """Check whether items fit in a single prompt"""
+        return count_tokens(_compact(items)) <= self.token_budget
+
+    async def condense(self, reports: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """
+        Map reports into per-domain group summaries, then reduce until
+        the summaries fit in one prompt.
+
+        Args:
+            reports: Flat bottleneck reports, ideally pre-ranked by impact
+
+        Returns:
+            List of group summaries
+        """
+        semaphore = asyncio.Semaphore(self.max_concurrency)
+        self.rounds = 0
+
+        # Map: domain groups, split into budget-sized chunks
+        by_domain: Dict[str, List[Dict[str, Any]]] = defaultdict(list)
+        for report in reports:
+            by_domain[report.get("domain") or "unknown"].append(
+                {k: report[k] for k in _REPORT_FIELDS if k in report}
+            )
+
+        chunks = []
+        for domain, group in by_domain.items():
+            for chunk in self._pack(group):
+                chunks.append((domain, chunk))
+
+        summaries = await asyncio.gather(
+            *(self._map(domain, chunk, semaphore) for domain, chunk in chunks)
+        )
+        self.rounds += 1
+        logger.info(
+            f"Condensed {len(reports)} reports into {len(summaries)} group summaries"
+        )
+
+        # Reduce: merge summaries until they fit one prompt
+        while len(summaries) > 1 and not self.fits(summaries):
+            groups = self._pack(summaries, min_size=2)
+            summaries = await asyncio.gather(
+                *(self._reduce(group, semaphore) for group in groups)
+            )
+            self.rounds += 1
+            logger.info(f"Reduced to {len(summaries)} summaries")
+
+        return list(summaries)
+
+    def _pack(
+        self, items: List[Dict[str, Any]], min_size: int = 1
+    ) -> List[List[Dict[str, Any]]]:
+        """Greedily pack items into chunks that fit the token budget"""
+        chunks: List[List[Dict[str, Any]]] = []
+        current: List[Dict[str, Any]] = []
+        current_tokens = 0
+
+        for item in items:
+            tokens = count_tokens(_compact(item))
+            if (
+                current
+                and len(current) >= min_size
+                and current_tokens + tokens > self.token_budget
+            ):
+                chunks.append(current)
+                current, current_tokens = [], 0
+            current.append(item)
+            current_tokens += tokens
+
+        if current:
+            # Never leave a lone item behind when merging is required
+            if len(current) < min_size and chunks:
+                chunks[-1].extend(current)
+            else:
+                chunks.append(current)
+        return chunks
+
+    async def _map(
+        self, domain: str, reports: List[Dict[str, Any]], semaphore: asyncio.Semaphore
+    ) -> Dict[str, Any]:
+        user_message = f"""Domain: {domain}
+
+Bottleneck reports:
+{encode_table(reports, _REPORT_FIELDS)}
+
+Return the group summary as a JSON object following the specified structure."""
+
+        async with semaphore:
+            response_text = await self.call_model(
+                MAP_SYSTEM_PROMPT, user_message, self.summary_max_tokens
+            )
+        return self._parse_summary(response_text, [domain], reports)
+
+    async def _reduce(
+        self, summaries: List[Dict[str, Any]], semaphore: asyncio.Semaphore
+    ) -> Dict[str, Any]:
+        user_message = f"""Group summaries:
+{_compact(summaries)}
+
+Return the merged summary as a JSON object following the specified structure."""
+
+        domains = sorted({d for s in summaries for d in s.get("domains", [])})
+        bottlenecks = [b for s in summaries for b in s.get("top_bottlenecks", [])]
+
+        async with semaphore:
+            response_text = await self.call_model(
+                REDUCE_SYSTEM_PROMPT, user_message, self.summary_max_tokens
+            )
+        return self._parse_summary(response_text, domains, bottlenecks)
+
+    def _parse_summary(
+        self,
+        response_text: str,
+        domains: List[str],
+        bottlenecks: List[Dict[str, Any]],
+    ) -> Dict[str, Any]:
+        """Parse a summary, falling back to a local one on bad output"""
+        try:
+            summary = json.loads(response_text)
+            if not isinstance(summary, dict):
+                raise ValueError("summary is not an object")
+        except (json.JSONDecodeError, ValueError) as e:
+            logger.warning(f"Unparseable group summary, using local fallback: {e}")
+            summary = {
+                "summary": f"{len(bottlenecks)} bottleneck(s) reported",
+                "top_bottlenecks": sorted(
+                    bottlenecks,
+                    key=lambda x: x.get("impact_score", 0) * x.get("confidence", 0.5),
+                    reverse=True,
+                )[:5],
+            }
+
+        summary.setdefault("domains", domains)
+        summary.setdefault("summary", "")
+        summary.setdefault("top_bottlenecks", [])
+        summary.setdefault("conflicts", [])
+        summary.setdefault("recommended_actions", [])
+        return summary
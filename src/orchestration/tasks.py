@@ -0,0 +1,126 @@
+"""
+Job handlers for diagnosis and orchestration.
+
+Actions are not jobs: the executor claims them from the action queue.
+
+An "orchestrate" job fans out into one "diagnose" child job per agent,
+waits for all of them (on any worker), then synthesizes the plan:
+
+    orchestrate (fan_out) -> diagnose x N -> orchestrate (synthesize)
+"""
+
+import asyncio
+import logging
+from typing import Callable, Dict, Any, List, Tuple
+
+from src.orchestration.freshness import DiagnosisGate
+from src.orchestration.worker import JobHandler, WaitForChildren
+from src.storage.cost_ledger import cycle
+
+logger = logging.getLogger(__name__)
+
+# (agent_id, domain) -> SubAgent
+AgentFactory = Callable[[str, str], Any]
+
+# Diagnoses run before queued orchestrations
+DIAGNOSE_PRIORITY = 3
+
+SYNTHESIS_LOCK = "orchestration:synthesize"
+
+
+async def synthesize_plan(
+    db, orchestrator
+) -> Tuple[Dict[str, Any], int, List[Dict[str, Any]]]:
+    """
+    Synthesize the latest reports into a stored plan.
+
+    Runs under an advisory lock, so syntheses started by different
+    processes (workers, schedulers) take turns; the later one sees the
+    plan the earlier one stored and reuses it if nothing changed.
+
+    Returns:
+        (plan, plan_id, reports)
+    """
+    lock = await asyncio.to_thread(db.acquire_advisory_lock, SYNTHESIS_LOCK)
+    try:
+        reports = db.get_all_agent_reports()
+        previous_plan = db.get_latest_orchestration_result()
+        plan = await orchestrator.synthesize(reports, previous_plan=previous_plan)
+
+        if plan.get("cached") and previous_plan:
+            db.restamp_orchestration_result(previous_plan["id"], plan["week"])
+            plan_id = previous_plan["id"]
+        else:
+            plan_id = db.save_orchestration_result(plan).id
+        return plan, plan_id, reports
+    finally:
+        await asyncio.to_thread(db.release_advisory_lock, lock)
+
+
+def build_handlers(
+    db, queue, agent_factory: AgentFactory, orchestrator
+) -> Dict[str, JobHandler]:
+    """
+    Create the handlers a worker registers.
+
+    Args:
+        db: Connected PostgresClient
+        queue: JobQueue used to fan out child jobs
+        agent_factory: Builds a SubAgent from agent_id and domain
+        orchestrator: OrchestratorAgent used for synthesis
+    """
+
+    async def diagnose(job, worker):
+        payload = job["payload"]
+        agent_id = payload["agent_id"]
+        agent = agent_factory(agent_id, payload["domain"])
+
+        agent_info = db.get_agent_state(agent_id) or {"agent_id": agent_id}
+        check = DiagnosisGate(force=payload.get("force", False)).check(
+            agent, agent_info
+        )
+        if check.skip:
+            return {"agent_id": agent_id, "skipped": True}
+
+        # A cycle's diagnoses are its child jobs: spend goes to the parent
+        with cycle(job.get("parent_id")):
+            bottleneck = await agent.diagnose()
+        db.save_bottleneck(agent_id, bottleneck)
+        db.update_agent_last_run(agent_id, check.fingerprint)
+        return {"agent_id": agent_id, "skipped": False, "bottleneck": bottleneck}
+
+    async def orchestrate(job, worker):
+        payload = dict(job["payload"])
+
+        if payload.get("stage", "fan_out") == "fan_out":
+            children = [
+                {
+                    "kind": "diagnose",
+                    "payload": {
+                        "agent_id": agent_info["agent_id"],
+                        "domain": agent_info["domain"],
+                        "force": payload.get("force", False)
+                        or agent_info["agent_id"] in payload.get("force_agents", []),
+                    },
+                    "priority": DIAGNOSE_PRIORITY,
+                }
+                for agent_info in db.get_all_agents()
+            ]
+            if children:
+                queue.enqueue_many(children, parent_id=job["id"])
+                logger.info(f"Job {job['id']} fanned out {len(children)} diagnoses")
+                raise WaitForChildren({**payload, "stage": "synthesize"})
+
+        # Every diagnosis finished (or was dead-lettered): synthesize
+        with cycle(job["id"]):
+            plan, plan_id, reports = await synthesize_plan(db, orchestrator)
+
+        return {
+            "plan_id": plan_id,
+            "cached": bool(plan.get("cached")),
+            "reports": len(reports),
+            "top_bottleneck": (plan.get("top_bottleneck") or {}).get("description"),
+            "weekly_plan_items": len(plan.get("weekly_plan", [])),
+        }
+
+    return {"diagnose": diagnose, "orchestrate": orchestrate}
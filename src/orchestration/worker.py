@@ -0,0 +1,190 @@
+"""
+Worker process for the Postgres job queue.
+
+A worker runs a fixed number of concurrent slots. Each slot claims one
+job at a time, runs the handler registered for its kind while a
+background heartbeat keeps the lease alive, and records the outcome.
+Run as many workers, on as many hosts, as the workload needs: claiming
+uses SKIP LOCKED, so workers never contend for the same job.
+"""
+
+import os
+import socket
+import asyncio
+import logging
+from typing import Awaitable, Callable, Dict, Any, Optional
+
+from src.observability.telemetry import get_tracer, record_metric
+
+logger = logging.getLogger(__name__)
+
+# (job, worker) -> result stored on the job
+JobHandler = Callable[[Dict[str, Any], "Worker"], Awaitable[Optional[Dict[str, Any]]]]
+
+
+class WaitForChildren(Exception):
+    """
+    Raised by a handler that enqueued child jobs and must resume later.
+
+    The job is parked until its last child finishes, then claimed again
+    with the given payload (e.g. recording the next stage).
+    """
+
+    def __init__(self, payload: Dict[str, Any]):
+        super().__init__("Waiting for child jobs")
+        self.payload = payload
+
+
+class Worker:
+    """
+    Claims and runs jobs with a fixed number of concurrent slots.
+
+    Usage:
+        worker = Worker(JobQueue(db), {"diagnose": handle_diagnose}, concurrency=4)
+        await worker.run(stop_event)
+    """
+
+    def __init__(
+        self,
+        queue,
+        handlers: Dict[str, JobHandler],
+        worker_id: str = None,
+        concurrency: int = 4,
+        lease_seconds: float = 120,
+        poll_interval: float = 1.0,
+    ):
+        """
+        Args:
+            queue: JobQueue
+            handlers: Coroutine per job kind
+            worker_id: Unique name of this worker (default: host:pid)
+            concurrency: Jobs run at the same time
+            lease_seconds: Lease length; heartbeats renew it every third of it
+            poll_interval: Seconds an idle slot waits before claiming again
+        """
+        self.queue = queue
+        self.handlers = handlers
+        self.worker_id = worker_id or f"{socket.gethostname()}:{os.getpid()}"
+        self.concurrency = concurrency
+        self.lease_seconds = lease_seconds
+        self.poll_interval = poll_interval
+        self.processed = 0
+        self.failed = 0
+
+    async def run(self, stop: asyncio.Event = None) -> None:
+        """Run all slots until stop is set; in-flight jobs are finished first"""
+        stop = stop or asyncio.Event()
+        logger.info(
+            f"Worker {self.worker_id} started "
+            f"({self.concurrency} slots, kinds: {', '.join(sorted(self.handlers))})"
+        )
+        await asyncio.gather(*(self._slot(stop) for _ in range(self.concurrency)))
+        logger.info(
+            f"Worker {self.worker_id} stopped after {self.processed} job(s), "
+            f"{self.failed} failure(s)"
+        )
+
+    async def run_until_empty(self) -> int:
+        """Process jobs until none are runnable; returns the number processed"""
+        before = self.processed + self.failed
+        while await self.process_next():
+            pass
+        return self.processed + self.failed - before
+
+    async def _slot(self, stop: asyncio.Event) -> None:
+        while not stop.is_set():
+            try:
+                worked = await self.process_next()
+            except Exception as e:
+                # Database hiccups shouldn't kill the slot
+                logger.error(f"Worker slot error: {e}", exc_info=True)
+                worked = False
+
+            if not worked:
+                try:
+                    await asyncio.wait_for(stop.wait(), timeout=self.poll_interval)
+                except asyncio.TimeoutError:
+                    pass
+
+    async def process_next(self) -> bool:
+        """Claim and run one job; returns False when nothing was runnable"""
+        jobs = await asyncio.to_thread(
+            self.queue.claim, self.worker_id, 1, self.lease_seconds
+        )
+        if not jobs:
+            return False
+        await self._process(jobs[0])
+        return True
+
+    async def _process(self, job: Dict[str, Any]) -> None:
+        job_id = job["id"]
+        handler = self.handlers.get(job["kind"])
+
+        with get_tracer().start_as_current_span("worker.job") as span:
+            span.set_attribute("job.id", job_id)
+            span.set_attribute("job.kind", job["kind"])
+            span.set_attribute("job.attempt", job["attempts"])
+
+            if handler is None:
+                await asyncio.to_thread(
+                    self.queue.fail,
+                    job_id,
+                    self.worker_id,
+                    f"No handler for job kind '{job['kind']}'",
+                )
+                self.failed += 1
+                return
+
+            task = asyncio.create_task(handler(job, self))
+            heartbeat = asyncio.create_task(self._heartbeat(job_id, task))
+            loop = asyncio.get_running_loop()
+            started = loop.time()
+            try:
+                result = await task
+            except WaitForChildren as waiting:
+                await asyncio.to_thread(
+                    self.queue.wait_for_children,
+                    job_id,
+                    self.worker_id,
+                    waiting.payload,
+                )
+                logger.info(f"Job {job_id} waiting for child jobs")
+                return
+            except asyncio.CancelledError:
+                if not (heartbeat.done() and heartbeat.result()):
+                    raise
+                # Lease lost: another worker owns the job now
+                self.failed += 1
+                return
+            except Exception as e:
+                status = await asyncio.to_thread(
+                    self.queue.fail, job_id, self.worker_id, f"{type(e).__name__}: {e}"
+                )
+                span.set_attribute("error", True)
+                logger.error(f"Job {job_id} ({job['kind']}) failed: {e} -> {status}")
+                self.failed += 1
+                return
+            finally:
+                heartbeat.cancel()
+                record_metric(
+                    "worker.job_seconds", loop.time() - started, {"kind": job["kind"]}
+                )
+
+            await asyncio.to_thread(self.queue.complete, job_id, self.worker_id, result)
+            self.processed += 1
+
+    async def _heartbeat(self, job_id: int, task: asyncio.Task) -> bool:
+        """
+        Renew the lease while the handler runs.
+
+        If the lease is lost the handler is cancelled and True returned.
+        """
+        while True:
+            await asyncio.sleep(self.lease_seconds / 3)
+            held = await asyncio.to_thread(
+                self.queue.heartbeat, job_id, self.worker_id, self.lease_seconds
+            )
+            if not held:
+                logger.warning(f"Lost lease on job {job_id}, cancelling it")
+                task.cancel()
+                return True
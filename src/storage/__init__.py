@@ -1,6 +1,6 @@
 """Storage layer for Sentinel."""
 
-from .models import Base, Agent, Bottleneck, Action, OrchestratorPlan, DecisionLog, NotionSync
+from .models import Base, Agent, Bottleneck, Action, OrchestratorPlan, DecisionLog, NotionSync, Job, TableVersion
 from .postgres_client import PostgresClient
 from .notion_client import NotionClient
 
@@ -12,6 +12,8 @@ __all__ = [
     'OrchestratorPlan',
     'DecisionLog',
     'NotionSync',
+    'Job',
+    'TableVersion',
     'PostgresClient',
     'NotionClient',
 ]
@@ -0,0 +1,242 @@
+"""
+Queue operations over the actions table.
+
+Actions are logged as "queued" (e.g. by POST /execute) and consumed by
+the ActionExecutor. Claiming locks candidate rows with FOR UPDATE SKIP
+LOCKED, so several executors can share the table; outcomes are written
+back in batches with a single bulk UPDATE.
+"""
+
+import logging
+from datetime import datetime, timedelta
+from typing import Dict, Any, Iterable, List, Optional, Tuple
+
+from sqlalchemy import select, update
+
+from .models import Action, Agent
+
+logger = logging.getLogger(__name__)
+
+# Candidate rows locked per slot, so saturated agents don't starve the claim
+CLAIM_WINDOW = 4
+
+PERCENTILES = (50, 90, 99)
+
+# (action_type, queued_at, started_at, completed_at)
+TimingRow = Tuple[str, datetime, datetime, datetime]
+
+
+def _action_dict(action: Action, domain: str = None) -> Dict[str, Any]:
+    return {
+        "id": action.id,
+        "agent_id": action.agent_id,
+        "domain": domain,
+        "action_type": action.action_type,
+        "description": action.description,
+        "parameters": action.parameters or {},
+        "status": action.status,
+        "priority": action.priority,
+        "queued_at": action.queued_at.isoformat() if action.queued_at else None,
+        "started_at": action.started_at.isoformat() if action.started_at else None,
+        "completed_at": (
+            action.completed_at.isoformat() if action.completed_at else None
+        ),
+        "result": action.result,
+        "error": action.error,
+    }
+
+
+def latency_summary(rows: Iterable[TimingRow]) -> Dict[str, Dict[str, Any]]:
+    """
+    Queue latency and execution time percentiles per action type.
+
+    Returns:
+        {action_type: {"count": n, "queue_seconds": {"p50": ..}, "execution_seconds": {..}}}
+    """
+    import numpy as np
+
+    by_type: Dict[str, List[Tuple[float, float]]] = {}
+    for action_type, queued_at, started_at, completed_at in rows:
+        if not (queued_at and started_at and completed_at):
+            continue
+        by_type.setdefault(action_type, []).append(
+            (
+                (started_at - queued_at).total_seconds(),
+                (completed_at - started_at).total_seconds(),
+            )
+        )
+
+    summary = {}
+    for action_type, samples in sorted(by_type.items()):
+        timings = np.array(samples)
+        queue_p = np.percentile(timings[:, 0], PERCENTILES)
+        exec_p = np.percentile(timings[:, 1], PERCENTILES)
+        summary[action_type] = {
+            "count": len(samples),
+            "queue_seconds": {
+                f"p{p}": round(float(v), 3) for p, v in zip(PERCENTILES, queue_p)
+            },
+            "execution_seconds": {
+                f"p{p}": round(float(v), 3) for p, v in zip(PERCENTILES, exec_p)
+            },
+        }
+    return summary
+
+
+class ActionQueue:
+    """
+    Action queue operations over a connected PostgresClient.
+
+    Usage:
+        actions = ActionQueue(db)
+        for action in actions.claim(4, running={"research-01": 1}, per_agent_limit=2):
+            ...
+        actions.record([{"id": action["id"], "status": "completed", ...}])
+    """
+
+    def __init__(self, db):
+        self.db = db
+
+    def depth(self) -> int:
+        """Number of actions waiting to be claimed"""
+        session = self.db.Session()
+        try:
+            return session.query(Action).filter_by(status="queued").count()
+        finally:
+            session.close()
+
+    def claim(
+        self,
+        limit: int,
+        running: Dict[str, int] = None,
+        per_agent_limit: int = None,
+    ) -> List[Dict[str, Any]]:
+        """
+        Mark up to limit queued actions as executing, by priority.
+
+        Lower priority values run first, then oldest first.
+
+        Args:
+            limit: Most actions to claim
+            running: Actions this executor already runs, per agent
+            per_agent_limit: Most actions running at once for one agent
+        """
+        if limit <= 0:
+            return []
+        running = dict(running or {})
+
+        session = self.db.Session()
+        try:
+            query = (
+                select(Action, Agent.domain)
+                .join(Agent, Agent.agent_id == Action.agent_id)
+                .where(Action.status == "queued")
+                .order_by(Action.priority, Action.queued_at, Action.id)
+                .limit(limit * CLAIM_WINDOW)
+                .with_for_update(skip_locked=True, of=Action)
+            )
+            if per_agent_limit:
+                saturated = [a for a, n in running.items() if n >= per_agent_limit]
+                if saturated:
+                    query = query.where(Action.agent_id.notin_(saturated))
+
+            now = datetime.utcnow()
+            claimed = []
+            for action, domain in session.execute(query).all():
+                if len(claimed) >= limit:
+                    break
+                if (
+                    per_agent_limit
+                    and running.get(action.agent_id, 0) >= per_agent_limit
+                ):
+                    continue
+                running[action.agent_id] = running.get(action.agent_id, 0) + 1
+                action.status = "executing"
+                action.started_at = now
+                claimed.append((action, domain))
+                self._publish(session, action.id, "executing", action.agent_id)
+
+            session.commit()
+            return [_action_dict(action, domain) for action, domain in claimed]
+        finally:
+            session.close()
+
+    def record(self, outcomes: List[Dict[str, Any]]) -> int:
+        """
+        Write finished actions back in one transaction.
+
+        Each outcome holds the action "id" plus the columns to set
+        (status, completed_at, result, error).
+        """
+        if not outcomes:
+            return 0
+        session = self.db.Session()
+        try:
+            session.execute(update(Action), outcomes)
+            for outcome in outcomes:
+                if "status" in outcome:
+                    self._publish(session, outcome["id"], outcome["status"])
+            session.commit()
+            return len(outcomes)
+        finally:
+            session.close()
+
+    def requeue_stale(self, older_than_seconds: float) -> int:
+        """Re-queue actions left executing by an executor that died"""
+        session = self.db.Session()
+        try:
+            cutoff = datetime.utcnow() - timedelta(seconds=older_than_seconds)
+            stale = [
+                action_id
+                for (action_id,) in session.query(Action.id).filter(
+                    Action.status == "executing", Action.started_at < cutoff
+                )
+            ]
+            count = (
+                session.query(Action)
+                .filter(Action.id.in_(stale), Action.status == "executing")
+                .update(
+                    {"status": "queued", "started_at": None},
+                    synchronize_session=False,
+                )
+            )
+            for action_id in stale:
+                self._publish(session, action_id, "queued")
+            session.commit()
+            if count:
+                logger.warning(f"Re-queued {count} stale action(s)")
+            return count
+        finally:
+            session.close()
+
+    def _publish(self, session, action_id: int, status: str, agent_id: str = None):
+        # Status change event, sent when the transaction commits
+        data = {"id": action_id, "status": status}
+        if agent_id:
+            data["agent_id"] = agent_id
+        self.db.publish_event("action", data, session=session)
+
+    def get(self, action_id: int) -> Optional[Dict[str, Any]]:
+        """Get one action"""
+        session = self.db.Session()
+        try:
+            action = session.get(Action, action_id)
+            return _action_dict(action) if action else None
+        finally:
+            session.close()
+
+    def latency_stats(self, since: datetime = None) -> Dict[str, Dict[str, Any]]:
+        """Percentiles per action type over finished actions (optionally recent)"""
+        session = self.db.Session()
+        try:
+            query = session.query(
+                Action.action_type,
+                Action.queued_at,
+                Action.started_at,
+                Action.completed_at,
+            ).filter(Action.completed_at.isnot(None))
+            if since:
+                query = query.filter(Action.completed_at >= since)
+            return latency_summary(query.all())
+        finally:
+            session.close()
@@ -0,0 +1,401 @@
+"""
+Token and cost ledger for Claude calls, with rolling budgets.
+
+Every Claude call (BaseAgent.call_claude, and batch results) is recorded
+as an llm_calls row with its token counts and cost. Rows are buffered
+and written in batches: once FLUSH_SIZE are pending, or FLUSH_SECONDS
+after the first one, and at exit.
+
+Budgets cap an agent's or a project's spend over a rolling window
+(e.g. $5 per 24 hours). call_claude checks them before dispatching and
+raises BudgetExceeded instead of calling Claude once one is used up.
+Budgets come from project configs (init-project) and are re-read every
+BUDGET_REFRESH_SECONDS; spend is summed from the ledger, including rows
+not flushed yet, so one process can't overshoot between flushes.
+
+Processes that call Claude install a ledger with setup_ledger(db);
+without one, calls are neither recorded nor limited.
+"""
+
+import atexit
+import logging
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from datetime import datetime, timedelta
+from typing import Any, Dict, List, Optional, Tuple
+
+from sqlalchemy import func, insert
+
+from src.observability import metrics
+
+from .models import Agent, Budget, LLMCall
+
+logger = logging.getLogger(__name__)
+
+# USD per million tokens: (input, output, cache read, cache write),
+# matched by model name prefix
+MODEL_PRICES: Dict[str, Tuple[float, float, float, float]] = {
+    "claude-opus-4": (15.0, 75.0, 1.5, 18.75),
+    "claude-sonnet-4": (3.0, 15.0, 0.3, 3.75),
+    "claude-3-7-sonnet": (3.0, 15.0, 0.3, 3.75),
+    "claude-3-5-sonnet": (3.0, 15.0, 0.3, 3.75),
+    "claude-haiku-4": (1.0, 5.0, 0.1, 1.25),
+    "claude-3-5-haiku": (0.8, 4.0, 0.08, 1.0),
+    "claude-3-haiku": (0.25, 1.25, 0.03, 0.3),
+}
+DEFAULT_PRICES = MODEL_PRICES["claude-sonnet-4"]
+
+# Message Batches API calls cost half
+BATCH_DISCOUNT = 0.5
+
+# Buffered rows written at once, and the longest a row waits
+FLUSH_SIZE = 50
+FLUSH_SECONDS = 5.0
+
+# Seconds between re-reads of the budgets table
+BUDGET_REFRESH_SECONDS = 60.0
+
+# Columns `sentinel costs` can group by
+GROUP_BY = ("agent_id", "domain", "project", "cycle_id", "model", "day")
+
+# Orchestration cycle the current task's calls belong to
+_cycle: ContextVar[Optional[str]] = ContextVar("sentinel_cycle", default=None)
+
+_ledger: Optional["CostLedger"] = None
+
+
+class BudgetExceeded(Exception):
+    """A budget covering this call is used up"""
+
+    def __init__(self, scope: str, name: str, spent: float, budget: Budget):
+        self.scope = scope
+        self.name = name
+        self.spent = spent
+        self.limit_usd = budget.limit_usd
+        self.window_hours = budget.window_hours
+        super().__init__(
+            f"{scope.capitalize()} {name} spent ${spent:.2f} of its "
+            f"${budget.limit_usd:.2f} budget in the last {budget.window_hours:g}h"
+        )
+
+
+def model_prices(model: str) -> Tuple[float, float, float, float]:
+    """Per-million-token prices for a model (Sonnet's if unknown)"""
+    for prefix in sorted(MODEL_PRICES, key=len, reverse=True):
+        if model.startswith(prefix):
+            return MODEL_PRICES[prefix]
+    return DEFAULT_PRICES
+
+
+def call_cost(
+    model: str,
+    input_tokens: int,
+    output_tokens: int,
+    cache_read_tokens: int = 0,
+    cache_write_tokens: int = 0,
+    batch: bool = False,
+) -> float:
+    """Cost of one call in USD"""
+    prices = model_prices(model)
+    tokens = (input_tokens, output_tokens, cache_read_tokens, cache_write_tokens)
+    cost = sum(n * price for n, price in zip(tokens, prices)) / 1_000_000
+    return cost * BATCH_DISCOUNT if batch else cost
+
+
+@contextmanager
+def cycle(cycle_id):
+    """Attribute Claude calls made inside (this task and its children) to a cycle"""
+    token = _cycle.set(str(cycle_id) if cycle_id is not None else None)
+    try:
+        yield
+    finally:
+        _cycle.reset(token)
+
+
+def setup_ledger(db) -> "CostLedger":
+    """Install the ledger call_claude records to (one per process)"""
+    global _ledger
+
+    if _ledger is None or _ledger.db is not db:
+        if _ledger is not None:
+            _ledger.flush()
+        _ledger = CostLedger(db)
+    return _ledger
+
+
+def get_ledger() -> Optional["CostLedger"]:
+    """The installed ledger, or None"""
+    return _ledger
+
+
+@atexit.register
+def _flush_at_exit() -> None:
+    if _ledger is not None:
+        _ledger.flush()
+
+
+class CostLedger:
+    """
+    Records Claude calls and enforces budgets over a connected PostgresClient.
+
+    Usage:
+        ledger = CostLedger(db)
+        ledger.check("research-01")  # Raises BudgetExceeded
+        ledger.record("research-01", model, response.usage, domain="research")
+        ledger.flush()
+    """
+
+    def __init__(
+        self,
+        db,
+        flush_size: int = FLUSH_SIZE,
+        flush_seconds: float = FLUSH_SECONDS,
+        clock=time.monotonic,
+    ):
+        self.db = db
+        self.flush_size = flush_size
+        self.flush_seconds = flush_seconds
+        self.clock = clock
+        self._lock = threading.Lock()
+        self._pending: List[Dict[str, Any]] = []
+        self._timer: Optional[threading.Timer] = None
+        # Budgets and agent projects, re-read every BUDGET_REFRESH_SECONDS
+        self._budgets: Dict[Tuple[str, str], Budget] = {}
+        self._projects: Dict[str, str] = {}
+        self._loaded_at: Optional[float] = None
+
+    def record(
+        self,
+        agent_id: str,
+        model: str,
+        usage,
+        domain: str = None,
+        batch: bool = False,
+    ) -> float:
+        """
+        Buffer a call's usage (a Claude response's usage block).
+
+        Returns:
+            The call's cost in USD
+        """
+        row = {
+            "agent_id": agent_id,
+            "domain": domain,
+            "project": self._project(agent_id),
+            "cycle_id": _cycle.get(),
+            "model": model,
+            "input_tokens": usage.input_tokens or 0,
+            "output_tokens": usage.output_tokens or 0,
+            "cache_read_tokens": getattr(usage, "cache_read_input_tokens", None) or 0,
+            "cache_write_tokens": (
+                getattr(usage, "cache_creation_input_tokens", None) or 0
+            ),
+            "batch": batch,
+            "created_at": datetime.utcnow(),
+        }
+        row["cost_usd"] = call_cost(
+            model,
+            row["input_tokens"],
+            row["output_tokens"],
+            row["cache_read_tokens"],
+            row["cache_write_tokens"],
+            batch,
+        )
+        metrics.record(
+            "claude.cost", row["cost_usd"], {"agent.id": agent_id, "model": model}
+        )
+
+        with self._lock:
+            self._pending.append(row)
+            full = len(self._pending) >= self.flush_size
+            if not full and self._timer is None:
+                self._timer = threading.Timer(self.flush_seconds, self.flush)
+                self._timer.daemon = True
+                self._timer.start()
+        if full:
+            self.flush()
+        return row["cost_usd"]
+
+    def flush(self) -> int:
+        """Write buffered rows; returns how many"""
+        with self._lock:
+            rows, self._pending = self._pending, []
+            if self._timer is not None:
+                self._timer.cancel()
+                self._timer = None
+        if not rows:
+            return 0
+
+        session = self.db.Session()
+        try:
+            session.execute(insert(LLMCall), rows)
+            session.commit()
+        except Exception as e:
+            session.rollback()
+            logger.error(f"Failed to write {len(rows)} ledger row(s): {e}")
+            with self._lock:
+                self._pending[:0] = rows  # Retried with the next flush
+            return 0
+        finally:
+            session.close()
+        return len(rows)
+
+    def check(self, agent_id: str) -> None:
+        """Raise BudgetExceeded if the agent's or its project's budget is spent"""
+        self._refresh()
+        scopes = [("agent", agent_id)]
+        project = self._projects.get(agent_id)
+        if project:
+            scopes.append(("project", project))
+
+        for scope, name in scopes:
+            budget = self._budgets.get((scope, name))
+            if budget is None:
+                continue
+            spent = self.spent(scope, name, budget.window_hours)
+            if spent >= budget.limit_usd:
+                metrics.record("errors", 1, {"component": "budget", "scope": scope})
+                raise BudgetExceeded(scope, name, spent, budget)
+
+    def spent(self, scope: str, name: str, window_hours: float) -> float:
+        """USD spent by an agent or project in the last window_hours"""
+        column = LLMCall.agent_id if scope == "agent" else LLMCall.project
+        since = datetime.utcnow() - timedelta(hours=window_hours)
+        session = self.db.Session()
+        try:
+            total = (
+                session.query(func.coalesce(func.sum(LLMCall.cost_usd), 0.0))
+                .filter(column == name, LLMCall.created_at >= since)
+                .scalar()
+            )
+        finally:
+            session.close()
+
+        key = "agent_id" if scope == "agent" else "project"
+        with self._lock:
+            total += sum(
+                r["cost_usd"]
+                for r in self._pending
+                if r[key] == name and r["created_at"] >= since
+            )
+        return float(total)
+
+    def set_budget(
+        self, scope: str, name: str, limit_usd: float, window_hours: float = 24.0
+    ) -> None:
+        """Create or replace the budget for an agent or project"""
+        if scope not in ("agent", "project"):
+            raise ValueError(f"Unknown budget scope: {scope}")
+        session = self.db.Session()
+        try:
+            budget = session.query(Budget).filter_by(scope=scope, name=name).first()
+            if budget is None:
+                budget = Budget(scope=scope, name=name)
+                session.add(budget)
+            budget.limit_usd = limit_usd
+            budget.window_hours = window_hours
+            budget.updated_at = datetime.utcnow()
+            session.commit()
+        finally:
+            session.close()
+        self._loaded_at = None  # Takes effect in this process now
+
+    def budgets(self) -> List[Dict[str, Any]]:
+        """Every budget with its current spend"""
+        self._refresh(force=True)
+        return [
+            {
+                "scope": scope,
+                "name": name,
+                "limit_usd": budget.limit_usd,
+                "window_hours": budget.window_hours,
+                "spent_usd": self.spent(scope, name, budget.window_hours),
+            }
+            for (scope, name), budget in sorted(self._budgets.items())
+        ]
+
+    def summary(
+        self, since: datetime = None, group_by: str = "agent_id"
+    ) -> List[Dict[str, Any]]:
+        """
+        Calls, tokens and cost per group, most expensive first.
+
+        Args:
+            since: Only calls made at or after this time (UTC)
+            group_by: One of GROUP_BY
+        """
+        if group_by not in GROUP_BY:
+            raise ValueError(f"Can't group by {group_by}")
+        self.flush()
+
+        if group_by == "day":
+            key = func.date(LLMCall.created_at)
+        else:
+            key = getattr(LLMCall, group_by)
+
+        session = self.db.Session()
+        try:
+            query = session.query(
+                key,
+                func.count(LLMCall.id),
+                func.sum(LLMCall.input_tokens),
+                func.sum(LLMCall.output_tokens),
+                func.sum(LLMCall.cache_read_tokens),
+                func.sum(LLMCall.cost_usd),
+            ).group_by(key)
+            if since is not None:
+                query = query.filter(LLMCall.created_at >= since)
+            rows = query.all()
+        finally:
+            session.close()
+
+        return sorted(
+            (
+                {
+                    group_by: str(group) if group is not None else None,
+                    "calls": calls,
+                    "input_tokens": int(input_tokens or 0),
+                    "output_tokens": int(output_tokens or 0),
+                    "cache_read_tokens": int(cache_read or 0),
+                    "cost_usd": float(cost or 0.0),
+                }
+                for group, calls, input_tokens, output_tokens, cache_read, cost in rows
+            ),
+            key=lambda row: row["cost_usd"],
+            reverse=True,
+        )
+
+    def _project(self, agent_id: str) -> Optional[str]:
+        self._refresh()
+        return self._projects.get(agent_id)
+
+    def _refresh(self, force: bool = False) -> None:
+        now = self.clock()
+        if (
+            not force
+            and self._loaded_at is not None
+            and now - self._loaded_at < BUDGET_REFRESH_SECONDS
+        ):
+            return
+
+        session = self.db.Session()
+        try:
+            budgets = session.query(Budget).all()
+            projects = (
+                session.query(Agent.agent_id, Agent.project)
+                .filter(Agent.project.isnot(None))
+                .all()
+            )
+            session.expunge_all()
+        except Exception as e:
+            # e.g. a database from before budgets: keep what we had
+            logger.warning(f"Failed to load budgets: {e}")
+            self._loaded_at = now
+            return
+        finally:
+            session.close()
+        self._budgets = {(b.scope, b.name): b for b in budgets}
+        self._projects = dict(projects)
+        self._loaded_at = now
@@ -0,0 +1,198 @@
+"""
+Change events from every Sentinel process, for push updates.
+
+Writers publish events in their transactions (PostgresClient.
+publish_event): bottleneck saves, agent runs, security ingests, plan
+saves and action status changes. On PostgreSQL these are NOTIFYs, so an
+EventBus in each server process LISTENs on one dedicated connection and
+sees every event once it commits, whichever worker, executor or
+scheduler made the write. Elsewhere (SQLite) only this process's events
+are seen.
+
+Events are deltas, {"event": kind, "data": {...}}; clients load
+GET /dashboard/snapshot first and apply them to it. A subscriber that
+falls too far behind gets a "resync" event instead of the ones it
+missed, and should re-read the snapshot.
+"""
+
+import json
+import asyncio
+import logging
+from contextlib import contextmanager
+from typing import Any, Dict, Iterable, Optional, Set
+
+from src.storage.postgres_client import EVENTS_CHANNEL
+
+logger = logging.getLogger(__name__)
+
+# Events a subscriber may have waiting before it is told to resync
+MAX_PENDING = 1000
+
+# Seconds between attempts to re-open a lost LISTEN connection
+RECONNECT_SECONDS = 2.0
+
+RESYNC = {"event": "resync", "data": {}}
+
+
+class Subscription:
+    """One subscriber's queue of events"""
+
+    def __init__(self, kinds: Optional[Set[str]], max_pending: int):
+        self.kinds = kinds
+        self.queue: "asyncio.Queue[Dict[str, Any]]" = asyncio.Queue(max_pending)
+
+    def put(self, event: Dict[str, Any]) -> bool:
+        """Queue an event if wanted; False if the backlog had to be dropped"""
+        if self.kinds and event["event"] not in self.kinds | {"resync"}:
+            return True
+        if self.queue.full():
+            # Too far behind: drop the backlog and have it re-read instead
+            while not self.queue.empty():
+                self.queue.get_nowait()
+            self.queue.put_nowait(RESYNC)
+            return False
+        self.queue.put_nowait(event)
+        return True
+
+    async def get(self, timeout: float = None) -> Optional[Dict[str, Any]]:
+        """Next event, or None after timeout seconds without one"""
+        try:
+            return await asyncio.wait_for(self.queue.get(), timeout)
+        except asyncio.TimeoutError:
+            return None
+
+
+class EventBus:
+    """
+    Fans change events out to this process's subscribers.
+
+    Usage:
+        bus = EventBus(db)
+        await bus.start()
+        with bus.subscribe({"bottleneck", "plan"}) as events:
+            event = await events.get(timeout=15)
+        await bus.stop()
+    """
+
+    def __init__(self, db, max_pending: int = MAX_PENDING):
+        self.db = db
+        self.max_pending = max_pending
+        self.subscriptions: Set[Subscription] = set()
+        self.loop: Optional[asyncio.AbstractEventLoop] = None
+        self._conn = None
+        self._reconnect: Optional[asyncio.Task] = None
+        self.counts = {"received": 0, "resyncs": 0, "reconnects": 0}
+
+    @property
+    def listening(self) -> bool:
+        """Whether events from other processes are being received"""
+        return self._conn is not None
+
+    async def start(self) -> None:
+        self.loop = asyncio.get_running_loop()
+        if self.db.engine.dialect.name != "postgresql":
+            self.db.event_listeners.append(self._receive_threadsafe)
+            return
+        try:
+            self._listen()
+        except Exception as e:
+            logger.warning(f"Event bus can't LISTEN yet, retrying: {e}")
+            self._reconnect = asyncio.create_task(self._reconnect_loop())
+
+    async def stop(self) -> None:
+        if self._reconnect:
+            self._reconnect.cancel()
+        if self._receive_threadsafe in self.db.event_listeners:
+            self.db.event_listeners.remove(self._receive_threadsafe)
+        self._close()
+
+    @contextmanager
+    def subscribe(self, kinds: Iterable[str] = None):
+        """Subscription to events of the given kinds (all if None)"""
+        subscription = Subscription(set(kinds) if kinds else None, self.max_pending)
+        self.subscriptions.add(subscription)
+        try:
+            yield subscription
+        finally:
+            self.subscriptions.discard(subscription)
+
+    def publish(self, event: Dict[str, Any]) -> None:
+        """Deliver an event to every subscriber (on the event loop)"""
+        self.counts["received"] += 1
+        for subscription in list(self.subscriptions):
+            if not subscription.put(event):
+                self.counts["resyncs"] += 1
+
+    def _receive(self, payload: str) -> None:
+        try:
+            event = json.loads(payload)
+        except ValueError:
+            logger.warning(f"Ignoring malformed event: {payload[:100]}")
+            return
+        self.publish(event)
+
+    def _receive_threadsafe(self, payload: str) -> None:
+        # Local events are committed from whatever thread did the write
+        self.loop.call_soon_threadsafe(self._receive, payload)
+
+    def _listen(self) -> None:
+        # A dedicated connection outside the pool, in autocommit mode
+        conn = self.db.engine.raw_connection()
+        pg = conn.driver_connection
+        conn.detach()
+        try:
+            pg.autocommit = True
+            with pg.cursor() as cursor:
+                cursor.execute(f"LISTEN {EVENTS_CHANNEL}")
+        except Exception:
+            pg.close()
+            raise
+        self._conn = pg
+        self.loop.add_reader(pg.fileno(), self._on_readable)
+        logger.info(f"Listening for events on {EVENTS_CHANNEL}")
+
+    def _on_readable(self) -> None:
+        try:
+            self._conn.poll()
+        except Exception as e:
+            logger.warning(f"Lost event connection: {e}")
+            self._close()
+            # Events may have been missed while it was down
+            self.publish(RESYNC)
+            self._reconnect = asyncio.create_task(self._reconnect_loop())
+            return
+
+        while self._conn.notifies:
+            self._receive(self._conn.notifies.pop(0).payload)
+
+    async def _reconnect_loop(self) -> None:
+        while True:
+            await asyncio.sleep(RECONNECT_SECONDS)
+            try:
+                self._listen()
+            except Exception as e:
+                logger.warning(f"Event bus reconnect failed: {e}")
+                continue
+            self.counts["reconnects"] += 1
+            self.publish(RESYNC)
+            return
+
+    def _close(self) -> None:
+        if self._conn is None:
+            return
+        try:
+            self.loop.remove_reader(self._conn.fileno())
+        except Exception:
+            pass  # Already closed underneath
+        try:
+            self._conn.close()
+        except Exception:
+            pass
+        self._conn = None
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            **self.counts,
+            "subscribers": len(self.subscriptions),
+            "listening": self.listening,
+        }
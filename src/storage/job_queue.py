@@ -0,0 +1,418 @@
+"""
+Durable job queue on PostgreSQL.
+
+Workers claim jobs with SELECT ... FOR UPDATE SKIP LOCKED, so any number
+of worker processes on any number of hosts can poll the same table
+without blocking each other or double-claiming a job. A claimed job is
+leased: the worker extends the lease with heartbeats, and a job whose
+lease expires (its worker died) becomes claimable again. Failed jobs are
+retried with exponential backoff until max_attempts, then dead-lettered.
+
+Jobs can fan out into child jobs: a parent that waits on its children
+goes to "waiting" and is re-queued once the last child finishes.
+"""
+
+import logging
+from datetime import datetime, timedelta
+from typing import Dict, Any, List, Optional, Tuple
+
+from sqlalchemy import and_, func, or_, select
+
+from .models import Job
+
+logger = logging.getLogger(__name__)
+
+TERMINAL_STATUSES = ("succeeded", "dead")
+
+# Retry backoff: base * 2^(attempt - 1), capped
+RETRY_BASE_SECONDS = 5
+RETRY_MAX_SECONDS = 600
+
+
+def _job_dict(job: Job) -> Dict[str, Any]:
+    return {
+        "id": job.id,
+        "kind": job.kind,
+        "payload": job.payload or {},
+        "status": job.status,
+        "priority": job.priority,
+        "attempts": job.attempts,
+        "max_attempts": job.max_attempts,
+        "parent_id": job.parent_id,
+        "locked_by": job.locked_by,
+        "result": job.result,
+        "error": job.error,
+        "created_at": job.created_at.isoformat() if job.created_at else None,
+        "started_at": job.started_at.isoformat() if job.started_at else None,
+        "completed_at": job.completed_at.isoformat() if job.completed_at else None,
+    }
+
+
+class JobQueue:
+    """
+    Job queue operations over a connected PostgresClient.
+
+    Usage:
+        queue = JobQueue(db)
+        job_id = queue.enqueue("diagnose", {"agent_id": "research-01"})
+        for job in queue.claim("worker-1", limit=4, lease_seconds=60):
+            ...
+            queue.complete(job["id"], "worker-1", result)
+    """
+
+    def __init__(self, db):
+        self.db = db
+
+    def enqueue(
+        self,
+        kind: str,
+        payload: Dict[str, Any] = None,
+        priority: int = 5,
+        max_attempts: int = 3,
+        parent_id: int = None,
+    ) -> int:
+        """Add a job; returns its ID"""
+        return self.enqueue_many(
+            [{"kind": kind, "payload": payload, "priority": priority}],
+            max_attempts=max_attempts,
+            parent_id=parent_id,
+        )[0]
+
+    def enqueue_many(
+        self,
+        jobs: List[Dict[str, Any]],
+        max_attempts: int = 3,
+        parent_id: int = None,
+    ) -> List[int]:
+        """Add several jobs in one transaction; returns their IDs"""
+        session = self.db.Session()
+        try:
+            rows = [
+                Job(
+                    kind=job["kind"],
+                    payload=job.get("payload") or {},
+                    priority=job.get("priority", 5),
+                    max_attempts=max_attempts,
+                    parent_id=parent_id,
+                    run_after=datetime.utcnow(),
+                )
+                for job in jobs
+            ]
+            session.add_all(rows)
+            session.commit()
+            return [row.id for row in rows]
+        finally:
+            session.close()
+
+    def enqueue_unique(
+        self,
+        kind: str,
+        payload: Dict[str, Any] = None,
+        priority: int = 5,
+        max_attempts: int = 3,
+    ) -> Tuple[int, bool]:
+        """
+        Add a top-level job unless one of the same kind is unfinished.
+
+        An advisory lock on the kind makes the check and insert atomic
+        across processes, so concurrent requests on different server
+        workers can't both start one.
+
+        Returns:
+            (job_id, created); job_id is the unfinished job's if not created
+        """
+        session = self.db.Session()
+        try:
+            self.db.advisory_xact_lock(session, f"jobs:{kind}")
+            existing = (
+                session.query(Job.id)
+                .filter(
+                    Job.kind == kind,
+                    Job.parent_id.is_(None),
+                    Job.status.notin_(TERMINAL_STATUSES),
+                )
+                .order_by(Job.id)
+                .first()
+            )
+            if existing:
+                session.commit()
+                return existing.id, False
+
+            job = Job(
+                kind=kind,
+                payload=payload or {},
+                priority=priority,
+                max_attempts=max_attempts,
+                run_after=datetime.utcnow(),
+            )
+            session.add(job)
+            session.commit()
+            return job.id, True
+        finally:
+            session.close()
+
+    def claim(
+        self, worker_id: str, limit: int = 1, lease_seconds: float = 60
+    ) -> List[Dict[str, Any]]:
+        """
+        Lease up to limit runnable jobs to a worker.
+
+        Runnable jobs are queued jobs whose backoff has passed, and running
+        jobs whose lease expired. Rows locked by other workers' claims are
+        skipped rather than waited on.
+        """
+        session = self.db.Session()
+        try:
+            now = datetime.utcnow()
+            rows = (
+                session.execute(
+                    select(Job)
+                    .where(
+                        or_(
+                            and_(Job.status == "queued", Job.run_after <= now),
+                            and_(Job.status == "running", Job.lease_expires_at < now),
+                        )
+                    )
+                    .order_by(Job.priority, Job.id)
+                    .limit(limit)
+                    .with_for_update(skip_locked=True)
+                )
+                .scalars()
+                .all()
+            )
+
+            claimed = []
+            for job in rows:
+                if job.status == "running" and job.attempts >= job.max_attempts:
+                    # Its worker died on the last attempt
+                    self._dead_letter(session, job, "Lease expired on final attempt")
+                    continue
+                if job.status == "running":
+                    logger.warning(f"Reclaiming job {job.id} from {job.locked_by}")
+
+                job.status = "running"
+                job.attempts = (job.attempts or 0) + 1
+                job.locked_by = worker_id
+                job.lease_expires_at = now + timedelta(seconds=lease_seconds)
+                job.heartbeat_at = now
+                job.started_at = job.started_at or now
+                claimed.append(job)
+
+            session.commit()
+            return [_job_dict(job) for job in claimed]
+        finally:
+            session.close()
+
+    def heartbeat(self, job_id: int, worker_id: str, lease_seconds: float = 60) -> bool:
+        """Extend a lease; returns False if the worker no longer holds it"""
+        session = self.db.Session()
+        try:
+            now = datetime.utcnow()
+            updated = (
+                session.query(Job)
+                .filter_by(id=job_id, locked_by=worker_id, status="running")
+                .update(
+                    {
+                        "heartbeat_at": now,
+                        "lease_expires_at": now + timedelta(seconds=lease_seconds),
+                    },
+                    synchronize_session=False,
+                )
+            )
+            session.commit()
+            return updated == 1
+        finally:
+            session.close()
+
+    def complete(
+        self, job_id: int, worker_id: str, result: Dict[str, Any] = None
+    ) -> bool:
+        """Mark a leased job succeeded; returns False if the lease was lost"""
+        session = self.db.Session()
+        try:
+            job = self._owned(session, job_id, worker_id)
+            if not job:
+                return False
+            job.status = "succeeded"
+            job.result = result
+            job.error = None
+            job.completed_at = datetime.utcnow()
+            job.locked_by = None
+            job.lease_expires_at = None
+            self._release_parent(session, job.parent_id)
+            session.commit()
+            return True
+        finally:
+            session.close()
+
+    def fail(self, job_id: int, worker_id: str, error: str) -> Optional[str]:
+        """
+        Record a failed attempt.
+
+        Returns:
+            The job's new status ("queued" for a retry, "dead" when out of
+            attempts), or None if the lease was lost
+        """
+        session = self.db.Session()
+        try:
+            job = self._owned(session, job_id, worker_id)
+            if not job:
+                return None
+
+            if job.attempts >= job.max_attempts:
+                self._dead_letter(session, job, error)
+            else:
+                delay = min(
+                    RETRY_BASE_SECONDS * 2 ** (job.attempts - 1), RETRY_MAX_SECONDS
+                )
+                job.status = "queued"
+                job.error = error
+                job.run_after = datetime.utcnow() + timedelta(seconds=delay)
+                job.locked_by = None
+                job.lease_expires_at = None
+                logger.warning(
+                    f"Job {job.id} failed (attempt {job.attempts}), retrying in {delay}s"
+                )
+
+            session.commit()
+            return job.status
+        finally:
+            session.close()
+
+    def wait_for_children(
+        self, job_id: int, worker_id: str, payload: Dict[str, Any] = None
+    ) -> bool:
+        """
+        Park a leased job until all of its children finish.
+
+        The payload is replaced (e.g. to record the next stage). If the
+        children already finished, the job is re-queued immediately.
+        """
+        session = self.db.Session()
+        try:
+            job = self._owned(session, job_id, worker_id, lock=True)
+            if not job:
+                return False
+            if payload is not None:
+                job.payload = payload
+            job.status = "waiting"
+            job.locked_by = None
+            job.lease_expires_at = None
+            session.flush()
+            self._release_parent(session, job.id)
+            session.commit()
+            return True
+        finally:
+            session.close()
+
+    def get(self, job_id: int) -> Optional[Dict[str, Any]]:
+        """Get one job, with a count of its children by status"""
+        session = self.db.Session()
+        try:
+            job = session.get(Job, job_id)
+            if not job:
+                return None
+            data = _job_dict(job)
+            data["children"] = dict(
+                session.query(Job.status, func.count(Job.id))
+                .filter(Job.parent_id == job_id)
+                .group_by(Job.status)
+                .all()
+            )
+            return data
+        finally:
+            session.close()
+
+    def children(self, parent_id: int) -> List[Dict[str, Any]]:
+        """Child jobs of a parent, oldest first"""
+        session = self.db.Session()
+        try:
+            rows = (
+                session.query(Job)
+                .filter(Job.parent_id == parent_id)
+                .order_by(Job.id)
+                .all()
+            )
+            return [_job_dict(job) for job in rows]
+        finally:
+            session.close()
+
+    def stats(self) -> Dict[str, Dict[str, int]]:
+        """Job counts by kind and status"""
+        session = self.db.Session()
+        try:
+            counts: Dict[str, Dict[str, int]] = {}
+            for kind, status, count in (
+                session.query(Job.kind, Job.status, func.count(Job.id))
+                .group_by(Job.kind, Job.status)
+                .all()
+            ):
+                counts.setdefault(kind, {})[status] = count
+            return counts
+        finally:
+            session.close()
+
+    def requeue_dead(self, kind: str = None) -> int:
+        """Give dead-lettered jobs a fresh set of attempts"""
+        session = self.db.Session()
+        try:
+            query = session.query(Job).filter_by(status="dead")
+            if kind:
+                query = query.filter_by(kind=kind)
+            # Clear the last failure, so the job doesn't look finished
+            count = query.update(
+                {
+                    "status": "queued",
+                    "attempts": 0,
+                    "run_after": datetime.utcnow(),
+                    "error": None,
+                    "completed_at": None,
+                },
+                synchronize_session=False,
+            )
+            session.commit()
+            return count
+        finally:
+            session.close()
+
+    def _owned(self, session, job_id: int, worker_id: str, lock: bool = False):
+        query = session.query(Job).filter_by(
+            id=job_id, locked_by=worker_id, status="running"
+        )
+        if lock:
+            query = query.with_for_update()
+        job = query.first()
+        if not job:
+            logger.warning(f"Worker {worker_id} no longer holds job {job_id}")
+        return job
+
+    def _dead_letter(self, session, job: Job, error: str) -> None:
+        job.status = "dead"
+        job.error = error
+        job.completed_at = datetime.utcnow()
+        job.locked_by = None
+        job.lease_expires_at = None
+        logger.error(f"Job {job.id} ({job.kind}) dead-lettered: {error}")
+        self._release_parent(session, job.parent_id)
+
+    def _release_parent(self, session, parent_id: Optional[int]) -> None:
+        """Re-queue a waiting parent once none of its children are pending"""
+        if parent_id is None:
+            return
+
+        # Lock the parent so concurrent children see each other's updates
+        parent = session.query(Job).filter_by(id=parent_id).with_for_update().first()
+        if not parent or parent.status != "waiting":
+            return
+
+        session.flush()
+        pending = (
+            session.query(func.count(Job.id))
+            .filter(Job.parent_id == parent_id)
+            .filter(Job.status.notin_(TERMINAL_STATUSES))
+            .scalar()
+        )
+        if pending == 0:
+            parent.status = "queued"
+            parent.attempts = 0
+            parent.run_after = datetime.utcnow()
@@ -13,6 +13,7 @@ from sqlalchemy import (
     Text,
     Boolean,
     ForeignKey,
+    UniqueConstraint,
 )
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import relationship
@@ -33,6 +34,8 @@ class Agent(Base):
     autonomy_level = Column(String(50), default="diagnostic")
     created_at = Column(DateTime, default=datetime.utcnow)
     last_run = Column(DateTime)
+    input_fingerprint = Column(String(64))  # Digest of inputs at last_run
+    project = Column(String(100), index=True)  # From init-project, for budgets
     is_active = Column(Boolean, default=True)
     metrics = Column(JSON)
 
@@ -88,7 +91,7 @@ class Action(Base):
     status = Column(
         String(50), default="queued"
     )  # queued, executing, completed, failed
-    priority = Column(Integer, default=5)  # 1-10
+    priority = Column(Integer, default=5)  # 1-10, lower runs first
     queued_at = Column(DateTime, default=datetime.utcnow)
     started_at = Column(DateTime)
     completed_at = Column(DateTime)
@@ -116,6 +119,8 @@ class OrchestratorPlan(Base):
     resource_allocation = Column(JSON)
     weekly_plan = Column(JSON)
     cross_domain_conflicts = Column(JSON)
+    input_fingerprint = Column(String(64), index=True)  # Hash of input reports
+    report_digests = Column(JSON)  # Per-report digests, for incremental updates
     created_at = Column(DateTime, default=datetime.utcnow)
 
     def __repr__(self):
@@ -158,8 +163,91 @@ class NotionSync(Base):
         return f"<NotionSync(entity_type='{self.entity_type}', status='{self.sync_status}')>"
 
 
+class Job(Base):
+    """Durable work queue shared by worker processes"""
+
+    __tablename__ = "jobs"
+
+    id = Column(Integer, primary_key=True)
+    kind = Column(String(50), nullable=False, index=True)  # diagnose, orchestrate
+    payload = Column(JSON)
+    status = Column(
+        String(20), default="queued", nullable=False, index=True
+    )  # queued, running, waiting, succeeded, dead
+    priority = Column(Integer, default=5)  # Lower runs first
+    attempts = Column(Integer, default=0)
+    max_attempts = Column(Integer, default=3)
+    run_after = Column(DateTime, default=datetime.utcnow, index=True)
+    locked_by = Column(String(100))  # Worker holding the lease
+    lease_expires_at = Column(DateTime)
+    heartbeat_at = Column(DateTime)
+    parent_id = Column(Integer, ForeignKey("jobs.id"), index=True)
+    result = Column(JSON)
+    error = Column(Text)
+    created_at = Column(DateTime, default=datetime.utcnow)
+    started_at = Column(DateTime)
+    completed_at = Column(DateTime)
+
+    def __repr__(self):
+        return f"<Job(id={self.id}, kind='{self.kind}', status='{self.status}')>"
+
+
+class LLMCall(Base):
+    """Token and cost ledger: one row per Claude call"""
+
+    __tablename__ = "llm_calls"
+
+    id = Column(Integer, primary_key=True)
+    agent_id = Column(String(100), nullable=False, index=True)
+    domain = Column(String(100))
+    project = Column(String(100), index=True)
+    cycle_id = Column(String(100), index=True)  # Orchestration cycle, if any
+    model = Column(String(100), nullable=False)
+    input_tokens = Column(Integer, default=0, nullable=False)
+    output_tokens = Column(Integer, default=0, nullable=False)
+    cache_read_tokens = Column(Integer, default=0, nullable=False)
+    cache_write_tokens = Column(Integer, default=0, nullable=False)
+    cost_usd = Column(Float, default=0.0, nullable=False)
+    batch = Column(Boolean, default=False)  # Message Batches API (discounted)
+    created_at = Column(DateTime, default=datetime.utcnow, index=True)
+
+    def __repr__(self):
+        return f"<LLMCall(agent_id='{self.agent_id}', cost_usd={self.cost_usd:.4f})>"
+
+
+class Budget(Base):
+    """Rolling spend limit for an agent or a project"""
+
+    __tablename__ = "budgets"
+    __table_args__ = (UniqueConstraint("scope", "name"),)
+
+    id = Column(Integer, primary_key=True)
+    scope = Column(String(20), nullable=False)  # agent, project
+    name = Column(String(100), nullable=False)  # agent_id or project name
+    limit_usd = Column(Float, nullable=False)
+    window_hours = Column(Float, default=24.0, nullable=False)
+    updated_at = Column(DateTime, default=datetime.utcnow)
+
+    def __repr__(self):
+        return f"<Budget({self.scope}='{self.name}', limit_usd={self.limit_usd})>"
+
+
+class TableVersion(Base):
+    """Per-table write counters, bumped in the same transaction as writes"""
+
+    __tablename__ = "table_versions"
+
+    table_name = Column(String(100), primary_key=True)
+    version = Column(Integer, default=0, nullable=False)
+    updated_at = Column(DateTime, default=datetime.utcnow)
+
+    def __repr__(self):
+        return f"<TableVersion(table='{self.table_name}', version={self.version})>"
+
+
 class SecurityVulnerabilityModel(Base):
     """Storage for aggregated security findings"""
+
     __tablename__ = 'security_vulnerabilities'
 
     id = Column(Integer, primary_key=True)
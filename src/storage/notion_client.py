@@ -8,8 +8,6 @@ import logging
 from datetime import datetime
 from typing import Dict, Any, Optional
 
-from notion_client import Client
-
 logger = logging.getLogger(__name__)
 
 
@@ -24,6 +22,9 @@ class NotionClient:
         if not self.api_key:
             raise ValueError("NOTION_API_KEY not set in environment")
 
+        # Deferred: the SDK (and httpx) only load when Notion is used
+        from notion_client import Client
+
         self.client = Client(auth=self.api_key)
         logger.info(f"Initialized Notion client for {self.workspace_name}")
 
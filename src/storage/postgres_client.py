@@ -4,13 +4,18 @@ PostgreSQL client for managing Sentinel state.
 
 import os
 import json
+import time
+import hashlib
 import logging
+from contextlib import contextmanager
 from datetime import datetime
-from typing import Dict, Any, List, Optional
+from typing import Dict, Any, List, Optional, Tuple
 
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, event, func, inspect, text
+from sqlalchemy.engine import make_url
 from sqlalchemy.orm import sessionmaker
 
+from src.observability import metrics
 from .models import (
     Base,
     Agent,
@@ -20,10 +25,77 @@ from .models import (
     DecisionLog,
     NotionSync,
     SecurityVulnerabilityModel,
+    TableVersion,
 )
 
 logger = logging.getLogger(__name__)
 
+# NOTIFY channel carrying change events to every server process
+EVENTS_CHANNEL = "sentinel_events"
+
+# Postgres caps NOTIFY payloads at 8000 bytes
+MAX_EVENT_BYTES = 7900
+
+# (table, column) added to tables that existing databases already have;
+# create_all() skips existing tables, so init_db() adds these itself
+ADDED_COLUMNS = (
+    ("orchestrator_plans", "input_fingerprint"),
+    ("orchestrator_plans", "report_digests"),
+    ("agents", "input_fingerprint"),
+    ("agents", "project"),
+)
+
+
+def _pool_options(db_url: str) -> Dict[str, Any]:
+    """
+    Connection pool sized for SENTINEL_DIAGNOSE_CONCURRENCY.
+
+    A running diagnosis holds an advisory lock connection plus one for
+    its reads and writes; the overflow serves every other request.
+    """
+    if make_url(db_url).get_backend_name() != "postgresql":
+        return {}
+    slots = int(os.getenv("SENTINEL_DIAGNOSE_CONCURRENCY", "8"))
+    return {"pool_size": 2 * slots, "max_overflow": 10}
+
+
+def _advisory_lock_id(key: str) -> int:
+    # pg advisory locks take a bigint key
+    return int.from_bytes(hashlib.sha256(key.encode()).digest()[:8], "big", signed=True)
+
+
+def _query_operation(statement: str) -> str:
+    # SELECT, INSERT, ...: low cardinality, unlike the statement itself
+    return statement.lstrip().split(None, 1)[0].upper() if statement.strip() else ""
+
+
+def _start_query_timer(conn, cursor, statement, parameters, context, executemany):
+    conn.info.setdefault("query_start", []).append(time.perf_counter())
+
+
+def _record_query(conn, cursor, statement, parameters, context, executemany):
+    elapsed = time.perf_counter() - conn.info["query_start"].pop()
+    metrics.record(
+        "db.query.duration",
+        elapsed,
+        {"db.system": conn.dialect.name, "db.operation": _query_operation(statement)},
+    )
+
+
+def _record_query_error(context):
+    starts = context.connection.info.get("query_start") if context.connection else None
+    if starts:
+        starts.pop()
+    metrics.record(
+        "errors",
+        1,
+        {
+            "component": "db",
+            "error.type": type(context.original_exception).__name__,
+            "db.operation": _query_operation(context.statement or ""),
+        },
+    )
+
 
 class PostgresClient:
     """Client for PostgreSQL operations"""
@@ -35,12 +107,22 @@ class PostgresClient:
 
         self.engine = None
         self.Session = None
+        # Versioned-table writes made by this process (see bump_versions)
+        self.write_generation = 0
+        # Called with each committed event's payload when not on PostgreSQL
+        self.event_listeners: List = []
 
     def connect(self):
         """Connect to database"""
         try:
-            self.engine = create_engine(self.db_url)
+            self.engine = create_engine(self.db_url, **_pool_options(self.db_url))
             self.Session = sessionmaker(bind=self.engine)
+            event.listen(self.Session, "after_commit", self._deliver_local_events)
+            event.listen(self.Session, "after_rollback", self._drop_local_events)
+            # Query latency and errors for db.query.duration / errors
+            event.listen(self.engine, "before_cursor_execute", _start_query_timer)
+            event.listen(self.engine, "after_cursor_execute", _record_query)
+            event.listen(self.engine, "handle_error", _record_query_error)
             logger.info("Connected to PostgreSQL")
         except Exception as e:
             logger.error(f"Failed to connect to database: {e}")
@@ -50,11 +132,243 @@ class PostgresClient:
         """Initialize database schema (create all tables)"""
         try:
             Base.metadata.create_all(self.engine)
+            self._add_missing_columns()
+            self._seed_table_versions()
             logger.info("Database schema initialized")
         except Exception as e:
             logger.error(f"Failed to initialize database: {e}")
             raise
 
+    def acquire_advisory_lock(self, key: str):
+        """
+        Block until this process holds the advisory lock for key.
+
+        Returns a handle for release_advisory_lock. Locks are session-level
+        and held on a dedicated connection; on databases without advisory
+        locks (SQLite in tests) this is a no-op.
+        """
+        if self.engine.dialect.name != "postgresql":
+            return None
+        lock_id = _advisory_lock_id(key)
+        conn = self.engine.connect()
+        try:
+            conn.execute(text("SELECT pg_advisory_lock(:id)"), {"id": lock_id})
+            conn.commit()
+        except Exception:
+            conn.close()
+            raise
+        return conn, lock_id
+
+    def try_advisory_lock(self, key: str) -> Tuple[bool, Any]:
+        """
+        Take the advisory lock for key unless another session holds it.
+
+        Returns (acquired, handle); release with release_advisory_lock. The
+        lock lasts until released or until its connection drops (e.g. the
+        process dies). Without advisory locks (SQLite) it is always acquired.
+        """
+        if self.engine.dialect.name != "postgresql":
+            return True, None
+        lock_id = _advisory_lock_id(key)
+        conn = self.engine.connect()
+        try:
+            acquired = conn.execute(
+                text("SELECT pg_try_advisory_lock(:id)"), {"id": lock_id}
+            ).scalar()
+            conn.commit()
+        except Exception:
+            conn.close()
+            raise
+        if not acquired:
+            conn.close()
+            return False, None
+        return True, (conn, lock_id)
+
+    def advisory_xact_lock(self, session, key: str) -> None:
+        """Hold the advisory lock for key until session's transaction ends"""
+        if self.engine.dialect.name != "postgresql":
+            return
+        session.execute(
+            text("SELECT pg_advisory_xact_lock(:id)"), {"id": _advisory_lock_id(key)}
+        )
+
+    def advisory_lock_alive(self, handle) -> bool:
+        """Whether a held lock's connection is still open (so the lock is held)"""
+        if handle is None:
+            return True
+        conn, _ = handle
+        try:
+            conn.execute(text("SELECT 1"))
+            conn.commit()
+            return True
+        except Exception:
+            return False
+
+    def release_advisory_lock(self, handle) -> None:
+        """Release a lock from acquire_advisory_lock"""
+        if handle is None:
+            return
+        conn, lock_id = handle
+        try:
+            conn.execute(text("SELECT pg_advisory_unlock(:id)"), {"id": lock_id})
+            conn.commit()
+        finally:
+            conn.close()
+
+    # Tables whose versions back the API response cache
+    VERSIONED_TABLES = (
+        "agents",
+        "bottlenecks",
+        "security_vulnerabilities",
+        "orchestrator_plans",
+    )
+
+    def _add_missing_columns(self):
+        """Add ADDED_COLUMNS (and their indexes) to tables created before them"""
+        inspector = inspect(self.engine)
+        with self.engine.begin() as conn:
+            for table_name, column_name in ADDED_COLUMNS:
+                existing = {c["name"] for c in inspector.get_columns(table_name)}
+                if column_name in existing:
+                    continue
+
+                table = Base.metadata.tables[table_name]
+                column = table.c[column_name]
+                ddl = column.type.compile(dialect=self.engine.dialect)
+                # Backfill existing rows with the model's default
+                if column.default is not None and column.default.is_scalar:
+                    ddl += f" DEFAULT {column.default.arg!r}"
+                if_not_exists = (
+                    "IF NOT EXISTS " if self.engine.dialect.name == "postgresql" else ""
+                )
+                conn.execute(
+                    text(
+                        f"ALTER TABLE {table_name} "
+                        f"ADD COLUMN {if_not_exists}{column_name} {ddl}"
+                    )
+                )
+                for index in table.indexes:
+                    if column_name in index.columns:
+                        index.create(conn, checkfirst=True)
+                logger.info(f"Added column {table_name}.{column_name}")
+
+    def _seed_table_versions(self):
+        session = self.Session()
+        try:
+            existing = {row.table_name for row in session.query(TableVersion).all()}
+            session.add_all(
+                TableVersion(table_name=table, version=0)
+                for table in self.VERSIONED_TABLES
+                if table not in existing
+            )
+            session.commit()
+        finally:
+            session.close()
+
+    def bump_versions(self, session, *tables: str) -> None:
+        """
+        Increment table versions inside the caller's transaction.
+
+        Readers derive cache validators (ETags) from these counters, so
+        every write to a versioned table must bump it before committing.
+        """
+        now = datetime.utcnow()
+        for table in tables:
+            updated = (
+                session.query(TableVersion)
+                .filter_by(table_name=table)
+                .update(
+                    {"version": TableVersion.version + 1, "updated_at": now},
+                    synchronize_session=False,
+                )
+            )
+            if not updated:
+                session.add(TableVersion(table_name=table, version=1, updated_at=now))
+        self.write_generation += 1
+
+    def publish_event(self, kind: str, data: Dict[str, Any], session=None) -> None:
+        """
+        Publish a change event, such as a saved bottleneck.
+
+        Within session the event is sent only if its transaction commits;
+        without one it is sent at once. On PostgreSQL it is a NOTIFY on
+        EVENTS_CHANNEL, seen by every listening process (EventBus);
+        elsewhere it reaches this process's event_listeners.
+        """
+        payload = json.dumps({"event": kind, "data": data}, default=str)
+        if len(payload) > MAX_EVENT_BYTES:
+            # Keep what identifies the change; clients re-read the rest
+            ids = {k: v for k, v in data.items() if k in ("id", "agent_id")}
+            payload = json.dumps(
+                {"event": kind, "data": {**ids, "truncated": True}}, default=str
+            )
+
+        if session is None:
+            with self._session() as session:
+                self.publish_event(kind, data, session=session)
+                session.commit()
+            return
+
+        if self.engine.dialect.name == "postgresql":
+            session.execute(
+                text("SELECT pg_notify(:channel, :payload)"),
+                {"channel": EVENTS_CHANNEL, "payload": payload},
+            )
+        else:
+            session.info.setdefault("events", []).append(payload)
+
+    def _deliver_local_events(self, session) -> None:
+        for payload in session.info.pop("events", []):
+            for listener in self.event_listeners:
+                listener(payload)
+
+    def _drop_local_events(self, session) -> None:
+        session.info.pop("events", None)
+
+    def get_table_versions(self, tables, session=None) -> Dict[str, int]:
+        """Current versions of the given tables (0 if never written)"""
+        with self._session(session) as session:
+            rows = (
+                session.query(TableVersion.table_name, TableVersion.version)
+                .filter(TableVersion.table_name.in_(list(tables)))
+                .all()
+            )
+            versions = dict(rows)
+            return {table: versions.get(table, 0) for table in tables}
+
+    @contextmanager
+    def _session(self, session=None):
+        # The caller's session if given (left open), else a new one
+        if session is not None:
+            yield session
+            return
+        session = self.Session()
+        try:
+            yield session
+        finally:
+            session.close()
+
+    @contextmanager
+    def snapshot_session(self):
+        """
+        Session for reads that must agree with each other.
+
+        On PostgreSQL the reads run in one REPEATABLE READ, READ ONLY
+        transaction, so they all see the database as of the first one.
+        Pass it as session= to the get_* methods.
+        """
+        session = self.Session()
+        try:
+            if self.engine.dialect.name == "postgresql":
+                session.connection(
+                    execution_options={"isolation_level": "REPEATABLE READ"}
+                )
+                session.execute(text("SET TRANSACTION READ ONLY"))
+            yield session
+        finally:
+            session.rollback()
+            session.close()
+
     def close(self):
         """Close database connection"""
         if self.engine:
@@ -68,6 +382,7 @@ class PostgresClient:
         name: str = None,
         responsibilities: List[str] = None,
         autonomy_level: str = "diagnostic",
+        project: str = None,
     ) -> Agent:
         """Register a new agent"""
         session = self.Session()
@@ -76,6 +391,9 @@ class PostgresClient:
             existing = session.query(Agent).filter_by(agent_id=agent_id).first()
             if existing:
                 logger.info(f"Agent {agent_id} already registered")
+                if project and existing.project != project:
+                    existing.project = project
+                    session.commit()
                 return existing
 
             agent = Agent(
@@ -84,21 +402,39 @@ class PostgresClient:
                 name=name,
                 responsibilities=responsibilities or [],
                 autonomy_level=autonomy_level,
+                project=project,
             )
             session.add(agent)
+            self.bump_versions(session, "agents")
+            self.publish_event(
+                "agent",
+                {"agent_id": agent_id, "domain": domain, "name": name},
+                session=session,
+            )
             session.commit()
             logger.info(f"Registered agent: {agent_id}")
             return agent
         finally:
             session.close()
 
-    def update_agent_last_run(self, agent_id: str):
-        """Update agent's last_run timestamp to now"""
+    def update_agent_last_run(self, agent_id: str, input_fingerprint: str = None):
+        """Update agent's last_run timestamp to now, with the inputs it saw"""
         session = self.Session()
         try:
             agent = session.query(Agent).filter_by(agent_id=agent_id).first()
             if agent:
                 agent.last_run = datetime.now()
+                agent.input_fingerprint = input_fingerprint
+                self.bump_versions(session, "agents")
+                self.publish_event(
+                    "agent",
+                    {
+                        "agent_id": agent_id,
+                        "domain": agent.domain,
+                        "last_run": agent.last_run.isoformat(),
+                    },
+                    session=session,
+                )
                 session.commit()
                 logger.info(f"Updated last_run for {agent_id}")
         except Exception as e:
@@ -119,12 +455,97 @@ class PostgresClient:
                 recommended_action=bottleneck.get("recommended_action"),
             )
             session.add(bottleneck_obj)
+            self.bump_versions(session, "bottlenecks")
+            session.flush()
+            self._publish_bottleneck(session, bottleneck_obj)
             session.commit()
             logger.info(f"Saved bottleneck for {agent_id}")
             return bottleneck_obj
         finally:
             session.close()
 
+    def save_bottlenecks(self, items: List[Dict[str, Any]]) -> int:
+        """
+        Save several agents' bottlenecks in one transaction.
+
+        Items that carry "input_fingerprint" also mark their agent's run
+        (last_run and the inputs it saw), as update_agent_last_run does.
+
+        Args:
+            items: [{"agent_id": str, "bottleneck": {...}}, ...]
+
+        Returns:
+            Number of bottlenecks saved (all or none)
+        """
+        session = self.Session()
+        try:
+            bottlenecks = [
+                Bottleneck(
+                    agent_id=item["agent_id"],
+                    description=item["bottleneck"].get("description"),
+                    confidence=item["bottleneck"].get("confidence", 0.0),
+                    impact_score=item["bottleneck"].get("impact_score", 0.0),
+                    blocking=item["bottleneck"].get("blocking", []),
+                    recommended_action=item["bottleneck"].get("recommended_action"),
+                )
+                for item in items
+            ]
+            session.add_all(bottlenecks)
+            self.bump_versions(session, "bottlenecks")
+
+            runs = {
+                item["agent_id"]: item["input_fingerprint"]
+                for item in items
+                if "input_fingerprint" in item
+            }
+            if runs:
+                now = datetime.now()
+                agents = session.query(Agent).filter(Agent.agent_id.in_(runs)).all()
+                for agent in agents:
+                    agent.last_run = now
+                    agent.input_fingerprint = runs[agent.agent_id]
+                    self.publish_event(
+                        "agent",
+                        {
+                            "agent_id": agent.agent_id,
+                            "domain": agent.domain,
+                            "last_run": now.isoformat(),
+                        },
+                        session=session,
+                    )
+                if agents:
+                    self.bump_versions(session, "agents")
+
+            session.flush()
+            for bottleneck in bottlenecks:
+                self._publish_bottleneck(session, bottleneck)
+            session.commit()
+            logger.info(f"Saved {len(items)} bottleneck(s)")
+            return len(items)
+        except Exception:
+            session.rollback()
+            raise
+        finally:
+            session.close()
+
+    def _publish_bottleneck(self, session, bottleneck: Bottleneck) -> None:
+        # Shaped like a report's "bottleneck", so clients can patch it in
+        self.publish_event(
+            "bottleneck",
+            {
+                "agent_id": bottleneck.agent_id,
+                "bottleneck": {
+                    "description": bottleneck.description,
+                    "impact_score": bottleneck.impact_score,
+                    "confidence": bottleneck.confidence,
+                    "blocking": bottleneck.blocking or [],
+                    "recommended_action": bottleneck.recommended_action,
+                    "identified_at": bottleneck.identified_at.isoformat(),
+                },
+            },
+            session=session,
+        )
+
     def log_action(
         self,
         agent_id: str,
@@ -132,8 +553,9 @@ class PostgresClient:
         description: str = None,
         parameters: Dict = None,
         status: str = "queued",
+        priority: int = 5,
     ) -> Action:
-        """Log an action"""
+        """Log an action (queued actions are run by the ActionExecutor)"""
         session = self.Session()
         try:
             action = Action(
@@ -142,9 +564,23 @@ class PostgresClient:
                 description=description,
                 parameters=parameters or {},
                 status=status,
+                priority=priority,
             )
             session.add(action)
+            session.flush()
+            self.publish_event(
+                "action",
+                {
+                    "id": action.id,
+                    "agent_id": agent_id,
+                    "action_type": action_type,
+                    "status": status,
+                    "priority": priority,
+                },
+                session=session,
+            )
             session.commit()
+            session.refresh(action)
             logger.info(f"Logged action for {agent_id}: {action_type}")
             return action
         finally:
@@ -163,15 +599,37 @@ class PostgresClient:
                 "domain": agent.domain,
                 "name": agent.name,
                 "last_run": agent.last_run,
+                "input_fingerprint": agent.input_fingerprint,
                 "metrics": agent.metrics or {},
             }
         finally:
             session.close()
 
-    def get_all_agents(self) -> List[Dict[str, Any]]:
-        """Get all registered agents"""
+    def get_latest_bottleneck(self, agent_id: str) -> Optional[Dict[str, Any]]:
+        """Most recently identified bottleneck for an agent"""
         session = self.Session()
         try:
+            b = (
+                session.query(Bottleneck)
+                .filter_by(agent_id=agent_id)
+                .order_by(Bottleneck.identified_at.desc(), Bottleneck.id.desc())
+                .first()
+            )
+            if not b:
+                return None
+            return {
+                "description": b.description,
+                "confidence": b.confidence,
+                "impact_score": b.impact_score,
+                "blocking": b.blocking or [],
+                "recommended_action": b.recommended_action,
+            }
+        finally:
+            session.close()
+
+    def get_all_agents(self, session=None) -> List[Dict[str, Any]]:
+        """Get all registered agents"""
+        with self._session(session) as session:
             agents = session.query(Agent).filter_by(is_active=True).all()
             return [
                 {
@@ -179,20 +637,26 @@ class PostgresClient:
                     "domain": a.domain,
                     "name": a.name,
                     "last_run": a.last_run,
+                    "input_fingerprint": a.input_fingerprint,
                     "autonomy_level": a.autonomy_level,
                 }
                 for a in agents
             ]
-        finally:
-            session.close()
 
-    def get_all_agent_reports(self) -> List[Dict[str, Any]]:
+    def get_all_agent_reports(self, session=None) -> List[Dict[str, Any]]:
         """Get latest reports from all agents"""
-        session = self.Session()
-        try:
+        with self._session(session) as session:
             agents = session.query(Agent).filter_by(is_active=True).all()
             reports = []
 
+            # When each agent's oldest still-open bottleneck was identified
+            open_since = dict(
+                session.query(Bottleneck.agent_id, func.min(Bottleneck.identified_at))
+                .filter_by(status="open")
+                .group_by(Bottleneck.agent_id)
+                .all()
+            )
+
             for agent in agents:
                 # Get latest bottleneck
                 latest_bottleneck = (
@@ -210,6 +674,14 @@ class PostgresClient:
                             "description": latest_bottleneck.description,
                             "impact_score": latest_bottleneck.impact_score,
                             "confidence": latest_bottleneck.confidence,
+                            "blocking": latest_bottleneck.blocking or [],
+                            "recommended_action": latest_bottleneck.recommended_action,
+                            "identified_at": latest_bottleneck.identified_at.isoformat()
+                            if latest_bottleneck.identified_at
+                            else None,
+                            "open_since": open_since[agent.agent_id].isoformat()
+                            if open_since.get(agent.agent_id)
+                            else None,
                         }
                         if latest_bottleneck
                         else None,
@@ -218,8 +690,6 @@ class PostgresClient:
                 )
 
             return reports
-        finally:
-            session.close()
 
     def save_orchestration_result(self, plan: Dict[str, Any]) -> OrchestratorPlan:
         """Save orchestration result"""
@@ -232,14 +702,71 @@ class PostgresClient:
                 resource_allocation=plan.get("resource_allocation", {}),
                 weekly_plan=plan.get("weekly_plan", []),
                 cross_domain_conflicts=plan.get("cross_domain_conflicts", []),
+                input_fingerprint=plan.get("input_fingerprint"),
+                report_digests=plan.get("report_digests"),
             )
             session.add(plan_obj)
+            self.bump_versions(session, "orchestrator_plans")
+            session.flush()
+            self._publish_plan(session, plan_obj)
             session.commit()
+            session.refresh(plan_obj)  # Keep fields readable after close
             logger.info(f"Saved orchestration plan for week {plan.get('week')}")
             return plan_obj
         finally:
             session.close()
 
+    def get_latest_orchestration_result(self, session=None) -> Optional[Dict[str, Any]]:
+        """Get the most recently saved orchestration plan"""
+        with self._session(session) as session:
+            plan = (
+                session.query(OrchestratorPlan)
+                .order_by(OrchestratorPlan.created_at.desc())
+                .first()
+            )
+            if not plan:
+                return None
+
+            return {
+                "id": plan.id,
+                "week": plan.week,
+                "top_bottleneck": plan.top_bottleneck,
+                "priority_ranking": plan.priority_ranking or [],
+                "resource_allocation": plan.resource_allocation or {},
+                "weekly_plan": plan.weekly_plan or [],
+                "cross_domain_conflicts": plan.cross_domain_conflicts or [],
+                "input_fingerprint": plan.input_fingerprint,
+                "report_digests": plan.report_digests or {},
+                "created_at": plan.created_at.isoformat() if plan.created_at else None,
+            }
+
+    def _publish_plan(self, session, plan: OrchestratorPlan) -> None:
+        self.publish_event(
+            "plan",
+            {
+                "id": plan.id,
+                "week": plan.week,
+                "top_bottleneck": plan.top_bottleneck,
+                "created_at": plan.created_at.isoformat(),
+            },
+            session=session,
+        )
+
+    def restamp_orchestration_result(self, plan_id: int, week: str) -> None:
+        """Mark a stored plan as current without duplicating it"""
+        session = self.Session()
+        try:
+            plan = session.query(OrchestratorPlan).filter_by(id=plan_id).first()
+            if plan:
+                plan.week = week
+                plan.created_at = datetime.utcnow()
+                self.bump_versions(session, "orchestrator_plans")
+                self._publish_plan(session, plan)
+                session.commit()
+                logger.info(f"Re-stamped orchestration plan {plan_id} as {week}")
+        finally:
+            session.close()
+
     def log_decision(
         self,
         agent_id: str,
@@ -284,6 +811,7 @@ class PostgresClient:
                 existing.remediation = vulnerability.get('remediation')
                 existing.severity = vulnerability.get('severity', 'medium')
                 existing.identified_at = datetime.utcnow()
+                self.bump_versions(session, "security_vulnerabilities")
                 session.commit()
                 return existing
 
@@ -299,16 +827,16 @@ class PostgresClient:
                 identified_at=datetime.utcnow()
             )
             session.add(vuln_obj)
+            self.bump_versions(session, "security_vulnerabilities")
             session.commit()
             logger.info(f"Saved vulnerability from {vulnerability.get('source')}: {vulnerability.get('rule_id')}")
             return vuln_obj
         finally:
             session.close()
 
-    def get_security_summary(self) -> Dict[str, Any]:
+    def get_security_summary(self, session=None) -> Dict[str, Any]:
         """Get summary of all security findings"""
-        session = self.Session()
-        try:
+        with self._session(session) as session:
             vulns = session.query(SecurityVulnerabilityModel).filter_by(status='open').all()
             
             summary = {
@@ -322,13 +850,10 @@ class PostgresClient:
                 summary["counts_by_source"][v.source] = summary["counts_by_source"].get(v.source, 0) + 1
                 
             return summary
-        finally:
-            session.close()
 
-    def get_vulnerabilities(self, source: str = None, severity: str = None, limit: int = 100) -> List[Dict[str, Any]]:
+    def get_vulnerabilities(self, source: str = None, severity: str = None, limit: int = 100, session=None) -> List[Dict[str, Any]]:
         """Get list of security vulnerabilities"""
-        session = self.Session()
-        try:
+        with self._session(session) as session:
             query = session.query(SecurityVulnerabilityModel).filter_by(status='open')
             if source:
                 query = query.filter_by(source=source)
@@ -351,5 +876,3 @@ class PostgresClient:
                 }
                 for v in vulns
             ]
-        finally:
-            session.close()
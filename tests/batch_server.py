@@ -0,0 +1,157 @@
+"""
+Local stand-in for the Message Batches API used by batch-mode tests.
+
+Implements just enough of /v1/messages/batches for the anthropic SDK:
+create, retrieve and the JSONL results download. Batches report
+"in_progress" for a configurable number of polls before ending.
+"""
+
+import json
+import threading
+import uuid
+from datetime import datetime, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Callable, Dict, Optional
+
+
+def _now() -> str:
+    return datetime.now(timezone.utc).isoformat()
+
+
+class StubBatchServer:
+    """Threaded HTTP server emulating message batches"""
+
+    def __init__(
+        self,
+        responder: Callable[[Dict[str, Any]], Optional[str]],
+        polls_until_ended: int = 1,
+    ):
+        """
+        Args:
+            responder: Maps request params to response text; None errors the request
+            polls_until_ended: Retrieve calls answered "in_progress" before ending
+        """
+        self.responder = responder
+        self.polls_until_ended = polls_until_ended
+        self.batches: Dict[str, Dict[str, Any]] = {}
+        self.created = 0
+        self._server = ThreadingHTTPServer(("127.0.0.1", 0), self._handler())
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+
+    @property
+    def url(self) -> str:
+        host, port = self._server.server_address
+        return f"http://{host}:{port}"
+
+    def __enter__(self):
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self._server.shutdown()
+        self._server.server_close()
+
+    def _batch_body(self, batch_id: str) -> Dict[str, Any]:
+        batch = self.batches[batch_id]
+        ended = batch["polls"] > self.polls_until_ended
+        total = len(batch["requests"])
+        errored = sum(1 for r in batch["results"] if r["result"]["type"] != "succeeded")
+        return {
+            "id": batch_id,
+            "type": "message_batch",
+            "processing_status": "ended" if ended else "in_progress",
+            "request_counts": {
+                "processing": 0 if ended else total,
+                "succeeded": total - errored if ended else 0,
+                "errored": errored if ended else 0,
+                "canceled": 0,
+                "expired": 0,
+            },
+            "created_at": batch["created_at"],
+            "expires_at": batch["created_at"],
+            "ended_at": _now() if ended else None,
+            "archived_at": None,
+            "cancel_initiated_at": None,
+            "results_url": f"{self.url}/v1/messages/batches/{batch_id}/results"
+            if ended
+            else None,
+        }
+
+    def _create(self, body: Dict[str, Any]) -> Dict[str, Any]:
+        batch_id = f"msgbatch_{uuid.uuid4().hex[:12]}"
+        results = []
+        for request in body["requests"]:
+            text = self.responder(request["params"])
+            if text is None:
+                result = {
+                    "type": "errored",
+                    "error": {
+                        "type": "error",
+                        "error": {"type": "api_error", "message": "stub failure"},
+                    },
+                }
+            else:
+                result = {
+                    "type": "succeeded",
+                    "message": {
+                        "id": f"msg_{uuid.uuid4().hex[:12]}",
+                        "type": "message",
+                        "role": "assistant",
+                        "model": request["params"]["model"],
+                        "content": [{"type": "text", "text": text}],
+                        "stop_reason": "end_turn",
+                        "stop_sequence": None,
+                        "usage": {"input_tokens": 10, "output_tokens": 10},
+                    },
+                }
+            results.append({"custom_id": request["custom_id"], "result": result})
+
+        self.batches[batch_id] = {
+            "requests": body["requests"],
+            "results": results,
+            "polls": 0,
+            "created_at": _now(),
+        }
+        self.created += 1
+        return self._batch_body(batch_id)
+
+    def _handler(self):
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def log_message(self, *args):
+                pass
+
+            def _send(self, status: int, payload: str, content_type: str):
+                data = payload.encode()
+                self.send_response(status)
+                self.send_header("Content-Type", content_type)
+                self.send_header("Content-Length", str(len(data)))
+                self.end_headers()
+                self.wfile.write(data)
+
+            def do_POST(self):
+                if self.path.rstrip("/") != "/v1/messages/batches":
+                    return self._send(404, "{}", "application/json")
+                length = int(self.headers.get("Content-Length", 0))
+                body = json.loads(self.rfile.read(length))
+                self._send(200, json.dumps(stub._create(body)), "application/json")
+
+            def do_GET(self):
+                parts = self.path.strip("/").split("/")
+                batch_id = parts[3] if len(parts) > 3 else None
+                if batch_id not in stub.batches:
+                    return self._send(404, "{}", "application/json")
+
+                if len(parts) == 5 and parts[4] == "results":
+                    lines = "\n".join(
+                        json.dumps(r) for r in stub.batches[batch_id]["results"]
+                    )
+                    return self._send(200, lines, "application/binary")
+
+                stub.batches[batch_id]["polls"] += 1
+                self._send(
+                    200, json.dumps(stub._batch_body(batch_id)), "application/json"
+                )
+
+        return Handler
@@ -0,0 +1,46 @@
+"""
+Shared test setup
+"""
+
+import os
+
+import pytest
+
+from src.storage.postgres_client import PostgresClient
+
+# Nothing in the suite exports telemetry; tests that check spans or
+# metrics pass in-memory exporters and readers
+os.environ.setdefault("OTEL_TRACES_EXPORTER", "none")
+os.environ.setdefault("OTEL_METRICS_EXPORTER", "none")
+
+
+@pytest.fixture
+def make_db(tmp_path, monkeypatch):
+    """
+    Build a database on a throwaway SQLite file (no row locking).
+
+    DATABASE_URL points at the file, so other clients (e.g. the server's)
+    open the same database.
+
+    Usage:
+        db = make_db(("research-01", "research"), ("github-01", "github", "intel"))
+
+    Each agent is (agent_id, domain) or (agent_id, domain, project).
+    """
+    monkeypatch.setenv("DATABASE_URL", f"sqlite:///{tmp_path / 'sentinel.db'}")
+
+    def make(*agents) -> PostgresClient:
+        db = PostgresClient()
+        db.connect()
+        db.init_db()
+        for agent_id, domain, *project in agents:
+            db.register_agent(agent_id, domain, project=project[0] if project else None)
+        return db
+
+    return make
+
+
+@pytest.fixture
+def db(make_db) -> PostgresClient:
+    """Database with one registered agent, research-01"""
+    return make_db(("research-01", "research"))
@@ -0,0 +1,126 @@
+"""
+Tests for the action queue and executor
+"""
+
+import asyncio
+
+import pytest
+
+from src.orchestration.executor import ActionExecutor
+from src.storage.action_queue import ActionQueue
+
+
+class RecordingAgent:
+    """Stands in for a SubAgent and tracks concurrent executions"""
+
+    running = {}
+    peak = {}
+    order = []
+
+    def __init__(self, agent_id, domain):
+        self.agent_id = agent_id
+
+    async def execute(self, action):
+        cls = RecordingAgent
+        cls.order.append(action["n"])
+        cls.running[self.agent_id] = cls.running.get(self.agent_id, 0) + 1
+        cls.peak[self.agent_id] = max(
+            cls.peak.get(self.agent_id, 0), cls.running[self.agent_id]
+        )
+        await asyncio.sleep(0.01)
+        cls.running[self.agent_id] -= 1
+        if action.get("fail"):
+            raise RuntimeError("boom")
+        if action.get("block"):
+            return {"status": "blocked", "reason": "Failed confidence threshold"}
+        return {"status": "done", "n": action["n"]}
+
+
+@pytest.fixture
+def db(make_db):
+    RecordingAgent.running, RecordingAgent.peak, RecordingAgent.order = {}, {}, []
+    return make_db(("agent-a", "research"), ("agent-b", "github"))
+
+
+def test_claims_by_priority_within_agent_limits(db):
+    """Claims follow priority and never exceed the per-agent limit"""
+    for n, (agent, priority) in enumerate(
+        [("agent-a", 5), ("agent-a", 1), ("agent-a", 2), ("agent-b", 9)]
+    ):
+        db.log_action(agent, "triage", parameters={"n": n}, priority=priority)
+
+    actions = ActionQueue(db)
+    claimed = actions.claim(3, running={"agent-a": 1}, per_agent_limit=2)
+
+    assert [a["parameters"]["n"] for a in claimed] == [1, 3]
+    assert all(a["status"] == "executing" and a["started_at"] for a in claimed)
+    assert claimed[0]["domain"] == "research"
+    assert [a["parameters"]["n"] for a in actions.claim(5)] == [2, 0]
+
+
+@pytest.mark.asyncio
+async def test_executor_runs_and_records_in_batches(db):
+    """Outcomes, timing and per-type percentiles are recorded"""
+    ids = [
+        db.log_action("agent-a", "triage", parameters={"n": n}, priority=n).id
+        for n in range(6)
+    ]
+    failing = db.log_action("agent-b", "label", parameters={"n": 6, "fail": True}).id
+    blocked = db.log_action("agent-b", "label", parameters={"n": 7, "block": True}).id
+
+    actions = ActionQueue(db)
+    executor = ActionExecutor(
+        actions, RecordingAgent, concurrency=4, per_agent_limit=2, batch_size=3
+    )
+    assert await executor.run_until_empty() == 8
+
+    assert RecordingAgent.peak["agent-a"] == 2
+    assert RecordingAgent.order.index(0) < RecordingAgent.order.index(5)
+    assert (executor.completed, executor.failed) == (6, 2)
+
+    done = actions.get(ids[0])
+    assert done["status"] == "completed"
+    assert done["result"] == {"status": "done", "n": 0}
+    assert done["queued_at"] <= done["started_at"] <= done["completed_at"]
+    assert actions.get(failing)["error"] == "RuntimeError: boom"
+    assert actions.get(blocked)["status"] == "failed"
+
+    stats = actions.latency_stats()
+    assert stats["triage"]["count"] == 6
+    assert set(stats["label"]["execution_seconds"]) == {"p50", "p90", "p99"}
+    assert executor.latency_summary()["triage"]["count"] == 6
+
+
+@pytest.mark.asyncio
+async def test_executor_builds_agents_by_domain(db):
+    """Actions run on the agent class the shared factory maps their domain to"""
+    from src.agents.factory import build_agent
+    from src.agents.research_agent import ResearchAnalystAgent
+    from src.agents.security_aggregator import SecurityAggregatorAgent
+
+    db.register_agent("security-aggregator", "security")
+    db.log_action("security-aggregator", "suppress", parameters={"confidence": 0.9})
+    db.log_action("agent-a", "summarize_paper", priority=1)
+
+    executor = ActionExecutor(ActionQueue(db), build_agent)
+    assert await executor.run_until_empty() == 2
+
+    assert isinstance(executor._agents["security-aggregator"], SecurityAggregatorAgent)
+    assert isinstance(executor._agents["agent-a"], ResearchAnalystAgent)
+    assert executor.completed == 2
+
+
+@pytest.mark.asyncio
+async def test_failed_action_keeps_the_agents_message(db):
+    """An agent's failure message is recorded as the action's error"""
+    from src.agents.factory import build_agent
+
+    failed = db.log_action("agent-a", "unheard_of", parameters={"confidence": 0.9}).id
+
+    actions = ActionQueue(db)
+    executor = ActionExecutor(actions, build_agent)
+    assert await executor.run_until_empty() == 1
+
+    action = actions.get(failed)
+    assert action["status"] == "failed"
+    assert action["error"] == "Unknown action type: unheard_of"
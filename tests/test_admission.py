@@ -0,0 +1,90 @@
+"""
+Tests for admission control on expensive endpoints
+"""
+
+import asyncio
+
+import httpx
+import pytest
+from fastapi import FastAPI
+
+from src.mcp_server.admission import (
+    AdmissionControl,
+    AdmissionMiddleware,
+    AdmissionPolicy,
+)
+
+
+def _app(policy: AdmissionPolicy):
+    release = asyncio.Event()
+    control = AdmissionControl({("POST", "/diagnose"): policy})
+    app = FastAPI()
+    app.add_middleware(AdmissionMiddleware, control=control)
+
+    @app.post("/diagnose")
+    async def diagnose():
+        await release.wait()
+        return {"ok": True}
+
+    @app.get("/health")
+    async def health():
+        return {"status": "ok"}
+
+    client = httpx.AsyncClient(
+        transport=httpx.ASGITransport(app=app), base_url="http://test"
+    )
+    return client, control.limiters[("POST", "/diagnose")], release
+
+
+@pytest.mark.asyncio
+async def test_client_over_its_rate_gets_429():
+    """A client's burst is admitted, then it's told when to retry"""
+    client, limiter, release = _app(AdmissionPolicy(10, 10, 5.0, rate=0.5, burst=2))
+    release.set()
+
+    statuses = [(await client.post("/diagnose")).status_code for _ in range(2)]
+    limited = await client.post("/diagnose")
+
+    assert statuses == [200, 200]
+    assert limited.status_code == 429
+    assert limited.headers["retry-after"] == "2"  # One token per 2 seconds
+    assert limited.json()["reason"] == "rate_limited"
+    assert (await client.get("/health")).status_code == 200  # Unguarded
+    assert limiter.stats()["rate_limited"] == 1
+
+
+@pytest.mark.asyncio
+async def test_saturated_endpoint_queues_then_rejects():
+    """Past the cap requests wait in a bounded queue; overflow gets 429"""
+    client, limiter, release = _app(AdmissionPolicy(1, 1, 5.0, rate=100, burst=100))
+
+    running = asyncio.create_task(client.post("/diagnose"))
+    await asyncio.sleep(0.05)
+    queued = asyncio.create_task(client.post("/diagnose"))
+    await asyncio.sleep(0.05)
+    assert (limiter.active, limiter.queue_depth) == (1, 1)
+
+    overflow = await client.post("/diagnose")
+    assert overflow.status_code == 429
+    assert int(overflow.headers["retry-after"]) >= 1
+
+    release.set()
+    assert [r.status_code for r in await asyncio.gather(running, queued)] == [200, 200]
+    assert limiter.stats()["admitted"] == 2
+    assert (limiter.active, limiter.queue_depth) == (0, 0)
+
+
+@pytest.mark.asyncio
+async def test_queue_wait_times_out():
+    """A queued request that doesn't get a slot in time is rejected"""
+    client, limiter, release = _app(AdmissionPolicy(1, 4, 0.1, rate=100, burst=100))
+
+    running = asyncio.create_task(client.post("/diagnose"))
+    await asyncio.sleep(0.05)
+    timed_out = await client.post("/diagnose")
+
+    assert timed_out.status_code == 429
+    assert limiter.queue_depth == 0
+    release.set()
+    assert (await running).status_code == 200
+    assert limiter.active == 0
@@ -7,10 +7,17 @@ import asyncio
 from src.agents.sub_agent import SubAgent
 
 
+class SampleAgent(SubAgent):
+    """Minimal concrete sub-agent"""
+
+    async def diagnose(self):
+        return {"description": "test", "confidence": 0.5, "impact_score": 1.0}
+
+
 @pytest.fixture
 def sample_agent():
     """Create a sample sub-agent for testing"""
-    agent = SubAgent("test-001", "test-domain")
+    agent = SampleAgent("test-001", "test-domain")
     return agent
 
 
@@ -51,3 +58,25 @@ def test_execute_guardrails(sample_agent):
     
     can_execute = sample_agent.can_execute(action)
     assert not can_execute
+
+
+def test_build_agent_maps_domains(tmp_path, monkeypatch):
+    """Every process builds the same agent class for a domain"""
+    from src.agents.factory import build_agent
+
+    monkeypatch.setenv("DATABASE_URL", f"sqlite:///{tmp_path / 'sentinel.db'}")
+    built = {
+        (agent_id, domain): type(build_agent(agent_id, domain)).__name__
+        for agent_id, domain in [
+            ("security-aggregator", "security"),
+            ("github-triage-01", "github-triage"),
+            ("research-01", "ai-systems-research"),
+            ("production-001", "podcast-production"),
+        ]
+    }
+    assert built == {
+        ("security-aggregator", "security"): "SecurityAggregatorAgent",
+        ("github-triage-01", "github-triage"): "GitHubTriageAgent",
+        ("research-01", "ai-systems-research"): "ResearchAnalystAgent",
+        ("production-001", "podcast-production"): "ResearchAnalystAgent",
+    }
@@ -0,0 +1,113 @@
+"""
+Tests for batch-mode diagnosis against a local stand-in batch server
+"""
+
+import json
+
+import anthropic
+import pytest
+
+from src.agents.github_agent import GitHubTriageAgent
+from src.agents.research_agent import ResearchAnalystAgent
+from src.orchestration.batch import BatchCheckpoint, BatchDiagnosisRunner
+from tests.batch_server import StubBatchServer
+
+
+def _responder(params):
+    """Answer with a bottleneck naming the domain in the system prompt"""
+    if "failing-domain" in params["system"]:
+        return None
+    return json.dumps(
+        {
+            "description": f"Bottleneck for {params['system'].split(': ')[1][:20]}",
+            "confidence": 0.8,
+            "impact_score": 12,
+            "blocking": ["release"],
+            "recommended_action": "Act",
+            "reasoning": "Because",
+        }
+    )
+
+
+@pytest.fixture
+def agents():
+    return [
+        ResearchAnalystAgent("research-001", "ai-systems-research"),
+        GitHubTriageAgent("github-001", "github-triage"),
+    ]
+
+
+@pytest.fixture
+def checkpoint(tmp_path):
+    return BatchCheckpoint(str(tmp_path / "batch.json"))
+
+
+@pytest.mark.asyncio
+async def test_batch_run_fans_out_results(agents, checkpoint):
+    """All agents are diagnosed by a single batch"""
+    with StubBatchServer(_responder, polls_until_ended=2) as server:
+        client = anthropic.Anthropic(api_key="test", base_url=server.url)
+        runner = BatchDiagnosisRunner(client, checkpoint, poll_interval=0)
+
+        results = await runner.run(agents, context={"mode": "diagnostic"})
+
+    assert server.created == 1
+    assert set(results) == {"research-001", "github-001"}
+    for result in results.values():
+        assert result["status"] == "success"
+        assert result["bottleneck"]["impact_score"] == 10.0  # Clamped
+    assert checkpoint.load() is None
+
+
+@pytest.mark.asyncio
+async def test_batch_resumes_from_checkpoint(agents, checkpoint):
+    """A restarted runner resumes the checkpointed batch instead of resubmitting"""
+    with StubBatchServer(_responder, polls_until_ended=5) as server:
+        client = anthropic.Anthropic(api_key="test", base_url=server.url)
+
+        state = BatchDiagnosisRunner(client, checkpoint).submit(agents)
+        assert checkpoint.load()["batch_id"] == state["batch_id"]
+
+        # Simulate a process restart with a fresh runner
+        runner = BatchDiagnosisRunner(client, checkpoint, poll_interval=0)
+        results = await runner.run(agents)
+
+    assert server.created == 1
+    assert all(r["status"] == "success" for r in results.values())
+
+
+@pytest.mark.asyncio
+async def test_batch_reports_errored_requests(checkpoint):
+    """Errored batch requests surface as per-agent errors"""
+    agents = [
+        ResearchAnalystAgent("research-001", "ai-systems-research"),
+        ResearchAnalystAgent("research-002", "failing-domain"),
+    ]
+    with StubBatchServer(_responder) as server:
+        client = anthropic.Anthropic(api_key="test", base_url=server.url)
+        runner = BatchDiagnosisRunner(client, checkpoint, poll_interval=0)
+
+        results = await runner.run(agents)
+
+    assert results["research-001"]["status"] == "success"
+    assert results["research-002"]["status"] == "error"
+
+
+@pytest.mark.asyncio
+async def test_batch_checkpoint_kept_until_results_are_stored(agents, checkpoint):
+    """A caller storing results itself resumes the batch if storing fails"""
+    with StubBatchServer(_responder) as server:
+        client = anthropic.Anthropic(api_key="test", base_url=server.url)
+        runner = BatchDiagnosisRunner(client, checkpoint, poll_interval=0)
+
+        await runner.run(agents, keep_checkpoint=True)
+        assert runner.pending() is not None  # e.g. save_bottlenecks() raised
+
+        results = await BatchDiagnosisRunner(client, checkpoint, poll_interval=0).run(
+            agents, keep_checkpoint=True
+        )
+        runner.complete()
+
+    assert server.created == 1
+    assert all(r["status"] == "success" for r in results.values())
+    assert runner.pending() is None
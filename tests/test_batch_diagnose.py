@@ -0,0 +1,128 @@
+"""
+Tests for the batch diagnose endpoint
+"""
+
+import json
+import time
+from types import SimpleNamespace
+
+import pytest
+from fastapi.testclient import TestClient
+
+from src.agents.research_agent import ResearchAnalystAgent
+from src.mcp_server.admission import AdmissionControl
+from src.orchestration.singleflight import DiagnosisCoalescer
+from src.storage.event_bus import EventBus
+
+
+class StubAgent:
+    def __init__(self, agent_id):
+        self.agent_id = agent_id
+
+    def input_fingerprint(self):
+        return f"{self.agent_id}-inputs"
+
+    async def diagnose(self):
+        if self.agent_id == "broken":
+            raise RuntimeError("Claude unavailable")
+        return {"description": f"{self.agent_id} backlog", "confidence": 0.8}
+
+
+class BlockingMessages:
+    """A synchronous Claude client, like the SDK's: create() blocks"""
+
+    def create(self, **kwargs):
+        time.sleep(0.3)
+        return SimpleNamespace(
+            usage=SimpleNamespace(input_tokens=100, output_tokens=20),
+            content=[
+                SimpleNamespace(text='{"description": "Review", "confidence": 0.8}')
+            ],
+        )
+
+
+@pytest.fixture
+def client(make_db, monkeypatch):
+    monkeypatch.setenv("NOTION_API_KEY", "test")
+    from src.mcp_server import sentinel_server
+
+    async def stub_agent(agent_id, domain=None, project=None):
+        return StubAgent(agent_id)
+
+    monkeypatch.setattr(sentinel_server, "_get_or_create_agent", stub_agent)
+    db = make_db(
+        ("research-01", "research"), ("github-01", "research"), ("broken", "research")
+    )
+    monkeypatch.setattr(sentinel_server, "db", db)
+    monkeypatch.setattr(sentinel_server, "coalescer", DiagnosisCoalescer(db))
+    monkeypatch.setattr(sentinel_server, "bus", EventBus(db))
+    # Fresh rate limits, so this module's requests don't use up the burst
+    monkeypatch.setattr(
+        sentinel_server.admission, "limiters", AdmissionControl().limiters
+    )
+    with TestClient(sentinel_server.app) as client:
+        client.db = db
+        yield client
+
+
+ITEMS = [
+    {"agent_id": "research-01", "domain": "research"},
+    {"agent_id": "broken", "domain": "research"},
+    {"agent_id": "unknown", "domain": "research"},
+    {"agent_id": "github-01", "domain": "research"},
+]
+
+
+def test_batch_reports_each_item(client):
+    """Failures stay per item; successful bottlenecks are all saved"""
+    body = client.post("/diagnose/batch", json={"items": ITEMS}).json()
+
+    assert [r["status"] for r in body["results"]] == ["ok", "error", "error", "ok"]
+    assert body["results"][1]["error"] == "Claude unavailable"
+    assert body["results"][2]["error"] == "Agent not registered"
+    assert (body["succeeded"], body["failed"], body["saved"]) == (2, 2, 2)
+    reports = client.db.get_all_agent_reports()
+    assert sum(1 for r in reports if r.get("bottleneck")) == 2
+
+
+def test_batch_marks_each_saved_run(client):
+    """Saved items update last_run and the inputs, so the gate sees them"""
+    client.post("/diagnose/batch", json={"items": ITEMS})
+
+    state = client.db.get_agent_state("research-01")
+    assert state["last_run"] is not None
+    assert state["input_fingerprint"] == "research-01-inputs"
+    assert client.db.get_agent_state("broken")["last_run"] is None
+
+
+def test_batch_streams_ndjson(client):
+    """Streaming returns one line per item, then a summary"""
+    response = client.post("/diagnose/batch", json={"items": ITEMS, "stream": True})
+
+    assert response.headers["content-type"].startswith("application/x-ndjson")
+    lines = [json.loads(line) for line in response.text.splitlines()]
+    assert sorted(line["index"] for line in lines[:-1]) == [0, 1, 2, 3]
+    assert lines[-1]["summary"]["saved"] == 2
+
+
+def test_batch_items_overlap_their_claude_calls(client, monkeypatch):
+    """Blocking Claude calls run off the event loop, so items overlap"""
+    from src.mcp_server import sentinel_server
+
+    async def research_agent(agent_id, domain=None, project=None):
+        agent = ResearchAnalystAgent(agent_id, "research")
+        agent.claude_client = SimpleNamespace(messages=BlockingMessages())
+        return agent
+
+    monkeypatch.setattr(sentinel_server, "_get_or_create_agent", research_agent)
+    items = [{"agent_id": f"research-{n}", "domain": "research"} for n in range(4)]
+    for item in items:
+        client.db.register_agent(item["agent_id"], "research")
+
+    start = time.perf_counter()
+    body = client.post("/diagnose/batch", json={"items": items}).json()
+    elapsed = time.perf_counter() - start
+
+    assert body["succeeded"] == 4
+    # One call's 0.3s plus overhead, not 4 x 0.3s back to back
+    assert elapsed < 0.8
@@ -0,0 +1,139 @@
+"""
+Tests for deterministic conflict detection
+"""
+
+import time
+
+from src.agents.orchestrator import OrchestratorAgent
+from src.orchestration.conflicts import ConflictDetector, normalize_item
+
+
+def test_normalize_item():
+    """Blocking items normalize across case, punctuation and articles"""
+    assert normalize_item("The Production-Deployment!") == "production deployment"
+    assert normalize_item("  release  v1.2 ") == "release v1 2"
+
+
+def test_detects_cross_domain_shared_blocker():
+    """Reports in different domains blocking the same item collide"""
+    reports = [
+        {
+            "agent_id": "sec",
+            "domain": "security",
+            "impact_score": 9,
+            "confidence": 0.9,
+            "blocking": ["Production deployment"],
+        },
+        {
+            "agent_id": "gh",
+            "domain": "github-triage",
+            "impact_score": 5,
+            "confidence": 0.8,
+            "blocking": ["production-deployment"],
+        },
+        {
+            "agent_id": "gh2",
+            "domain": "github-triage",
+            "impact_score": 4,
+            "confidence": 0.8,
+            "blocking": ["code review"],
+        },
+    ]
+
+    conflicts = ConflictDetector().detect(reports)
+
+    assert len(conflicts) == 1
+    assert conflicts[0]["resource"] == "production deployment"
+    assert conflicts[0]["affected_domains"] == ["github-triage", "security"]
+    assert conflicts[0]["agents"] == ["sec", "gh"]
+
+
+def test_same_domain_is_not_a_conflict():
+    """Collisions inside one domain are not cross-domain conflicts"""
+    reports = [
+        {"agent_id": "a", "domain": "d", "blocking": ["release"]},
+        {"agent_id": "b", "domain": "d", "blocking": ["release"]},
+    ]
+    assert ConflictDetector().detect(reports) == []
+
+
+def test_action_resources_collide():
+    """Recommended actions naming the same resource collide"""
+    reports = [
+        {
+            "agent_id": "a",
+            "domain": "security",
+            "recommended_action": "Upgrade the staging cluster",
+        },
+        {
+            "agent_id": "b",
+            "domain": "podcast-production",
+            "recommended_action": "Reserve the staging cluster for renders",
+        },
+    ]
+    resources = {c["resource"] for c in ConflictDetector().detect(reports)}
+    assert resources == {"staging cluster"}
+
+
+def test_shared_verbs_and_common_words_do_not_conflict():
+    """Only explicitly named resources collide, not shared vocabulary"""
+    reports = [
+        {
+            "agent_id": "a",
+            "domain": "security",
+            "recommended_action": "Review and update the data retention policy",
+        },
+        {
+            "agent_id": "b",
+            "domain": "research",
+            "recommended_action": "Schedule a review of the data pipeline update",
+        },
+        {
+            "agent_id": "c",
+            "domain": "github-triage",
+            "recommended_action": "Update docs in nctroy/sentinel and/or review PRs",
+        },
+        {
+            "agent_id": "d",
+            "domain": "podcast-production",
+            "recommended_action": "Move renders off `nctroy/sentinel` CI runners",
+        },
+    ]
+    conflicts = ConflictDetector().detect(reports)
+    assert [c["resource"] for c in conflicts] == ["nctroy/sentinel"]
+    assert conflicts[0]["agents"] == ["c", "d"]
+
+
+def test_fallback_plan_includes_conflicts():
+    """The no-LLM fallback path now carries detected conflicts"""
+    orchestrator = OrchestratorAgent()
+    ranked = orchestrator._rank_by_impact(
+        [
+            {"agent_id": "a", "domain": "x", "blocking": ["release"]},
+            {"agent_id": "b", "domain": "y", "blocking": ["release"]},
+        ]
+    )
+    plan = orchestrator._generate_plan(ranked, orchestrator._find_conflicts(ranked))
+    assert plan["cross_domain_conflicts"][0]["resource"] == "release"
+
+
+def test_scales_to_thousands_of_reports():
+    """Detection over 5000 reports stays well under a second"""
+    reports = [
+        {
+            "agent_id": f"agent-{i}",
+            "domain": f"domain-{i % 50}",
+            "impact_score": i % 10,
+            "confidence": 0.8,
+            "blocking": [f"item {i % 300}", f"shared {i % 7}"],
+            "recommended_action": f"Upgrade service-{i % 400} runtime",
+        }
+        for i in range(5000)
+    ]
+
+    start = time.perf_counter()
+    conflicts = ConflictDetector().detect(reports)
+    elapsed = time.perf_counter() - start
+
+    assert conflicts
+    assert elapsed < 1.0
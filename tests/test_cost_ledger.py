@@ -0,0 +1,111 @@
+"""
+Tests for the token and cost ledger and budgets
+"""
+
+from types import SimpleNamespace
+
+import pytest
+
+from src.agents.research_agent import ResearchAnalystAgent
+from src.storage import cost_ledger
+from src.storage.cost_ledger import BudgetExceeded, CostLedger, call_cost, cycle
+from src.storage.models import LLMCall
+
+MODEL = "claude-sonnet-4-20250514"
+
+
+def _usage(input_tokens, output_tokens, cache_read=0):
+    return SimpleNamespace(
+        input_tokens=input_tokens,
+        output_tokens=output_tokens,
+        cache_read_input_tokens=cache_read,
+        cache_creation_input_tokens=0,
+    )
+
+
+class FakeMessages:
+    def __init__(self):
+        self.calls = 0
+
+    def create(self, model, **kwargs):
+        self.calls += 1
+        return SimpleNamespace(
+            usage=_usage(100_000, 20_000),
+            content=[SimpleNamespace(text="{}")],
+        )
+
+
+def _rows(db) -> int:
+    session = db.Session()
+    try:
+        return session.query(LLMCall).count()
+    finally:
+        session.close()
+
+
+@pytest.fixture
+def db(make_db):
+    return make_db(
+        ("research-01", "research", "intel"), ("github-01", "github", "intel")
+    )
+
+
+def test_calls_are_written_in_batches_and_summarized(db):
+    """Rows wait for a full batch; totals group by project and cycle"""
+    ledger = CostLedger(db, flush_size=3, flush_seconds=60)
+
+    with cycle(42):
+        ledger.record("research-01", MODEL, _usage(1000, 500), domain="research")
+        ledger.record("github-01", MODEL, _usage(2000, 100, cache_read=8000))
+    assert _rows(db) == 0
+    ledger.record("research-01", MODEL, _usage(1000, 500), batch=True)
+    assert _rows(db) == 3
+
+    assert call_cost(MODEL, 1000, 500) == pytest.approx(0.0105)
+    assert call_cost(MODEL, 1000, 500, batch=True) == pytest.approx(0.00525)
+    (project,) = ledger.summary(group_by="project")
+    assert project["project"] == "intel"
+    assert project["calls"] == 3
+    assert project["cache_read_tokens"] == 8000
+    assert project["cost_usd"] == pytest.approx(0.0105 + 0.0099 + 0.00525)
+    cycles = {row["cycle_id"]: row["calls"] for row in ledger.summary(None, "cycle_id")}
+    assert cycles == {"42": 2, None: 1}
+
+
+def test_summary_flushes_pending_rows(db):
+    """Reports include calls still buffered in this process"""
+    ledger = CostLedger(db, flush_size=100, flush_seconds=60)
+    ledger.record("research-01", MODEL, _usage(1000, 500))
+
+    (row,) = ledger.summary()
+    assert row["agent_id"] == "research-01"
+    assert ledger.flush() == 0
+
+
+@pytest.mark.asyncio
+async def test_budgets_stop_calls_before_dispatch(db, monkeypatch):
+    """Once an agent's or its project's budget is spent, Claude isn't called"""
+    ledger = CostLedger(db, flush_size=100, flush_seconds=60)
+    monkeypatch.setattr(cost_ledger, "_ledger", ledger)
+    ledger.set_budget("agent", "research-01", limit_usd=1.0)
+    ledger.set_budget("project", "intel", limit_usd=1.5, window_hours=1)
+
+    agent = ResearchAnalystAgent("research-01", "research")
+    agent.claude_client = SimpleNamespace(messages=FakeMessages())
+    # $0.60 a call: the second crosses the agent's $1 (spend isn't flushed)
+    for _ in range(2):
+        await agent.call_claude("system", "user", model=MODEL)
+    with pytest.raises(BudgetExceeded) as exceeded:
+        await agent.call_claude("system", "user", model=MODEL)
+    assert exceeded.value.scope == "agent"
+    assert agent.claude_client.messages.calls == 2
+
+    other = ResearchAnalystAgent("github-01", "github")
+    other.claude_client = SimpleNamespace(messages=FakeMessages())
+    await other.call_claude("system", "user", model=MODEL)  # $1.80 for the project
+    with pytest.raises(BudgetExceeded, match="Project intel spent"):
+        await other.call_claude("system", "user", model=MODEL)
+
+    budgets = {b["name"]: b for b in ledger.budgets()}
+    assert budgets["research-01"]["spent_usd"] == pytest.approx(1.2)
+    assert budgets["intel"]["spent_usd"] == pytest.approx(1.8)
@@ -0,0 +1,68 @@
+"""
+Tests for token-budgeted prompt encoding
+"""
+
+import json
+
+from src.orchestration.encoding import PromptEncoder, count_tokens, encode_table
+
+
+def _reports(count):
+    return [
+        {
+            "agent_id": f"agent-{i}",
+            "domain": "github-triage",
+            "impact_score": 10.0 - i * 0.1,
+            "confidence": 0.9,
+            "description": f"Stale pull request backlog number {i}",
+            "blocking": ["release v1.2", "code review throughput"],
+            "recommended_action": "Schedule a focused review session",
+            "reasoning": "Review latency compounds over the week",
+        }
+        for i in range(count)
+    ]
+
+
+def test_table_lists_keys_once():
+    """The compact table is much smaller than pretty-printed JSON"""
+    reports = _reports(20)
+    table = encode_table(reports, ["agent_id", "description", "blocking"])
+
+    assert table.splitlines()[0] == "agent_id|description|blocking"
+    assert table.count("agent_id") == 1
+    assert "release v1.2;code review throughput" in table
+    assert count_tokens(table) < count_tokens(json.dumps(reports, indent=2)) / 2
+
+
+def test_encode_fits_without_trimming():
+    """Reports that fit the budget are encoded in full"""
+    encoded = PromptEncoder(token_budget=100000).encode(_reports(10))
+
+    assert encoded.complete
+    assert encoded.trimmed == 0
+    assert "reasoning" in encoded.fields
+
+
+def test_encode_trims_lowest_ranked_first():
+    """Low-ranked reports lose optional fields before any report is dropped"""
+    reports = _reports(30)
+    full = PromptEncoder(token_budget=100000).encode(reports).tokens
+
+    encoded = PromptEncoder(token_budget=int(full * 0.8)).encode(reports)
+
+    assert encoded.complete
+    assert 0 < encoded.trimmed < len(reports)
+    assert encoded.tokens <= int(full * 0.8)
+    rows = encoded.text.splitlines()
+    assert "Schedule a focused review session" in rows[1]
+    assert "Schedule a focused review session" not in rows[-1]
+
+
+def test_encode_omits_reports_over_budget():
+    """When trimming is not enough, the lowest-ranked reports are omitted"""
+    encoded = PromptEncoder(token_budget=200).encode(_reports(30))
+
+    assert not encoded.complete
+    assert encoded.included + encoded.omitted == 30
+    assert encoded.tokens <= 200
+    assert "agent-0|" in encoded.text
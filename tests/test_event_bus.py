@@ -0,0 +1,61 @@
+"""
+Tests for change events and the event bus
+"""
+
+import asyncio
+
+import pytest
+
+from src.storage.action_queue import ActionQueue
+from src.storage.event_bus import EventBus
+
+
+@pytest.mark.asyncio
+async def test_committed_writes_reach_subscribers(db):
+    """Writes from any thread become deltas; rolled-back ones don't"""
+    bus = EventBus(db)
+    await bus.start()
+
+    with bus.subscribe({"bottleneck", "action"}) as events:
+        await asyncio.to_thread(
+            db.save_bottleneck,
+            "research-01",
+            {"description": "Backlog", "confidence": 0.9},
+        )
+        action = db.log_action("research-01", "noop")
+        ActionQueue(db).claim(1)
+        with pytest.raises(Exception):
+            # No agent: the insert fails and its event is dropped
+            db.save_bottlenecks([{"agent_id": None, "bottleneck": {}}])
+        db.update_agent_last_run("research-01")  # "agent": not subscribed
+
+        received = []
+        while (event := await events.get(timeout=0.2)) is not None:
+            received.append(event)
+
+    assert [e["event"] for e in received] == ["bottleneck", "action", "action"]
+    assert received[0]["data"]["agent_id"] == "research-01"
+    assert received[0]["data"]["bottleneck"]["description"] == "Backlog"
+    assert [e["data"]["status"] for e in received[1:]] == ["queued", "executing"]
+    assert received[2]["data"]["id"] == action.id
+    await bus.stop()
+
+
+@pytest.mark.asyncio
+async def test_lagging_subscriber_is_told_to_resync(db):
+    """A full backlog is replaced by one resync event"""
+    bus = EventBus(db, max_pending=2)
+    await bus.start()
+
+    with bus.subscribe() as events:
+        for n in range(3):
+            bus.publish({"event": "plan", "data": {"id": n}})
+        bus.publish({"event": "plan", "data": {"id": 3}})
+
+        assert await events.get(timeout=0.1) == {"event": "resync", "data": {}}
+        assert (await events.get(timeout=0.1))["data"] == {"id": 3}
+        assert await events.get(timeout=0.05) is None
+
+    assert bus.stats()["resyncs"] == 1
+    assert bus.stats()["subscribers"] == 0
+    await bus.stop()
@@ -0,0 +1,51 @@
+"""
+Tests for change-driven diagnosis skipping
+"""
+
+from datetime import datetime, timedelta
+
+from src.agents.research_agent import ResearchAnalystAgent
+from src.orchestration.freshness import DiagnosisGate
+
+
+def _stored(agent, hours_ago=1):
+    return {
+        "agent_id": agent.agent_id,
+        "input_fingerprint": agent.input_fingerprint(),
+        "last_run": datetime.now() - timedelta(hours=hours_ago),
+    }
+
+
+def test_unchanged_recent_agent_is_skipped():
+    """Same inputs and a recent run reuse the stored bottleneck"""
+    agent = ResearchAnalystAgent("research-1", "ai-systems-research")
+
+    check = DiagnosisGate(max_age_hours=24).check(agent, _stored(agent))
+
+    assert check.skip
+    assert check.fingerprint == agent.input_fingerprint()
+
+
+def test_changed_stale_or_new_agent_is_diagnosed():
+    """Changed inputs, a stale run or no stored run all trigger diagnosis"""
+    agent = ResearchAnalystAgent("research-1", "ai-systems-research")
+    gate = DiagnosisGate(max_age_hours=24)
+
+    stored = _stored(agent)
+    agent.sources.append("Papers With Code")
+    assert gate.check(agent, stored).reason == "inputs changed"
+
+    assert gate.check(agent, _stored(agent, hours_ago=48)).reason == (
+        "last run is stale"
+    )
+    assert gate.check(agent, {"agent_id": agent.agent_id}).reason == ("inputs changed")
+
+
+def test_force_overrides_skip():
+    """Forcing globally or per agent always re-diagnoses"""
+    agent = ResearchAnalystAgent("research-1", "ai-systems-research")
+    stored = _stored(agent)
+
+    assert DiagnosisGate(force=True).check(agent, stored).reason == "forced"
+    assert not DiagnosisGate(force_agents=["research-1"]).check(agent, stored).skip
+    assert DiagnosisGate(force_agents=["other"]).check(agent, stored).skip
@@ -0,0 +1,64 @@
+"""
+Tests that startup paths don't load heavy SDKs (see bench_import_time.py)
+"""
+
+import os
+import sys
+import json
+import subprocess
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+HEAVY_MODULES = ("anthropic", "notion_client", "grpc", "opentelemetry.sdk")
+
+
+def _loaded_heavy_modules(code: str, **env) -> list:
+    """Run code in a fresh interpreter and list the heavy SDKs it imported"""
+    report = (
+        "import sys, json; print(json.dumps(sorted({h for h in %r "
+        "for m in sys.modules if m == h or m.startswith(h + '.')})))" % (HEAVY_MODULES,)
+    )
+    environ = {k: v for k, v in os.environ.items() if k != "NOTION_API_KEY"}
+    proc = subprocess.run(
+        [sys.executable, "-c", f"{code}\n{report}"],
+        cwd=ROOT,
+        env={**environ, **env},
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    return json.loads(proc.stdout.strip().splitlines()[-1])
+
+
+def test_cli_and_server_start_without_heavy_sdks(tmp_path):
+    """The CLI, list-agents' imports and the server (without Notion) stay light"""
+    database = f"sqlite:///{tmp_path / 'startup.db'}"
+    assert _loaded_heavy_modules("import src.cli.cli") == []
+    assert (
+        _loaded_heavy_modules(
+            "import src.cli.cli\n"
+            "from src.storage.postgres_client import PostgresClient",
+            DATABASE_URL=database,
+        )
+        == []
+    )
+    assert (
+        _loaded_heavy_modules(
+            "import src.mcp_server.sentinel_server", DATABASE_URL=database
+        )
+        == []
+    )
+
+
+def test_agents_create_clients_on_first_use():
+    """Building an agent doesn't import the Claude SDK or set up telemetry"""
+    code = (
+        "from src.agents.sub_agent import SubAgent\n"
+        "class Agent(SubAgent):\n"
+        "    async def diagnose(self): return {}\n"
+        "agent = Agent('agent-1', 'research')"
+    )
+    assert _loaded_heavy_modules(code, ANTHROPIC_API_KEY="test") == []
+    assert _loaded_heavy_modules(
+        code + "\nagent.claude_client", ANTHROPIC_API_KEY="test"
+    ) == ["anthropic"]
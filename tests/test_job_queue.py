@@ -0,0 +1,151 @@
+"""
+Tests for the durable job queue and worker
+"""
+
+import json
+
+import pytest
+from sqlalchemy import text
+
+from src.agents.factory import build_agent
+from src.orchestration.tasks import build_handlers
+from src.orchestration.worker import WaitForChildren, Worker
+from src.storage.job_queue import JobQueue
+
+
+@pytest.fixture
+def queue(make_db):
+    """Job queue on a throwaway SQLite database (no row locking)"""
+    return JobQueue(make_db())
+
+
+def test_claims_are_exclusive_and_ordered(queue):
+    """Jobs are leased to one worker at a time, by priority"""
+    low = queue.enqueue("diagnose", {"n": 1}, priority=5)
+    high = queue.enqueue("diagnose", {"n": 2}, priority=1)
+    last = queue.enqueue("diagnose", {"n": 3}, priority=5)
+
+    first = queue.claim("worker-a", limit=2)
+    second = queue.claim("worker-b", limit=2)
+
+    assert [job["id"] for job in first] == [high, low]
+    assert [job["id"] for job in second] == [last]
+    assert queue.claim("worker-c") == []
+    assert not queue.complete(high, "worker-b")
+    assert queue.complete(high, "worker-a", {"ok": True})
+    assert queue.get(high)["status"] == "succeeded"
+
+
+def test_retries_then_dead_letters(queue):
+    """Failures back off and retry until max_attempts, then dead-letter"""
+    job_id = queue.enqueue("diagnose", max_attempts=2)
+
+    queue.claim("worker-a")
+    assert queue.fail(job_id, "worker-a", "boom") == "queued"
+    assert queue.claim("worker-a") == []  # Still backing off
+
+    # Skip the backoff; the worker then dies during the final attempt
+    session = queue.db.Session()
+    session.execute(text("UPDATE jobs SET run_after = created_at"))
+    session.commit()
+    session.close()
+    queue.claim("worker-a", lease_seconds=-1)
+    assert queue.claim("worker-b") == []
+
+    job = queue.get(job_id)
+    assert job["status"] == "dead"
+    assert job["attempts"] == 2
+    assert job["error"] and job["completed_at"]
+    assert queue.requeue_dead() == 1
+
+    job = queue.get(job_id)
+    assert job["status"] == "queued"
+    assert (job["error"], job["completed_at"]) == (None, None)
+
+
+def test_expired_lease_is_reclaimed(queue):
+    """A job whose worker stopped heartbeating moves to another worker"""
+    job_id = queue.enqueue("diagnose")
+    queue.claim("worker-a", lease_seconds=-1)
+
+    reclaimed = queue.claim("worker-b")
+
+    assert [job["id"] for job in reclaimed] == [job_id]
+    assert not queue.heartbeat(job_id, "worker-a")
+    assert queue.heartbeat(job_id, "worker-b")
+
+
+@pytest.mark.asyncio
+async def test_parent_resumes_after_children(queue):
+    """A fanned-out parent job runs its next stage after the last child"""
+    diagnosed = []
+
+    async def orchestrate(job, worker):
+        if job["payload"].get("stage") != "synthesize":
+            queue.enqueue_many(
+                [{"kind": "diagnose", "payload": {"agent_id": i}} for i in range(3)],
+                parent_id=job["id"],
+            )
+            raise WaitForChildren({"stage": "synthesize"})
+        return {"diagnosed": sorted(diagnosed)}
+
+    async def diagnose(job, worker):
+        diagnosed.append(job["payload"]["agent_id"])
+        return {}
+
+    parent = queue.enqueue("orchestrate", priority=9)
+    worker = Worker(queue, {"orchestrate": orchestrate, "diagnose": diagnose})
+
+    assert await worker.run_until_empty() == 4
+
+    job = queue.get(parent)
+    assert job["status"] == "succeeded"
+    assert job["result"] == {"diagnosed": [0, 1, 2]}
+    assert job["children"] == {"succeeded": 3}
+
+
+def test_enqueue_unique_joins_unfinished_job(queue):
+    """A second orchestration isn't queued while the first is unfinished"""
+    first, created = queue.enqueue_unique("orchestrate", {"force": False})
+    assert created
+    assert queue.enqueue_unique("orchestrate", {"force": True}) == (first, False)
+
+    queue.claim("worker-a")
+    queue.complete(first, "worker-a", {})
+
+    second, created = queue.enqueue_unique("orchestrate")
+    assert created and second != first
+
+
+@pytest.mark.asyncio
+async def test_security_diagnose_job_ingests_sarif(queue, tmp_path, monkeypatch):
+    """Queued security diagnoses run the aggregator, which ingests SARIF"""
+    monkeypatch.chdir(tmp_path)
+    (tmp_path / "security-reports").mkdir()
+    sarif = {
+        "runs": [
+            {
+                "tool": {"driver": {"rules": [{"id": "no-eval"}]}},
+                "results": [
+                    {
+                        "ruleId": "no-eval",
+                        "level": "error",
+                        "message": {"text": "eval can be harmful"},
+                    }
+                ],
+            }
+        ]
+    }
+    (tmp_path / "security-reports" / "eslint-results.sarif").write_text(
+        json.dumps(sarif)
+    )
+    db = queue.db
+    db.register_agent("security-aggregator", "security")
+
+    queue.enqueue("diagnose", {"agent_id": "security-aggregator", "domain": "security"})
+    worker = Worker(queue, build_handlers(db, queue, build_agent, None))
+    assert await worker.run_until_empty() == 1
+
+    summary = db.get_security_summary()
+    assert summary["total_findings"] == 1
+    assert summary["counts_by_severity"]["high"] == 1
@@ -0,0 +1,146 @@
+"""
+Tests for the MCP transports (stdio and POST /mcp)
+"""
+
+import io
+import os
+import json
+import asyncio
+
+import pytest
+from fastapi.testclient import TestClient
+from pydantic import BaseModel
+
+from src.mcp_server.mcp_protocol import MCPServer, ToolError, run_stdio
+from src.orchestration.singleflight import DiagnosisCoalescer
+from src.storage.event_bus import EventBus
+
+
+class EchoRequest(BaseModel):
+    text: str
+    delay: float = 0
+
+
+def _server() -> MCPServer:
+    server = MCPServer("test", "1.0")
+
+    @server.tool("echo", EchoRequest)
+    async def echo(args: EchoRequest, client: str):
+        """Echo the text back"""
+        await asyncio.sleep(args.delay)
+        if args.text == "fail":
+            raise ToolError("Echo refused")
+        return {"text": args.text, "client": client}
+
+    return server
+
+
+def _call(request_id, name, **arguments):
+    return {
+        "jsonrpc": "2.0",
+        "id": request_id,
+        "method": "tools/call",
+        "params": {"name": name, "arguments": arguments},
+    }
+
+
+@pytest.mark.asyncio
+async def test_stdio_answers_each_request_when_ready():
+    """A slow tool call doesn't hold up the requests behind it"""
+    messages = [
+        {"jsonrpc": "2.0", "id": 1, "method": "initialize", "params": {}},
+        {"jsonrpc": "2.0", "method": "notifications/initialized"},
+        _call(2, "echo", text="slow", delay=0.2),
+        {"jsonrpc": "2.0", "id": 3, "method": "tools/list"},
+        _call(4, "echo", text="fail"),
+        _call(5, "echo"),
+    ]
+    read_fd, write_fd = os.pipe()
+    os.write(write_fd, b"".join(json.dumps(m).encode() + b"\n" for m in messages))
+    os.close(write_fd)
+    stdout = io.BytesIO()
+
+    with os.fdopen(read_fd, "rb") as stdin:
+        await run_stdio(_server(), stdin=stdin, stdout=stdout)
+
+    responses = [json.loads(line) for line in stdout.getvalue().splitlines()]
+    by_id = {r["id"]: r for r in responses}
+    assert len(responses) == 5  # Nothing for the notification
+    assert responses[-1]["id"] == 2  # Finished last
+    assert by_id[1]["result"]["serverInfo"] == {"name": "test", "version": "1.0"}
+    assert by_id[2]["result"]["structuredContent"] == {
+        "text": "slow",
+        "client": "stdio",
+    }
+    (tool,) = by_id[3]["result"]["tools"]
+    assert tool["description"] == "Echo the text back"
+    assert tool["inputSchema"]["required"] == ["text"]
+    assert by_id[4]["result"] == {
+        "content": [{"type": "text", "text": "Echo refused"}],
+        "isError": True,
+    }
+    assert by_id[5]["error"]["code"] == -32602  # Missing "text"
+
+
+@pytest.fixture
+def client(db, monkeypatch):
+    from src.mcp_server import sentinel_server
+
+    class StubAgent:
+        agent_id = "research-01"
+
+        def input_fingerprint(self):
+            return None
+
+        async def diagnose(self):
+            return {"description": "backlog", "confidence": 0.8}
+
+    async def stub_agent(agent_id, domain=None, project=None):
+        return StubAgent()
+
+    monkeypatch.setattr(sentinel_server, "_get_or_create_agent", stub_agent)
+    monkeypatch.setattr(sentinel_server, "db", db)
+    monkeypatch.setattr(sentinel_server, "coalescer", DiagnosisCoalescer(db))
+    monkeypatch.setattr(sentinel_server, "bus", EventBus(db))
+    with TestClient(sentinel_server.app) as client:
+        yield client
+
+
+def test_http_transport_calls_endpoints_in_process(client):
+    """POST /mcp runs the same handlers as the REST endpoints"""
+    batch = [
+        _call(1, "diagnose", agent_id="research-01", domain="research"),
+        _call(2, "execute", agent_id="unknown", action={"type": "noop"}),
+        _call(3, "state", agent_id="research-01"),
+    ]
+    response = client.post("/mcp", json=batch)
+
+    assert response.status_code == 200
+    by_id = {r["id"]: r["result"] for r in response.json()}
+    assert by_id[1]["structuredContent"]["bottleneck"]["description"] == "backlog"
+    assert by_id[2]["isError"]
+    assert by_id[2]["content"][0]["text"] == "Agent unknown not registered"
+    assert by_id[3]["structuredContent"]["state"]["agent_id"] == "research-01"
+
+    notification = {"jsonrpc": "2.0", "method": "notifications/initialized"}
+    assert client.post("/mcp", json=notification).status_code == 202
+    assert client.get("/stats").json()["mcp"]["calls"] == 3
+
+
+@pytest.mark.asyncio
+async def test_only_registered_agents_are_kept(make_db, monkeypatch):
+    """Client-supplied IDs and projects don't add instances to the registry"""
+    from src.mcp_server import sentinel_server
+
+    db = make_db(("research-01", "ai-systems-research"))
+    monkeypatch.setattr(sentinel_server, "db", db)
+    monkeypatch.setattr(sentinel_server, "agents", {})
+    get = sentinel_server._get_or_create_agent
+
+    first = await get("research-01", "research", project="alpha")
+    assert await get("research-01", "research", project="beta") is first
+    assert first.domain == "ai-systems-research"
+    for n in range(3):
+        await get(f"made-up-{n}", "research")
+
+    assert list(sentinel_server.agents) == ["research-01"]
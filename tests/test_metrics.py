@@ -0,0 +1,103 @@
+"""
+Tests for the OpenTelemetry metrics catalog and its instrumentation
+"""
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from opentelemetry.sdk.metrics.export import InMemoryMetricReader
+
+from src.observability import metrics
+from src.observability.metrics import LATENCY_BUCKETS, MetricsMiddleware
+from src.observability.telemetry import instrument_agent_method, record_metric
+
+
+@pytest.fixture
+def reader():
+    reader = InMemoryMetricReader()
+    metrics.setup_metrics(reader=reader)
+    return reader
+
+
+def _points(reader) -> dict:
+    """{metric name: [data points]} collected so far"""
+    points = {}
+    for resource in reader.get_metrics_data().resource_metrics:
+        for scope in resource.scope_metrics:
+            for metric in scope.metrics:
+                points[metric.name] = list(metric.data.data_points)
+    return points
+
+
+class StubAgent:
+    agent_type = "research"
+
+    @instrument_agent_method("stub.diagnose")
+    async def diagnose(self, fail: bool = False):
+        if fail:
+            raise ValueError("no data")
+        return {"confidence": 0.9}
+
+
+class Usage:
+    input_tokens = 120
+    output_tokens = 30
+    cache_read_input_tokens = 100
+
+
+@pytest.mark.asyncio
+async def test_catalog_instruments_record_by_kind(reader):
+    """Histograms, counters and gauges are all fed by name"""
+    agent = StubAgent()
+    await agent.diagnose()
+    with pytest.raises(ValueError):
+        await agent.diagnose(fail=True)
+    metrics.record_tokens(Usage(), {"agent.type": "research"})
+    metrics.record_tokens(Usage(), {"agent.type": "research"})
+    record_metric("admission.queue_depth", 3, {"endpoint": "diagnose"})
+    record_metric("admission.queue_depth", 1, {"endpoint": "diagnose"})
+    metrics.observe("actions.queue_depth", lambda: [(7, {})])
+    assert not metrics.record("not.in.catalog", 1)
+
+    points = _points(reader)
+    durations = {p.attributes["success"]: p for p in points["sentinel.agent.duration"]}
+    assert durations[True].count == durations[False].count == 1
+    assert tuple(durations[True].explicit_bounds) == LATENCY_BUCKETS
+    (error,) = points["sentinel.errors"]
+    assert error.attributes["error.type"] == "ValueError"
+    assert error.attributes["component"] == "agent"
+    assert points["sentinel.claude.tokens.input"][0].value == 240
+    assert points["sentinel.claude.tokens.output"][0].value == 60
+    assert points["sentinel.claude.tokens.cache_read"][0].value == 200
+    assert [p.value for p in points["sentinel.admission.queue_depth"]] == [1]
+    assert [p.value for p in points["sentinel.actions.queue_depth"]] == [7]
+
+
+def test_db_queries_and_endpoints_are_timed(reader, make_db):
+    """Queries by operation, requests by route template and status"""
+    # Made after the reader is set up, so its queries are measured
+    db = make_db(("research-01", "research"))
+    db.get_all_agents()
+
+    app = FastAPI()
+    app.add_middleware(MetricsMiddleware)
+
+    @app.get("/agents/{agent_id}")
+    async def get_agent(agent_id: str):
+        return {"agent_id": agent_id}
+
+    with TestClient(app) as client:
+        client.get("/agents/research-01")
+        client.get("/agents/github-01")
+        client.get("/missing")
+
+    points = _points(reader)
+    operations = {
+        p.attributes["db.operation"] for p in points["sentinel.db.query.duration"]
+    }
+    assert {"SELECT", "INSERT"} <= operations
+    requests = {
+        (p.attributes["http.route"], p.attributes["http.status_code"]): p.count
+        for p in points["sentinel.http.server.duration"]
+    }
+    assert requests == {("/agents/{agent_id}", 200): 2, ("unmatched", 404): 1}
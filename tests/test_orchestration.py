@@ -2,6 +2,8 @@
 Tests for orchestration logic
 """
 
+import json
+
 import pytest
 from src.agents.orchestrator import OrchestratorAgent
 
@@ -32,3 +34,92 @@ async def test_rank_by_impact(orchestrator):
     
     assert ranked[0]["impact_score"] == 8  # Highest impact first
     assert ranked[-1]["impact_score"] == 3  # Lowest impact last
+
+
+def _plan_response(*args, **kwargs):
+    return json.dumps(
+        {
+            "top_bottleneck": {"agent_id": "agent-0"},
+            "priority_ranking": [],
+            "cross_domain_conflicts": [],
+            "weekly_plan": [{"action": "Fix it", "domain": "d", "priority": 1}],
+        }
+    )
+
+
+def _memo_reports(count=8):
+    return [
+        {
+            "agent_id": f"agent-{i}",
+            "domain": "github-triage",
+            "description": f"Bottleneck {i}",
+            "impact_score": i,
+            "confidence": 0.8,
+            "last_run": f"2025-01-0{i % 9 + 1}T00:00:00",
+        }
+        for i in range(count)
+    ]
+
+
+@pytest.mark.asyncio
+async def test_unchanged_reports_reuse_plan(orchestrator):
+    """An unchanged report set is re-stamped without calling Claude"""
+    prompts = []
+
+    async def fake_call_claude(system_prompt, user_message, max_tokens=2000):
+        prompts.append(user_message)
+        return _plan_response()
+
+    orchestrator.call_claude = fake_call_claude
+    first = await orchestrator.synthesize(_memo_reports())
+
+    # Only volatile fields differ on the second run
+    reports = _memo_reports()
+    for report in reports:
+        report["last_run"] = "2025-02-01T00:00:00"
+    second = await orchestrator.synthesize(reports, previous_plan=first)
+
+    assert len(prompts) == 1
+    assert second["cached"] is True
+    assert second["input_fingerprint"] == first["input_fingerprint"]
+
+
+@pytest.mark.asyncio
+async def test_small_change_synthesizes_incrementally(orchestrator):
+    """Only changed reports and the previous plan are sent on small changes"""
+    prompts = []
+
+    async def fake_call_claude(system_prompt, user_message, max_tokens=2000):
+        prompts.append(user_message)
+        return _plan_response()
+
+    orchestrator.call_claude = fake_call_claude
+    first = await orchestrator.synthesize(_memo_reports())
+
+    reports = _memo_reports()
+    reports[3]["description"] = "A brand new bottleneck"
+    second = await orchestrator.synthesize(reports, previous_plan=first)
+
+    assert second["synthesis_mode"] == "incremental"
+    assert "A brand new bottleneck" in prompts[-1]
+    assert "Bottleneck 5" not in prompts[-1]
+    assert len(second["priority_ranking"]) == len(reports)
+
+
+@pytest.mark.asyncio
+async def test_fallback_plan_is_reused(orchestrator):
+    """A plan ranked locally after a bad response is memoized like any other"""
+    prompts = []
+
+    async def fake_call_claude(system_prompt, user_message, max_tokens=2000):
+        prompts.append(user_message)
+        return "not json"
+
+    orchestrator.call_claude = fake_call_claude
+    first = await orchestrator.synthesize(_memo_reports())
+
+    assert first["synthesis_mode"] == "fallback"
+    assert orchestrator.current_plan is first
+    second = await orchestrator.synthesize(_memo_reports())
+    assert len(prompts) == 1
+    assert second["cached"] is True
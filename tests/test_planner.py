@@ -0,0 +1,93 @@
+"""
+Tests for dependency-graph weekly planning
+"""
+
+import pytest
+
+from src.agents.orchestrator import OrchestratorAgent
+from src.orchestration.planner import DependencyPlanner
+
+
+def _report(agent_id, domain, description, impact, blocking=(), effort=None):
+    report = {
+        "agent_id": agent_id,
+        "domain": domain,
+        "description": description,
+        "impact_score": impact,
+        "confidence": 0.8,
+        "blocking": list(blocking),
+        "recommended_action": f"Resolve {description.lower()}",
+    }
+    if effort is not None:
+        report["effort_hours"] = effort
+    return report
+
+
+def _chain():
+    return [
+        _report("ci-agent", "infra", "Flaky CI pipeline", 9, ["release process"]),
+        _report("release-agent", "github", "Release process stalled", 7, ["docs"]),
+        _report("docs-agent", "docs", "Docs out of date", 5),
+    ]
+
+
+def test_blocking_chain_orders_waves():
+    """A blocker is scheduled in an earlier wave than what it blocks"""
+    schedule = DependencyPlanner().schedule(_chain())
+
+    assert schedule.waves == [[0], [1], [2]]
+    assert schedule.critical_path == [0, 1, 2]
+    assert schedule.critical_path_hours == 12.0
+    assert schedule.cycles_broken == 0
+
+
+def test_cycle_broken_at_highest_priority():
+    """Mutual blockers are released highest-priority first"""
+    reports = [
+        _report("a-agent", "infra", "Alpha outage", 9, ["beta"]),
+        _report("b-agent", "github", "Beta backlog", 4, ["alpha"]),
+    ]
+
+    schedule = DependencyPlanner().schedule(reports)
+
+    assert schedule.cycles_broken == 1
+    assert schedule.waves[0] == [0]
+    assert sum(len(wave) for wave in schedule.waves) == 2
+
+
+def test_allocation_fits_weekly_budget():
+    """Selected work never exceeds the weekly budget"""
+    reports = [
+        _report(f"agent-{i}", f"d{i % 3}", f"Task {i}", 10 - i, effort=3 + i % 4)
+        for i in range(12)
+    ]
+
+    weekly_plan, allocation, _ = DependencyPlanner(weekly_hours=16).plan(reports)
+
+    assert allocation["method"] == "knapsack"
+    assert allocation["allocated_hours"] <= 16
+    assert sum(item["effort_hours"] for item in weekly_plan) <= 16
+    assert len(allocation["selected"]) + len(allocation["deferred"]) == 12
+    assert [item["priority"] for item in weekly_plan] == list(
+        range(1, len(weekly_plan) + 1)
+    )
+
+
+@pytest.mark.asyncio
+async def test_fallback_plan_includes_schedule():
+    """An unparseable synthesis still yields a dependency-ordered plan"""
+    orchestrator = OrchestratorAgent()
+
+    async def fake_call_claude(system_prompt, user_message, max_tokens=2000):
+        return "not json"
+
+    orchestrator.call_claude = fake_call_claude
+    plan = await orchestrator.synthesize(_chain())
+
+    assert [item["agent_id"] for item in plan["weekly_plan"]] == [
+        "ci-agent",
+        "release-agent",
+        "docs-agent",
+    ]
+    assert plan["critical_path"] == ["ci-agent", "release-agent", "docs-agent"]
+    assert plan["resource_allocation"]["allocated_hours"] == 12.0
@@ -0,0 +1,60 @@
+"""
+Tests for orchestration progress events
+"""
+
+import json
+
+import pytest
+
+from src.orchestration.progress import format_sse, orchestration_events
+from src.storage.job_queue import JobQueue
+
+
+@pytest.fixture
+def queue(make_db):
+    return JobQueue(make_db())
+
+
+@pytest.mark.asyncio
+async def test_streams_agent_completions_then_result(queue):
+    """Each finished diagnosis is reported once, then the plan result"""
+    job_id = queue.enqueue("orchestrate", {})
+    queue.claim("worker-a")
+    ids = queue.enqueue_many(
+        [{"kind": "diagnose", "payload": {"agent_id": f"agent-{n}"}} for n in range(2)],
+        parent_id=job_id,
+    )
+    queue.wait_for_children(job_id, "worker-a", {"stage": "synthesize"})
+
+    events = orchestration_events(queue, job_id, poll_interval=0)
+    assert (await anext(events))["data"]["stage"] == "diagnosing"
+
+    queue.claim("worker-b")
+    bottleneck = {"description": "Backlog", "impact_score": 7}
+    queue.complete(
+        ids[0], "worker-b", {"agent_id": "agent-0", "bottleneck": bottleneck}
+    )
+    first = await anext(events)
+    assert first["event"] == "agent"
+    assert first["data"]["agent_id"] == "agent-0"
+    assert first["data"]["bottleneck"] == bottleneck
+    assert (first["data"]["completed"], first["data"]["total"]) == (1, 2)
+
+    queue.claim("worker-b")
+    queue.complete(ids[1], "worker-b", {"agent_id": "agent-1", "skipped": True})
+    second = await anext(events)
+    assert second["data"]["skipped"] and second["data"]["completed"] == 2
+    assert (await anext(events))["data"]["stage"] == "synthesizing"
+
+    queue.claim("worker-a")
+    queue.complete(job_id, "worker-a", {"plan_id": 3})
+    remaining = [event async for event in events]
+    assert remaining == [{"event": "complete", "data": {"plan_id": 3}}]
+
+
+def test_format_sse():
+    """Events are encoded as SSE frames; None is a keepalive comment"""
+    frame = format_sse({"event": "agent", "data": {"agent_id": "a"}}, event_id=4)
+    assert frame == 'id: 4\nevent: agent\ndata: {"agent_id": "a"}\n\n'
+    assert json.loads(frame.split("data: ")[1]) == {"agent_id": "a"}
+    assert format_sse(None) == ": keepalive\n\n"
@@ -0,0 +1,126 @@
+"""
+Tests for the ETag/TTL response cache
+"""
+
+import pytest
+from fastapi import FastAPI, Request
+from fastapi.testclient import TestClient
+
+from src.mcp_server.response_cache import DashboardSnapshot, ResponseCache
+from src.storage.postgres_client import PostgresClient
+
+
+class Clock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def setup(db):
+    clock = Clock()
+    cache = ResponseCache(db, ttl_seconds=2, clock=clock)
+    builds = []
+    app = FastAPI()
+
+    @app.get("/reports")
+    async def reports(request: Request):
+        def build():
+            builds.append(1)
+            return {"reports": db.get_all_agent_reports()}
+
+        return cache.respond(request, ("agents", "bottlenecks"), build)
+
+    return TestClient(app), db, clock, builds
+
+
+def test_if_none_match_gets_304(setup):
+    """Unchanged data is revalidated without rebuilding the body"""
+    client, db, clock, builds = setup
+
+    first = client.get("/reports")
+    etag = first.headers["etag"]
+    assert first.status_code == 200 and first.json()["reports"]
+
+    assert client.get("/reports", headers={"If-None-Match": etag}).status_code == 304
+    clock.now += 10  # Past the TTL: versions are checked, still unchanged
+    assert client.get("/reports", headers={"If-None-Match": etag}).status_code == 304
+    assert client.get("/reports").json() == first.json()
+    assert len(builds) == 1
+
+
+def test_writes_invalidate(setup):
+    """A write in this process invalidates at once; others after the TTL"""
+    client, db, clock, builds = setup
+    etag = client.get("/reports").headers["etag"]
+
+    db.save_bottleneck("research-01", {"description": "Backlog", "confidence": 0.9})
+    changed = client.get("/reports", headers={"If-None-Match": etag})
+    assert changed.status_code == 200
+    assert changed.json()["reports"][0]["bottleneck"]["description"] == "Backlog"
+    etag = changed.headers["etag"]
+
+    # Another worker writes: served from cache until the TTL runs out
+    other = PostgresClient()
+    other.connect()
+    other.save_bottleneck("research-01", {"description": "Reviews", "confidence": 0.9})
+    assert client.get("/reports", headers={"If-None-Match": etag}).status_code == 304
+    clock.now += 3
+    assert client.get("/reports", headers={"If-None-Match": etag}).status_code == 200
+    assert len(builds) == 3
+
+
+def test_plan_writes_bump_version(setup):
+    """Saving or re-stamping a plan changes the plan's validators"""
+    _, db, _, _ = setup
+    before = db.get_table_versions(("orchestrator_plans",))["orchestrator_plans"]
+
+    plan = db.save_orchestration_result({"week": "2024-06-03T09:00:00"})
+    db.restamp_orchestration_result(plan.id, "2024-06-10T09:00:00")
+
+    versions = db.get_table_versions(("orchestrator_plans",))
+    assert versions["orchestrator_plans"] == before + 2
+
+
+def test_dashboard_snapshot_rebuilds_changed_panels(setup):
+    """One response for every panel; a write rebuilds only its panels"""
+    _, db, clock, _ = setup
+    snapshot = DashboardSnapshot(db, ttl_seconds=2, clock=clock)
+    app = FastAPI()
+
+    @app.get("/dashboard/snapshot")
+    async def dashboard(request: Request):
+        return snapshot.respond(request)
+
+    client = TestClient(app)
+    first = client.get("/dashboard/snapshot")
+    body = first.json()
+    assert set(body) == {
+        "agents",
+        "reports",
+        "plan",
+        "security_summary",
+        "vulnerabilities",
+        "versions",
+    }
+    assert body["agents"][0]["agent_id"] == "research-01"
+    assert snapshot.counts["panels_built"] == 5
+
+    db.save_bottleneck("research-01", {"description": "Backlog", "confidence": 0.9})
+    changed = client.get(
+        "/dashboard/snapshot", headers={"If-None-Match": first.headers["etag"]}
+    )
+    assert changed.status_code == 200
+    assert changed.json()["reports"][0]["bottleneck"]["description"] == "Backlog"
+    assert changed.json()["agents"] == body["agents"]
+    assert snapshot.counts["panels_built"] == 6  # Only "reports"
+
+    clock.now += 3
+    etag = changed.headers["etag"]
+    assert (
+        client.get("/dashboard/snapshot", headers={"If-None-Match": etag}).status_code
+        == 304
+    )
+    assert snapshot.counts["revalidated"] == 1
@@ -0,0 +1,88 @@
+"""
+Tests for the cadence scheduler
+"""
+
+import random
+import asyncio
+from datetime import datetime, timedelta
+
+import pytest
+
+from src.orchestration.scheduler import (
+    CronCadence,
+    IntervalCadence,
+    Scheduler,
+    parse_cadence,
+)
+
+
+class FakeClock:
+    def __init__(self, start):
+        self.now = start
+
+    def __call__(self):
+        return self.now
+
+
+def test_parse_cadences():
+    """Aliases, intervals and cron expressions are all accepted"""
+    assert parse_cadence("daily").period == timedelta(days=1)
+    assert parse_cadence("every 30m").period == timedelta(minutes=30)
+    assert parse_cadence("6h").period == timedelta(hours=6)
+
+    # Mondays at 09:00; 2025-01-01 is a Wednesday
+    cron = parse_cadence("0 9 * * 1")
+    assert isinstance(cron, CronCadence)
+    assert cron.next_after(datetime(2025, 1, 1, 12, 0)) == datetime(2025, 1, 6, 9, 0)
+    assert cron.next_after(datetime(2025, 1, 6, 9, 0)) == datetime(2025, 1, 13, 9, 0)
+
+    with pytest.raises(ValueError):
+        parse_cadence("fortnightly-ish")
+
+
+def test_missed_runs_catch_up_once():
+    """A job missed while stopped runs once now, or waits when catch-up is off"""
+    clock = FakeClock(datetime(2025, 1, 10, 12, 0))
+    last_run = datetime(2025, 1, 7, 8, 0)
+
+    async def job():
+        pass
+
+    catching_up = Scheduler(max_jitter_seconds=0, clock=clock)
+    assert catching_up.add("a", IntervalCadence(86400), job, last_run).next_run == (
+        clock.now
+    )
+
+    waiting = Scheduler(max_jitter_seconds=0, catch_up=False, clock=clock)
+    next_run = waiting.add("a", IntervalCadence(86400), job, last_run).next_run
+    assert next_run == datetime(2025, 1, 11, 8, 0)
+
+
+@pytest.mark.asyncio
+async def test_jitter_and_overlap_prevention():
+    """Due times are jittered, and a still-running job is not started twice"""
+    clock = FakeClock(datetime(2025, 1, 1, 0, 0))
+    release = asyncio.Event()
+    starts = []
+
+    async def slow_job():
+        starts.append(clock.now)
+        await release.wait()
+
+    scheduler = Scheduler(max_jitter_seconds=30, clock=clock, rng=random.Random(1))
+    job = scheduler.add("slow", IntervalCadence(60), slow_job)
+    assert clock.now <= job.due <= clock.now + timedelta(seconds=30)
+
+    clock.now += timedelta(seconds=30)
+    assert len(scheduler.run_pending()) == 1
+    await asyncio.sleep(0)
+
+    # Due again while the first run is still going
+    clock.now += timedelta(seconds=120)
+    assert scheduler.run_pending() == []
+    assert job.overlaps == 1
+
+    release.set()
+    await asyncio.gather(*scheduler._tasks)
+    assert job.runs == 1 and not job.running
+    assert len(starts) == 1
@@ -0,0 +1,91 @@
+"""
+Tests that init_db brings databases created by earlier versions up to date
+"""
+
+import pytest
+from sqlalchemy import create_engine, inspect, text
+
+from src.storage.postgres_client import PostgresClient
+
+# Tables as the first release created them, before columns were added
+OLD_TABLES = (
+    """CREATE TABLE agents (
+        id INTEGER PRIMARY KEY,
+        agent_id VARCHAR(100) NOT NULL UNIQUE,
+        domain VARCHAR(100) NOT NULL,
+        name VARCHAR(200),
+        responsibilities JSON,
+        autonomy_level VARCHAR(50),
+        created_at DATETIME,
+        last_run DATETIME,
+        is_active BOOLEAN,
+        metrics JSON
+    )""",
+    """CREATE TABLE orchestrator_plans (
+        id INTEGER PRIMARY KEY,
+        week VARCHAR(100) NOT NULL UNIQUE,
+        top_bottleneck JSON NOT NULL,
+        priority_ranking JSON,
+        resource_allocation JSON,
+        weekly_plan JSON,
+        cross_domain_conflicts JSON,
+        created_at DATETIME
+    )""",
+)
+
+
+@pytest.fixture
+def db(tmp_path, monkeypatch):
+    url = f"sqlite:///{tmp_path / 'sentinel.db'}"
+    engine = create_engine(url)
+    with engine.begin() as conn:
+        for ddl in OLD_TABLES:
+            conn.execute(text(ddl))
+        conn.execute(
+            text(
+                "INSERT INTO orchestrator_plans (id, week, top_bottleneck) "
+                "VALUES (1, '2024-W52', '{}')"
+            )
+        )
+        conn.execute(
+            text(
+                "INSERT INTO agents (id, agent_id, domain, is_active) "
+                "VALUES (1, 'research-01', 'research', 1)"
+            )
+        )
+    engine.dispose()
+
+    monkeypatch.setenv("DATABASE_URL", url)
+    db = PostgresClient()
+    db.connect()
+    db.init_db()
+    db.init_db()  # Idempotent
+    return db
+
+
+def _columns(db, table: str) -> set:
+    return {c["name"] for c in inspect(db.engine).get_columns(table)}
+
+
+def test_plans_gain_fingerprint_columns(db):
+    """Memoized plans can be read and written on an upgraded database"""
+    assert {"input_fingerprint", "report_digests"} <= _columns(db, "orchestrator_plans")
+    indexes = inspect(db.engine).get_indexes("orchestrator_plans")
+    assert any(i["column_names"] == ["input_fingerprint"] for i in indexes)
+
+    assert db.get_latest_orchestration_result()["week"] == "2024-W52"
+    db.save_orchestration_result(
+        {"week": "2025-W01", "top_bottleneck": {}, "input_fingerprint": "abc"}
+    )
+    assert db.get_latest_orchestration_result()["input_fingerprint"] == "abc"
+
+
+def test_agents_gain_input_fingerprint(db):
+    """Agent endpoints and the freshness gate work on an upgraded database"""
+    assert "input_fingerprint" in _columns(db, "agents")
+
+    (agent,) = db.get_all_agents()
+    assert agent["input_fingerprint"] is None
+    db.update_agent_last_run("research-01", "f" * 64)
+    assert db.get_all_agents()[0]["input_fingerprint"] == "f" * 64
+    assert db.get_all_agent_reports()[0]["agent_id"] == "research-01"
@@ -0,0 +1,72 @@
+"""
+Tests for vectorized priority scoring
+"""
+
+from datetime import datetime, timedelta, timezone
+
+from src.orchestration.scoring import PriorityScorer, ScoringWeights
+
+NOW = datetime(2025, 3, 1, tzinfo=timezone.utc)
+
+
+def _ago(days):
+    return (NOW - timedelta(days=days)).replace(tzinfo=None).isoformat()
+
+
+def test_defaults_match_impact_times_confidence():
+    """By default every extra factor is off: the score is impact * confidence"""
+    reports = [
+        {"impact_score": 5, "confidence": 0.8, "identified_at": _ago(60)},
+        {"impact_score": 8, "confidence": 0.9, "blocking": ["a", "b"]},
+        {"impact_score": 3, "open_since": _ago(90)},
+    ]
+
+    scores = PriorityScorer(ScoringWeights()).score(reports, now=NOW)
+
+    assert scores.tolist() == [4.0, 7.2, 1.5]
+
+
+def test_weighted_features():
+    """Recency decays, while open age, blockers and domain weight boost"""
+    scorer = PriorityScorer(
+        ScoringWeights(
+            recency_half_life_days=7,
+            open_age_weight=0,
+            blocks_weight=0,
+            domain_weights={"security": 2.0},
+        )
+    )
+    reports = [
+        {"impact_score": 8, "confidence": 1.0, "identified_at": _ago(7)},
+        {"impact_score": 8, "confidence": 1.0, "identified_at": _ago(0)},
+        {"impact_score": 5, "confidence": 1.0, "domain": "security"},
+    ]
+
+    scores = scorer.score(reports, now=NOW)
+
+    assert abs(scores[0] - 4.0) < 1e-6
+    assert [r["impact_score"] for r in scorer.rank(reports, now=NOW)] == [5, 8, 8]
+
+    boosted = PriorityScorer(
+        ScoringWeights(open_age_weight=0.5, blocks_weight=0.1)
+    ).score(
+        [
+            {"impact_score": 5, "confidence": 1.0, "blocking": ["a", "b"]},
+            {"impact_score": 5, "confidence": 1.0, "open_since": _ago(30)},
+            {"impact_score": 5, "confidence": 1.0},
+        ],
+        now=NOW,
+    )
+    assert boosted[0] > boosted[2] and boosted[1] > boosted[2]
+
+
+def test_top_k_matches_full_ranking():
+    """top_k returns the head of the full ranking, ties in input order"""
+    reports = [
+        {"agent_id": f"agent-{i}", "impact_score": i % 17, "confidence": 0.8}
+        for i in range(1000)
+    ]
+    scorer = PriorityScorer(ScoringWeights())
+
+    assert scorer.top_k(reports, 25, now=NOW) == scorer.rank(reports, now=NOW)[:25]
+    assert scorer.top_k(reports, 0) == []
@@ -0,0 +1,89 @@
+"""
+Tests for API serialization and response compression
+"""
+
+import json
+from datetime import datetime
+
+import numpy as np
+from fastapi import FastAPI, Response
+from fastapi.responses import StreamingResponse
+from fastapi.testclient import TestClient
+
+from src.mcp_server.serialization import (
+    CompressionMiddleware,
+    FastJSONResponse,
+    dumps,
+    negotiate_encoding,
+)
+
+LARGE = {"priority_ranking": [{"rank": n, "description": "x" * 40} for n in range(200)]}
+
+
+def _client():
+    app = FastAPI(default_response_class=FastJSONResponse)
+    app.add_middleware(CompressionMiddleware, minimum_size=1024)
+
+    @app.get("/large")
+    async def large():
+        return FastJSONResponse(LARGE, headers={"ETag": '"v1"'})
+
+    @app.get("/small")
+    async def small():
+        return {"ok": True}
+
+    @app.get("/events")
+    async def events():
+        async def stream():
+            yield "event: status\ndata: " + "x" * 2000 + "\n\n"
+
+        return StreamingResponse(stream(), media_type="text/event-stream")
+
+    @app.get("/unchanged")
+    async def unchanged():
+        return Response(status_code=304, headers={"ETag": '"v1"'})
+
+    return TestClient(app)
+
+
+def test_dumps_handles_native_types():
+    """Datetimes, numpy values and sets encode without a pre-pass"""
+    payload = {
+        "at": datetime(2024, 5, 1, 9, 30, 15, 250),
+        "score": np.float64(0.5),
+        "scores": np.array([1.5, 2.0]),
+        "tags": {"a"},
+        7: "int key",
+    }
+    assert json.loads(dumps(payload)) == {
+        "at": "2024-05-01T09:30:15.000250",
+        "score": 0.5,
+        "scores": [1.5, 2.0],
+        "tags": ["a"],
+        "7": "int key",
+    }
+
+
+def test_negotiates_encoding():
+    assert negotiate_encoding("gzip, deflate") == "gzip"
+    assert negotiate_encoding("gzip;q=0, identity") is None
+    assert negotiate_encoding(None) is None
+
+
+def test_compresses_large_responses_only():
+    """Large bodies are gzipped; small, streamed and 304 responses aren't"""
+    client = _client()
+    headers = {"Accept-Encoding": "gzip"}
+
+    response = client.get("/large", headers=headers)
+    assert response.headers["content-encoding"] == "gzip"
+    assert response.headers["etag"] == 'W/"v1"'
+    assert "Accept-Encoding" in response.headers["vary"]
+    assert int(response.headers["content-length"]) < len(dumps(LARGE)) / 5
+    assert response.json() == LARGE
+
+    assert "content-encoding" not in client.get("/small", headers=headers).headers
+    assert "content-encoding" not in client.get("/events", headers=headers).headers
+    assert client.get("/unchanged", headers=headers).status_code == 304
+    identity = client.get("/large", headers={"Accept-Encoding": "identity"})
+    assert "content-encoding" not in identity.headers
@@ -0,0 +1,131 @@
+"""
+Tests for diagnosis request coalescing
+"""
+
+import asyncio
+
+import pytest
+
+from src.orchestration.singleflight import DiagnosisCoalescer, SingleFlight
+from src.storage.postgres_client import PostgresClient
+
+
+class SlowAgent:
+    def __init__(self, agent_id, fingerprint="abc"):
+        self.agent_id = agent_id
+        self.fingerprint = fingerprint
+        self.calls = 0
+
+    def input_fingerprint(self):
+        return self.fingerprint
+
+    async def diagnose(self):
+        self.calls += 1
+        await asyncio.sleep(0.05)
+        return {"description": "Review backlog", "confidence": 0.9, "impact_score": 6}
+
+
+@pytest.mark.asyncio
+async def test_concurrent_identical_diagnoses_share_one_call(db):
+    """Overlapping requests for the same inputs run and store once"""
+    coalescer = DiagnosisCoalescer(db)
+    agent = SlowAgent("research-01")
+
+    results = await asyncio.gather(*(coalescer.diagnose(agent) for _ in range(5)))
+
+    assert agent.calls == 1
+    assert [shared for _, shared in results].count(False) == 1
+    assert all(b["description"] == "Review backlog" for b, _ in results)
+    assert coalescer.stats()["coalesced"] == 4
+    assert coalescer.stats()["in_flight"] == 0
+    reports = db.get_all_agent_reports()
+    assert reports[0]["bottleneck"]["description"] == "Review backlog"
+    assert db.get_agent_state("research-01")["input_fingerprint"] == "abc"
+
+    # Changed inputs are a different request
+    await asyncio.gather(coalescer.diagnose(SlowAgent("research-01", "def")))
+    assert coalescer.stats()["leaders"] == 2
+
+
+@pytest.mark.asyncio
+async def test_shared_call_survives_a_cancelled_caller():
+    """The first caller going away doesn't cancel the work for the others"""
+    flight = SingleFlight()
+    started = asyncio.Event()
+
+    async def work():
+        started.set()
+        await asyncio.sleep(0.05)
+        return "done"
+
+    first = asyncio.create_task(flight.do("key", work))
+    await started.wait()
+    second = asyncio.create_task(flight.do("key", work))
+    await asyncio.sleep(0)
+    first.cancel()
+
+    assert await second == ("done", True)
+    assert flight.in_flight == 0
+
+
+@pytest.mark.asyncio
+async def test_leaders_take_a_slot_before_the_lock(db, monkeypatch):
+    """Lock connections never outnumber the diagnosis slots"""
+    held = []
+    peak = 0
+    acquire, release = db.acquire_advisory_lock, db.release_advisory_lock
+
+    def counted_acquire(key):
+        nonlocal peak
+        held.append(key)
+        peak = max(peak, len(held))
+        return acquire(key)
+
+    def counted_release(handle):
+        held.pop()
+        release(handle)
+
+    monkeypatch.setattr(db, "acquire_advisory_lock", counted_acquire)
+    monkeypatch.setattr(db, "release_advisory_lock", counted_release)
+    for n in range(6):
+        db.register_agent(f"agent-{n}", "research")
+
+    coalescer = DiagnosisCoalescer(db, slots=asyncio.Semaphore(2))
+    agents = [SlowAgent(f"agent-{n}") for n in range(6)]
+    await asyncio.gather(*(coalescer.diagnose(agent) for agent in agents))
+
+    assert all(agent.calls == 1 for agent in agents)
+    assert peak == 2
+
+
+def test_pool_fits_the_diagnosis_slots(monkeypatch):
+    """Each running diagnosis can hold its lock and a session at once"""
+    monkeypatch.setenv("DATABASE_URL", "postgresql://sentinel@localhost/sentinel")
+    monkeypatch.setenv("SENTINEL_DIAGNOSE_CONCURRENCY", "12")
+    client = PostgresClient()
+    client.connect()
+
+    assert client.engine.pool.size() == 24
+
+
+@pytest.mark.asyncio
+async def test_storing_requests_never_rely_on_batch_callers(db):
+    """A diagnosis left to its caller to store is never shared as stored"""
+    coalescer = DiagnosisCoalescer(db)
+    agent = SlowAgent("research-01")
+
+    # Batch items (persist=False) share a call, but each batch saves it
+    batch = await asyncio.gather(
+        coalescer.diagnose(agent, persist=False),
+        coalescer.diagnose(agent, persist=False),
+    )
+    assert agent.calls == 1
+    assert [shared for _, shared in batch] == [False, False]
+
+    # A request that stores runs on its own, even beside a batch item
+    _, (_, shared) = await asyncio.gather(
+        coalescer.diagnose(agent, persist=False), coalescer.diagnose(agent)
+    )
+    assert agent.calls == 3
+    assert not shared
+    assert db.get_agent_state("research-01")["input_fingerprint"] == "abc"
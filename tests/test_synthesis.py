@@ -0,0 +1,130 @@
+"""
+Tests for hierarchical (map-reduce) synthesis
+"""
+
+import json
+import time
+from types import SimpleNamespace
+
+import pytest
+
+from src.agents.orchestrator import OrchestratorAgent
+from src.orchestration.synthesis import HierarchicalSynthesizer
+
+
+def _reports(count, domains=4):
+    return [
+        {
+            "agent_id": f"agent-{i}",
+            "domain": f"domain-{i % domains}",
+            "description": f"Bottleneck number {i} " + "x" * 200,
+            "impact_score": i % 10,
+            "confidence": 0.8,
+            "blocking": ["release"],
+            "recommended_action": "Fix it",
+        }
+        for i in range(count)
+    ]
+
+
+class FakeModel:
+    """Echoes a small summary for every map/reduce call"""
+
+    def __init__(self):
+        self.calls = []
+
+    async def __call__(self, system_prompt, user_message, max_tokens):
+        self.calls.append(system_prompt)
+        return json.dumps({"summary": "ok", "top_bottlenecks": [{"x": "y" * 200}]})
+
+
+class BlockingMessages:
+    """A synchronous Claude client, like the SDK's: create() blocks"""
+
+    def __init__(self, delay=0.0):
+        self.delay = delay
+        self.prompts = []
+
+    def create(self, model, max_tokens, system, messages):
+        self.prompts.append(messages[0]["content"])
+        time.sleep(self.delay)
+        if "Chief of Staff (Orchestrator)" in system:
+            text = {
+                "top_bottleneck": {"agent_id": "agent-9"},
+                "priority_ranking": [],
+                "cross_domain_conflicts": [],
+                "weekly_plan": [],
+            }
+        else:
+            text = {"summary": "ok"}
+        return SimpleNamespace(
+            usage=SimpleNamespace(input_tokens=100, output_tokens=20),
+            content=[SimpleNamespace(text=json.dumps(text))],
+        )
+
+
+def _orchestrator(messages) -> OrchestratorAgent:
+    orchestrator = OrchestratorAgent()
+    orchestrator.claude_client = SimpleNamespace(messages=messages)
+    return orchestrator
+
+
+@pytest.mark.asyncio
+async def test_condense_groups_by_domain():
+    """Each domain is summarized separately in the map step"""
+    model = FakeModel()
+    synthesizer = HierarchicalSynthesizer(model, token_budget=100000)
+
+    summaries = await synthesizer.condense(_reports(40, domains=4))
+
+    assert len(summaries) == 4
+    assert sorted(s["domains"][0] for s in summaries) == [
+        f"domain-{i}" for i in range(4)
+    ]
+    assert synthesizer.rounds == 1
+
+
+@pytest.mark.asyncio
+async def test_rounds_grow_logarithmically():
+    """Reduce rounds grow with log of the fleet size, not linearly"""
+    rounds = {}
+    for count in (50, 400):
+        model = FakeModel()
+        synthesizer = HierarchicalSynthesizer(model, token_budget=600)
+        summaries = await synthesizer.condense(_reports(count, domains=count))
+        assert synthesizer.fits(summaries) or len(summaries) == 1
+        rounds[count] = synthesizer.rounds
+
+    assert rounds[400] <= rounds[50] + 3
+
+
+@pytest.mark.asyncio
+async def test_orchestrator_uses_hierarchical_path_for_large_fleets():
+    """Oversized report sets are condensed before the final synthesis"""
+    messages = BlockingMessages()
+    orchestrator = _orchestrator(messages)
+    orchestrator.synthesizer.token_budget = 2000
+    prompts = messages.prompts
+    reports = _reports(200)
+
+    plan = await orchestrator.synthesize(reports)
+
+    assert len(prompts) > 1
+    assert "hierarchical group summaries" in prompts[-1]
+    assert len(plan["priority_ranking"]) == len(reports)
+    assert plan["synthesis_rounds"] >= 2
+
+
+@pytest.mark.asyncio
+async def test_group_syntheses_run_in_parallel():
+    """Blocking model calls in one round overlap instead of queueing"""
+    orchestrator = _orchestrator(BlockingMessages(delay=0.2))
+    orchestrator.synthesizer.token_budget = 100000
+
+    start = time.perf_counter()
+    summaries = await orchestrator.synthesizer.condense(_reports(40, domains=8))
+    elapsed = time.perf_counter() - start
+
+    assert len(summaries) == 8
+    # One round of 8 concurrent calls, not 8 x 0.2s back to back
+    assert elapsed < 0.6
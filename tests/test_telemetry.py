@@ -0,0 +1,182 @@
+"""
+Tests for trace sampling and the disabled telemetry mode
+"""
+
+import os
+import sys
+import json
+import subprocess
+from types import SimpleNamespace
+
+import pytest
+from opentelemetry.sdk.metrics.export import InMemoryMetricReader
+from opentelemetry.sdk.trace.export.in_memory_span_exporter import (
+    InMemorySpanExporter,
+)
+
+from src.agents.research_agent import ResearchAnalystAgent
+from src.observability import metrics, telemetry
+from src.observability.telemetry import flush_telemetry, setup_telemetry
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+MODEL = "claude-sonnet-4-20250514"
+
+
+class FakeMessages:
+    def create(self, model, **kwargs):
+        return SimpleNamespace(
+            usage=SimpleNamespace(input_tokens=120, output_tokens=30),
+            content=[SimpleNamespace(text="{}")],
+        )
+
+
+@pytest.fixture
+def traces(monkeypatch):
+    """Keep each test's tracer from leaking into the next"""
+    monkeypatch.setattr(telemetry, "_tracer", None)
+    monkeypatch.setattr(telemetry, "_provider", None)
+    monkeypatch.setattr(telemetry, "_enabled", True)
+    reader = InMemoryMetricReader()
+    metrics.setup_metrics(reader=reader)
+    return reader
+
+
+def _points(reader) -> dict:
+    """{metric name: [data points]} collected so far"""
+    return {
+        metric.name: list(metric.data.data_points)
+        for resource in reader.get_metrics_data().resource_metrics
+        for scope in resource.scope_metrics
+        for metric in scope.metrics
+    }
+
+
+def _agent() -> ResearchAnalystAgent:
+    agent = ResearchAnalystAgent("research-01", "research")
+    agent.claude_client = SimpleNamespace(messages=FakeMessages())
+    return agent
+
+
+@pytest.mark.asyncio
+async def test_one_span_per_claude_call(traces):
+    """The decorator's span carries the model and token counts"""
+    exporter = InMemorySpanExporter()
+    setup_telemetry(span_exporter=exporter, sample_ratio=1.0)
+
+    await _agent().call_claude("system", "user", model=MODEL)
+    flush_telemetry()
+
+    (span,) = exporter.get_finished_spans()
+    assert span.name == "claude.api.call"
+    assert span.attributes["agent.id"] == "research-01"
+    assert span.attributes["model"] == MODEL
+    assert span.attributes["tokens.total"] == 150
+    assert span.attributes["success"] is True
+
+
+@pytest.mark.asyncio
+async def test_unsampled_calls_still_record_metrics(traces):
+    """With a ratio of 0 no spans are kept, but latency is still measured"""
+    exporter = InMemorySpanExporter()
+    setup_telemetry(span_exporter=exporter, sample_ratio=0.0)
+
+    for _ in range(3):
+        await _agent().call_claude("system", "user", model=MODEL)
+    flush_telemetry()
+
+    assert exporter.get_finished_spans() == ()
+    (duration,) = _points(traces)["sentinel.claude.duration"]
+    assert duration.count == 3
+
+
+@pytest.mark.asyncio
+async def test_reader_records_after_disabled_setup(monkeypatch):
+    """A test reader records metrics even under OTEL_SDK_DISABLED"""
+    monkeypatch.setenv("OTEL_SDK_DISABLED", "true")
+    monkeypatch.setattr(telemetry, "_tracer", None)
+    monkeypatch.setattr(telemetry, "_enabled", True)
+    monkeypatch.setattr(metrics, "_meter", None)
+    monkeypatch.setattr(metrics, "_recording", True)
+    setup_telemetry()
+    assert not metrics._recording
+
+    reader = InMemoryMetricReader()
+    metrics.setup_metrics(reader=reader)
+    await _agent().call_claude("system", "user", model=MODEL)
+
+    assert _points(reader)["sentinel.claude.duration"][0].count == 1
+
+
+@pytest.mark.asyncio
+async def test_failed_trace_setup_keeps_metrics(traces):
+    """Metrics are recorded for every call even if tracing can't start"""
+    # An out-of-range ratio makes the sampler, and so trace setup, fail
+    setup_telemetry(span_exporter=InMemorySpanExporter(), sample_ratio=2.0)
+    assert not telemetry._enabled
+
+    await _agent().call_claude("system", "user", model=MODEL)
+
+    assert _points(traces)["sentinel.claude.duration"][0].count == 1
+
+
+def test_disabled_mode_starts_nothing(tmp_path):
+    """OTEL_SDK_DISABLED: no-op tracer and meter, no SDK, no exporter threads"""
+    code = (
+        "import sys, json, threading, asyncio\n"
+        "from src.observability import metrics, telemetry\n"
+        "tracer = telemetry.setup_telemetry()\n"
+        "print(json.dumps({\n"
+        "    'tracer': type(tracer).__name__,\n"
+        "    'meter': type(metrics._meter).__name__,\n"
+        "    'sdk': any(m.startswith('opentelemetry.sdk') for m in sys.modules),\n"
+        "    'threads': threading.active_count(),\n"
+        "}))\n"
+    )
+    proc = subprocess.run(
+        [sys.executable, "-c", code],
+        cwd=ROOT,
+        env={**os.environ, "OTEL_SDK_DISABLED": "true"},
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    report = json.loads(proc.stdout.strip().splitlines()[-1])
+    assert report == {
+        "tracer": "NoOpTracer",
+        "meter": "NoOpMeter",
+        "sdk": False,
+        "threads": 1,
+    }
+
+
+def test_get_tracer_before_setup_starts_nothing():
+    """Spans before setup_telemetry() go to the proxy tracer, not an exporter"""
+    code = (
+        "import sys, json, threading\n"
+        "from src.observability import telemetry\n"
+        "with telemetry.get_tracer().start_as_current_span('work') as span:\n"
+        "    recording = span.is_recording()\n"
+        "print(json.dumps({\n"
+        "    'tracer': type(telemetry.get_tracer()).__name__,\n"
+        "    'recording': recording,\n"
+        "    'sdk': any(m.startswith('opentelemetry.sdk') for m in sys.modules),\n"
+        "    'threads': threading.active_count(),\n"
+        "}))\n"
+    )
+    environ = {k: v for k, v in os.environ.items() if not k.startswith("OTEL_")}
+    proc = subprocess.run(
+        [sys.executable, "-c", code],
+        cwd=ROOT,
+        env=environ,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    report = json.loads(proc.stdout.strip().splitlines()[-1])
+    assert report == {
+        "tracer": "ProxyTracer",
+        "recording": False,
+        "sdk": False,
+        "threads": 1,
+    }
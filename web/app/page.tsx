@@ -1,44 +1,99 @@
 "use client";
 
-import { useState } from "react";
+import { useEffect, useState } from "react";
 import useSWR, { mutate } from "swr";
 import { AgentCard } from "@/components/dashboard/AgentCard";
 import { BottleneckList } from "@/components/dashboard/BottleneckList";
 import { Button } from "@/components/ui/button";
 import { Play, RefreshCw, AlertCircle } from "lucide-react";
-import { fetchAgents, fetchReports, runOrchestration } from "@/lib/api";
+import { fetchDashboardSnapshot, runOrchestration, subscribeToEvents, AgentProgress, DashboardEvent } from "@/lib/api";
 import { Alert, AlertDescription, AlertTitle } from "@/components/ui/alert";
 
-const FETCH_AGENTS_KEY = "/agents";
-const FETCH_REPORTS_KEY = "/reports";
+const FETCH_SNAPSHOT_KEY = "/dashboard/snapshot";
+
+// Apply a pushed delta to the cached snapshot
+function applyEvent(snapshot: any, { event, data }: DashboardEvent) {
+  if (!snapshot) return snapshot;
+  switch (event) {
+    case "bottleneck":
+      return {
+        ...snapshot,
+        reports: snapshot.reports.map((report: any) =>
+          report.agent_id === data.agent_id
+            ? { ...report, bottleneck: { open_since: report.bottleneck?.open_since ?? data.bottleneck.identified_at, ...data.bottleneck } }
+            : report,
+        ),
+      };
+    case "agent": {
+      if (!snapshot.agents.some((agent: any) => agent.agent_id === data.agent_id)) {
+        // Newly registered
+        return {
+          ...snapshot,
+          agents: [...snapshot.agents, data],
+          reports: [...snapshot.reports, { agent_id: data.agent_id, domain: data.domain, bottleneck: null, last_run: null }],
+        };
+      }
+      return {
+        ...snapshot,
+        agents: snapshot.agents.map((agent: any) =>
+          agent.agent_id === data.agent_id ? { ...agent, ...data } : agent,
+        ),
+        reports: snapshot.reports.map((report: any) =>
+          report.agent_id === data.agent_id && data.last_run ? { ...report, last_run: data.last_run } : report,
+        ),
+      };
+    }
+    case "ingest":
+      return { ...snapshot, security_summary: data.summary };
+    case "plan":
+      return { ...snapshot, plan: { ...snapshot.plan, ...data } };
+    default:
+      return snapshot;
+  }
+}
 
 export default function Dashboard() {
   const [isRunning, setIsRunning] = useState(false);
   const [cycleError, setCycleError] = useState<string | null>(null);
+  const [stage, setStage] = useState<string | null>(null);
+  const [progress, setProgress] = useState<AgentProgress[]>([]);
 
-  // SWR Hooks for polling
-  const { data: agentsData, error: agentsError, isLoading: agentsLoading } = useSWR(FETCH_AGENTS_KEY, fetchAgents, { refreshInterval: 2000 });
-  const { data: reportsData, error: reportsError, isLoading: reportsLoading } = useSWR(FETCH_REPORTS_KEY, fetchReports, { refreshInterval: 2000 });
+  // Every panel in one request; changes are pushed, so polling is a fallback
+  const { data: snapshot, error: connectionError, isLoading: loading } = useSWR(FETCH_SNAPSHOT_KEY, fetchDashboardSnapshot, { refreshInterval: 60000 });
 
-  const agents = agentsData?.agents || [];
-  const reports = reportsData?.reports || [];
+  useEffect(
+    () =>
+      subscribeToEvents((update) => {
+        if (update.event === "ready" || update.event === "resync" || update.data.truncated) {
+          mutate(FETCH_SNAPSHOT_KEY);
+        } else {
+          mutate(FETCH_SNAPSHOT_KEY, (current: any) => applyEvent(current, update), { revalidate: false });
+        }
+      }, ["agent", "bottleneck", "ingest", "plan"]),
+    [],
+  );
 
-  const loading = agentsLoading || reportsLoading;
-  const connectionError = agentsError || reportsError;
+  const agents = snapshot?.agents || [];
+  const reports = snapshot?.reports || [];
 
   const handleRunCycle = async () => {
     try {
       setIsRunning(true);
       setCycleError(null);
-      await runOrchestration();
-      // Trigger immediate re-fetch
-      mutate(FETCH_AGENTS_KEY);
-      mutate(FETCH_REPORTS_KEY);
+      setProgress([]);
+      await runOrchestration((update) => {
+        if (update.event === "status") {
+          setStage(update.data.stage);
+        } else {
+          setProgress((previous) => [...previous, update.data]);
+        }
+      });
     } catch (err: any) {
       console.error(err);
       setCycleError(err.message || "Failed to run cycle");
     } finally {
       setIsRunning(false);
+      setStage(null);
     }
   };
 
@@ -61,7 +116,7 @@ export default function Dashboard() {
 
           <Button className="gap-2" onClick={handleRunCycle} disabled={isRunning || !!connectionError}>
             <Play size={16} />
-            {isRunning ? "Running Cycle..." : "Run Diagnostic Cycle"}
+            {isRunning ? `Running Cycle${stage ? ` (${stage})` : ""}...` : "Run Diagnostic Cycle"}
           </Button>
         </div>
       </div>
@@ -90,7 +145,7 @@ export default function Dashboard() {
             key={agent.agent_id}
             id={agent.agent_id}
             domain={agent.domain}
-            status={isRunning ? "working" : "idle"}
+            status={isRunning && !progress.some((p) => p.agent_id === agent.agent_id) ? "working" : "idle"}
             lastActive={formatLastRun(agent.last_run)}
           />
         ))}
@@ -104,9 +159,31 @@ export default function Dashboard() {
       <div className="grid gap-4 md:grid-cols-2 lg:grid-cols-7">
         <div className="col-span-4 border rounded-xl p-6 bg-white shadow-sm">
           <h3 className="font-semibold text-lg mb-4">Live Activity</h3>
-          <div className="text-slate-500 text-sm">
-            Activity polling enabled (2s). Watch terminal for detailed logs.
-          </div>
+          {progress.length === 0 ? (
+            <div className="text-slate-500 text-sm">
+              {isRunning ? "Waiting for the first diagnosis..." : "Run a cycle to see agents report in."}
+            </div>
+          ) : (
+            <ul className="space-y-2 text-sm">
+              {progress.map((item) => (
+                <li key={item.agent_id} className="flex justify-between gap-4">
+                  <span className="font-medium text-slate-700">{item.agent_id}</span>
+                  <span className="text-slate-500 truncate">
+                    {item.status === "dead"
+                      ? `failed: ${item.error}`
+                      : item.skipped
+                        ? "unchanged, skipped"
+                        : item.bottleneck?.description || "no bottleneck"}
+                  </span>
+                </li>
+              ))}
+              {isRunning && (
+                <li className="text-slate-400">
+                  {progress[progress.length - 1].completed} of {progress[progress.length - 1].total} agents done
+                </li>
+              )}
+            </ul>
+          )}
         </div>
         <div className="col-span-3 border rounded-xl p-6 bg-white shadow-sm">
           <h3 className="font-semibold text-lg mb-4">Active Bottlenecks</h3>
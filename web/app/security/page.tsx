@@ -1,10 +1,7 @@
 "use client";
 
 import { useEffect, useState } from "react";
-import { 
-  fetchSecuritySummary, 
-  fetchVulnerabilities 
-} from "@/lib/api";
+import { fetchDashboardSnapshot, subscribeToEvents } from "@/lib/api";
 import { 
   Card, 
   CardContent, 
@@ -54,12 +51,9 @@ export default function SecurityDashboard() {
   useEffect(() => {
     async function loadData() {
       try {
-        const [summaryData, vulnsData] = await Promise.all([
-          fetchSecuritySummary(),
-          fetchVulnerabilities()
-        ]);
-        setSummary(summaryData);
-        setVulnerabilities(vulnsData.vulnerabilities || []);
+        const snapshot = await fetchDashboardSnapshot();
+        setSummary(snapshot.security_summary);
+        setVulnerabilities(snapshot.vulnerabilities || []);
       } catch (err) {
         console.error("Failed to load security data", err);
       } finally {
@@ -67,6 +61,8 @@ export default function SecurityDashboard() {
       }
     }
     loadData();
+    // Re-read after each ingest (and on (re)connect or resync)
+    return subscribeToEvents(() => loadData(), ["ingest"]);
   }, []);
 
   const getSeverityBadge = (severity: string) => {
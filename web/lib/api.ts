@@ -1,5 +1,13 @@
 const API_BASE_URL = "http://localhost:8000";
 
+// The server sheds load on expensive endpoints with 429 + Retry-After
+function busyError(response: Response, action: string) {
+  const retryAfter = response.headers.get("Retry-After");
+  return new Error(
+    `Failed to ${action}: server busy` + (retryAfter ? `, retry in ${retryAfter}s` : ""),
+  );
+}
+
 export async function fetchAgents() {
   const response = await fetch(`${API_BASE_URL}/agents`);
   if (!response.ok) {
@@ -8,6 +16,34 @@ export async function fetchAgents() {
   return response.json();
 }
 
+// Every dashboard panel (agents, reports, plan, security) in one request
+export async function fetchDashboardSnapshot() {
+  const response = await fetch(`${API_BASE_URL}/dashboard/snapshot`);
+  if (!response.ok) {
+    throw new Error("Failed to fetch dashboard");
+  }
+  return response.json();
+}
+
+export type DashboardEvent = {
+  event: "ready" | "agent" | "bottleneck" | "ingest" | "plan" | "action" | "resync";
+  data: any;
+};
+
+// Deltas to the dashboard snapshot, pushed as they're committed. On
+// "ready" (each (re)connect) and "resync", re-read the snapshot.
+export function subscribeToEvents(onEvent: (event: DashboardEvent) => void, kinds?: string[]) {
+  const query = kinds ? `?kinds=${kinds.join(",")}` : "";
+  const source = new EventSource(`${API_BASE_URL}/events${query}`);
+  for (const event of ["ready", "agent", "bottleneck", "ingest", "plan", "action", "resync"] as const) {
+    source.addEventListener(event, (message) => {
+      onEvent({ event, data: JSON.parse((message as MessageEvent).data) });
+    });
+  }
+  // EventSource reconnects by itself; "ready" follows each reconnect
+  return () => source.close();
+}
+
 export async function fetchReports() {
   const response = await fetch(`${API_BASE_URL}/reports`);
   if (!response.ok) {
@@ -24,20 +60,92 @@ export async function runDiagnosis(agentId: string, domain: string) {
     },
     body: JSON.stringify({ agent_id: agentId, domain }),
   });
+  if (response.status === 429) {
+    throw busyError(response, "run diagnosis");
+  }
   if (!response.ok) {
     throw new Error("Failed to run diagnosis");
   }
   return response.json();
 }
 
-export async function runOrchestration() {
+export async function runDiagnoses(items: { agent_id: string; domain: string }[]) {
+  const response = await fetch(`${API_BASE_URL}/diagnose/batch`, {
+    method: "POST",
+    headers: {
+      "Content-Type": "application/json",
+    },
+    body: JSON.stringify({ items }),
+  });
+  if (response.status === 429) {
+    throw busyError(response, "run diagnoses");
+  }
+  if (!response.ok) {
+    throw new Error("Failed to run diagnoses");
+  }
+  return response.json();
+}
+
+export async function fetchJob(jobId: number) {
+  const response = await fetch(`${API_BASE_URL}/jobs/${jobId}`);
+  if (!response.ok) {
+    throw new Error("Failed to fetch job");
+  }
+  return response.json();
+}
+
+export type AgentProgress = {
+  agent_id: string;
+  domain: string;
+  status: "succeeded" | "dead";
+  skipped: boolean;
+  bottleneck?: { description?: string; impact_score?: number; confidence?: number };
+  error?: string;
+  completed: number;
+  total: number;
+};
+
+export type OrchestrationProgress =
+  | { event: "status"; data: { job_id: number; stage: string; agents: number } }
+  | { event: "agent"; data: AgentProgress };
+
+export async function runOrchestration(
+  onProgress?: (progress: OrchestrationProgress) => void,
+) {
   const response = await fetch(`${API_BASE_URL}/orchestrate`, {
     method: "POST",
   });
+  if (response.status === 429) {
+    throw busyError(response, "run orchestration cycle");
+  }
   if (!response.ok) {
     throw new Error("Failed to run orchestration cycle");
   }
-  return response.json();
+  const { job_id } = await response.json();
+
+  // The cycle runs on the worker pool; follow its progress events
+  return new Promise((resolve, reject) => {
+    const source = new EventSource(`${API_BASE_URL}/orchestrate/${job_id}/events`);
+    for (const event of ["status", "agent"] as const) {
+      source.addEventListener(event, (message) => {
+        onProgress?.({ event, data: JSON.parse((message as MessageEvent).data) });
+      });
+    }
+    source.addEventListener("complete", (message) => {
+      source.close();
+      resolve(JSON.parse((message as MessageEvent).data));
+    });
+    source.addEventListener("failed", (message) => {
+      source.close();
+      reject(new Error(JSON.parse((message as MessageEvent).data).error || "Orchestration cycle failed"));
+    });
+    source.onerror = () => {
+      // EventSource reconnects by itself unless the stream was refused
+      if (source.readyState === EventSource.CLOSED) {
+        reject(new Error("Lost connection to orchestration progress"));
+      }
+    };
+  });
 }
 
 export async function fetchSecuritySummary() {